@@ -0,0 +1,6 @@
+"""Reproducible throughput benchmarks for the KISS Signal data and backtest pipelines.
+
+Run ``python -m benchmarks run`` to record a JSON baseline and
+``python -m benchmarks compare BASELINE CURRENT`` to flag regressions.
+All inputs are synthetic and seeded, so no network access is needed.
+"""
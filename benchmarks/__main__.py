@@ -0,0 +1,86 @@
+"""Command line entry point: ``python -m benchmarks run|compare``."""
+
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from .harness import compare_results, load_results, run_benchmarks, save_results
+from .scenarios import BenchmarkParams
+
+app = typer.Typer(help="KISS Signal throughput benchmarks")
+console = Console()
+
+
+@app.command()
+def run(
+    output: Path = typer.Option(Path("benchmarks/results/latest.json"), "--output", "-o", help="Results JSON path."),
+    symbols: int = typer.Option(10, "--symbols", help="Number of synthetic symbols."),
+    years: int = typer.Option(3, "--years", help="Years of synthetic history per symbol."),
+    positions: int = typer.Option(200, "--positions", help="Open positions for process_open_positions."),
+    strategy_rows: int = typer.Option(20000, "--strategy-rows", help="Rows in the strategies table for reporter queries."),
+    seed: int = typer.Option(42, "--seed", help="Random seed for synthetic data."),
+    repeat: int = typer.Option(3, "--repeat", help="Timed repetitions per scenario (best is kept)."),
+    scenario: Optional[List[str]] = typer.Option(None, "--scenario", "-s", help="Scenario to run (repeatable; default all)."),
+    timeout: Optional[float] = typer.Option(None, "--timeout", help="Seconds before a scenario is stopped and reported as failed."),
+) -> None:
+    """Run benchmark scenarios and write a JSON results file."""
+    params = BenchmarkParams(symbols=symbols, years=years, positions=positions, strategy_rows=strategy_rows, seed=seed)
+    try:
+        results = run_benchmarks(params, scenario, repeat=repeat, timeout=timeout)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    save_results(results, output)
+
+    table = Table(title="Benchmark Results")
+    for column in ("Scenario", "Wall (s)", "Peak RSS (MiB)", "Ops", "Ops/sec"):
+        table.add_column(column, justify="left" if column == "Scenario" else "right")
+    for name, result in results["scenarios"].items():
+        if "error" in result:
+            table.add_row(name, f"[red]{result['error']}[/red]", "", "", "")
+            continue
+        rss = result["peak_rss_mb"]
+        table.add_row(
+            name, f"{result['wall_s']:.3f}", "-" if rss is None else f"{rss:.0f}",
+            str(result["ops"]), f"{result['ops_per_sec']:.1f}" if result["ops_per_sec"] else "-",
+        )
+    console.print(table)
+    console.print(f"Results saved to: {output}")
+
+
+@app.command()
+def compare(
+    baseline: Path = typer.Argument(..., help="Baseline results JSON."),
+    current: Path = typer.Argument(..., help="Current results JSON."),
+    threshold: float = typer.Option(0.2, "--threshold", help="Allowed relative slowdown/growth (0.2 = 20%)."),
+) -> None:
+    """Compare two results files; exits 1 if any scenario regressed beyond the threshold."""
+    try:
+        rows = compare_results(load_results(baseline), load_results(current), threshold)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(2)
+
+    table = Table(title=f"Benchmark Comparison (threshold {threshold:.0%})")
+    for column in ("Scenario", "Wall", "Peak RSS", "Status"):
+        table.add_column(column)
+    for row in rows:
+        wall = row.get("wall_s_change")
+        rss = row.get("peak_rss_mb_change")
+        table.add_row(
+            row["scenario"],
+            "-" if wall is None else f"{wall:+.1%}",
+            "-" if rss is None else f"{rss:+.1%}",
+            "[red]REGRESSION[/red]" if row["regressed"] else "[green]ok[/green]",
+        )
+    console.print(table)
+
+    if any(row["regressed"] for row in rows):
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    app()
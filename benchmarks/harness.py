@@ -0,0 +1,146 @@
+"""Benchmark runner and regression comparison.
+
+Every scenario runs in its own spawned process so peak RSS and "cold" state are
+per-scenario. Results are written as JSON:
+
+    {"meta": {...}, "scenarios": {name: {"wall_s", "peak_rss_mb", "ops", "ops_per_sec"}}}
+"""
+
+import json
+import multiprocessing as mp
+import platform
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from queue import Empty
+from typing import Any, Dict, List, Optional
+
+from kiss_signal.performance import peak_memory_mb
+
+from .scenarios import SCENARIOS, BenchmarkParams
+
+__all__ = ["run_benchmarks", "compare_results", "load_results", "save_results"]
+
+
+def _run_in_child(name: str, params: BenchmarkParams, repeat: int, queue: "mp.Queue[Dict[str, Any]]") -> None:
+    import logging
+    logging.disable(logging.CRITICAL)  # Keep pipeline logging out of the measurement
+    try:
+        with tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as tmp:
+            run = SCENARIOS[name](params, Path(tmp))
+            timings = []
+            ops = 0
+            for _ in range(repeat):
+                start = time.perf_counter()
+                ops = run()
+                timings.append(time.perf_counter() - start)
+            wall = min(timings)
+            queue.put({
+                "wall_s": wall,
+                "peak_rss_mb": peak_memory_mb(),
+                "ops": ops,
+                "ops_per_sec": ops / wall if wall > 0 else None,
+                "repeat": repeat,
+            })
+    except Exception as e:  # Report scenario failures instead of hanging the parent
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def _collect(process: Any, queue: Any, timeout: Optional[float], poll: float = 1.0) -> Dict[str, Any]:
+    """Wait for a scenario's result, reporting a crashed or timed-out child as an error."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        try:
+            result: Dict[str, Any] = queue.get(timeout=poll)
+            return result
+        except Empty:
+            pass
+        if not process.is_alive():
+            try:  # The result can land just as the child exits
+                result = queue.get(timeout=poll)
+                return result
+            except Empty:
+                return {"error": f"Scenario process exited with code {process.exitcode} without a result"}
+        if deadline is not None and time.monotonic() >= deadline:
+            process.terminate()
+            return {"error": f"Timed out after {timeout:g}s"}
+
+
+def run_benchmarks(
+    params: BenchmarkParams,
+    scenarios: Optional[List[str]] = None,
+    repeat: int = 1,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Run the selected scenarios (all by default) and return the results document.
+
+    A scenario whose process dies (e.g. killed for memory) or runs longer than
+    ``timeout`` seconds is recorded with an ``error`` instead of hanging the run.
+    """
+    names = scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {unknown}. Available: {list(SCENARIOS)}")
+
+    ctx = mp.get_context("spawn")
+    results: Dict[str, Any] = {}
+    for name in names:
+        # Cold-cache scenarios are only meaningful on their first pass
+        scenario_repeat = 1 if name == "cache_load_cold" else repeat
+        queue = ctx.Queue()
+        process = ctx.Process(target=_run_in_child, args=(name, params, scenario_repeat, queue))
+        process.start()
+        results[name] = _collect(process, queue, timeout)
+        process.join()
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": asdict(params),
+        },
+        "scenarios": results,
+    }
+
+
+def save_results(results: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    results: Dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    return results
+
+
+def compare_results(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.2
+) -> List[Dict[str, Any]]:
+    """Compare two result documents scenario by scenario.
+
+    A scenario regresses when its wall time or peak RSS grows by more than
+    ``threshold`` (a fraction, 0.2 = 20%) relative to the baseline.
+
+    Returns:
+        One row per scenario present in both documents with the relative changes
+        and a ``regressed`` flag
+    """
+    if baseline.get("meta", {}).get("params") != current.get("meta", {}).get("params"):
+        raise ValueError("Baseline and current results were recorded with different benchmark parameters")
+
+    rows = []
+    for name, base in baseline.get("scenarios", {}).items():
+        cur = current.get("scenarios", {}).get(name)
+        if cur is None or "error" in base or "error" in cur:
+            continue
+        row: Dict[str, Any] = {"scenario": name, "regressed": False}
+        for metric in ("wall_s", "peak_rss_mb"):
+            if base.get(metric) and cur.get(metric) is not None:
+                change = cur[metric] / base[metric] - 1
+                row[f"{metric}_change"] = change
+                row["regressed"] = row["regressed"] or change > threshold
+        rows.append(row)
+    return rows
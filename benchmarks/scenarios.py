@@ -0,0 +1,219 @@
+"""Benchmark scenarios.
+
+Each scenario is a setup function ``(params, workdir) -> run`` where ``run()``
+executes the measured work and returns the number of operations it performed.
+Setup (data generation, database seeding, JIT warm-up) is not timed.
+"""
+
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict
+from unittest.mock import patch
+
+import pandas as pd
+
+from kiss_signal import data, persistence, reporter
+from kiss_signal.backtester import Backtester
+from kiss_signal.config import Config, EdgeScoreWeights, RuleDef, RulesConfig, WalkForwardConfig
+
+from .synthetic import generate_ohlcv, generate_universe, symbol_names, write_cache
+
+__all__ = ["BenchmarkParams", "SCENARIOS"]
+
+RunFn = Callable[[], int]
+SetupFn = Callable[["BenchmarkParams", Path], RunFn]
+
+
+@dataclass(frozen=True)
+class BenchmarkParams:
+    """Size knobs shared by all scenarios."""
+    symbols: int = 10
+    years: int = 3
+    positions: int = 200
+    strategy_rows: int = 20000
+    seed: int = 42
+
+
+def _freeze_date(universe: Dict[str, pd.DataFrame]) -> date:
+    return max(frame.index[-1] for frame in universe.values()).date()
+
+
+def _rules_config() -> RulesConfig:
+    return RulesConfig(
+        context_filters=[
+            RuleDef(name="market_bullish", type="market_above_sma", params={"index_symbol": "^NSEI", "period": 50}),
+        ],
+        entry_signals=[
+            RuleDef(name="sma_cross", type="sma_crossover", params={"fast_period": 10, "slow_period": 20}),
+            RuleDef(name="rsi_oversold", type="rsi_oversold", params={"period": 14, "oversold_threshold": 40.0}),
+        ],
+        exit_conditions=[
+            RuleDef(name="atr_stop", type="stop_loss_atr", params={"period": 14, "multiplier": 2.0}),
+            RuleDef(name="take_profit", type="take_profit_pct", params={"percentage": 0.10}),
+        ],
+    )
+
+
+def _app_config(workdir: Path, cache_dir: Path, freeze_date: date) -> Config:
+    universe_file = workdir / "universe.csv"
+    universe_file.write_text("symbol\n", encoding="utf-8")
+    return Config(
+        universe_path=str(universe_file),
+        historical_data_years=1,
+        cache_dir=str(cache_dir),
+        hold_period=20,
+        min_trades_threshold=1,
+        edge_score_weights=EdgeScoreWeights(win_pct=0.6, sharpe=0.4),
+        database_path=str(workdir / "bench.db"),
+        reports_output_dir=str(workdir / "reports"),
+        edge_score_threshold=0.5,
+        freeze_date=freeze_date,
+    )
+
+
+def cache_load_cold(params: BenchmarkParams, workdir: Path) -> RunFn:
+    """First get_price_data pass over CSV caches in a fresh process."""
+    universe = generate_universe(params.symbols, params.years, params.seed, include_index=False)
+    cache_dir = workdir / "cache"
+    write_cache(universe, cache_dir)
+    freeze = _freeze_date(universe)
+
+    def run() -> int:
+        for symbol in universe:
+            data.get_price_data(symbol, cache_dir, years=params.years, freeze_date=freeze)
+        return len(universe)
+    return run
+
+
+def cache_load_warm(params: BenchmarkParams, workdir: Path) -> RunFn:
+    """Repeat get_price_data pass after one untimed warm-up pass."""
+    run = cache_load_cold(params, workdir)
+    run()
+    return run
+
+
+def refresh_market_data(params: BenchmarkParams, workdir: Path) -> RunFn:
+    """refresh_market_data against an in-memory fake adapter (no network, no rate-limit sleeps)."""
+    symbols = symbol_names(params.symbols)
+    cache_dir = workdir / "refresh_cache"
+
+    def fake_fetch(symbol: str, years: int, freeze_date: object = None) -> pd.DataFrame:
+        frame = generate_ohlcv(symbol.replace(".NS", ""), years, params.seed)
+        return frame.reset_index()
+
+    def run() -> int:
+        with patch("kiss_signal.adapters.yfinance.fetch_symbol_data", side_effect=fake_fetch), \
+                patch.object(data.time, "sleep"):
+            results = data.refresh_market_data(symbols, str(cache_dir), years=params.years)
+        return sum(1 for ok in results.values() if ok)
+    return run
+
+
+def walk_forward_backtest(params: BenchmarkParams, workdir: Path) -> RunFn:
+    """Full walk_forward_backtest per symbol with a context filter and ATR exits."""
+    universe = generate_universe(params.symbols, params.years, params.seed)
+    market_data = universe.pop("^NSEI")
+    rules_config = _rules_config()
+    walk_forward = WalkForwardConfig(
+        enabled=True, training_period="365d", testing_period="90d", step_size="90d", min_trades_per_period=1
+    )
+    weights = EdgeScoreWeights(win_pct=0.6, sharpe=0.4)
+    bt = Backtester(hold_period=20, min_trades_threshold=1)
+
+    def backtest(symbol: str, frame: pd.DataFrame) -> None:
+        try:
+            bt.walk_forward_backtest(frame, walk_forward, rules_config, symbol, weights, market_data=market_data)
+        except ValueError:
+            pass  # No tradeable OOS windows is a valid outcome for random data
+
+    # Warm numba/vectorbt JIT caches so timings reflect steady-state throughput
+    first_symbol = next(iter(universe))
+    backtest(first_symbol, universe[first_symbol])
+
+    def run() -> int:
+        for symbol, frame in universe.items():
+            backtest(symbol, frame)
+        return len(universe)
+    return run
+
+
+def process_open_positions(params: BenchmarkParams, workdir: Path) -> RunFn:
+    """process_open_positions with N open positions spread over the universe."""
+    universe = generate_universe(params.symbols, params.years, params.seed)
+    nifty = universe["^NSEI"]
+    cache_dir = workdir / "cache"
+    write_cache(universe, cache_dir)
+    freeze = _freeze_date(universe)
+    app_config = _app_config(workdir, cache_dir, freeze)
+    db_path = Path(app_config.database_path)
+    persistence.create_database(db_path)
+
+    symbols = symbol_names(params.symbols)
+    rows = []
+    for i in range(params.positions):
+        symbol = symbols[i % len(symbols)]
+        entry_date = freeze - timedelta(days=1 + i % 30)
+        entry_price = float(universe[symbol]["close"].asof(pd.Timestamp(entry_date)))
+        rows.append((symbol, entry_date.isoformat(), entry_price, "OPEN", json.dumps(["bench"])))
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.executemany(
+            "INSERT INTO positions (symbol, entry_date, entry_price, status, rule_stack_used) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    exit_conditions = [
+        {"type": "stop_loss_atr", "params": {"period": 14, "multiplier": 2.0}},
+        {"type": "take_profit_pct", "params": {"percentage": 0.10}},
+        {"type": "sma_cross_under", "params": {"fast_period": 10, "slow_period": 20}},
+    ]
+
+    def run() -> int:
+        to_close, to_hold = reporter.process_open_positions(db_path, app_config, exit_conditions, nifty)
+        return len(to_close) + len(to_hold)
+    return run
+
+
+def reporter_aggregation(params: BenchmarkParams, workdir: Path) -> RunFn:
+    """Per-stock and aggregated strategy analysis queries over a seeded strategies table."""
+    db_path = workdir / "strategies.db"
+    persistence.create_database(db_path)
+    symbols = symbol_names(max(params.symbols, 1))
+    rule_stacks = [
+        json.dumps([{"name": f"rule_{r}", "type": "sma_crossover", "params": {"fast_period": 10, "slow_period": 20 + r}}])
+        for r in range(10)
+    ]
+    rows = []
+    for i in range(params.strategy_rows):
+        rows.append((
+            f"2025-01-{1 + (i // (len(symbols) * len(rule_stacks))) % 28:02d}T00:00:{i % 60:02d}",
+            symbols[i % len(symbols)],
+            rule_stacks[(i // len(symbols)) % len(rule_stacks)],
+            0.5 + (i % 50) / 100, 0.4 + (i % 30) / 100, 0.5 + (i % 20) / 10,
+            10 + i % 40, 0.01 * (i % 7), json.dumps({"freeze_date": None}), f"hash{i % 3}",
+        ))
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO strategies (run_timestamp, symbol, rule_stack, edge_score, win_pct, sharpe, "
+            "total_trades, avg_return, config_snapshot, config_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def run() -> int:
+        for _ in reporter.iter_strategy_performance(db_path, min_trades=10):
+            pass
+        reporter.analyze_strategy_performance_aggregated(db_path, min_trades=10)
+        return len(rows)  # Strategy rows scanned by each query
+    return run
+
+
+SCENARIOS: Dict[str, SetupFn] = {
+    "cache_load_cold": cache_load_cold,
+    "cache_load_warm": cache_load_warm,
+    "refresh_market_data": refresh_market_data,
+    "walk_forward_backtest": walk_forward_backtest,
+    "process_open_positions": process_open_positions,
+    "reporter_aggregation": reporter_aggregation,
+}
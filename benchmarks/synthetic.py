@@ -0,0 +1,83 @@
+"""Seeded synthetic OHLCV data for benchmarks.
+
+Prices follow a geometric random walk; each symbol gets its own stream derived
+from (seed, symbol), so adding symbols never changes existing ones.
+"""
+
+import zlib
+from datetime import date
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from kiss_signal import data
+
+__all__ = ["generate_ohlcv", "generate_universe", "write_cache", "symbol_names"]
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def symbol_names(n_symbols: int) -> List[str]:
+    """Deterministic synthetic ticker names (SYN0000, SYN0001, ...)."""
+    return [f"SYN{i:04d}" for i in range(n_symbols)]
+
+
+def generate_ohlcv(
+    symbol: str,
+    years: int,
+    seed: int = 42,
+    end: date = date(2025, 6, 30),
+    drift: float = 0.0003,
+    volatility: float = 0.018,
+    start_price: float = 100.0,
+) -> pd.DataFrame:
+    """Generate business-day OHLCV data ending at ``end``.
+
+    Args:
+        symbol: Symbol name; mixed into the seed so every symbol differs
+        years: Years of history (252 bars per year)
+        seed: Base seed for reproducibility
+        end: Last bar date
+        drift: Mean daily log return
+        volatility: Daily log return standard deviation
+        start_price: First close
+
+    Returns:
+        DataFrame indexed by date with open/high/low/close/volume columns
+    """
+    rng = np.random.default_rng([seed, zlib.crc32(symbol.encode())])
+    n_bars = years * TRADING_DAYS_PER_YEAR
+    index = pd.bdate_range(end=pd.Timestamp(end), periods=n_bars, name="date")
+
+    log_returns = rng.normal(drift, volatility, n_bars)
+    close = start_price * np.exp(np.cumsum(log_returns))
+    prev_close = np.concatenate([[start_price], close[:-1]])
+    open_ = prev_close * (1 + rng.normal(0, volatility / 3, n_bars))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, volatility / 2, n_bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, volatility / 2, n_bars)))
+    volume = rng.lognormal(mean=13, sigma=0.4, size=n_bars).astype(np.int64)
+
+    return pd.DataFrame(
+        {"open": open_, "high": high, "low": low, "close": close, "volume": volume},
+        index=index,
+    )
+
+
+def generate_universe(
+    n_symbols: int, years: int, seed: int = 42, include_index: bool = True
+) -> Dict[str, pd.DataFrame]:
+    """Generate ``n_symbols`` synthetic stocks plus (optionally) a ^NSEI index series."""
+    universe = {symbol: generate_ohlcv(symbol, years, seed) for symbol in symbol_names(n_symbols)}
+    if include_index:
+        universe["^NSEI"] = generate_ohlcv("^NSEI", years, seed, drift=0.0004, volatility=0.01, start_price=18000.0)
+    return universe
+
+
+# impure
+def write_cache(universe: Dict[str, pd.DataFrame], cache_dir: Path) -> None:
+    """Write frames through the production cache writer (CSV + latest-bar index)."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for symbol, frame in universe.items():
+        data._save_cache(symbol, frame, cache_dir)
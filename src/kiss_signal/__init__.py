@@ -3,8 +3,19 @@
 __version__ = "1.4.0"
 __author__ = "KISS Signal Team"
 
+import importlib
+from typing import Any
+
 # Re-export main classes and modules for convenience
 from .config import Config
-from . import data, backtester, persistence, reporter
 
 __all__ = ["Config", "data", "backtester", "persistence", "reporter", "__version__"]
+
+_LAZY_SUBMODULES = {"data", "backtester", "persistence", "reporter"}
+
+
+def __getattr__(name: str) -> Any:
+    # Submodules load on first access so importing the CLI stays fast
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
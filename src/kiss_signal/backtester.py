@@ -3,34 +3,78 @@
 This module handles backtesting of rule combinations and edge score calculation.
 """
 
+import hashlib
+import json
 import logging
 from datetime import date, timedelta
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import numpy as np
 import pandas as pd
-import vectorbt as vbt
 
 # Configure pandas to opt into future behavior for downcasting
 pd.set_option('future.no_silent_downcasting', True)
 
-from . import rules
+from . import expressions, metrics, rules
 from .config import RulesConfig, EdgeScoreWeights, Config, WalkForwardConfig, RuleDef
 from .performance import performance_monitor
 from .exceptions import DataMismatchError
 
-__all__ = ["Backtester"]
+if TYPE_CHECKING:
+    import vectorbt as vbt
+
+__all__ = ["Backtester", "WindowResultCache", "SignalCache"]
 
 logger = logging.getLogger(__name__)
 
-# Configure vectorbt to handle irregular frequencies
-try:
-    import vectorbt as vbt
-    # Set global frequency for array wrapper to handle irregular data
-    vbt.settings.array_wrapper['freq'] = 'B'  # Business day frequency for stock data
-    logger.debug("Configured vectorbt with business day frequency for irregular data")
-except Exception as e:
-    logger.warning(f"Could not configure vectorbt frequency settings: {e}")
+# Walk-forward window starts are aligned to business days counted from this Monday
+_WINDOW_GRID_EPOCH = np.datetime64("2000-01-03")
+
+# Salted into persisted cache keys; bump when a code change alters the results
+# cached for unchanged inputs, so stale entries stop matching.
+CACHE_VERSION = 1
+
+# Frames whose expression node values are kept: a window's training, testing and market frames
+_EXPRESSION_FRAMES = 8
+
+_vbt_module: Any = None
+
+
+def _vbt() -> Any:
+    """Imports and configures vectorbt on first use.
+
+    vectorbt pulls in numba, scipy and plotting libraries and costs seconds to
+    import, so commands that never backtest (``--help``, analysis) skip it.
+    """
+    global _vbt_module
+    if _vbt_module is None:
+        import vectorbt
+        # Configure vectorbt to handle irregular frequencies
+        try:
+            # Set global frequency for array wrapper to handle irregular data
+            vectorbt.settings.array_wrapper['freq'] = 'B'  # Business day frequency for stock data
+            logger.debug("Configured vectorbt with business day frequency for irregular data")
+        except Exception as e:
+            logger.warning(f"Could not configure vectorbt frequency settings: {e}")
+        _vbt_module = vectorbt
+    return _vbt_module
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps ``backtester.vbt`` reachable (e.g. for patching) without an eager import
+    if name == "vbt":
+        return _vbt()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _simulation_close(price_data: pd.DataFrame) -> pd.Series:
+    """Close prices in float64 for vectorbt.
+
+    Compact frames (data.enable_compact_mode) store float32 prices; returns,
+    cumulative equity and Sharpe are accumulated from this float64 copy instead.
+    """
+    close = price_data["close"]
+    return close if close.dtype == np.float64 else close.astype(np.float64)
+
 
 def _ensure_frequency(data: pd.DataFrame) -> pd.DataFrame:
     """Ensure DataFrame has a consistent business day frequency.
@@ -72,6 +116,236 @@ def _ensure_frequency(data: pd.DataFrame) -> pd.DataFrame:
     return data
 
 
+class WindowResultCache:
+    """Walk-forward window results keyed by a hash of each window's input data.
+
+    Holds the OOS result (or None when the window produced none) of every window
+    seen for one symbol under one configuration, together with the window
+    boundaries. Rows are exchanged with the ``walk_forward_windows`` table with
+    results as JSON strings, decoded lazily on a hit. ``used`` collects the rows
+    needed by the current run, so windows that left the history are dropped on save.
+    """
+
+    def __init__(self, rows: Optional[List[Dict[str, str]]] = None) -> None:
+        self._rows: Dict[str, Dict[str, str]] = {row["window_key"]: dict(row) for row in rows or []}
+        self.used: Dict[str, Dict[str, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Returns (found, result) for a window key."""
+        row = self._rows.get(key)
+        if row is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        self.used[key] = row
+        return True, self._decode(row["result"])
+
+    def put(
+        self,
+        key: str,
+        result: Optional[Dict[str, Any]],
+        training_start: pd.Timestamp,
+        training_end: pd.Timestamp,
+        testing_end: pd.Timestamp,
+    ) -> None:
+        row = {
+            "window_key": key,
+            "training_start": training_start.isoformat(),
+            "oos_test_start": training_end.isoformat(),
+            "oos_test_end": testing_end.isoformat(),
+            "result": json.dumps(result, default=self._encode_value),
+        }
+        self._rows[key] = row
+        self.used[key] = row
+
+    def results(self) -> List[Optional[Dict[str, Any]]]:
+        """Results of the windows used by the current run, in window order."""
+        return [self._decode(row["result"]) for row in self.used.values()]
+
+    @property
+    def changed(self) -> bool:
+        """True when this run computed new windows or stopped needing old ones."""
+        return self.misses > 0 or len(self.used) != len(self._rows)
+
+    @staticmethod
+    def _encode_value(value: Any) -> Any:
+        if hasattr(value, 'model_dump'):
+            return value.model_dump()
+        if isinstance(value, (pd.Timestamp, date)):
+            return value.isoformat()
+        if isinstance(value, np.generic):
+            return value.item()
+        raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+    @staticmethod
+    def _decode(payload: str) -> Optional[Dict[str, Any]]:
+        result: Optional[Dict[str, Any]] = json.loads(payload)
+        if result is None:
+            return None
+        result["rule_stack"] = [
+            RuleDef(**rule) if isinstance(rule, dict) else rule for rule in result.get("rule_stack", [])
+        ]
+        for field in ("oos_period_start", "oos_test_start", "oos_test_end"):
+            if result.get(field) is not None:
+                result[field] = pd.Timestamp(result[field])
+        return result
+
+
+# Bars before the first appended bar that a rule's signal on it depends on. Only
+# rules of finite memory are listed; recursive indicators (EMA, RSI, ATR, running
+# maxima) depend on the whole history and are recomputed in full.
+_SIGNAL_LOOKBACK: Dict[str, Callable[..., int]] = {
+    "sma_crossover": lambda fast_period=10, slow_period=20, **_: int(slow_period) + 1,
+    "sma_cross_under": lambda fast_period=10, slow_period=20, **_: int(slow_period) + 1,
+    "price_above_sma": lambda period=50, **_: int(period),
+    "price_above_long_sma": lambda period=200, **_: int(period),
+    "market_above_sma": lambda period=50, **_: int(period),
+    "volume_spike": lambda period=20, **_: int(period),
+    "hammer_pattern": lambda **_: 0,
+    "engulfing_pattern": lambda **_: 1,
+    "bollinger_squeeze": lambda period=20, **_: int(period) + 5,
+    "donchian_breakout": lambda period=20, **_: int(period) + 1,
+    "donchian_breakdown": lambda period=10, **_: int(period) + 1,
+}
+
+
+class SignalCache:
+    """Rule signal series keyed by rule type, parameters and a hash of the input bars.
+
+    Signals are stored bit-packed (``np.packbits``) per (signal key, data hash)
+    together with the first date and length of the frame they were computed on,
+    and exchanged with the ``signal_cache`` table. An unchanged frame is a cache
+    read. A frame that only appends bars to a stored one reuses the stored bits
+    and, for rules of finite lookback, evaluates the rule on the new tail plus
+    its lookback only; rolling sums restart on the shorter slice, so tail values
+    match a full evaluation up to floating-point rounding.
+    """
+
+    def __init__(self, rows: Optional[List[Dict[str, Any]]] = None) -> None:
+        self._rows: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._by_start: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for row in rows or []:
+            self._add(dict(row))
+        self.used: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._superseded: Set[Tuple[str, str]] = set()
+        self._frame: Optional[pd.DataFrame] = None
+        self._row_hashes: Optional[np.ndarray] = None
+        self.hits = 0
+        self.extended = 0
+        self.misses = 0
+
+    @staticmethod
+    def signal_key(rule_type: str, params: Optional[Dict[str, Any]]) -> str:
+        """CACHE_VERSION, rule type and canonical (sorted, JSON) parameters."""
+        params = {key: value for key, value in (params or {}).items() if key != "index_symbol"}
+        return f"v{CACHE_VERSION}:{rule_type}:{json.dumps(params, sort_keys=True, default=str)}"
+
+    def signals(
+        self,
+        rule_type: str,
+        params: Optional[Dict[str, Any]],
+        price_data: pd.DataFrame,
+        compute: Callable[[pd.DataFrame], pd.Series],
+    ) -> pd.Series:
+        """Signals of a rule on price_data, computed with ``compute`` only where not cached."""
+        if price_data.empty or not isinstance(price_data.index, pd.DatetimeIndex):
+            return compute(price_data)
+        key = self.signal_key(rule_type, params)
+        data_hash = self._hash(price_data, len(price_data))
+        row = self._rows.get((key, data_hash))
+        if row is not None:
+            self.hits += 1
+            self.used[(key, data_hash)] = row
+            return pd.Series(self._unpack(row), index=price_data.index)
+
+        prefix = self._stored_prefix(key, rule_type, params, price_data)
+        if prefix is not None:
+            row, lookback = prefix
+            start = max(0, row["length"] - lookback)
+            tail = compute(price_data.iloc[start:])
+            values = np.concatenate([
+                self._unpack(row), tail.fillna(False).to_numpy(dtype=bool)[row["length"] - start:]
+            ])
+            signals = pd.Series(values, index=price_data.index)
+            self._superseded.add((key, row["data_hash"]))
+            self.extended += 1
+        else:
+            signals = compute(price_data)
+            self.misses += 1
+
+        if len(signals) == len(price_data) and signals.index.equals(price_data.index):
+            self._store(key, data_hash, price_data, signals)
+        return signals
+
+    def rows(self, since: Optional[pd.Timestamp] = None) -> List[Dict[str, Any]]:
+        """Rows to persist: those used by this run, plus stored rows that were
+        neither extended by this run nor start before ``since``."""
+        kept = dict(self.used)
+        for row_key, row in self._rows.items():
+            if row_key in kept or row_key in self._superseded:
+                continue
+            if since is not None and pd.Timestamp(row["first_date"]) < since:
+                continue
+            kept[row_key] = row
+        return list(kept.values())
+
+    @property
+    def changed(self) -> bool:
+        """True when this run computed new signals."""
+        return self.misses > 0 or self.extended > 0
+
+    def _add(self, row: Dict[str, Any]) -> None:
+        self._rows[(row["signal_key"], row["data_hash"])] = row
+        self._by_start.setdefault((row["signal_key"], row["first_date"]), []).append(row)
+
+    def _store(self, key: str, data_hash: str, price_data: pd.DataFrame, signals: pd.Series) -> None:
+        row = {
+            "signal_key": key,
+            "data_hash": data_hash,
+            "first_date": pd.Timestamp(price_data.index[0]).isoformat(),
+            "length": len(signals),
+            "bits": np.packbits(signals.fillna(False).to_numpy(dtype=bool)).tobytes(),
+        }
+        self._add(row)
+        self.used[(key, data_hash)] = row
+
+    def _stored_prefix(
+        self, key: str, rule_type: str, params: Optional[Dict[str, Any]], price_data: pd.DataFrame
+    ) -> Optional[Tuple[Dict[str, Any], int]]:
+        """Longest stored frame that price_data extends, with the rule's lookback."""
+        lookback_of = _SIGNAL_LOOKBACK.get(rule_type)
+        if lookback_of is None:
+            return None
+        try:
+            lookback = lookback_of(**(params or {}))
+        except (TypeError, ValueError):
+            return None
+        candidates = self._by_start.get((key, price_data.index[0].isoformat()), [])
+        for row in sorted(candidates, key=lambda r: r["length"], reverse=True):
+            if row["length"] < len(price_data) and self._hash(price_data, row["length"]) == row["data_hash"]:
+                return row, lookback
+        return None
+
+    def _hash(self, price_data: pd.DataFrame, length: int) -> str:
+        """Hash of the first ``length`` bars; per-row hashes are reused for the same frame."""
+        if self._frame is not price_data:
+            self._frame = price_data
+            self._row_hashes = pd.util.hash_pandas_object(price_data, index=True).to_numpy()
+        row_hashes = self._row_hashes
+        assert row_hashes is not None
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(tuple(price_data.columns)).encode())
+        digest.update(row_hashes[:length].tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _unpack(row: Dict[str, Any]) -> np.ndarray:
+        bits = np.frombuffer(bytes(row["bits"]), dtype=np.uint8)
+        return np.unpackbits(bits, count=int(row["length"])).astype(bool)
+
+
 class Backtester:
     """Handles strategy backtesting and edge score calculation."""
 
@@ -85,11 +359,21 @@ class Backtester:
         self.hold_period = hold_period
         self.min_trades_threshold = min_trades_threshold
         self.initial_capital = initial_capital
+        # Expression rules of the rules config being walked forward, compiled into one
+        # plan, and node values per frame (id -> (frame, values)), most recent last
+        self._expression_plan: Optional[expressions.Plan] = None
+        self._expression_values: Dict[int, Tuple[pd.DataFrame, Dict[Any, Any]]] = {}
+        # Signal cache of the symbol being walked forward, if the caller provided one
+        self._signal_cache: Optional[SignalCache] = None
+        # Context filter signals on the market frame last seen (the same for every
+        # symbol and window), and precondition outcomes per (symbol, rule, data)
+        self._context_frame: Optional[pd.DataFrame] = None
+        self._context_values: Dict[str, pd.Series] = {}
+        self._precondition_results: Dict[Tuple[str, str, str], bool] = {}
         
         # Set global frequency for vectorbt to handle irregular data
         try:
-            import vectorbt as vbt
-            vbt.settings.array_wrapper['freq'] = 'D'  # Default to daily frequency
+            _vbt().settings.array_wrapper['freq'] = 'D'  # Default to daily frequency
         except Exception:
             pass  # Continue if vectorbt settings can't be set
         
@@ -202,6 +486,16 @@ class Backtester:
             # Apply context filters to final signals
             final_entry_signals = entry_signals & context_signals
             
+            # Every trade opens on an entry, so too few entries cannot meet the threshold; skip the simulation
+            entry_count = int(final_entry_signals.sum())
+            if entry_count < self.min_trades_threshold:
+                logger.debug(
+                    f"Combo {[r.name for r in combo]} on {symbol} has {entry_count} entries, "
+                    f"below threshold of {self.min_trades_threshold}; skipping simulation"
+                )
+                performance_monitor.increment("simulations_screened_out")
+                return None
+            
             # Generate exit signals from exit_conditions and time-based exits
             exit_signals, sl_stop, tp_stop = self._generate_exit_signals(
                 final_entry_signals, price_data, rules_config.exit_conditions
@@ -220,21 +514,22 @@ class Backtester:
                     logger.debug(f"First 3 entry dates: {final_entry_signals[final_entry_signals].index[:3].tolist()}")
                     logger.debug(f"Last 3 entry dates: {final_entry_signals[final_entry_signals].index[-3:].tolist()}")
             
-            portfolio = vbt.Portfolio.from_signals(
-                close=price_data['close'],
-                entries=final_entry_signals,
-                exits=exit_signals,
-                sl_stop=sl_stop,
-                tp_stop=tp_stop,
-                fees=0.001,
-                slippage=0.0005,
-                init_cash=self.initial_capital,
-                size=self._calculate_risk_based_size(price_data, final_entry_signals, rules_config.exit_conditions),
-            )
+            with performance_monitor.span("simulate"):
+                portfolio = _vbt().Portfolio.from_signals(
+                    close=_simulation_close(price_data),
+                    entries=final_entry_signals,
+                    exits=exit_signals,
+                    sl_stop=sl_stop,
+                    tp_stop=tp_stop,
+                    fees=0.001,
+                    slippage=0.0005,
+                    init_cash=self.initial_capital,
+                    size=self._calculate_risk_based_size(price_data, final_entry_signals, rules_config.exit_conditions),
+                )
             
             # More debug logging
-            total_trades = portfolio.trades.count()
             if logger.isEnabledFor(logging.DEBUG):
+                total_trades = len(portfolio.trades.values)
                 logger.debug(f"Portfolio trades count for {symbol}: {total_trades}")
                 logger.debug(f"Trade count type: {type(total_trades)}")
                 if total_trades == 0 and final_entry_signals.sum() > 0:
@@ -249,14 +544,15 @@ class Backtester:
 
     def _calculate_performance_metrics(
         self,
-        portfolio: vbt.Portfolio,
+        portfolio: "vbt.Portfolio",
         combo: List[Any],
         symbol: str,
         edge_score_weights: EdgeScoreWeights,
         min_trades_threshold: int,
     ) -> Optional[Dict[str, Any]]:
         """Calculate performance metrics for a backtest portfolio."""
-        total_trades = int(portfolio.trades.count())
+        performance = metrics.column_metrics(metrics.portfolio_metrics(portfolio, edge_score_weights, symbol))
+        total_trades = performance["total_trades"]
         rule_names = " + ".join([r.name for r in combo])
 
         if total_trades < min_trades_threshold:
@@ -266,40 +562,14 @@ class Backtester:
             )
             return None
 
-        win_pct = portfolio.trades.win_rate()
-        
-        # Calculate Sharpe ratio with proper inf/nan handling
-        try:
-            sharpe = portfolio.sharpe_ratio()
-            # Handle edge cases: NaN or infinite values should become 0.0
-            if not (sharpe == sharpe):  # NaN check (NaN != NaN)
-                sharpe = 0.0
-            elif sharpe == float('inf') or sharpe == float('-inf'):  # Inf check
-                logger.warning(
-                    f"Sharpe ratio for {symbol} is 'inf' due to zero volatility of returns. "
-                    f"This is common with few trades. Setting to 0.0 for calculations."
-                )
-                sharpe = 0.0
-        except Exception:
-            # Fallback: if sharpe calculation fails completely, use 0.0
-            sharpe = 0.0
-        
-        # Use .returns for percentage, not .pnl for absolute value. Multiply by 100.
-        try:
-            returns_mean = portfolio.trades.returns.mean()
-            avg_return = returns_mean * 100 if total_trades > 0 and (returns_mean == returns_mean) else 0.0
-        except Exception:
-            avg_return = 0.0
-
-        edge_score = (win_pct * edge_score_weights.win_pct) + (sharpe * edge_score_weights.sharpe)
         return {
             "symbol": symbol,
             "rule_stack": combo,
-            "edge_score": edge_score,
-            "win_pct": win_pct,
-            "sharpe": sharpe,
+            "edge_score": performance["edge_score"],
+            "win_pct": performance["win_pct"],
+            "sharpe": performance["sharpe"],
             "total_trades": total_trades,
-            "avg_return": avg_return,
+            "avg_return": performance["avg_return"],
         }
 
     def _parse_period(self, period_str: str) -> int:
@@ -320,11 +590,19 @@ class Backtester:
         data: pd.DataFrame, 
         training_days: int, 
         testing_days: int, 
-        step_days: int
+        step_days: int,
     ) -> List[Tuple[pd.Timestamp, pd.Timestamp, pd.Timestamp]]:
         """
         Generate rolling period boundaries using TRADING DAY counts for robustness.
         
+        Window starts sit on a fixed grid of business days counted from
+        _WINDOW_GRID_EPOCH (every ``step`` business days), so the boundaries
+        depend only on the dates in the data: they stay fixed as the history
+        window slides forward, whatever earlier runs stored. Each window starts
+        at the first bar on or after its grid date, so market holidays do not
+        move later windows; up to ``step - 1`` leading bars before the first
+        grid date start no window of their own.
+        
         Returns:
             List of tuples, where each tuple is (training_start, training_end, testing_end)
         """
@@ -354,8 +632,26 @@ class Backtester:
             logger.error(error_msg)
             raise ValueError(error_msg)
         
+        last_start = total_rows - min_required_rows
+        starts: List[int] = list(range(0, last_start + 1, step_size))
+        if step_size > 0 and isinstance(data.index, pd.DatetimeIndex):
+            # Each start is the first bar on or after a grid date, so a market
+            # holiday shifts only its own window, never the ones after it.
+            days = data.index.values.astype("datetime64[D]")
+            offset = int(np.busday_count(_WINDOW_GRID_EPOCH, days[0]))
+            first_grid_day = np.busday_offset(days[0], -offset % step_size, roll="forward")
+            span = int(np.busday_count(first_grid_day, days[-1])) + 1
+            grid = np.busday_offset(first_grid_day, np.arange(0, max(span, 0), step_size))
+            aligned = np.unique(np.searchsorted(days, grid, side="left"))
+            aligned = aligned[aligned <= last_start]
+            if len(aligned):
+                starts = [int(i) for i in aligned]
+                logger.debug(f"Window grid: {starts[0]} leading bars precede the first window")
+            else:
+                starts = [0]  # Too little history for an aligned window; fall back to the first bar
+        
         # Generate periods using integer slicing - bulletproof approach
-        for i in range(0, total_rows - min_required_rows + 1, step_size):
+        for i in starts:
             train_start_idx = i
             train_end_idx = i + train_window_size
             test_end_idx = train_end_idx + test_window_size
@@ -376,13 +672,44 @@ class Backtester:
         symbol: str = "TEST",
         edge_score_weights: Optional[EdgeScoreWeights] = None,
         config: Optional[Config] = None,
-        market_data: Optional[pd.DataFrame] = None
+        market_data: Optional[pd.DataFrame] = None,
+        window_cache: Optional[WindowResultCache] = None,
+        signal_cache: Optional[SignalCache] = None,
     ) -> List[Dict[str, Any]]:
         """
         Industry-standard walk-forward analysis - DEFAULT behavior.
         
         Returns ONLY out-of-sample performance - the only metrics that matter.
+        With a ``window_cache``, windows whose input bars are unchanged since an
+        earlier run reuse their stored result; as window boundaries are fixed
+        to a business-day grid, a daily run only backtests new windows.
+        With a ``signal_cache``, rule signals of windows that are backtested are
+        read from it when their rule and input bars are unchanged.
         """
+        previous_cache, self._signal_cache = self._signal_cache, signal_cache
+        previous_plan, self._expression_plan = self._expression_plan, self._compile_expressions(rules_config)
+        self._precondition_results.clear()  # Memoized per symbol history; keep it to one call
+        self._expression_values.clear()
+        try:
+            return self._walk_forward(
+                data, walk_forward_config, rules_config, symbol, edge_score_weights, market_data, window_cache
+            )
+        finally:
+            self._signal_cache = previous_cache
+            self._expression_plan = previous_plan
+            self._expression_values.clear()
+
+    def _walk_forward(
+        self,
+        data: pd.DataFrame,
+        walk_forward_config: WalkForwardConfig,
+        rules_config: RulesConfig,
+        symbol: str,
+        edge_score_weights: Optional[EdgeScoreWeights],
+        market_data: Optional[pd.DataFrame],
+        window_cache: Optional[WindowResultCache],
+    ) -> List[Dict[str, Any]]:
+        """Body of ``walk_forward_backtest``."""
         # --- NEW VALIDATION BLOCK ---
         if market_data is not None and not market_data.empty:
             if data.index.min() < market_data.index.min() or data.index.max() > market_data.index.max():
@@ -415,60 +742,48 @@ class Backtester:
             raise ValueError(error_msg)
         
         # Roll through time periods
+        screened_out = 0
+        context_warmup = self._context_warmup(rules_config)
         for i, (training_start, training_end, testing_end) in enumerate(periods):
-            # 1. Training phase - find best strategy on training data only
-            train_data = data[training_start:training_end]
-            train_data = _ensure_frequency(train_data)  # Restore frequency for vectorbt
-            
-            if train_data.empty:
-                logger.warning(f"Empty training data for period {i+1}, skipping")
-                continue
-                
-            # Slice market data to match training period for proper alignment
-            sliced_market_data = None
-            if market_data is not None:
-                sliced_market_data = market_data[training_start:training_end]
-                logger.debug(f"Sliced market data from {len(market_data)} to {len(sliced_market_data)} rows for training period")
-            
-            # Find best strategy using simple in-sample optimization on training data only
-            # This is safe because we only use it for training, never for final results
-            best_strategies = self._find_best_strategy_training(
-                train_data, rules_config, edge_score_weights, symbol, sliced_market_data
-            )
-            
-            if not best_strategies:
-                logger.warning(f"No viable strategy found in training period {i+1}")
-                continue
-                
-            best_strategy = best_strategies[0]  # Take the best one
-            
-            # 2. Testing phase - apply strategy to unseen out-of-sample data
-            test_start = training_end
-            test_end = testing_end
-            test_data = data[test_start:test_end]
-            test_data = _ensure_frequency(test_data)  # Restore frequency for vectorbt
-            
-            if test_data.empty:
-                logger.warning(f"Empty testing data for period {i+1}, skipping")
-                continue
-            
-            # Slice market data to match testing period for proper alignment
-            sliced_test_market_data = None
-            if market_data is not None:
-                sliced_test_market_data = market_data[test_start:test_end]
-                logger.debug(f"Sliced market data for testing period from {len(market_data)} to {len(sliced_test_market_data)} rows")
-            
-            # 3. Record ONLY out-of-sample performance
-            oos_performance = self._backtest_single_strategy_oos(
-                test_data, best_strategy["rule_stack"], rules_config, 
-                edge_score_weights, symbol, training_start, test_start, test_end, sliced_test_market_data
-            )
+            with performance_monitor.span("window"):
+                found = False
+                window_key = None
+                if window_cache is not None:
+                    window_key = self._window_cache_key(
+                        data, market_data, training_start, training_end, testing_end, context_warmup
+                    )
+                    found, oos_performance = window_cache.get(window_key)
+                if not found:
+                    train_data, test_data = self._window_frames(data, training_start, training_end, testing_end)
+                    # Raw entry signals per rule, generated once and shared by the screen and the window
+                    train_signals: Dict[int, pd.Series] = {}
+                    test_signals: Dict[int, pd.Series] = {}
+                    if self._window_can_trade(
+                        train_data, test_data, market_data, rules_config, symbol,
+                        walk_forward_config.min_trades_per_period, train_signals, test_signals,
+                    ):
+                        oos_performance = self._run_window(
+                            i, train_data, test_data, market_data, rules_config, edge_score_weights, symbol,
+                            training_start, training_end, testing_end, train_signals, test_signals,
+                        )
+                    else:
+                        oos_performance = None
+                        screened_out += 1
+                    if window_cache is not None and window_key is not None:
+                        window_cache.put(window_key, oos_performance, training_start, training_end, testing_end)
             
             if oos_performance and oos_performance["total_trades"] >= walk_forward_config.min_trades_per_period:
                 oos_results.append(oos_performance)
             else:
                 logger.debug(f"Period {i+1} insufficient trades, skipping")
         
+        performance_monitor.increment("windows_total", len(periods))
+        performance_monitor.increment("windows_screened_out", screened_out)
+        if screened_out:
+            logger.debug(f"{symbol}: pre-screen skipped {screened_out} of {len(periods)} windows")
+        if screened_out == len(periods):
+            performance_monitor.increment("symbols_screened_out")
+        
         # Final metrics come from concatenated out-of-sample periods only
         if not oos_results:
             error_msg = (
@@ -483,6 +798,167 @@ class Backtester:
         consolidated_result = self._consolidate_oos_results(oos_results, symbol)
         return [consolidated_result]  # Return single consolidated result
 
+    def _run_window(
+        self,
+        i: int,
+        train_data: pd.DataFrame,
+        test_data: pd.DataFrame,
+        market_data: Optional[pd.DataFrame],
+        rules_config: RulesConfig,
+        edge_score_weights: Optional[EdgeScoreWeights],
+        symbol: str,
+        training_start: pd.Timestamp,
+        training_end: pd.Timestamp,
+        testing_end: pd.Timestamp,
+        train_signals: Optional[Dict[int, pd.Series]] = None,
+        test_signals: Optional[Dict[int, pd.Series]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Trains on one walk-forward window and returns its out-of-sample result.
+
+        train_signals and test_signals hold entry signals the pre-screen already
+        generated on the window's frames (see ``_shared_signals``).
+        """
+        # 1. Training phase - find best strategy on training data only
+        if train_data.empty:
+            logger.warning(f"Empty training data for period {i+1}, skipping")
+            return None
+        
+        # Context filters see the full market series (evaluated once, then aligned to
+        # each window), so SMAs on the index are warmed up at every window start
+        # Find best strategy using simple in-sample optimization on training data only
+        # This is safe because we only use it for training, never for final results
+        best_strategies = self._find_best_strategy_training(
+            train_data, rules_config, edge_score_weights, symbol, market_data, train_signals
+        )
+    
+        if not best_strategies:
+            logger.warning(f"No viable strategy found in training period {i+1}")
+            return None
+        
+        best_strategy = best_strategies[0]  # Take the best one
+    
+        # 2. Testing phase - apply strategy to unseen out-of-sample data
+        test_start = training_end
+        test_end = testing_end
+    
+        if test_data.empty:
+            logger.warning(f"Empty testing data for period {i+1}, skipping")
+            return None
+    
+        # 3. Record ONLY out-of-sample performance
+        return self._backtest_single_strategy_oos(
+            test_data, best_strategy["rule_stack"], rules_config, 
+            edge_score_weights, symbol, training_start, test_start, test_end, market_data, test_signals
+        )
+
+    @staticmethod
+    def _window_frames(
+        data: pd.DataFrame, training_start: pd.Timestamp, training_end: pd.Timestamp, testing_end: pd.Timestamp
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Training and testing frames of a window, with frequency restored for vectorbt."""
+        train_data = _ensure_frequency(data[training_start:training_end])
+        test_data = _ensure_frequency(data[training_end:testing_end])
+        return train_data, test_data
+
+    def _window_can_trade(
+        self,
+        train_data: pd.DataFrame,
+        test_data: pd.DataFrame,
+        market_data: Optional[pd.DataFrame],
+        rules_config: RulesConfig,
+        symbol: str,
+        min_trades: int,
+        train_signals: Optional[Dict[int, pd.Series]] = None,
+        test_signals: Optional[Dict[int, pd.Series]] = None,
+    ) -> bool:
+        """Pre-screen: whether a window could produce an OOS result with ``min_trades`` trades.
+
+        Every trade opens on an entry signal, so signal counts bound trade counts.
+        Training only selects rules with at least one trade, and the OOS result
+        only counts with ``min_trades``. A window where no entry rule has at least
+        one context-filtered entry in training and ``min_trades`` in testing is
+        skipped before any portfolio simulation. Signals are evaluated on the
+        same frames as ``_run_window``, so the screen never drops a window that
+        would have counted, and are left in train_signals/test_signals for it.
+        """
+        if train_data.empty or test_data.empty:
+            return True  # Let _run_window log and handle it
+        try:
+            train_context = test_context = None
+            if rules_config.context_filters:
+                train_context = self._apply_context_filters(train_data, rules_config.context_filters, symbol, market_data)
+                test_context = self._apply_context_filters(test_data, rules_config.context_filters, symbol, market_data)
+                if not train_context.any():
+                    return False
+            for entry_rule in rules_config.entry_signals:
+                train_entries = self._shared_signals(entry_rule, train_data, train_signals)
+                train_entries = train_entries.reindex(train_data.index, fill_value=False).fillna(False).astype(bool)
+                if train_context is not None:
+                    train_entries = train_entries & train_context
+                if not train_entries.any():
+                    continue
+                test_entries = self.generate_signals_for_stack([entry_rule], test_data, test_signals)
+                test_entries = test_entries.reindex(test_data.index, fill_value=False).astype(bool)
+                if test_context is not None:
+                    test_entries = test_entries & test_context
+                if int(test_entries.sum()) >= min_trades:
+                    return True
+        except Exception as e:
+            logger.debug(f"Pre-screen failed for {symbol}, running the window: {e}")
+            return True
+        return False
+
+    @staticmethod
+    def _context_warmup(rules_config: RulesConfig) -> Optional[int]:
+        """Market bars before a window that its context filters read, None if unbounded.
+
+        Context filters are evaluated on the full market series, so their values
+        at a window's start depend on earlier bars (e.g. the SMA period). Filters
+        without a known lookback, such as expressions, may read the whole prefix.
+        """
+        warmup = 0
+        for filter_def in getattr(rules_config, "context_filters", None) or []:
+            lookback_of = _SIGNAL_LOOKBACK.get(filter_def.type)
+            if lookback_of is None:
+                return None
+            try:
+                warmup = max(warmup, lookback_of(**(filter_def.params or {})))
+            except (TypeError, ValueError):
+                return None
+        return warmup
+
+    def _window_cache_key(
+        self,
+        data: pd.DataFrame,
+        market_data: Optional[pd.DataFrame],
+        training_start: pd.Timestamp,
+        training_end: pd.Timestamp,
+        testing_end: pd.Timestamp,
+        context_warmup: Optional[int] = 0,
+    ) -> str:
+        """Content hash of everything a window's result depends on besides the rules.
+
+        Rules and app config are covered by the config hash the cache is scoped
+        to; this adds CACHE_VERSION, the window boundaries, backtester settings,
+        the exact price bars inside the window and the market bars inside it plus
+        the ``context_warmup`` bars before it (the whole prefix when None).
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((
+            CACHE_VERSION, str(training_start), str(training_end), str(testing_end),
+            self.hold_period, self.min_trades_threshold, self.initial_capital, context_warmup,
+        )).encode())
+        for frame, warmup in ((data, 0), (market_data, context_warmup)):
+            if frame is None:
+                digest.update(b"none")
+                continue
+            start = frame.index.searchsorted(training_start)
+            start = 0 if warmup is None else max(0, start - warmup)
+            window = frame.iloc[start:frame.index.searchsorted(testing_end, side="right")]
+            digest.update(repr(tuple(window.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(window, index=True).values.tobytes())
+        return digest.hexdigest()
+
     def _consolidate_oos_results(
         self,
         oos_results: List[Dict[str, Any]],
@@ -578,23 +1054,30 @@ class Backtester:
         rules_config: RulesConfig,
         edge_score_weights: Optional[EdgeScoreWeights],
         symbol: str,
-        market_data: Optional[pd.DataFrame] = None
+        market_data: Optional[pd.DataFrame] = None,
+        signals: Optional[Dict[int, pd.Series]] = None,
     ) -> List[Dict[str, Any]]:
         """Find best strategy on training data using simple in-sample optimization.
         
         This is only used during walk-forward training phase and results are never
         used for final performance metrics - only for strategy selection.
+        signals shares entry signals already generated on train_data.
         """
         if edge_score_weights is None:
             edge_score_weights = EdgeScoreWeights(win_pct=0.6, sharpe=0.4)
         
         best_strategies = []
+        context_signals = None
+        if rules_config.context_filters:
+            context_signals = self._apply_context_filters(
+                train_data, rules_config.context_filters, symbol, market_data
+            )
         
         # Test each entry signal individually (no combinations to keep it simple)
         for entry_rule in rules_config.entry_signals:
             try:
                 # Generate entry signals for this rule
-                entry_signals = self._generate_signals(entry_rule, train_data)
+                entry_signals = self._shared_signals(entry_rule, train_data, signals)
                 if entry_signals is None or not entry_signals.any():
                     continue
                 
@@ -602,10 +1085,7 @@ class Backtester:
                 entry_signals = entry_signals.reindex(train_data.index, fill_value=False)
                 
                 # Apply context filters if any
-                if rules_config.context_filters:
-                    context_signals = self._apply_context_filters(
-                        train_data, rules_config.context_filters, symbol, market_data
-                    )
+                if context_signals is not None:
                     entry_signals = entry_signals & context_signals
                     
                 if not entry_signals.any():
@@ -617,46 +1097,28 @@ class Backtester:
                 )
                 
                 # Create portfolio
-                portfolio = vbt.Portfolio.from_signals(
-                    train_data["close"],
-                    entries=entry_signals,
-                    exits=exit_signals,
-                    init_cash=self.initial_capital,
-                    sl_stop=sl_stop,
-                    tp_stop=tp_stop,
-                    size=self._calculate_risk_based_size(train_data, entry_signals, rules_config.exit_conditions),
-                )
+                with performance_monitor.span("simulate"):
+                    portfolio = _vbt().Portfolio.from_signals(
+                        _simulation_close(train_data),
+                        entries=entry_signals,
+                        exits=exit_signals,
+                        init_cash=self.initial_capital,
+                        sl_stop=sl_stop,
+                        tp_stop=tp_stop,
+                        size=self._calculate_risk_based_size(train_data, entry_signals, rules_config.exit_conditions),
+                    )
                 
-                total_trades = len(portfolio.trades.records_readable)
+                performance = metrics.column_metrics(metrics.portfolio_metrics(portfolio, edge_score_weights, symbol))
+                total_trades = performance["total_trades"]
                 if total_trades < 1:  # Lower threshold for training phase
                     continue
-                    
-                win_pct = portfolio.trades.win_rate()
-                
-                # Calculate Sharpe ratio with proper inf/nan handling  
-                try:
-                    sharpe = portfolio.sharpe_ratio()
-                    # Handle edge cases: NaN or infinite values should become 0.0
-                    if not (sharpe == sharpe):  # NaN check (NaN != NaN)
-                        sharpe = 0.0
-                    elif sharpe == float('inf') or sharpe == float('-inf'):  # Inf check
-                        logger.warning(
-                            f"Sharpe ratio for {symbol} is 'inf' due to zero volatility of returns. "
-                            f"This is common with few trades. Setting to 0.0 for calculations."
-                        )
-                        sharpe = 0.0
-                except Exception:
-                    # Fallback: if sharpe calculation fails completely, use 0.0
-                    sharpe = 0.0
-                
-                edge_score = (win_pct * edge_score_weights.win_pct) + (sharpe * edge_score_weights.sharpe)
-                
+
                 strategy = {
                     "symbol": symbol,
                     "rule_stack": [entry_rule],
-                    "edge_score": edge_score,
-                    "win_pct": win_pct,
-                    "sharpe": sharpe,
+                    "edge_score": performance["edge_score"],
+                    "win_pct": performance["win_pct"],
+                    "sharpe": performance["sharpe"],
                     "total_trades": total_trades,
                 }
                 
@@ -680,9 +1142,13 @@ class Backtester:
         period_start: pd.Timestamp,
         test_start: pd.Timestamp, 
         test_end: pd.Timestamp,
-        market_data: Optional[pd.DataFrame] = None
+        market_data: Optional[pd.DataFrame] = None,
+        signals: Optional[Dict[int, pd.Series]] = None,
     ) -> Optional[Dict[str, Any]]:
-        """Backtest a single strategy on out-of-sample test data."""
+        """Backtest a single strategy on out-of-sample test data.
+
+        signals shares entry signals already generated on test_data.
+        """
         try:
             # Normalize column names to lowercase for consistent data contract
             test_data = test_data.copy()
@@ -721,7 +1187,7 @@ class Backtester:
                 context_signals = pd.Series(True, index=test_data.index)
             
             # Generate combined signal for the rule combination
-            entry_signals = self.generate_signals_for_stack(rule_stack, test_data)
+            entry_signals = self.generate_signals_for_stack(rule_stack, test_data, signals)
             
             # Ensure signals are aligned to test_data index (for proper broadcasting with context filters)
             entry_signals = entry_signals.reindex(test_data.index, fill_value=False)
@@ -751,54 +1217,28 @@ class Backtester:
             )
             
             # Create vectorbt portfolio
-            portfolio = vbt.Portfolio.from_signals(
-                test_data["close"],
-                entries=entry_signals,
-                exits=exit_signals,
-                init_cash=self.initial_capital,
-                sl_stop=sl_stop,
-                tp_stop=tp_stop,
-                size=self._calculate_risk_based_size(test_data, entry_signals, rules_config.exit_conditions),
-            )
-            
-            total_trades = len(portfolio.trades.records_readable)
+            with performance_monitor.span("simulate"):
+                portfolio = _vbt().Portfolio.from_signals(
+                    _simulation_close(test_data),
+                    entries=entry_signals,
+                    exits=exit_signals,
+                    init_cash=self.initial_capital,
+                    sl_stop=sl_stop,
+                    tp_stop=tp_stop,
+                    size=self._calculate_risk_based_size(test_data, entry_signals, rules_config.exit_conditions),
+                )
             
             # Calculate performance metrics - no filtering here, that's walk_forward's job
-            win_pct = portfolio.trades.win_rate() if total_trades > 0 else 0.0
-            
-            # Calculate Sharpe ratio with proper inf/nan handling
-            try:
-                sharpe = portfolio.sharpe_ratio()
-                # Handle edge cases: NaN or infinite values should become 0.0
-                if not (sharpe == sharpe):  # NaN check (NaN != NaN)
-                    sharpe = 0.0
-                elif sharpe == float('inf') or sharpe == float('-inf'):  # Inf check
-                    logger.warning(
-                        f"Sharpe ratio for {symbol} is 'inf' due to zero volatility of returns. "
-                        f"This is common with few trades. Setting to 0.0 for calculations."
-                    )
-                    sharpe = 0.0
-            except Exception:
-                # Fallback: if sharpe calculation fails completely, use 0.0
-                sharpe = 0.0
-            
-            # Use .returns for percentage, not .pnl for absolute value. Multiply by 100.
-            try:
-                returns_mean = portfolio.trades.returns.mean()
-                avg_return = returns_mean * 100 if total_trades > 0 and (returns_mean == returns_mean) else 0.0
-            except Exception:
-                avg_return = 0.0
+            performance = metrics.column_metrics(metrics.portfolio_metrics(portfolio, edge_score_weights, symbol))
 
-            edge_score = (win_pct * edge_score_weights.win_pct) + (sharpe * edge_score_weights.sharpe)
-            
             return {
                 "symbol": symbol,
                 "rule_stack": rule_stack,
-                "edge_score": edge_score,
-                "win_pct": win_pct,
-                "sharpe": sharpe,
-                "total_trades": total_trades,
-                "avg_return": avg_return,
+                "edge_score": performance["edge_score"],
+                "win_pct": performance["win_pct"],
+                "sharpe": performance["sharpe"],
+                "total_trades": performance["total_trades"],
+                "avg_return": performance["avg_return"],
                 "oos_period_start": period_start,
                 "oos_test_start": test_start,
                 "oos_test_end": test_end,
@@ -858,7 +1298,9 @@ class Backtester:
         symbol: str = "TEST",
         market_data: Optional[pd.DataFrame] = None,
         freeze_date: Optional[date] = None,
-        config: Optional[Config] = None
+        config: Optional[Config] = None,
+        window_cache: Optional[WindowResultCache] = None,
+        signal_cache: Optional[SignalCache] = None,
     ) -> List[Dict[str, Any]]:
         """
         Find optimal strategies using professional walk-forward analysis ONLY.
@@ -881,18 +1323,73 @@ class Backtester:
             
         return self.walk_forward_backtest(
             price_data, walk_forward_config, rules_config, symbol,
-            edge_score_weights, config, market_data
+            edge_score_weights, config, market_data, window_cache=window_cache, signal_cache=signal_cache,
         )
 
     def _generate_time_based_exits(self, entry_signals: pd.Series, hold_period: int) -> pd.Series:
         """Generate exit signals based on holding period after entry signals."""
+        _vbt()  # Importing vectorbt registers the .vbt pandas accessor
         time_exits = entry_signals.vbt.fshift(hold_period)
         # Ensure boolean dtype and fill NaN with False
         return time_exits.fillna(False).astype(bool)
 
+    @staticmethod
+    def _compile_expressions(rules_config: RulesConfig) -> Optional[expressions.Plan]:
+        """One plan for every expression rule of a rules config, keyed by source.
+
+        Malformed expressions are left out; they fail when evaluated, like any
+        other rule.
+        """
+        sources: Dict[str, str] = {}
+        for group in ("preconditions", "context_filters", "entry_signals", "exit_conditions"):
+            for rule_def in getattr(rules_config, group, None) or []:
+                source = (rule_def.params or {}).get("expr") if rule_def.type == "expression" else None
+                if not isinstance(source, str) or source in sources:
+                    continue
+                try:
+                    expressions.parse(source)
+                except ValueError:
+                    continue
+                sources[source] = source
+        return expressions.Plan(sources) if sources else None
+
+    def _expression_cache(self, price_data: pd.DataFrame) -> Dict[Any, Any]:
+        """Node cache for expression rules on this frame.
+
+        Entry, exit and context rules evaluated on the same frame share it, so a
+        subexpression common to several rules is computed once, whichever frames
+        are evaluated in between. The last few frames keep their caches; each
+        entry holds its frame, so an id is never reused while cached.
+        """
+        entry = self._expression_values.pop(id(price_data), None)
+        if entry is None or entry[0] is not price_data:
+            entry = (price_data, {})
+            if len(self._expression_values) >= _EXPRESSION_FRAMES:
+                del self._expression_values[next(iter(self._expression_values))]
+        self._expression_values[id(price_data)] = entry  # Most recently used last
+        return entry[1]
+
+    def _evaluate_expression(self, rule_def: Any, price_data: pd.DataFrame) -> pd.Series:
+        """Signals of an ``expression`` rule (see the expressions module)."""
+        params = rule_def.params if hasattr(rule_def, 'params') else rule_def.get('params', {})
+        source = params.get('expr', '')
+        frame = price_data
+        if any(column != column.lower() for column in frame.columns):
+            frame = price_data.rename(columns=str.lower)
+        try:
+            with performance_monitor.span("rule"):
+                plan = self._expression_plan
+                if plan is None or source not in plan.roots:  # Evaluated outside a compiled rules config
+                    plan = expressions.Plan({source: source})
+                return plan.evaluate(frame, self._expression_cache(price_data), names=[source])[source]
+        except Exception as e:
+            logger.error(f"Error evaluating expression {params.get('expr')!r}: {e}")
+            raise ValueError("Rule 'expression' failed execution") from e
+
     def _generate_signals(self, rule_def: Any, price_data: pd.DataFrame) -> pd.Series:
         """
         Generates entry signals for a given rule definition.
+        While a signal cache is active, unchanged signals are read from it.
         Raises:
             ValueError: If rule definition is invalid or rule not found
         """
@@ -909,6 +1406,38 @@ class Backtester:
         if not rule_type:
             raise ValueError(f"Rule definition missing 'type' field: {rule_def}")
 
+        if self._signal_cache is not None:
+            return self._signal_cache.signals(
+                rule_type, rule_params, price_data,
+                lambda frame: self._compute_signals(rule_def, rule_type, rule_params, frame),
+            )
+        return self._compute_signals(rule_def, rule_type, rule_params, price_data)
+
+    def _shared_signals(
+        self, rule_def: Any, price_data: pd.DataFrame, signals: Optional[Dict[int, pd.Series]]
+    ) -> pd.Series:
+        """``_generate_signals``, memoized in signals by rule (id) for one price frame.
+
+        A walk-forward window's pre-screen, training and testing phases evaluate
+        the same entry rules on the same two frames; sharing the series
+        generates each once. Callers never modify the returned series in place.
+        """
+        if signals is None:
+            return self._generate_signals(rule_def, price_data)
+        key = id(rule_def)
+        if key not in signals:
+            signals[key] = self._generate_signals(rule_def, price_data)
+        return signals[key]
+
+    def _compute_signals(
+        self, rule_def: Any, rule_type: str, rule_params: Dict[str, Any], price_data: pd.DataFrame
+    ) -> pd.Series:
+        """Evaluates a rule on price_data (the uncached body of ``_generate_signals``)."""
+        if rule_type == "expression":
+            if price_data.empty:
+                return pd.Series(dtype=bool, name='signals')
+            return self._evaluate_expression(rule_def, price_data)
+
         rule_func = getattr(rules, rule_type, None)
         if rule_func is None:
             raise ValueError(f"Rule function '{rule_type}' not found in rules module")
@@ -949,7 +1478,8 @@ class Backtester:
                     converted_params[key] = value
                     
             # Call the actual rule function from the rules module
-            entry_signals = rule_func(price_data_normalized, **converted_params)
+            with performance_monitor.span("rule"):
+                entry_signals = rule_func(price_data_normalized, **converted_params)
         except Exception as e:
             logger.error(f"Error executing rule '{rule_type}' with params {rule_params}: {e}")
             raise ValueError(f"Rule '{rule_type}' failed execution") from e
@@ -964,7 +1494,7 @@ class Backtester:
         return entry_signals
 
     def generate_signals_for_stack(
-        self, rule_stack: List[Any], price_data: pd.DataFrame
+        self, rule_stack: List[Any], price_data: pd.DataFrame, signals: Optional[Dict[int, pd.Series]] = None
     ) -> pd.Series:
         """Generates combined entry signals for a given rule stack.
         
@@ -974,6 +1504,8 @@ class Backtester:
         Args:
             rule_stack: List of rule definitions to combine (can be objects or dicts)
             price_data: DataFrame with OHLCV data
+            signals: Optional per-rule signals already generated on price_data
+                (see ``_shared_signals``), filled in as rules are evaluated
             
         Returns:
             Combined boolean Series with entry signals
@@ -988,7 +1520,7 @@ class Backtester:
                 entry_rules.append(r)
 
         for rule_def in entry_rules:
-            rule_signals = self._generate_signals(rule_def, price_data)
+            rule_signals = self._shared_signals(rule_def, price_data, signals)
             if combined_signals is None:
                 combined_signals = rule_signals.copy()
             else:
@@ -1143,33 +1675,63 @@ class Backtester:
         if not preconditions:
             return True
         
+        # The same symbol history is checked for every rule combination; check each precondition once
+        digest = self._frame_digest(price_data)
         for precondition in preconditions:
-            try:
-                # Apply precondition function to FULL data for proper calculation
-                precondition_params = precondition.params.copy()
-                precondition_signals = getattr(rules, precondition.type)(price_data, **precondition_params)
-                
-                # Simple check: Are we meeting the precondition now (most recent valid period)?
-                recent_valid_signals = precondition_signals.dropna()
-                if len(recent_valid_signals) == 0:
-                    logger.debug(f"Stock {symbol} failed precondition '{precondition.name}': No valid data")
-                    return False
-                    
-                currently_meets_condition = recent_valid_signals.iloc[-1]
-                if not currently_meets_condition:
-                    logger.debug(f"Stock {symbol} failed precondition '{precondition.name}': Current condition not met")
-                    return False
-                    
-                logger.debug(f"Stock {symbol} passed precondition '{precondition.name}': Currently meets condition")
-                            
-            except Exception as e:
-                logger.error(f"Error checking precondition '{precondition.name}' for {symbol}: {e}")
-                # Fail-safe: if precondition check fails, exclude stock
+            memo_key = (symbol, SignalCache.signal_key(precondition.type, precondition.params), digest)
+            passed = self._precondition_results.get(memo_key)
+            if passed is None:
+                passed = self._check_precondition(price_data, precondition, symbol)
+                self._precondition_results[memo_key] = passed
+            if not passed:
                 return False
         
         logger.info(f"Stock {symbol} passed all {len(preconditions)} precondition checks")
         return True
 
+    def _check_precondition(self, price_data: pd.DataFrame, precondition: Any, symbol: str) -> bool:
+        """Whether the latest valid value of one precondition holds."""
+        try:
+            # Apply precondition function to FULL data for proper calculation
+            precondition_params = precondition.params.copy()
+            if precondition.type == "expression":
+                precondition_signals = self._evaluate_expression(precondition, price_data)
+            else:
+                precondition_signals = getattr(rules, precondition.type)(price_data, **precondition_params)
+            
+            # Simple check: Are we meeting the precondition now (most recent valid period)?
+            recent_valid_signals = precondition_signals.dropna()
+            if len(recent_valid_signals) == 0:
+                logger.debug(f"Stock {symbol} failed precondition '{precondition.name}': No valid data")
+                return False
+                
+            currently_meets_condition = recent_valid_signals.iloc[-1]
+            if not currently_meets_condition:
+                logger.debug(f"Stock {symbol} failed precondition '{precondition.name}': Current condition not met")
+                return False
+                
+            logger.debug(f"Stock {symbol} passed precondition '{precondition.name}': Currently meets condition")
+            return True
+                        
+        except Exception as e:
+            logger.error(f"Error checking precondition '{precondition.name}' for {symbol}: {e}")
+            # Fail-safe: if precondition check fails, exclude stock
+            return False
+
+    @staticmethod
+    def _frame_digest(frame: pd.DataFrame) -> str:
+        """Content hash of a frame (index, columns and values)."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(tuple(frame.columns)).encode())
+        values = frame.to_numpy()
+        if values.dtype == object or not isinstance(frame.index, pd.DatetimeIndex):
+            # Object arrays would hash their pointers; hash the contents instead
+            digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+        else:
+            digest.update(np.ascontiguousarray(frame.index.asi8).tobytes())
+            digest.update(np.ascontiguousarray(values).tobytes())
+        return digest.hexdigest()
+
     def _apply_context_filters(
         self,
         stock_data: pd.DataFrame,
@@ -1177,46 +1739,33 @@ class Backtester:
         symbol: str,
         market_data: Optional[pd.DataFrame],
     ) -> pd.Series:
-        """Apply context filters and return combined boolean series."""
+        """Apply context filters and return combined boolean series.
+
+        Each filter is evaluated once per market frame (see ``_market_context``)
+        and aligned to the stock's dates.
+        """
         if not context_filters:
             return pd.Series(True, index=stock_data.index)
         
-        combined_signals = pd.Series(True, index=stock_data.index)
+        combined: Optional[np.ndarray] = None
         
         for filter_def in context_filters:
             try:
-                if filter_def.type == "market_above_sma":
+                if filter_def.type in ("market_above_sma", "expression"):
                     # Check if market data is provided
                     if market_data is None:
                         logger.warning(f"Market data not provided for context filter on {symbol}")
                         return pd.Series(False, index=stock_data.index)
                     
-                    # Apply the filter with only valid parameters for market_above_sma
-                    valid_params = {}
-                    if "period" in filter_def.params:
-                        valid_params["period"] = filter_def.params["period"]
-                    
-                    # Convert string parameters to appropriate types (defensive programming)
-                    converted_valid_params = {}
-                    for key, value in valid_params.items():
-                        if isinstance(value, str) and value.replace('.', '').replace('-', '').isdigit():
-                            converted_valid_params[key] = float(value) if '.' in value else int(value)
-                        else:
-                            converted_valid_params[key] = value
-                    
-                    filter_signals = getattr(rules, filter_def.type)(market_data, **converted_valid_params)
-                    
-                    # Align with stock data and apply AND logic
-                    stock_index = stock_data.index
-                    aligned_filter = filter_signals.reindex(stock_index)
-                    aligned_filter = aligned_filter.ffill().fillna(False).infer_objects(copy=False)
-                    combined_signals &= aligned_filter
+                    aligned = self._align_context(self._market_context(filter_def, market_data), stock_data.index)
+                    combined = aligned if combined is None else combined & aligned
                     
                     # Log filter effectiveness
-                    filter_count = int(aligned_filter.sum())  # Ensure numeric type for arithmetic
-                    logger.debug(f"Context filter '{filter_def.name}' for {symbol}: "
-                                f"{filter_count}/{len(aligned_filter)} days pass "
-                                f"({filter_count/len(aligned_filter)*100:.1f}%)")
+                    if logger.isEnabledFor(logging.DEBUG) and len(aligned):
+                        filter_count = int(aligned.sum())
+                        logger.debug(f"Context filter '{filter_def.name}' for {symbol}: "
+                                    f"{filter_count}/{len(aligned)} days pass "
+                                    f"({filter_count/len(aligned)*100:.1f}%)")
                 else:
                     raise ValueError(f"Unknown context filter type: {filter_def.type}")
                     
@@ -1225,14 +1774,66 @@ class Backtester:
                 # Fail-safe: if context filter fails, exclude all signals
                 return pd.Series(False, index=stock_data.index)
         
+        combined_signals = pd.Series(combined, index=stock_data.index, copy=False)
         combined_count = int(combined_signals.sum())
         # Only log if filter pass rate is unusually low
-        pass_rate = combined_count/len(combined_signals)*100
+        pass_rate = combined_count/len(combined_signals)*100 if len(combined_signals) else 100.0
         if pass_rate < 20:
             logger.debug(f"Low filter pass rate for {symbol}: {pass_rate:.1f}% ({combined_count}/{len(combined_signals)} days)")
         
         return combined_signals
 
+    def _market_context(self, filter_def: Any, market_data: pd.DataFrame) -> pd.Series:
+        """A context filter's signals on the whole market frame, computed once per frame.
+
+        The market frame is shared by every symbol and walk-forward window of a
+        run, so each filter is evaluated on it once and sliced afterwards. The
+        values are read-only, as aligned slices are views of them.
+        """
+        if self._context_frame is not market_data:
+            self._context_frame = market_data
+            self._context_values = {}
+        key = SignalCache.signal_key(filter_def.type, filter_def.params)
+        if key not in self._context_values:
+            if filter_def.type == "expression":
+                # Context expressions describe the market index, e.g. "close > sma(close, 50)"
+                signals = self._evaluate_expression(filter_def, market_data)
+            else:
+                # Convert string parameters to appropriate types (defensive programming)
+                params = {}
+                if "period" in filter_def.params:
+                    value = filter_def.params["period"]
+                    if isinstance(value, str) and value.replace('.', '').replace('-', '').isdigit():
+                        value = float(value) if '.' in value else int(value)
+                    params["period"] = value
+                signals = getattr(rules, filter_def.type)(market_data, **params)
+            values = signals.ffill().fillna(False).to_numpy(dtype=bool)
+            values.flags.writeable = False
+            self._context_values[key] = pd.Series(values, index=signals.index, copy=False)
+        return self._context_values[key]
+
+    @staticmethod
+    def _align_context(signals: pd.Series, index: pd.Index) -> np.ndarray:
+        """Market signals on the dates of index, as ``reindex(index).ffill().fillna(False)``.
+
+        When the dates are a contiguous run of the market's, the result is a view.
+        """
+        source = signals.index
+        values = signals.to_numpy()
+        if len(index) == 0:
+            return np.zeros(0, dtype=bool)
+        if not (source.is_monotonic_increasing and source.is_unique and index.is_monotonic_increasing):
+            return np.asarray(signals.reindex(index).ffill().fillna(False).to_numpy(dtype=bool))
+        start = source.searchsorted(index[0])
+        stop = start + len(index)
+        if stop <= len(source) and source[start:stop].equals(index):
+            return np.asarray(values[start:stop], dtype=bool)
+        # Same as reindex().ffill().fillna(False): dates the market lacks repeat the previous date's value
+        positions = np.minimum(source.searchsorted(index), len(source) - 1)
+        matched = source[positions] == index
+        carried = np.maximum.accumulate(np.where(matched, np.arange(len(index)), -1))
+        return np.asarray(np.where(carried >= 0, values[positions[np.maximum(carried, 0)]], False), dtype=bool)
+
     def _test_single_rule(self, entry_rules: List[RuleDef], price_data: pd.DataFrame, 
                           rules_config: RulesConfig, edge_score_weights: EdgeScoreWeights, 
                           symbol: str, market_data: Optional[pd.DataFrame] = None) -> Optional[Dict[str, Any]]:
@@ -1,13 +1,16 @@
 """CLI entry point using Typer framework."""
 
+import itertools
 import json
 import logging
+import os
+import statistics
+import time
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, Tuple, cast
 import sys
 
-import pandas as pd
 import typer
 import rich.progress as progress
 from rich.console import Console
@@ -16,15 +19,20 @@ from rich.panel import Panel
 from rich.table import Table
 
 from .config import Config, load_config, load_rules
-from . import data, backtester, persistence
-from .backtester import Backtester  # For test compatibility
+from . import persistence
 from .reporter import (
     generate_daily_report,
     format_walk_forward_results,
+    format_symbol_walk_forward_results,
+    WALK_FORWARD_SUMMARY_HEADER,
     analyze_strategy_performance,
     analyze_strategy_performance_aggregated,
     format_strategy_analysis_as_csv,
+    iter_strategy_export_rows,
+    write_strategy_analysis,
     update_positions_and_generate_report_data,
+    latest_entry_signals,
+    WalkForwardReport,
     get_position_pricing as _reporter_get_position_pricing,
 )
 
@@ -35,9 +43,17 @@ def get_position_pricing(symbol: str, app_config: Config) -> Optional[Dict[str,
 # Backwards compatibility shim for tests (deleted function)
 
 
-from .performance import performance_monitor
+from .performance import performance_monitor, peak_memory_mb
+from .pipeline import run_pipeline
 from .exceptions import DataMismatchError
 
+# pandas, the data layer and the backtester load inside the commands that use
+# them, so --help and database-only commands start without them
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from . import backtester
+
 __all__ = ["app"]
 
 app = typer.Typer(help="KISS Signal CLI - Keep-It-Simple Signal Generation")
@@ -45,6 +61,18 @@ console = Console(record=True)
 
 logger = logging.getLogger(__name__)
 
+# Pipeline stages timed into the run_metrics ledger
+RUN_STAGES = ("refresh", "load", "backtest", "persist", "report")
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps ``cli.Backtester`` reachable for older callers without an eager import
+    if name == "Backtester":
+        from .backtester import Backtester
+
+        return Backtester
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # impure
 def setup_logging(verbose: bool = False) -> None:
@@ -94,17 +122,42 @@ def _analyze_symbol(
     app_config: Config, 
     rules_config: Any, 
     freeze_date: Optional[date], 
-    bt: backtester.Backtester,
-    market_data: Optional[pd.DataFrame] = None,
-) -> List[Dict[str, Any]]:
+    bt: "backtester.Backtester",
+    market_data: Optional["pd.DataFrame"] = None,
+    config_hash: Optional[str] = None,
+) -> Optional[List[Dict[str, Any]]]:
     """Helper to run backtest analysis for a single symbol."""
+    with performance_monitor.span("symbol"):
+        return _analyze_symbol_data(symbol, app_config, rules_config, freeze_date, bt, market_data, config_hash)
+
+
+def _analyze_symbol_data(
+    symbol: str, 
+    app_config: Config, 
+    rules_config: Any, 
+    freeze_date: Optional[date], 
+    bt: "backtester.Backtester",
+    market_data: Optional["pd.DataFrame"] = None,
+    config_hash: Optional[str] = None,
+    price_data: Optional["pd.DataFrame"] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """Loads one symbol's history and runs the strategy search on it.
+
+    With a ``config_hash``, walk-forward windows whose bars are unchanged since
+    an earlier run under the same configuration are served from the
+    walk_forward_windows table; only new or revised windows are backtested,
+    reading unchanged rule signals from the signal_cache table.
+    ``price_data`` skips the load when the caller already read the history.
+
+    Returns:
+        The symbol's strategies ([] when it has too little data or no strategy
+        survives walk-forward), or None when loading or analysis failed, so
+        that a resumed run retries it
+    """
+    from . import backtester
     try:
-        price_data = data.get_price_data(
-            symbol=symbol,
-            cache_dir=Path(app_config.cache_dir),
-            years=app_config.historical_data_years,
-            freeze_date=freeze_date,
-        )
+        if price_data is None:
+            price_data = _load_symbol_history(app_config, symbol, freeze_date)
         
         if price_data is None or len(price_data) < 100:
             logger.warning(f"Insufficient data for {symbol}, skipping")
@@ -112,15 +165,39 @@ def _analyze_symbol(
 
         latest_close = price_data['close'].iloc[-1]
 
-        strategies = bt.find_optimal_strategies(
-            price_data=price_data,
-            rules_config=rules_config,
-            market_data=market_data,
-            symbol=symbol,
-            freeze_date=freeze_date,
-            edge_score_weights=app_config.edge_score_weights,
-            config=app_config,  # Add config parameter
-        )
+        performance_monitor.increment("symbols_processed")
+        db_path = Path(app_config.database_path)
+        window_cache = None
+        signal_cache = None
+        if config_hash:
+            window_cache = backtester.WindowResultCache(persistence.get_walk_forward_windows(db_path, symbol, config_hash))
+            signal_cache = backtester.SignalCache(persistence.get_signal_cache(db_path, symbol))
+        try:
+            with performance_monitor.stage("backtest"):
+                strategies = bt.find_optimal_strategies(
+                    price_data=price_data,
+                    rules_config=rules_config,
+                    market_data=market_data,
+                    symbol=symbol,
+                    freeze_date=freeze_date,
+                    edge_score_weights=app_config.edge_score_weights,
+                    config=app_config,  # Add config parameter
+                    window_cache=window_cache,
+                    signal_cache=signal_cache,
+                )
+        finally:
+            # Keep computed windows even when the symbol yields no strategy
+            if window_cache is not None and config_hash:
+                logger.debug(f"{symbol}: {window_cache.hits} cached windows, {window_cache.misses} recomputed")
+                if window_cache.changed:
+                    persistence.save_walk_forward_windows(db_path, symbol, config_hash, list(window_cache.used.values()))
+            if signal_cache is not None:
+                logger.debug(
+                    f"{symbol}: {signal_cache.hits} cached signal series, "
+                    f"{signal_cache.extended} extended, {signal_cache.misses} computed"
+                )
+                if signal_cache.changed:
+                    persistence.save_signal_cache(db_path, symbol, signal_cache.rows(since=price_data.index[0]))
         
         result = []
         for strategy in strategies:
@@ -131,18 +208,212 @@ def _analyze_symbol(
 
     except DataMismatchError as e:
         logger.error(f"CRITICAL: Market data for ^NSEI does not cover the full history for {symbol}. Run data refresh.")
-        return []
+        return None
     except FileNotFoundError as e:
         logger.error(f"Data file not found for {symbol}: {e}")
-        return []
+        return None
     except ValueError as e:
+        # Walk-forward reports "no tradeable strategy" this way; rerunning the same config cannot change it
         logger.error(f"Configuration error for {symbol}: {e}")
         return []
     except Exception as e:
         logger.error(f"Error analyzing {symbol}: {e}")
-        return []
+        return None
+
+
+
+def _load_symbol_history(app_config: Config, symbol: str, freeze_date: Optional[date]) -> "pd.DataFrame":
+    from . import data
+    with performance_monitor.stage("load"):
+        return data.get_price_data(
+            symbol=symbol,
+            cache_dir=Path(app_config.cache_dir),
+            years=app_config.historical_data_years,
+            freeze_date=freeze_date,
+        )
+
+
+# impure
+def _load_market_data(app_config: Config, rules_config: Any) -> Tuple[Optional["pd.DataFrame"], Optional[str]]:
+    """Loads the index history that market_above_sma and expression context filters read.
+
+    Returns:
+        (market data, index symbol), or (None, None) when no context filter
+        needs the index or it could not be loaded.
+    """
+    from . import data
+    for filter_def in getattr(rules_config, 'context_filters', []) or []:
+        if hasattr(filter_def, 'type') and filter_def.type in ("market_above_sma", "expression"):
+            index_symbol = filter_def.params.get("index_symbol", "^NSEI")
+            try:
+                with performance_monitor.stage("load"):
+                    market_data = data.get_price_data(
+                        symbol=index_symbol,
+                        cache_dir=Path(app_config.cache_dir),
+                        years=app_config.historical_data_years,
+                        freeze_date=app_config.freeze_date,
+                    )
+                logger.info(f"Loaded market data for {index_symbol}")
+                return market_data, index_symbol  # Only need to load once
+            except Exception as e:
+                logger.warning(f"Could not load market data for {index_symbol}: {e}")
+    return None, None
+
+
+# Run-wide inputs of a pipeline worker process, set once per worker by _init_backtest_worker
+_worker_context: Dict[str, Any] = {}
+
+
+def _init_backtest_worker(
+    app_config: Config,
+    rules_config: Any,
+    backtester_params: Dict[str, Any],
+    market_data: Optional["pd.DataFrame"],
+    config_hash: str,
+) -> None:
+    """Ships the shared inputs (including the market frame) to a worker once, not per symbol."""
+    from . import backtester
+    # Built here rather than unpickled: __init__ also applies vectorbt's global settings
+    bt = backtester.Backtester(**backtester_params)
+    _worker_context.update(
+        app_config=app_config, rules_config=rules_config, bt=bt, market_data=market_data, config_hash=config_hash,
+    )
+
+
+def _backtest_in_worker(
+    symbol: str, price_data: Optional["pd.DataFrame"]
+) -> Tuple[Optional[List[Dict[str, Any]]], Dict[str, float], Dict[str, int]]:
+    """Pipeline process stage: backtests one preloaded symbol in a worker process.
+
+    Returns:
+        (strategies, stage durations, counters); strategies are None when the
+        load or the analysis failed. The worker's own run stats are handed back
+        so the parent can fold them into the run_metrics ledger.
+    """
+    performance_monitor.reset_run_stats()
+    strategies: Optional[List[Dict[str, Any]]] = None
+    if price_data is not None:
+        context = _worker_context
+        strategies = _analyze_symbol_data(
+            symbol, context["app_config"], context["rules_config"], context["app_config"].freeze_date,
+            context["bt"], context["market_data"], context["config_hash"], price_data=price_data,
+        )
+    return strategies, dict(performance_monitor.stage_durations), dict(performance_monitor.counters)
 
 
+# impure
+def _persist_symbol_batch(
+    db_path: Path,
+    run_timestamp: str,
+    config_snapshot: Dict[str, Any],
+    config_hash: str,
+    batch: List[Tuple[str, Tuple[Optional[List[Dict[str, Any]]], Dict[str, float], Dict[str, int]]]],
+) -> None:
+    """Pipeline write stage: saves a batch of symbols in one transaction, then checkpoints them.
+
+    Symbols whose analysis failed are not checkpointed, so --resume retries them.
+    """
+    freeze_date = config_snapshot.get("freeze_date")
+    strategies = [strategy for _, (symbol_results, _, _) in batch for strategy in symbol_results or []]
+    # The writer thread needs its own connection; sqlite3 connections are bound to their thread
+    db_connection = persistence.get_connection(db_path)
+    try:
+        with performance_monitor.stage("persist"):
+            if not persistence.save_strategies_batch(
+                db_connection, strategies, run_timestamp, config_snapshot, config_hash
+            ):
+                logger.warning(f"Could not save results for {len(batch)} symbols; they will be retried on --resume.")
+                return
+            for symbol, (symbol_results, _, _) in batch:
+                if symbol_results is None:
+                    logger.warning(f"Analysis of {symbol} failed; it will be retried on --resume.")
+                    continue
+                persistence.mark_symbol_complete(
+                    db_connection, run_timestamp, config_hash, symbol, len(symbol_results), freeze_date
+                )
+    finally:
+        db_connection.close()
+
+
+# impure
+def _run_symbols_pipelined(
+    symbols: List[str],
+    app_config: Config,
+    rules_config: Any,
+    bt: "backtester.Backtester",
+    market_data: Optional["pd.DataFrame"],
+    run_timestamp: str,
+    config_hash: str,
+    config_snapshot: Dict[str, Any],
+    workers: int,
+) -> None:
+    """Streams symbols through refresh/load → backtest (worker processes) → batched save.
+
+    Each stage runs concurrently with bounded queues between them, so a run takes
+    roughly as long as its slowest stage rather than the sum of all stages.
+    Results are only persisted; callers read them back from the database.
+    """
+    from . import data
+    freeze_date = app_config.freeze_date
+    backtester_params = {
+        "hold_period": bt.hold_period, "min_trades_threshold": bt.min_trades_threshold,
+        "initial_capital": bt.initial_capital,
+    }
+
+    def refreshed_symbols() -> Iterator[str]:
+        # Refresh lazily, one symbol at a time, so backtests start on fresh symbols right away
+        refresh = data.iter_refresh_market_data(
+            symbols, app_config.cache_dir, app_config.historical_data_years, freeze_date
+        )
+        while True:
+            with performance_monitor.stage("refresh"):
+                entry = next(refresh, None)
+            if entry is None:
+                return
+            yield entry[0]
+
+    done_count = 0
+    with console.status(f"[bold green]Running backtests ({workers} workers)...") as status:
+        def on_result(symbol: str, result: Tuple[Any, Dict[str, float], Dict[str, int]]) -> None:
+            nonlocal done_count
+            done_count += 1
+            _, stages, counters = result
+            for stage, seconds in stages.items():
+                performance_monitor.stage_durations[stage] += seconds
+            for counter, amount in counters.items():
+                performance_monitor.increment(counter, amount)
+            status.update(f"Analyzed {symbol} ({done_count}/{len(symbols)})...")
+
+        try:
+            run_pipeline(
+                refreshed_symbols(),
+                load=lambda symbol: _load_symbol_history(app_config, symbol, freeze_date),
+                process=_backtest_in_worker,
+                write=lambda batch: _persist_symbol_batch(
+                    Path(app_config.database_path), run_timestamp, config_snapshot, config_hash, batch
+                ),
+                workers=workers,
+                initializer=_init_backtest_worker,
+                initargs=(app_config, rules_config, backtester_params, market_data, config_hash),
+                on_result=on_result,
+            )
+        except KeyboardInterrupt:
+            console.print("[yellow]Run interrupted. Finished symbols are saved; continue with 'run --resume'.[/yellow]")
+            raise typer.Exit(130)
+
+
+def _report_screened_work() -> None:
+    """Prints how many walk-forward windows the pre-screen skipped without simulating."""
+    counters = performance_monitor.counters
+    windows = counters.get("windows_total", 0)
+    if not windows:
+        return
+    skipped = counters.get("windows_screened_out", 0)
+    console.print(
+        f"Pre-screen skipped {skipped} of {windows} walk-forward windows ({skipped / windows:.0%}); "
+        f"{counters.get('symbols_screened_out', 0)} symbols had no window able to trade."
+    )
+
 
 def display_results(results: List[Dict[str, Any]]) -> None:
     """Build and display a Rich Table of top strategies."""
@@ -200,6 +471,26 @@ def display_results(results: List[Dict[str, Any]]) -> None:
     )
 
 
+def _display_run_results(db_connection: persistence.Connection, run_timestamp: str) -> int:
+    """Displays a run's saved walk-forward results, read from the database one symbol at a time.
+
+    Returns:
+        Number of strategies the run saved
+    """
+    strategy_count = 0
+    rows = persistence.iter_run_strategies(db_connection, run_timestamp)
+    for symbol, group in itertools.groupby(rows, key=lambda row: row["symbol"]):
+        symbol_results = list(group)
+        if not strategy_count:
+            console.print("[bold blue]Walk-Forward Analysis Results (Out-of-Sample Only)[/bold blue]")
+            console.print(WALK_FORWARD_SUMMARY_HEADER, end="")
+        strategy_count += len(symbol_results)
+        console.print(format_symbol_walk_forward_results(symbol, symbol_results), end="")
+    if not strategy_count:
+        console.print("[red]No valid strategies found. Check data quality and rule configurations.[/red]")
+    return strategy_count
+
+
 # Back-compat: legacy tests import _display_results (removed during refactor).
 # Provide alias to preserve external observable contract without duplication.
 _display_results = display_results  # pragma: no cover
@@ -285,41 +576,70 @@ def _handle_command_exception(e: Exception, verbose: bool, context: str = "") ->
 
 def _process_and_save_results(
     db_connection: persistence.Connection, 
-    all_results: List[Dict[str, Any]], 
+    all_results: Optional[List[Dict[str, Any]]], 
     app_config: Config, 
-    rules_config: Any
-) -> None:
-    """Helper to display, save, update positions, and report results."""
-    run_timestamp = datetime.now().isoformat()
-    rules_dict = rules_config.model_dump() if hasattr(rules_config, 'model_dump') else dict(rules_config)
-    config_snapshot = persistence.create_config_snapshot(rules_dict, app_config, app_config.freeze_date.isoformat() if app_config.freeze_date else None)
-    config_hash = persistence.generate_config_hash(rules_dict, app_config)
-    
-    display_results(all_results)
-    _save_results(db_connection, all_results, run_timestamp, config_snapshot, config_hash)
+    rules_config: Any,
+    benchmark_data: Optional["pd.DataFrame"] = None,
+    run_timestamp: Optional[str] = None,
+) -> int:
+    """Helper to display, save, update positions, and report results.
+
+    When ``run_timestamp`` is given the results were already checkpointed per
+    symbol under it: they are displayed from the database (``all_results`` is
+    not used) and only reporting remains.
+
+    Returns:
+        Number of strategies in the run
+    """
+    if run_timestamp is not None:
+        strategy_count = _display_run_results(db_connection, run_timestamp)
+    else:
+        all_results = all_results or []
+        strategy_count = len(all_results)
+        display_results(all_results)
+        run_timestamp = datetime.now().isoformat()
+        rules_dict = rules_config.model_dump() if hasattr(rules_config, 'model_dump') else dict(rules_config)
+        config_snapshot = persistence.create_config_snapshot(rules_dict, app_config, app_config.freeze_date.isoformat() if app_config.freeze_date else None)
+        config_hash = persistence.generate_config_hash(rules_dict, app_config)
+        with performance_monitor.stage("persist"):
+            _save_results(db_connection, all_results, run_timestamp, config_snapshot, config_hash)
 
     # New pipeline step: update positions and get report data
     console.print("[5/5] Generating report...", style="blue")
     try:
-        report_data = update_positions_and_generate_report_data(
-            Path(app_config.database_path), run_timestamp, app_config, rules_config
-        )
-
-        # Call the new, simpler reporter
-        report_path = generate_daily_report(
-            new_buy_signals=report_data["new_buys"],
-            open_positions=report_data["open"],
-            closed_positions=report_data["closed"],
-            config=app_config,
-        )
-        
-        if report_path:
-            console.print(f"* Report generated: {report_path}", style="green")
-        else:
-            console.print("(WARN) Report generation failed", style="yellow")
+        with performance_monitor.stage("report"):
+            _generate_report(app_config, rules_config, run_timestamp, benchmark_data)
     except Exception as e:
         console.print(f"(WARN) Report error: {e}", style="yellow")
         logger.error(f"Report generation error: {e}", exc_info=True)
+    return strategy_count
+
+
+def _generate_report(
+    app_config: Config,
+    rules_config: Any,
+    run_timestamp: str,
+    benchmark_data: Optional["pd.DataFrame"],
+) -> None:
+    """Updates positions for this run and writes the daily report."""
+    report_data = update_positions_and_generate_report_data(
+        Path(app_config.database_path), run_timestamp, app_config, rules_config,
+        market_data=benchmark_data,
+    )
+
+    # Call the new, simpler reporter
+    report_path = generate_daily_report(
+        new_buy_signals=report_data["new_buys"],
+        open_positions=report_data["open"],
+        closed_positions=report_data["closed"],
+        config=app_config,
+        entry_signals=report_data.get("entry_signals"),
+    )
+    
+    if report_path:
+        console.print(f"* Report generated: {report_path}", style="green")
+    else:
+        console.print("(WARN) Report generation failed", style="yellow")
 
 
 @app.callback()
@@ -328,6 +648,8 @@ def main(
     config_path: str = typer.Option("config.yaml", "--config", help="Path to config YAML file."),
     rules_path: str = typer.Option("config/rules.yaml", "--rules", help="Path to rules YAML file."),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging."),
+    profile_memory: bool = typer.Option(False, "--profile-memory", help="With --verbose, also record peak memory per profiled span (slower)."),
+    server: Optional[str] = typer.Option(None, "--server", envvar="KISS_SIGNAL_SERVER", help="Send run/analyze-strategies/backtest to a warm 'serve' process at this URL (e.g. http://127.0.0.1:8765)."),
 ) -> None:
     """
     KISS Signal CLI.
@@ -344,10 +666,69 @@ def main(
             "config": load_config(Path(config_path)),
             "rules": load_rules(Path(rules_path)),
             "verbose": verbose,
+            "profile_memory": profile_memory,
+            "server": server,
         }
     except (FileNotFoundError, ValueError) as e:
         console.print(f"[red]Error loading configuration: {e}[/red]")
         raise typer.Exit(1)
+    # Compact mode is off in a fresh process; only load the data layer to change it
+    if ctx.obj["config"].compact_storage or f"{__package__}.data" in sys.modules:
+        from . import data
+
+        data.enable_compact_mode(ctx.obj["config"].compact_storage)
+
+
+def _context_argv(ctx: typer.Context) -> List[str]:
+    """Rebuilds command-line arguments from a parsed context (minus --server)."""
+    argv: List[str] = []
+    for param in ctx.command.params:
+        if param.name is None or param.name == "server":
+            continue
+        value = ctx.params.get(param.name)
+        if value is None:
+            continue
+        if param.param_type_name == "argument":
+            argv.append(str(value))
+        elif getattr(param, "is_flag", False):
+            if value:
+                argv.append(param.opts[0])
+            elif param.secondary_opts:
+                argv.append(param.secondary_opts[0])
+        else:
+            argv.extend([param.opts[0], str(value)])
+    return argv
+
+
+# impure
+def _forward_to_server(ctx: typer.Context) -> None:
+    """With --server, runs this command on the warm server instead of locally.
+
+    Prints the server's output and exits with the command's exit code; returns
+    without doing anything when no server is configured.
+    """
+    server_url = (ctx.obj or {}).get("server")
+    if not server_url:
+        return
+    from .server import invoke_remote, read_token
+
+    # The group's context is a plain click Context; _context_argv only reads what both share
+    argv = _context_argv(cast(typer.Context, ctx.parent)) if ctx.parent is not None else []
+    if ctx.info_name is not None:
+        argv.append(ctx.info_name)
+    argv.extend(_context_argv(ctx))
+    try:
+        token = read_token(Path(ctx.obj["config"].cache_dir))
+    except OSError as e:
+        console.print(f"[red]No KISS Signal server token found (is 'serve' running with this config?): {e}[/red]")
+        raise typer.Exit(1)
+    try:
+        exit_code, output = invoke_remote(server_url, argv, os.getcwd(), token)
+    except OSError as e:
+        console.print(f"[red]Could not reach KISS Signal server at {server_url}: {e}[/red]")
+        raise typer.Exit(1)
+    console.print(output, end="", markup=False, highlight=False, soft_wrap=True)
+    raise typer.Exit(exit_code)
 
 
 def _execute_analysis_pipeline(
@@ -356,6 +737,8 @@ def _execute_analysis_pipeline(
     output_file: Path,
     per_stock: bool,
     min_trades: Optional[int],
+    output_format: str = "csv",
+    compress: bool = False,
 ) -> None:
     """Executes the analysis-only command pipeline."""
     app_config = ctx.obj["config"]
@@ -371,16 +754,39 @@ def _execute_analysis_pipeline(
     
     try:
         min_trades_value = min_trades if min_trades is not None else 10
-        strategy_performance = (analyze_strategy_performance if per_stock else analyze_strategy_performance_aggregated)(db_path, min_trades=min_trades_value)
-        
-        if not strategy_performance:
-            console.print("[yellow]No strategy data found.[/yellow]")
+        if output_format not in ("csv", "parquet"):
+            raise ValueError(f"Unsupported output format: {output_format}. Use 'csv' or 'parquet'.")
+        if output_file is None:
             return
-        
-        report_content = format_strategy_analysis_as_csv(strategy_performance, aggregate=not per_stock)
-        if output_file is not None:
-            output_file.write_text(report_content, encoding="utf-8")
-            console.print(f"✅ Strategy performance analysis saved to: [cyan]{output_file}[/cyan]")
+
+        if per_stock:
+            # Stream rows from the cursor straight to disk - constant memory for any DB size
+            rows = iter_strategy_export_rows(db_path, min_trades=min_trades_value)
+            first_row = next(rows, None)
+            if first_row is None:
+                console.print("[yellow]No strategy data found.[/yellow]")
+                return
+            write_strategy_analysis(
+                itertools.chain([first_row], rows),
+                output_file, aggregate=False, output_format=output_format, compress=compress,
+            )
+        else:
+            # Aggregated leaderboard is one row per strategy group, small enough to hold
+            strategy_performance = analyze_strategy_performance_aggregated(db_path, min_trades=min_trades_value)
+            
+            if not strategy_performance:
+                console.print("[yellow]No strategy data found.[/yellow]")
+                return
+            
+            if output_format == "csv" and not compress:
+                report_content = format_strategy_analysis_as_csv(strategy_performance, aggregate=True)
+                output_file.write_text(report_content, encoding="utf-8")
+            else:
+                write_strategy_analysis(
+                    strategy_performance, output_file, aggregate=True,
+                    output_format=output_format, compress=compress,
+                )
+        console.print(f"✅ Strategy performance analysis saved to: [cyan]{output_file}[/cyan]")
     except (OSError, PermissionError) as write_error:
         raise ValueError(f"Cannot write to output path: {output_file}") from write_error
     except Exception as e:
@@ -390,6 +796,88 @@ def _execute_analysis_pipeline(
         _save_command_log(log_file)
 
 
+def _print_profile(stats: Dict[str, Dict[str, float]]) -> None:
+    """Print hot-path span statistics, slowest span first."""
+    table = Table(title="Hot-Path Profile")
+    for column in ("Span", "Calls", "Total (ms)", "p50 (ms)", "p95 (ms)", "Max (ms)"):
+        table.add_column(column, justify="left" if column == "Span" else "right")
+    for name, entry in sorted(stats.items(), key=lambda item: item[1]['total_ms'], reverse=True):
+        table.add_row(
+            name, str(entry['count']), f"{entry['total_ms']:.1f}",
+            f"{entry['p50_ms']:.2f}", f"{entry['p95_ms']:.2f}", f"{entry['max_ms']:.2f}",
+        )
+    console.print(table)
+
+
+# impure
+def _export_profile(app_config: Config) -> None:
+    """Print hot-path span statistics and write JSON + collapsed-stack profiles."""
+    profiler = performance_monitor.profiler
+    stats = profiler.get_stats()
+    if not stats:
+        return
+    _print_profile(stats)
+
+    stem = f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    output_dir = Path(app_config.reports_output_dir)
+    try:
+        json_path = profiler.export_json(output_dir / f"{stem}.json")
+        collapsed_path = profiler.export_collapsed(output_dir / f"{stem}.collapsed")
+        console.print(f"Profile saved to: {json_path} (flame graph: {collapsed_path})")
+    except OSError as e:
+        logger.warning(f"Could not write profile files: {e}")
+
+
+# impure
+def _start_run_checkpoint(
+    db_connection: persistence.Connection, app_config: Config, rules_config: Any, resume: bool
+) -> Tuple[str, str, Dict[str, Any], Set[str]]:
+    """Fixes the run identity up front so results can be checkpointed per symbol.
+
+    Returns:
+        (run_timestamp, config_hash, config_snapshot, symbols already completed)
+    """
+    rules_dict = rules_config.model_dump() if hasattr(rules_config, 'model_dump') else dict(rules_config)
+    freeze_iso = app_config.freeze_date.isoformat() if app_config.freeze_date else None
+    config_snapshot = persistence.create_config_snapshot(rules_dict, app_config, freeze_iso)
+    config_hash = persistence.generate_config_hash(rules_dict, app_config)
+
+    if resume:
+        unfinished = persistence.get_resumable_run(db_connection, config_hash, freeze_iso)
+        if unfinished:
+            run_timestamp, completed = unfinished
+            console.print(f"Resuming run {run_timestamp}: {len(completed)} symbols already complete.")
+            return run_timestamp, config_hash, config_snapshot, completed
+        console.print("[yellow]No unfinished run to resume for this configuration; starting a new run.[/yellow]")
+
+    # A fresh run supersedes any abandoned checkpoints for this configuration
+    persistence.clear_run_progress(db_connection, config_hash)
+    return datetime.now().isoformat(), config_hash, config_snapshot, set()
+
+
+# impure
+def _record_run_metrics(
+    app_config: Config, command: str, run_timestamp: str, config_hash: str, symbols_total: int
+) -> None:
+    """Persists this run's stage timings and counters to the run_metrics ledger."""
+    full_run = performance_monitor.metrics.get("full_backtest")
+    stages = performance_monitor.stage_durations
+    counters = performance_monitor.counters
+    persistence.save_run_metrics(Path(app_config.database_path), {
+        "run_timestamp": run_timestamp,
+        "command": command,
+        "config_hash": config_hash,
+        "total_duration": full_run.last_duration if full_run else None,
+        **{f"{stage}_duration": stages.get(stage, 0.0) for stage in RUN_STAGES},
+        "symbols_total": symbols_total,
+        "symbols_processed": counters.get("symbols_processed", 0),
+        "cache_hits": counters.get("cache_hits", 0),
+        "cache_misses": counters.get("cache_misses", 0),
+        "db_rows_written": counters.get("db_rows_written", 0),
+        "peak_memory_mb": peak_memory_mb(),
+    })
+
+
 def _execute_backtest_pipeline(
     ctx: typer.Context,
     freeze_data: Optional[str],
@@ -398,8 +886,15 @@ def _execute_backtest_pipeline(
     min_trades: Optional[int],
     force: bool,
     preserve_all: bool,
+    resume: bool = False,
+    workers: int = 1,
 ) -> None:
-    """Executes the backtesting and reporting pipeline for run/clear commands."""
+    """Executes the backtesting and reporting pipeline for run/clear commands.
+
+    With ``workers`` > 1 symbols stream through the concurrent pipeline
+    (see :mod:`kiss_signal.pipeline`); otherwise they run one at a time.
+    """
+    from . import backtester, data
     app_config = ctx.obj["config"]
     rules_config = ctx.obj["rules"]
     verbose = ctx.obj["verbose"]
@@ -447,21 +942,29 @@ def _execute_backtest_pipeline(
             console.print(f"✅ Cleared: {clear_result['cleared_count']} strategies")
             console.print(f"✅ Preserved: {clear_result['preserved_count']} historical strategies")
 
+        performance_monitor.reset_run_stats()
+        if verbose:
+            performance_monitor.profiler.reset()
+            performance_monitor.profiler.enable(trace_memory=ctx.obj.get("profile_memory", False))
+
         # Core workflow - inline backtesting workflow
         with performance_monitor.monitor_execution("full_backtest"):
             console.print("[1/4] Configuration loaded.")
             if app_config.freeze_date:
                 if verbose: logger.info(f"Freeze mode active: {app_config.freeze_date}")
                 console.print("[2/4] Skipping data refresh (freeze mode).")
+            elif workers > 1:
+                console.print("[2/4] Market data will be refreshed per symbol alongside backtesting.")
             else:
                 if verbose: logger.info("Refreshing market data")
                 console.print("[2/4] Refreshing market data...")
-                data.refresh_market_data(
-                    universe_path=app_config.universe_path,
-                    cache_dir=app_config.cache_dir,
-                    years=app_config.historical_data_years,
-                    freeze_date=app_config.freeze_date,
-                )
+                with performance_monitor.stage("refresh"):
+                    data.refresh_market_data(
+                        universe_path=app_config.universe_path,
+                        cache_dir=app_config.cache_dir,
+                        years=app_config.historical_data_years,
+                        freeze_date=app_config.freeze_date,
+                    )
 
             console.print("[3/4] Analyzing strategies for each ticker...")
             symbols = data.load_universe(app_config.universe_path)
@@ -475,35 +978,60 @@ def _execute_backtest_pipeline(
             )
             
             # Fetch market data once if context filters are present
-            market_data = None
-            context_filters = getattr(rules_config, 'context_filters', [])
-            if context_filters:
-                for filter_def in context_filters:
-                    if hasattr(filter_def, 'type') and filter_def.type == "market_above_sma":
-                        index_symbol = filter_def.params.get("index_symbol", "^NSEI")
-                        try:
-                            market_data = data.get_price_data(
-                                symbol=index_symbol,
-                                cache_dir=Path(app_config.cache_dir),
-                                years=app_config.historical_data_years,
-                                freeze_date=app_config.freeze_date,
-                            )
-                            logger.info(f"Loaded market data for {index_symbol}")
-                            break  # Only need to load once
-                        except Exception as e:
-                            logger.warning(f"Could not load market data for {index_symbol}: {e}")
+            market_data, market_index_symbol = _load_market_data(app_config, rules_config)
             
-            all_results = []
-            with console.status("[bold green]Running backtests...") as status:
-                for i, symbol in enumerate(symbols):
-                    status.update(f"Analyzing {symbol} ({i+1}/{len(symbols)})...")
-                    all_results.extend(_analyze_symbol(symbol, app_config, rules_config, app_config.freeze_date, bt, market_data))
+            run_timestamp, config_hash, config_snapshot, completed = _start_run_checkpoint(
+                db_connection, app_config, rules_config, resume
+            )
+            freeze_iso = app_config.freeze_date.isoformat() if app_config.freeze_date else None
+            
+            # Each symbol is committed as it finishes so a crash loses at most one symbol;
+            # results are read back from the database for display and reporting
+            if workers > 1:
+                _run_symbols_pipelined(
+                    [symbol for symbol in symbols if symbol not in completed],
+                    app_config, rules_config, bt, market_data, run_timestamp, config_hash, config_snapshot, workers,
+                )
+            else:
+                with console.status("[bold green]Running backtests...") as status:
+                    for i, symbol in enumerate(symbols):
+                        if symbol in completed:
+                            continue
+                        status.update(f"Analyzing {symbol} ({i+1}/{len(symbols)})...")
+                        symbol_results = _analyze_symbol(
+                            symbol, app_config, rules_config, app_config.freeze_date, bt, market_data, config_hash
+                        )
+                        if symbol_results is None:
+                            logger.warning(f"Analysis of {symbol} failed; it will be retried on --resume.")
+                            continue
+                        with performance_monitor.stage("persist"):
+                            saved = persistence.save_strategies_batch(
+                                db_connection, symbol_results, run_timestamp, config_snapshot, config_hash
+                            )
+                            if saved:
+                                persistence.mark_symbol_complete(
+                                    db_connection, run_timestamp, config_hash, symbol, len(symbol_results), freeze_iso
+                                )
+                            else:
+                                logger.warning(f"Could not save results for {symbol}; it will be retried on --resume.")
             
             console.print("[4/4] Analysis complete. Results summary:")
-            _process_and_save_results(db_connection, all_results, app_config, rules_config)
+            _report_screened_work()
+            # The NIFTY frame loaded for market_above_sma doubles as the report benchmark
+            benchmark_data = market_data if market_index_symbol == "^NSEI" else None
+            strategy_count = _process_and_save_results(
+                db_connection, None, app_config, rules_config, benchmark_data,
+                run_timestamp=run_timestamp,
+            )
+            persistence.clear_run_progress(db_connection, config_hash)
             
             if clear_strategies:
-                console.print(f"✅ New strategies found: {len(all_results)}")
+                console.print(f"✅ New strategies found: {strategy_count}")
+
+        _record_run_metrics(
+            app_config, "clear-and-recalculate" if clear_strategies else "run",
+            run_timestamp, config_hash, len(symbols),
+        )
 
         # Performance summary
         if verbose:
@@ -512,11 +1040,13 @@ def _execute_backtest_pipeline(
                 console.print("\n[bold blue]Performance Summary:[/bold blue]")
                 console.print(f"Total Duration: {perf_summary['total_duration']:.2f}s")
                 console.print(f"Slowest Function: {perf_summary['slowest_function']}")
+            _export_profile(app_config)
 
     except Exception as e:
         context = "during clearing and recalculation" if clear_strategies else "during run pipeline"
         _handle_command_exception(e, verbose, context)
     finally:
+        performance_monitor.profiler.disable()
         if db_connection:
             db_connection.close()
             logger.info("Database connection closed.")
@@ -528,9 +1058,12 @@ def run(
     ctx: typer.Context,
     freeze_data: Optional[str] = typer.Option(None, "--freeze-data", help="Freeze data to specific date (YYYY-MM-DD)"),
     min_trades: Optional[int] = typer.Option(None, "--min-trades", help="Minimum trades required during backtesting (None = use config default)"),
+    resume: bool = typer.Option(False, "--resume", help="Continue the last interrupted run for this configuration, skipping symbols already completed."),
+    workers: int = typer.Option(1, "--workers", "-w", min=1, help="Backtest worker processes; above 1, loading, backtesting and saving overlap."),
 ) -> None:
     """Run the KISS Signal analysis pipeline with professional walk-forward validation."""
-    _execute_backtest_pipeline(ctx, freeze_data, "run_log.txt", clear_strategies=False, min_trades=min_trades, force=False, preserve_all=False)
+    _forward_to_server(ctx)
+    _execute_backtest_pipeline(ctx, freeze_data, "run_log.txt", clear_strategies=False, min_trades=min_trades, force=False, preserve_all=False, resume=resume, workers=workers)
 
 
 @app.command(name="analyze-strategies")
@@ -539,9 +1072,12 @@ def analyze_strategies(
     output_file: Path = typer.Option("strategy_performance_report.csv", "--output", "-o", help="Path to save the strategy performance report as a CSV file."),
     per_stock: bool = typer.Option(False, "--per-stock", help="Generate detailed per-stock strategy report instead of the aggregated leaderboard."),
     min_trades: Optional[int] = typer.Option(None, "--min-trades", help="Minimum trades required for analysis (None = use default threshold)"),
+    output_format: str = typer.Option("csv", "--format", help="Output file format: 'csv' or 'parquet' (parquet requires pyarrow)."),
+    compress: bool = typer.Option(False, "--gzip", help="Gzip-compress the output (CSV is written as .csv.gz content, Parquet uses gzip codec)."),
 ) -> None:
     """Analyze and report on the comprehensive performance of all strategies."""
-    _execute_analysis_pipeline(ctx, "analyze_strategies_log.txt", output_file, per_stock, min_trades)
+    _forward_to_server(ctx)
+    _execute_analysis_pipeline(ctx, "analyze_strategies_log.txt", output_file, per_stock, min_trades, output_format, compress)
 
 
 @app.command(name="clear-and-recalculate")
@@ -553,3 +1089,223 @@ def clear_and_recalculate(
 ) -> None:
     """Intelligently clear current strategies and recalculate with preservation of historical data."""
     _execute_backtest_pipeline(ctx, freeze_data, "clear_and_recalculate_log.txt", clear_strategies=True, min_trades=None, force=force, preserve_all=preserve_all)
+
+
+@app.command(name="run-metrics")
+def run_metrics(
+    ctx: typer.Context,
+    last: int = typer.Option(10, "--last", "-n", help="Number of most recent runs to show."),
+) -> None:
+    """Show stage timings and counters recorded for the last N runs."""
+    app_config = ctx.obj["config"]
+    rows = persistence.get_run_metrics(Path(app_config.database_path), limit=last)
+    if not rows:
+        console.print("[yellow]No run metrics recorded yet.[/yellow]")
+        return
+
+    # Relative to the median of the shown runs, so a 3x slower run stands out
+    totals = [row["total_duration"] for row in rows if row["total_duration"]]
+    median_total = statistics.median(totals) if totals else None
+
+    table = Table(title=f"Run Metrics (last {len(rows)} runs)")
+    table.add_column("Run", style="cyan", no_wrap=True)
+    table.add_column("Command")
+    table.add_column("Config")
+    for column in ("Total (s)", "vs Median", *(f"{stage.title()} (s)" for stage in RUN_STAGES),
+                   "Symbols", "Cache Hit", "Rows", "Peak MB"):
+        table.add_column(column, justify="right")
+
+    def seconds(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:.1f}"
+
+    for row in reversed(rows):  # Oldest first so the trend reads top to bottom
+        lookups = (row["cache_hits"] or 0) + (row["cache_misses"] or 0)
+        total = row["total_duration"]
+        ratio = f"{total / median_total:.2f}x" if total and median_total else "-"
+        if total and median_total and total > 1.5 * median_total:
+            ratio = f"[red]{ratio}[/red]"
+        table.add_row(
+            row["run_timestamp"][:16].replace("T", " "),
+            row["command"],
+            (row["config_hash"] or "-")[:8],
+            seconds(total),
+            ratio,
+            *(seconds(row[f"{stage}_duration"]) for stage in RUN_STAGES),
+            f"{row['symbols_processed'] or 0}/{row['symbols_total'] or 0}",
+            f"{row['cache_hits'] / lookups:.0%}" if lookups else "-",
+            str(row["db_rows_written"] or 0),
+            "-" if row["peak_memory_mb"] is None else f"{row['peak_memory_mb']:.0f}",
+        )
+    console.print(table)
+
+
+# impure
+def _backtest_single_symbol(
+    symbol: str, app_config: Config, rules_config: Any, min_trades: Optional[int]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Runs the strategy search on one symbol without touching the database.
+
+    Returns:
+        (strategies, out-of-sample result of every walk-forward window that
+        met ``walk_forward.min_trades_per_period``), windows in date order
+
+    Raises:
+        FileNotFoundError: If the symbol has no cached history in freeze mode
+        ValueError: If the history is unusable
+    """
+    from . import backtester
+    with performance_monitor.span("load"):
+        price_data = _load_symbol_history(app_config, symbol, app_config.freeze_date)
+        market_data, _ = _load_market_data(app_config, rules_config)
+
+    threshold = min_trades if min_trades is not None else app_config.min_trades_threshold
+    bt = backtester.Backtester(
+        hold_period=app_config.hold_period,
+        min_trades_threshold=threshold,
+        initial_capital=app_config.portfolio_initial_capital,
+    )
+    # In-memory only: collects every window's result for the per-window report
+    window_cache = backtester.WindowResultCache()
+    try:
+        with performance_monitor.span("symbol"):
+            strategies = bt.find_optimal_strategies(
+                price_data=price_data,
+                rules_config=rules_config,
+                market_data=market_data,
+                symbol=symbol,
+                freeze_date=app_config.freeze_date,
+                edge_score_weights=app_config.edge_score_weights,
+                config=app_config,
+                window_cache=window_cache,
+            )
+    except DataMismatchError:
+        raise
+    except ValueError as e:  # Walk-forward found no usable window; the windows still explain why
+        logger.warning(str(e))
+        strategies = []
+
+    min_period_trades = app_config.walk_forward.min_trades_per_period
+    windows = [
+        result for result in window_cache.results()
+        if result and result["total_trades"] >= min_period_trades
+    ]
+    return strategies, windows
+
+
+@app.command(name="backtest")
+def backtest(
+    ctx: typer.Context,
+    symbol: str = typer.Argument(..., help="Symbol to backtest, e.g. RELIANCE."),
+    rules_file: Optional[Path] = typer.Option(None, "--rules", help="Rules YAML to evaluate (default: the global --rules file)."),
+    freeze_data: Optional[str] = typer.Option(None, "--freeze-data", help="Freeze data to specific date (YYYY-MM-DD)"),
+    min_trades: Optional[int] = typer.Option(None, "--min-trades", help="Minimum trades required during backtesting (None = use config default)"),
+    profile: bool = typer.Option(False, "--profile", help="Print the time spent in each profiled span."),
+) -> None:
+    """Backtest one symbol and print its walk-forward windows; writes nothing to the database."""
+    _forward_to_server(ctx)
+    app_config = ctx.obj["config"]
+    try:
+        rules_config = load_rules(rules_file) if rules_file else ctx.obj["rules"]
+    except (FileNotFoundError, ValueError) as e:
+        console.print(f"[red]Error loading rules: {e}[/red]")
+        raise typer.Exit(1)
+    app_config.freeze_date = _parse_freeze_date(freeze_data)
+
+    if profile:
+        performance_monitor.profiler.reset()
+        performance_monitor.profiler.enable()
+    start = time.perf_counter()
+    try:
+        strategies, windows = _backtest_single_symbol(symbol, app_config, rules_config, min_trades)
+    except (FileNotFoundError, ValueError) as e:
+        console.print(f"[red]Backtest failed for {symbol}: {e}[/red]")
+        raise typer.Exit(1)
+    finally:
+        performance_monitor.profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    if strategies:
+        table = Table(title=f"Optimal Strategy for {symbol}")
+        for column in ("Rule Stack", "Edge Score", "Win %", "Sharpe", "Avg Return", "Trades", "Consistency"):
+            table.add_column(column, justify="left" if column == "Rule Stack" else "right")
+        for strategy in strategies:
+            rule_names = [str(getattr(rule, 'name', None) or getattr(rule, 'type', rule)) for rule in strategy["rule_stack"]]
+            table.add_row(
+                " + ".join(rule_names),
+                f"{strategy['edge_score']:.3f}",
+                f"{strategy['win_pct']:.1%}",
+                f"{strategy['sharpe']:.2f}",
+                f"{strategy['avg_return']:.2f}",
+                str(strategy["total_trades"]),
+                f"{strategy.get('consistency_score', 0.0):.1%}",
+            )
+        console.print(table)
+    else:
+        console.print(f"[yellow]No strategy for {symbol} passed walk-forward validation.[/yellow]")
+
+    console.print(WalkForwardReport(windows).generate_report(symbol), markup=False, highlight=False)
+    if profile:
+        _print_profile(performance_monitor.profiler.get_stats())
+    console.print(f"Backtested {symbol} in {elapsed:.2f}s (no database writes).")
+
+
+@app.command(name="signals")
+def signals(
+    ctx: typer.Context,
+    rules_file: Optional[Path] = typer.Option(None, "--rules", help="Rules YAML to evaluate (default: the global --rules file)."),
+    freeze_data: Optional[str] = typer.Option(None, "--freeze-data", help="Freeze data to specific date (YYYY-MM-DD)"),
+) -> None:
+    """Show which universe symbols' entry rules fire on the latest bar, from persisted streaming state."""
+    from . import data
+    _forward_to_server(ctx)
+    app_config = ctx.obj["config"]
+    try:
+        rules_config = load_rules(rules_file) if rules_file else ctx.obj["rules"]
+    except (FileNotFoundError, ValueError) as e:
+        console.print(f"[red]Error loading rules: {e}[/red]")
+        raise typer.Exit(1)
+    app_config.freeze_date = _parse_freeze_date(freeze_data)
+
+    start = time.perf_counter()
+    symbols = data.load_universe(app_config.universe_path)
+    market_data, index_symbol = _load_market_data(app_config, rules_config)
+
+    db_path = Path(app_config.database_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    persistence.create_database(db_path)
+    with performance_monitor.stage("load"):
+        fired, frames = latest_entry_signals(
+            db_path, symbols, app_config, rules_config, market_data, index_symbol or "^NSEI"
+        )
+    elapsed = time.perf_counter() - start
+
+    firing = [symbol for symbol, signal in fired.items() if signal]
+    if firing:
+        table = Table(title="Entry Signals on the Latest Bar")
+        table.add_column("Symbol", style="cyan")
+        table.add_column("Date")
+        table.add_column("Close", justify="right")
+        for symbol in firing:
+            frame = frames[symbol]
+            table.add_row(symbol, str(frame.index[-1])[:10], f"{frame['close'].iloc[-1]:.2f}")
+        console.print(table)
+    else:
+        console.print("[yellow]No entry signals on the latest bar.[/yellow]")
+    console.print(f"Evaluated {len(fired)} of {len(symbols)} symbols in {elapsed:.2f}s.")
+
+
+@app.command(name="serve")
+def serve(
+    ctx: typer.Context,
+    host: str = typer.Option("127.0.0.1", "--host", help="Loopback interface to bind; other addresses are refused."),
+    port: int = typer.Option(8765, "--port", help="Port to listen on."),
+    warm_up: bool = typer.Option(True, "--warm-up/--no-warm-up", help="Compile backtesting kernels before accepting requests."),
+) -> None:
+    """Keep data and compiled kernels warm and serve commands sent with --server."""
+    from .server import serve_forever
+
+    try:
+        serve_forever(host, port, ctx.obj["config"], ctx.obj["rules"], warm_up)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
@@ -64,6 +64,9 @@ class Config(BaseModel):
     
     # Walk-forward analysis configuration
     walk_forward: WalkForwardConfig = Field(default_factory=WalkForwardConfig)
+
+    # Hold prices as float32 and volume as int32 in memory (simulation stays float64)
+    compact_storage: bool = Field(default=False)
     freeze_date: Optional[date] = None
 
     @field_validator("universe_path")
@@ -83,6 +86,14 @@ class RuleDef(BaseModel):
     params: Dict[str, Any]
     description: Optional[str] = None
 
+    @field_validator("params")
+    def _expression_parses(cls, v: Dict[str, Any], info: ValidationInfo) -> Dict[str, Any]:
+        if info.data.get("type") == "expression":
+            from .expressions import parse  # Imports the indicator stack; only needed for expression rules
+
+            parse(v.get("expr", ""))
+        return v
+
 class RulesConfig(BaseModel):
     """Defines the structure of the rules.yaml file."""
     preconditions: List[RuleDef] = Field(default_factory=list)
@@ -4,18 +4,110 @@ This module provides simple functions for downloading, caching, and serving
 market data for NSE equities without unnecessary abstraction.
 """
 
+import json
 import logging
+import os
+import tempfile
+import threading
 import time
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
-__all__ = ["get_price_data", "refresh_market_data", "load_universe"]
+from .performance import performance_monitor
+
+__all__ = [
+    "get_price_data", "get_latest_bars", "refresh_market_data", "iter_refresh_market_data", "load_universe",
+    "enable_frame_cache", "frame_cache_size", "enable_compact_mode", "compact_frame", "price_panel",
+]
 
 logger = logging.getLogger(__name__)
 
+# Latest-bar index maintained next to the per-symbol CSV caches. The lock serialises
+# its read-merge-write; during a refresh updates are queued per cache dir instead.
+LATEST_BARS_FILENAME = "_latest_bars.json"
+_latest_bars_lock = threading.RLock()
+_pending_latest_bars: Optional[Dict[Path, Dict[str, Dict[str, object]]]] = None
+
+# Parsed cache files kept by long-lived processes: path -> (mtime_ns, size, frame).
+# None (the default) disables it, so one-shot CLI runs don't hold every frame.
+_frame_cache: Optional[Dict[Path, Tuple[int, int, pd.DataFrame]]] = None
+
+
+def enable_frame_cache(enabled: bool = True) -> None:
+    """Keep parsed cache files in memory across get_price_data calls.
+
+    Entries are revalidated against the file's mtime and size on every load and
+    dropped when this process rewrites the file, so appended bars are picked up.
+    """
+    global _frame_cache
+    _frame_cache = {} if enabled else None
+
+
+def frame_cache_size() -> int:
+    return len(_frame_cache) if _frame_cache is not None else 0
+
+
+# Opt-in compact storage (Config.compact_storage): frames are served as float32
+# prices and int32/float32 volume instead of float64 and nullable Int64.
+_compact = False
+
+_PRICE_COLUMNS = ("open", "high", "low", "close", "adj close", "adj_close")
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+def enable_compact_mode(enabled: bool = True) -> None:
+    """Serve price frames from get_price_data in compact dtypes (see compact_frame).
+
+    Rule kernels and the simulator work in float64 regardless, so only the frames
+    held in memory shrink. Switching modes drops the frame cache so a long-lived
+    process never mixes both layouts.
+    """
+    global _compact
+    if enabled != _compact and _frame_cache:
+        _frame_cache.clear()
+    _compact = enabled
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Returns an OHLCV frame with float32 prices and int32 (or float32) volume.
+
+    Volume stays integral as int32 when every value is a whole number that fits;
+    missing values or larger counts fall back to float32. Other columns are kept.
+    """
+    dtypes: Dict[str, Any] = {}
+    for column in df.columns:
+        if str(column).lower() in _PRICE_COLUMNS:
+            dtypes[column] = np.float32
+        elif str(column).lower() == "volume":
+            volume = df[column].to_numpy(dtype=float, na_value=np.nan)
+            integral = bool(np.isfinite(volume).all()) and bool((volume == np.round(volume)).all())
+            fits = integral and (volume.size == 0 or (volume.min() >= 0 and volume.max() <= _INT32_MAX))
+            dtypes[column] = np.int32 if fits else np.float32
+    if not dtypes:
+        return df
+    if any(pd.api.types.is_extension_array_dtype(df[column]) for column in dtypes):
+        # Nullable Int64 volume from the yfinance adapter: go through float to turn <NA> into NaN
+        df = df.astype({column: float for column in dtypes if pd.api.types.is_extension_array_dtype(df[column])})
+    return df.astype(dtypes)
+
+
+def price_panel(frames: Dict[str, pd.DataFrame], column: str = "close", dtype: str = "float64") -> pd.DataFrame:
+    """Stacks one column of many symbols into a dates x symbols panel.
+
+    Dates are the union of all histories; a symbol is NaN before its listing,
+    after delisting and on days it did not trade. This is the input layout of
+    the universe-wide ``*_2d`` kernels in :mod:`kiss_signal.rules`. Pass
+    ``dtype="float32"`` to halve a large universe's panel; the kernels upcast
+    to float64 internally.
+    """
+    panel = pd.DataFrame({symbol: frame[column] for symbol, frame in frames.items()}, dtype=dtype)
+    return panel.sort_index()
+
 
 # impure
 def load_universe(universe_path: str) -> List[str]:
@@ -117,6 +209,7 @@ def get_price_data(
         except (FileNotFoundError, ValueError, AttributeError):
             logger.warning(f"Could not load or validate cache for {symbol}. Re-fetching.")
 
+    performance_monitor.increment("cache_misses" if should_fetch else "cache_hits")
     if should_fetch:
         if freeze_date:
             raise FileNotFoundError(f"Cached data not found for {symbol} (freeze mode)")
@@ -175,6 +268,8 @@ def get_price_data(
             # If resampling fails, continue with original data
             logger.debug(f"Frequency standardization failed for {symbol}: {e}. Using original data.")
     
+    if _compact:
+        data = compact_frame(data)  # After resampling, whose gap rows would upcast int32 volume
     
     # Log warnings for limited data (with same logic as before)
     is_position_tracking = start_date is not None and end_date is not None
@@ -320,16 +415,201 @@ def _save_cache(symbol: str, data: pd.DataFrame, cache_dir: Path) -> bool:
             data_to_save = data.copy()
         
         data_to_save.to_csv(cache_file, index=False)
+        if _frame_cache is not None:
+            _frame_cache.pop(cache_file.absolute(), None)
         logger.debug(f"Saved cache to {cache_file}")
+        _record_latest_bars(cache_dir, {symbol: _latest_bar_entry(data, cache_file)})
         return True
     except Exception as e:
         logger.error(f"Failed to save cache for {symbol}: {e}")
         return False
 
 
+def _latest_bar_entry(data: pd.DataFrame, cache_file: Path) -> Optional[Dict[str, object]]:
+    """Build the latest-bar index entry for a frame just written to cache_file."""
+    try:
+        if data.empty:
+            return None
+        latest = data.iloc[-1]
+        bar_date = data.index[-1] if isinstance(data.index, pd.DatetimeIndex) else latest.get("date")
+        return {
+            "date": pd.Timestamp(bar_date).date().isoformat(),
+            "close": float(latest["close"]),
+            "high": float(latest["high"]),
+            "low": float(latest["low"]),
+            "mtime_ns": cache_file.stat().st_mtime_ns,
+        }
+    except (KeyError, TypeError, ValueError, OSError) as e:
+        logger.debug(f"Could not build latest-bar entry for {cache_file}: {e}")
+        return None
+
+
+def _read_latest_bars(cache_dir: Path) -> Dict[str, Dict[str, object]]:
+    index_file = cache_dir / LATEST_BARS_FILENAME
+    try:
+        with open(index_file, "r", encoding="utf-8") as f:
+            index: Dict[str, Dict[str, object]] = json.load(f)
+        return index
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable latest-bar index {index_file}: {e}")
+        return {}
+
+
+# impure
+def _write_latest_bars(cache_dir: Path, entries: Dict[str, Dict[str, object]]) -> None:
+    """Merge entries into the latest-bar index, replacing the file atomically."""
+    index_file = cache_dir / LATEST_BARS_FILENAME
+    with _latest_bars_lock:
+        try:
+            index = _read_latest_bars(cache_dir)
+            index.update(entries)
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=cache_dir, prefix=f"{LATEST_BARS_FILENAME}.", suffix=".tmp", delete=False
+            ) as f:
+                json.dump(index, f, sort_keys=True)
+            try:
+                os.replace(f.name, index_file)
+            except OSError:
+                os.unlink(f.name)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to update latest-bar index {index_file}: {e}")
+
+
+# impure
+def _record_latest_bars(cache_dir: Path, entries: Dict[str, Optional[Dict[str, object]]]) -> None:
+    """Merge entries into the latest-bar index, or queue them while a refresh batches writes."""
+    usable: Dict[str, Dict[str, object]] = {
+        symbol: entry for symbol, entry in entries.items() if entry is not None
+    }
+    if not usable:
+        return
+    with _latest_bars_lock:
+        if _pending_latest_bars is not None:
+            _pending_latest_bars.setdefault(cache_dir, {}).update(usable)
+            return
+    _write_latest_bars(cache_dir, usable)
+
+
+@contextmanager
+def _batched_latest_bars() -> Iterator[None]:
+    """Queue latest-bar index updates and write each index once on exit.
+
+    A refresh saves many caches in a row; without batching every save would
+    re-read and rewrite the whole index.
+    """
+    global _pending_latest_bars
+    with _latest_bars_lock:
+        if _pending_latest_bars is not None:  # Nested: the outer batch flushes
+            outer = True
+        else:
+            outer = False
+            _pending_latest_bars = {}
+    try:
+        yield
+    finally:
+        if not outer:
+            with _latest_bars_lock:
+                pending, _pending_latest_bars = _pending_latest_bars or {}, None
+            for cache_dir, entries in pending.items():
+                _write_latest_bars(cache_dir, entries)
+
+
+# impure
+def get_latest_bars(
+    symbols: List[str],
+    cache_dir: Path,
+    freeze_date: Optional[date] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Get the last close/high/low for many symbols from the latest-bar index.
+
+    The index is written alongside the CSV caches by _save_cache, so a single JSON
+    read answers every symbol. Symbols missing from the index, whose cache file has
+    changed since it was indexed, or whose indexed bar is after freeze_date fall back
+    to get_price_data (and are re-indexed when possible).
+
+    Args:
+        symbols: Stock or index symbols
+        cache_dir: Path to cache directory
+        freeze_date: Optional freeze date for backtesting
+
+    Returns:
+        Mapping of symbol to {'date', 'close', 'high', 'low'}; symbols without
+        usable data are omitted
+    """
+    index = _read_latest_bars(cache_dir)
+    latest: Dict[str, Dict[str, Any]] = {}
+    backfill: Dict[str, Optional[Dict[str, object]]] = {}
+
+    for symbol in dict.fromkeys(symbols):
+        entry = index.get(symbol)
+        cache_file = _get_cache_filepath(symbol, cache_dir)
+        if entry is not None:
+            try:
+                fresh = cache_file.stat().st_mtime_ns == entry["mtime_ns"]
+            except OSError:
+                fresh = False
+            in_range = freeze_date is None or date.fromisoformat(str(entry["date"])) <= freeze_date
+            if fresh and in_range:
+                latest[symbol] = {key: entry[key] for key in ("date", "close", "high", "low")}
+                continue
+
+        # Slow path: full history load for this symbol only
+        try:
+            price_data = get_price_data(
+                symbol=symbol,
+                cache_dir=cache_dir,
+                years=1,  # Only need recent data for the latest bar
+                freeze_date=freeze_date,
+            )
+        except Exception as e:
+            logger.error(f"Failed to get latest bar for {symbol}: {e}")
+            continue
+
+        if price_data is None or len(price_data) == 0:
+            logger.warning(f"No price data available for {symbol}")
+            continue
+
+        bar = price_data.iloc[-1]
+        latest[symbol] = {
+            "date": pd.Timestamp(price_data.index[-1]).date().isoformat()
+            if isinstance(price_data.index, pd.DatetimeIndex) else None,
+            "close": float(bar["close"]),
+            "high": float(bar["high"]),
+            "low": float(bar["low"]),
+        }
+        # Only an unfrozen load reflects the end of the cache file
+        if freeze_date is None and cache_file.exists():
+            backfill[symbol] = _latest_bar_entry(price_data, cache_file)
+
+    _record_latest_bars(cache_dir, backfill)
+    return latest
+
+
 def _load_cache(symbol: str, cache_dir: Path) -> pd.DataFrame:
     """Load symbol data from a cache file, setting 'date' as the index."""
     cache_file = _get_cache_filepath(symbol, cache_dir)
+    if _frame_cache is None:
+        return _parse_cache_file(symbol, cache_file)
+
+    try:
+        stat = cache_file.stat()
+    except OSError:
+        return _parse_cache_file(symbol, cache_file)  # Let the parser report the missing file
+    key = cache_file.absolute()  # A server process serves clients from different working directories
+    entry = _frame_cache.get(key)
+    if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+        return entry[2].copy()
+    df = _parse_cache_file(symbol, cache_file)
+    if _compact:
+        df = compact_frame(df)
+    _frame_cache[key] = (stat.st_mtime_ns, stat.st_size, df)
+    return df.copy()
+
+
+def _parse_cache_file(symbol: str, cache_file: Path) -> pd.DataFrame:
     try:
         # Load the CSV file first
         df = pd.read_csv(cache_file)
@@ -400,45 +680,67 @@ def _fetch_and_store_data(
     return False
 
 
-def refresh_market_data(
-    universe_path: Union[str, List[str]],
+def iter_refresh_market_data(
+    symbols: List[str],
     cache_dir: str,
     years: int = 3,
     freeze_date: Optional[date] = None,
-) -> Dict[str, bool]:
-    """Refresh market data for all symbols in the universe."""
+) -> Iterator[Tuple[str, bool]]:
+    """Refresh symbols one at a time, yielding (symbol, success) as each is ready.
+
+    Symbols whose cache is already fresh are yielded first, without any fetch, so
+    a consumer can start working on them while stale symbols are downloaded.
+    """
     cache_path = Path(cache_dir)
     cache_path.mkdir(parents=True, exist_ok=True)
-    
-    symbols = universe_path if isinstance(universe_path, list) else load_universe(universe_path)
-    
+
     if freeze_date is not None:
         logger.info("Freeze mode active, skipping cache refresh")
-        return {symbol: True for symbol in symbols}
-    
+        for symbol in symbols:
+            yield symbol, True
+        return
+
     # Filter symbols that need refresh
     symbols_to_fetch = [symbol for symbol in symbols if _needs_refresh(cache_path / f"{symbol}.NS.csv")]
+    performance_monitor.increment("symbols_refreshed", len(symbols_to_fetch))
     
     if not symbols_to_fetch:
         logger.info("All symbols are fresh, no refresh needed")
-        return {symbol: True for symbol in symbols}
-
-    logger.info(f"Refreshing {len(symbols_to_fetch)} symbols")
-    
-    # Fetch data for each symbol
-    results = {}
-    for i, symbol in enumerate(symbols_to_fetch):
-        # Add rate limiting between requests
-        if i > 0:
-            time.sleep(0.5)  # 500ms delay between requests to avoid rate limiting
-            
-        logger.debug(f"Fetching {symbol} ({i+1}/{len(symbols_to_fetch)})")
-        results[symbol] = _fetch_and_store_data(symbol, years, freeze_date, cache_path)
+    else:
+        logger.info(f"Refreshing {len(symbols_to_fetch)} symbols")
+
+    stale = set(symbols_to_fetch)
+    for symbol in symbols:
+        if symbol not in stale:
+            yield symbol, True
+
+    # Fetch data for each symbol; the latest-bar index is written once at the end
+    successful = 0
+    with _batched_latest_bars():
+        for i, symbol in enumerate(symbols_to_fetch):
+            # Add rate limiting between requests
+            if i > 0:
+                time.sleep(0.5)  # 500ms delay between requests to avoid rate limiting
+                
+            logger.debug(f"Fetching {symbol} ({i+1}/{len(symbols_to_fetch)})")
+            success = _fetch_and_store_data(symbol, years, freeze_date, cache_path)
+            successful += bool(success)
+            yield symbol, success
     
     # Log summary
-    successful = sum(1 for success in results.values() if success)
-    logger.info(f"Successfully refreshed {successful}/{len(symbols_to_fetch)} symbols")
-    
+    if symbols_to_fetch:
+        logger.info(f"Successfully refreshed {successful}/{len(symbols_to_fetch)} symbols")
+
+
+def refresh_market_data(
+    universe_path: Union[str, List[str]],
+    cache_dir: str,
+    years: int = 3,
+    freeze_date: Optional[date] = None,
+) -> Dict[str, bool]:
+    """Refresh market data for all symbols in the universe."""
+    symbols = universe_path if isinstance(universe_path, list) else load_universe(universe_path)
+    results = dict(iter_refresh_market_data(symbols, cache_dir, years, freeze_date))
     return {symbol: results.get(symbol, True) for symbol in symbols}
 
 
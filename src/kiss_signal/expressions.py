@@ -0,0 +1,437 @@
+"""Expressions - Declarative rule language compiled to a deduplicated evaluation plan.
+
+A rule with ``type: "expression"`` combines indicators and existing rules in a
+single line of ``rules.yaml``::
+
+    - name: "trend_with_momentum"
+      type: "expression"
+      params:
+        expr: "sma(close, 10) crosses_above sma(close, 20) and rsi(14) > 40"
+
+Grammar, loosest binding first::
+
+    or / and / not                 boolean logic
+    a > b, >=, <, <=, ==, !=       comparisons
+    a crosses_above b              a > b now, a <= b on the previous bar
+    a crosses_below b              a < b now, a >= b on the previous bar
+    + - * /, unary -               arithmetic
+    close, open, high, low, volume price columns
+    sma(...), rsi(...), ...        indicator primitives (see ``INDICATORS``)
+    volume_spike(...), ...         boolean rule functions from ``rules``
+
+Series arguments come first and may be omitted (``rsi(14)`` is ``rsi(close, 14)``);
+numeric parameters are literals, positional or by keyword.
+
+Expressions parse into a DAG of hash-consed nodes: structurally identical
+subexpressions are the same node, whichever rule they come from. A ``Plan``
+evaluates each distinct node once, in dependency order, over NumPy arrays.
+Evaluation takes an optional node cache; passing the same cache for every rule
+evaluated on one frame shares indicators between entry, exit and context rules.
+"""
+
+import functools
+import inspect
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import kernels, rules
+
+__all__ = ["Node", "Plan", "INDICATORS", "RULE_PRIMITIVES", "parse", "evaluate"]
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+@dataclass(frozen=True)
+class Node:
+    """One operation in an expression DAG. Equal nodes are computed once."""
+    op: str  # "column", "const", "indicator", "rule", or an operator
+    name: str = ""  # Column, indicator or rule name
+    inputs: Tuple["Node", ...] = ()
+    params: Tuple[Tuple[str, Any], ...] = ()
+
+    @property
+    def is_boolean(self) -> bool:
+        return self.op in _BOOLEAN_OPS
+
+    def __str__(self) -> str:
+        if self.op == "column":
+            return self.name
+        if self.op == "const":
+            return repr(self.params[0][1])
+        if self.op in ("indicator", "rule"):
+            args = [str(node) for node in self.inputs] + [f"{key}={value!r}" for key, value in self.params]
+            return f"{self.name}({', '.join(args)})"
+        if self.op in ("not", "neg"):
+            return f"{'not ' if self.op == 'not' else '-'}{self.inputs[0]}"
+        return f"({self.inputs[0]} {self.op} {self.inputs[1]})"
+
+
+# ===== Primitives =====
+
+def _ema(index: pd.Index, values: np.ndarray, period: int) -> np.ndarray:
+    return np.asarray(pd.Series(values, index=index).ewm(span=period, adjust=False).mean(), dtype=float)
+
+
+def _rsi(index: pd.Index, values: np.ndarray, period: int) -> np.ndarray:
+    return np.asarray(rules.calculate_rsi(pd.Series(values, index=index), int(period)), dtype=float)
+
+
+def _atr(index: pd.Index, high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    frame = pd.DataFrame({"high": high, "low": low, "close": close}, index=index)
+    return np.asarray(rules.calculate_atr(frame, int(period)), dtype=float)
+
+
+def _shift(index: pd.Index, values: np.ndarray, periods: int) -> np.ndarray:
+    return np.asarray(pd.Series(values, index=index).shift(int(periods)), dtype=float)
+
+
+@dataclass(frozen=True)
+class _Indicator:
+    func: Callable[..., np.ndarray]  # (index, *input arrays, **params) -> float array
+    inputs: Tuple[str, ...]  # Default column for each series argument
+    params: Tuple[Tuple[str, Any], ...]  # (name, default); None marks a required parameter
+
+
+INDICATORS: Dict[str, _Indicator] = {
+    "sma": _Indicator(lambda index, values, period: kernels.rolling_mean(values, int(period)),
+                      ("close",), (("period", None),)),
+    "ema": _Indicator(_ema, ("close",), (("period", None),)),
+    "std": _Indicator(lambda index, values, period: kernels.rolling_std(values, int(period)),
+                      ("close",), (("period", None),)),
+    "highest": _Indicator(lambda index, values, period: kernels.rolling_max(values, int(period)),
+                          ("high",), (("period", None),)),
+    "lowest": _Indicator(lambda index, values, period: kernels.rolling_min(values, int(period)),
+                         ("low",), (("period", None),)),
+    "rsi": _Indicator(_rsi, ("close",), (("period", 14),)),
+    "atr": _Indicator(_atr, ("high", "low", "close"), (("period", 14),)),
+    "shift": _Indicator(_shift, ("close",), (("periods", 1),)),
+}
+
+# Boolean rules usable by name. Percentage/ATR stops are not signals on their own:
+# the backtester implements them from entry prices.
+_NOT_PRIMITIVES = {"stop_loss_pct", "take_profit_pct", "stop_loss_atr", "take_profit_atr"}
+RULE_PRIMITIVES: Dict[str, Callable[..., pd.Series]] = {
+    name: getattr(rules, name) for name in rules.__all__
+    if not name.startswith("calculate_") and not name.endswith("_2d") and name not in _NOT_PRIMITIVES
+}
+
+
+def _rule_params(name: str) -> Tuple[Tuple[str, Any], ...]:
+    parameters = list(inspect.signature(RULE_PRIMITIVES[name]).parameters.values())[1:]  # Skip the frame
+    return tuple(
+        (p.name, None if p.default is inspect.Parameter.empty else p.default)
+        for p in parameters if p.name != "entry_signals"
+    )
+
+
+# ===== Parser =====
+
+_TOKEN = re.compile(r"\s*(?:(\d+\.\d*|\.\d+|\d+)|([A-Za-z_]\w*)|(>=|<=|==|!=|[-+*/(),=<>]))")
+_COMPARISONS = (">", "<", ">=", "<=", "==", "!=", "crosses_above", "crosses_below")
+_BOOLEAN_OPS = {"rule", "and", "or", "not", *_COMPARISONS}
+
+
+def _tokenize(source: str) -> List[str]:
+    tokens: List[str] = []
+    position = 0
+    source = source.rstrip()
+    while position < len(source):
+        match = _TOKEN.match(source, position)
+        if match is None:
+            raise ValueError(f"Unexpected character {source[position:].lstrip()[:1]!r} in expression: {source}")
+        assert match.lastindex is not None  # Every alternative is a single capturing group
+        tokens.append(match.group(match.lastindex))
+        position = match.end()
+    return tokens
+
+
+def _number(token: str) -> Any:
+    return float(token) if "." in token else int(token)
+
+
+class _Parser:
+    """Recursive-descent parser producing type-checked nodes."""
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.tokens = _tokenize(source)
+        self.position = 0
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self) -> str:
+        token = self._peek()
+        if token is None:
+            raise ValueError(f"Unexpected end of expression: {self.source}")
+        self.position += 1
+        return token
+
+    def _expect(self, token: str) -> None:
+        found = self._next()
+        if found != token:
+            raise ValueError(f"Expected {token!r} but found {found!r} in expression: {self.source}")
+
+    def _require(self, node: Node, boolean: bool, context: str) -> Node:
+        if node.is_boolean != boolean:
+            kind = "a condition" if boolean else "a number"
+            raise ValueError(f"{context} needs {kind}, got '{node}' in expression: {self.source}")
+        return node
+
+    def parse(self) -> Node:
+        node = self._or()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected {self._peek()!r} in expression: {self.source}")
+        return self._require(node, True, "An expression")
+
+    def _or(self) -> Node:
+        node = self._and()
+        while self._peek() == "or":
+            self._next()
+            node = Node("or", inputs=(self._require(node, True, "'or'"), self._require(self._and(), True, "'or'")))
+        return node
+
+    def _and(self) -> Node:
+        node = self._not()
+        while self._peek() == "and":
+            self._next()
+            node = Node("and", inputs=(self._require(node, True, "'and'"), self._require(self._not(), True, "'and'")))
+        return node
+
+    def _not(self) -> Node:
+        if self._peek() == "not":
+            self._next()
+            return Node("not", inputs=(self._require(self._not(), True, "'not'"),))
+        return self._comparison()
+
+    def _comparison(self) -> Node:
+        node = self._sum()
+        if self._peek() in _COMPARISONS:
+            op = self._next()
+            right = self._sum()
+            node = Node(op, inputs=(self._require(node, False, f"'{op}'"), self._require(right, False, f"'{op}'")))
+        return node
+
+    def _sum(self) -> Node:
+        node = self._term()
+        while self._peek() in ("+", "-"):
+            op = self._next()
+            node = Node(op, inputs=(self._require(node, False, f"'{op}'"), self._require(self._term(), False, f"'{op}'")))
+        return node
+
+    def _term(self) -> Node:
+        node = self._unary()
+        while self._peek() in ("*", "/"):
+            op = self._next()
+            node = Node(op, inputs=(self._require(node, False, f"'{op}'"), self._require(self._unary(), False, f"'{op}'")))
+        return node
+
+    def _unary(self) -> Node:
+        if self._peek() == "-":
+            self._next()
+            operand = self._require(self._unary(), False, "'-'")
+            if operand.op == "const":  # Fold negative literals so they can be parameters
+                return Node("const", params=(("value", -operand.params[0][1]),))
+            return Node("neg", inputs=(operand,))
+        return self._atom()
+
+    def _atom(self) -> Node:
+        token = self._next()
+        if token == "(":
+            node = self._or()
+            self._expect(")")
+            return node
+        if token[0].isdigit() or token[0] == ".":
+            return Node("const", params=(("value", _number(token)),))
+        if not (token[0].isalpha() or token[0] == "_"):
+            raise ValueError(f"Unexpected {token!r} in expression: {self.source}")
+        if self._peek() == "(":
+            self._next()
+            return self._call(token)
+        if token in COLUMNS:
+            return Node("column", name=token)
+        raise ValueError(f"Unknown name '{token}' in expression: {self.source}")
+
+    def _arguments(self) -> Tuple[List[Node], Dict[str, Node]]:
+        positional: List[Node] = []
+        keywords: Dict[str, Node] = {}
+        if self._peek() == ")":
+            self._next()
+            return positional, keywords
+        while True:
+            if self.position + 1 < len(self.tokens) and self.tokens[self.position + 1] == "=":
+                key = self._next()
+                self._next()
+                keywords[key] = self._or()
+            elif keywords:
+                raise ValueError(f"Positional argument after keyword argument in expression: {self.source}")
+            else:
+                positional.append(self._or())
+            token = self._next()
+            if token == ")":
+                return positional, keywords
+            if token != ",":
+                raise ValueError(f"Expected ',' or ')' but found {token!r} in expression: {self.source}")
+
+    def _call(self, name: str) -> Node:
+        positional, keywords = self._arguments()
+        if name in INDICATORS:
+            spec = INDICATORS[name]
+            series: List[Node] = []
+            while positional and positional[0].op != "const" and len(series) < len(spec.inputs):
+                series.append(self._require(positional.pop(0), False, f"{name}()"))
+            inputs = tuple(series) + tuple(Node("column", name=column) for column in spec.inputs[len(series):])
+            return Node("indicator", name=name, inputs=inputs, params=self._bind(name, spec.params, positional, keywords))
+        if name in RULE_PRIMITIVES:
+            return Node("rule", name=name, params=self._bind(name, _rule_params(name), positional, keywords))
+        raise ValueError(f"Unknown function '{name}' in expression: {self.source}")
+
+    def _bind(
+        self, name: str, spec: Tuple[Tuple[str, Any], ...], positional: List[Node], keywords: Dict[str, Node]
+    ) -> Tuple[Tuple[str, Any], ...]:
+        """Binds literal arguments to parameter names, filling defaults, in signature order."""
+        names = [key for key, _ in spec]
+        if len(positional) > len(names):
+            raise ValueError(f"{name}() takes at most {len(names)} parameters in expression: {self.source}")
+        given: Dict[str, Node] = dict(zip(names, positional))
+        for key, node in keywords.items():
+            if key not in names:
+                raise ValueError(f"{name}() has no parameter '{key}' in expression: {self.source}")
+            if key in given:
+                raise ValueError(f"{name}() got '{key}' twice in expression: {self.source}")
+            given[key] = node
+        bound = []
+        for key, default in spec:
+            argument: Optional[Node] = given.get(key)
+            if argument is None:
+                if default is None:
+                    raise ValueError(f"{name}() is missing parameter '{key}' in expression: {self.source}")
+                bound.append((key, default))
+            elif argument.op != "const":
+                raise ValueError(f"{name}() parameter '{key}' must be a number in expression: {self.source}")
+            else:
+                bound.append((key, argument.params[0][1]))
+        return tuple(bound)
+
+
+@functools.lru_cache(maxsize=256)
+def parse(source: str) -> Node:
+    """Parses an expression into its root node.
+
+    Raises:
+        ValueError: If the expression is malformed, uses unknown names, or does
+            not evaluate to a condition
+    """
+    if not isinstance(source, str) or not source.strip():
+        raise ValueError("Expression must be a non-empty string")
+    return _Parser(source).parse()
+
+
+# ===== Evaluation =====
+
+def _topological(roots: Iterable[Node]) -> List[Node]:
+    order: Dict[Node, None] = {}
+
+    def visit(node: Node) -> None:
+        if node in order:
+            return
+        for child in node.inputs:
+            visit(child)
+        order[node] = None
+
+    for root in roots:
+        visit(root)
+    return list(order)
+
+
+def _shifted(values: np.ndarray) -> np.ndarray:
+    shifted = np.empty(len(values))
+    shifted[:1] = np.nan
+    shifted[1:] = values[:-1]
+    return shifted
+
+
+def _compute(node: Node, args: List[Any], price_data: pd.DataFrame) -> Any:
+    op = node.op
+    if op == "const":
+        return node.params[0][1]
+    if op == "column":
+        if node.name not in price_data.columns:
+            raise ValueError(f"Missing required columns: ['{node.name}']")
+        return price_data[node.name].to_numpy(dtype=np.float64, na_value=np.nan)
+    if op == "indicator":
+        return INDICATORS[node.name].func(price_data.index, *args, **dict(node.params))
+    if op == "rule":
+        return RULE_PRIMITIVES[node.name](price_data, **dict(node.params)).to_numpy(dtype=bool, na_value=False)
+    if op == "crosses_above":
+        return (args[0] > args[1]) & (_shifted(args[0]) <= _shifted(args[1]))
+    if op == "crosses_below":
+        return (args[0] < args[1]) & (_shifted(args[0]) >= _shifted(args[1]))
+    if op == "and":
+        return args[0] & args[1]
+    if op == "or":
+        return args[0] | args[1]
+    if op == "not":
+        return ~args[0]
+    if op == "neg":
+        return -args[0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _BINARY[op](*args)  # NaN compares False, as in pandas
+
+
+_BINARY: Dict[str, Callable[[Any, Any], Any]] = {
+    "+": np.add, "-": np.subtract, "*": np.multiply, "/": np.divide,
+    ">": np.greater, "<": np.less, ">=": np.greater_equal, "<=": np.less_equal,
+    "==": np.equal, "!=": np.not_equal,
+}
+
+
+class Plan:
+    """Named expressions compiled into one deduplicated evaluation order."""
+
+    def __init__(self, expressions: Mapping[str, str]) -> None:
+        self.roots: Dict[str, Node] = {name: parse(source) for name, source in expressions.items()}
+        self.steps: List[Node] = _topological(self.roots.values())
+        self._root_steps: Dict[str, List[Node]] = {name: _topological([root]) for name, root in self.roots.items()}
+        logger.debug(f"Compiled {len(self.roots)} expressions into {len(self.steps)} distinct nodes")
+
+    def evaluate(
+        self,
+        price_data: pd.DataFrame,
+        cache: Optional[MutableMapping[Node, Any]] = None,
+        names: Optional[Iterable[str]] = None,
+    ) -> Dict[str, pd.Series]:
+        """Evaluates expressions on one frame; returns name -> boolean signals.
+
+        Args:
+            price_data: OHLCV frame with lowercase columns
+            cache: Node values already computed on this same frame; filled in
+                with the new ones. Never share a cache between frames.
+            names: Expressions to evaluate (default: all); only the nodes they
+                need are computed
+        """
+        values: MutableMapping[Node, Any] = {} if cache is None else cache
+        selected = list(self.roots) if names is None else list(names)
+        for name in selected:
+            for node in self._root_steps[name]:
+                if node not in values:
+                    values[node] = _compute(node, [values[child] for child in node.inputs], price_data)
+        return {
+            name: pd.Series(np.broadcast_to(values[self.roots[name]], len(price_data.index)).astype(bool),
+                            index=price_data.index)
+            for name in selected
+        }
+
+
+def evaluate(
+    source: str, price_data: pd.DataFrame, cache: Optional[MutableMapping[Node, Any]] = None
+) -> pd.Series:
+    """Boolean signals of a single expression (see ``Plan.evaluate`` for ``cache``)."""
+    return Plan({"signals": source}).evaluate(price_data, cache)["signals"]
@@ -0,0 +1,246 @@
+"""Incremental indicator state for daily position monitoring.
+
+Exit checks on open positions only need the latest ATR or SMA-cross value. Instead
+of recomputing the indicator over the whole history every day, a small state dict
+per (symbol, indicator) is persisted and advanced in O(1) per new bar. The state is
+rebuilt from the full history when it is missing or no longer matches the cache
+(e.g. after a cache rebuild rewrote past bars).
+
+States are plain JSON-serialisable dicts so persistence can store them as text.
+"""
+
+import logging
+import math
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from . import kernels, rules
+
+__all__ = [
+    "atr_key",
+    "sma_key",
+    "build_state",
+    "update_state",
+    "advance_state",
+    "locate_last_bar",
+    "sync_state",
+    "atr_value",
+    "sma_cross_flags",
+]
+
+logger = logging.getLogger(__name__)
+
+
+def atr_key(period: int) -> str:
+    """State key for a Wilder ATR of the given period."""
+    return f"atr:{period}"
+
+
+def sma_key(fast_period: int, slow_period: int) -> str:
+    """State key for a fast/slow SMA pair."""
+    return f"sma:{fast_period}:{slow_period}"
+
+
+def _parse_key(key: str) -> Tuple[str, Tuple[int, ...]]:
+    kind, *params = key.split(":")
+    return kind, tuple(int(p) for p in params)
+
+
+def _bar_label(label: Any) -> str:
+    return str(label)
+
+
+def _build_atr_state(price_data: pd.DataFrame, period: int) -> Dict[str, Any]:
+    rules._validate_ohlcv_columns(price_data, ["high", "low", "close"])
+    atr = rules.calculate_atr(price_data, period)
+    # calculate_atr adapts the period for short histories; only seed the
+    # recursive state once a full period is available.
+    ready = len(price_data) >= period and not pd.isna(atr.iloc[-1])
+    return {
+        "atr": float(atr.iloc[-1]) if ready else None,
+        "prev_close": float(price_data["close"].iloc[-1]),
+    }
+
+
+def _build_sma_state(price_data: pd.DataFrame, fast_period: int, slow_period: int) -> Dict[str, Any]:
+    if fast_period >= slow_period:
+        raise ValueError(f"fast_period ({fast_period}) must be less than slow_period ({slow_period})")
+    closes = [float(c) for c in price_data["close"].iloc[-(slow_period + 1):]]
+    window = closes[-slow_period:]
+    # Running sums carry Kahan compensation ([adding, removing]) so months of O(1)
+    # updates do not drift from a fresh rebuild
+    state: Dict[str, Any] = {
+        "window": window,
+        "fast_sum": math.fsum(window[-fast_period:]),
+        "slow_sum": math.fsum(window),
+        "fast_comp": [0.0, 0.0],
+        "slow_comp": [0.0, 0.0],
+        "fast": None,
+        "slow": None,
+        "prev_fast": None,
+        "prev_slow": None,
+    }
+    if len(closes) >= slow_period:
+        state["fast"] = state["fast_sum"] / fast_period
+        state["slow"] = state["slow_sum"] / slow_period
+    if len(closes) == slow_period + 1:
+        prev = closes[:-1]
+        state["prev_fast"] = math.fsum(prev[-fast_period:]) / fast_period
+        state["prev_slow"] = math.fsum(prev) / slow_period
+    return state
+
+
+def _slide_sum(state: Dict[str, Any], name: str, added: float, removed: Optional[float]) -> None:
+    """Move the compensated running sum state[name] one bar forward."""
+    comp = state.setdefault(name.replace("_sum", "_comp"), [0.0, 0.0])  # States saved before compensation
+    state[name], comp[0] = kernels.kahan_add(state[name], comp[0], added)
+    if removed is not None:
+        state[name], comp[1] = kernels.kahan_add(state[name], comp[1], -removed)
+
+
+def build_state(key: str, price_data: pd.DataFrame) -> Dict[str, Any]:
+    """Build indicator state from the full price history (the slow path).
+
+    Args:
+        key: Indicator key from atr_key() or sma_key()
+        price_data: DataFrame with OHLCV data; the last row is the current bar
+
+    Returns:
+        State dict positioned at the last bar of price_data
+
+    Raises:
+        ValueError: If the key is unknown or price_data is empty
+    """
+    if len(price_data) == 0:
+        raise ValueError("Cannot build indicator state from empty price data")
+
+    kind, params = _parse_key(key)
+    if kind == "atr":
+        state = _build_atr_state(price_data, *params)
+    elif kind == "sma":
+        state = _build_sma_state(price_data, *params)
+    else:
+        raise ValueError(f"Unknown indicator state key: {key}")
+
+    state.update({
+        "key": key,
+        "bars": len(price_data),
+        "last_date": _bar_label(price_data.index[-1]),
+        "last_close": float(price_data["close"].iloc[-1]),
+    })
+    return state
+
+
+def update_state(state: Dict[str, Any], bar: pd.Series, label: Any) -> Dict[str, Any]:
+    """Advance state by one new bar in O(1).
+
+    Args:
+        state: State returned by build_state() or a previous update_state()
+        bar: Row with 'high', 'low', 'close'
+        label: Index label of the bar
+
+    Returns:
+        The same state dict, updated in place
+    """
+    kind, params = _parse_key(state["key"])
+    close = float(bar["close"])
+
+    if kind == "atr":
+        (period,) = params
+        high, low = float(bar["high"]), float(bar["low"])
+        prev_close = state["prev_close"]
+        true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        if state["atr"] is not None:
+            alpha = 1.0 / period
+            state["atr"] = (1 - alpha) * state["atr"] + alpha * true_range
+        state["prev_close"] = close
+    else:
+        fast_period, slow_period = params
+        window = state["window"]
+        window.append(close)
+        _slide_sum(state, "fast_sum", close, window[-fast_period - 1] if len(window) > fast_period else None)
+        _slide_sum(state, "slow_sum", close, window.pop(0) if len(window) > slow_period else None)
+        state["prev_fast"], state["prev_slow"] = state["fast"], state["slow"]
+        if len(window) >= slow_period:
+            state["fast"] = state["fast_sum"] / fast_period
+            state["slow"] = state["slow_sum"] / slow_period
+
+    state["bars"] += 1
+    state["last_date"] = _bar_label(label)
+    state["last_close"] = close
+    return state
+
+
+def locate_last_bar(state: Dict[str, Any], price_data: pd.DataFrame) -> Optional[int]:
+    """Position of the state's ``last_date`` bar in price_data, scanning back from the end.
+
+    Shared by the exit-indicator states here and the entry-signal streams.
+    """
+    last_date = state.get("last_date")
+    for pos in range(len(price_data) - 1, -1, -1):
+        if _bar_label(price_data.index[pos]) == last_date:
+            return pos
+    return None
+
+
+def advance_state(key: str, state: Optional[Dict[str, Any]], price_data: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """Advance state over the bars of price_data after its last bar, without rebuilding.
+
+    price_data only needs to start at (or before) the state's last bar, so callers
+    can pass a short tail of the history.
+
+    Returns:
+        The updated state, or None when it cannot be advanced and must be rebuilt
+        from the full history: it is missing or for another key, an ATR state was
+        seeded before a full period was available, its last bar is not in
+        price_data or that bar's close no longer matches (cache rebuilt), or a
+        new bar has missing prices
+    """
+    if state is None or state.get("key") != key:
+        return None
+    kind, _ = _parse_key(key)
+    if kind == "atr" and state.get("atr") is None:
+        return None
+    pos = locate_last_bar(state, price_data)
+    if pos is None or not math.isclose(float(price_data["close"].iloc[pos]), state["last_close"]):
+        return None
+    new_bars = price_data.iloc[pos + 1:][["high", "low", "close"] if kind == "atr" else ["close"]]
+    if new_bars.isna().any().any():
+        return None
+    for label, bar in new_bars.iterrows():
+        update_state(state, bar, label)
+    return state
+
+
+def sync_state(key: str, state: Optional[Dict[str, Any]], price_data: pd.DataFrame) -> Tuple[Dict[str, Any], bool]:
+    """Bring state up to the last bar of price_data.
+
+    New bars after the state's last bar are applied incrementally (advance_state);
+    otherwise the state is rebuilt from price_data, which must then be the full history.
+
+    Returns:
+        Tuple of (state, rebuilt)
+    """
+    advanced = advance_state(key, state, price_data)
+    if advanced is not None:
+        return advanced, False
+    if state is not None:
+        logger.debug(f"Indicator state {key} is stale, rebuilding from full history")
+    return build_state(key, price_data), True
+
+
+def atr_value(state: Dict[str, Any]) -> float:
+    """Current ATR from an ATR state (NaN until a full period has been seen)."""
+    return float("nan") if state["atr"] is None else float(state["atr"])
+
+
+def sma_cross_flags(state: Dict[str, Any]) -> Tuple[bool, bool]:
+    """(crossed_under, crossed_over) on the last bar, matching sma_cross_under/sma_crossover."""
+    fast, slow = state["fast"], state["slow"]
+    prev_fast, prev_slow = state["prev_fast"], state["prev_slow"]
+    if None in (fast, slow, prev_fast, prev_slow):
+        return False, False
+    crossed_under = prev_fast > prev_slow and fast < slow
+    crossed_over = fast > slow and prev_fast <= prev_slow
+    return crossed_under, crossed_over
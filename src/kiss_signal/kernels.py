@@ -0,0 +1,416 @@
+"""Kernels - Compiled inner loops for the indicator hot path.
+
+``calculate_rsi`` and ``calculate_atr`` are called for every rule, window and
+symbol. Their pandas versions build diff/where/concat intermediates and run two
+``ewm`` passes. The kernels here compute true range and Wilder smoothing in a
+single pass over contiguous float64 arrays, for one series or for every column
+of a dates x symbols panel in one call.
+
+The rolling primitives (sum, mean, std, max, min and the since-event running
+max) are what the rules are built on. They take 1-D series or 2-D dates x
+symbols panels, where each column is an independent series. Sums and moments
+use pandas' running-sum updates with Kahan compensation (Welford for the
+variance), and max/min use a monotonic deque, so every bar is O(1).
+
+Kernels are plain Python functions over NumPy arrays. On first use they are
+compiled with numba (installed with vectorbt), with ``cache=True`` so later
+processes load the machine code from disk. The import is deferred so the CLI
+starts without numba. Without numba the same functions run interpreted, with
+identical results.
+
+The smoothing and the rolling sums replicate pandas' ``ewm(adjust=False)`` and
+``rolling`` update steps, including NaN handling, so results are bit-identical
+to the pandas code they replaced. NaN bars are skipped: a window's statistic is
+taken over its valid values, and needs ``min_periods`` of them.
+"""
+
+import logging
+import math
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+
+__all__ = [
+    "wilder_rsi",
+    "wilder_atr",
+    "rolling_sum",
+    "rolling_mean",
+    "rolling_std",
+    "rolling_max",
+    "rolling_min",
+    "running_max",
+    "kahan_add",
+]
+
+logger = logging.getLogger(__name__)
+
+_compiled: Dict[str, Callable[..., Any]] = {}
+
+
+def _kernel(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Returns the numba-compiled kernel, compiling (or loading) it on first use."""
+    compiled = _compiled.get(func.__name__)
+    if compiled is None:
+        try:
+            import numba
+        except ImportError:  # pragma: no cover - numba ships with vectorbt
+            logger.debug(f"numba unavailable; running {func.__name__} interpreted")
+            compiled = func
+        else:
+            compiled = numba.njit(cache=True, nogil=True)(func)
+        _compiled[func.__name__] = compiled
+    return compiled
+
+
+def kahan_add(total: float, compensation: float, value: float) -> Tuple[float, float]:
+    """Add value to a Kahan-compensated running sum; returns (total, compensation).
+
+    The same update the rolling-sum kernels apply per bar, for callers that keep
+    running sums outside a kernel (streaming and incremental indicator state).
+    Removing a value from a window is ``kahan_add(total, compensation, -value)``.
+    """
+    y = value - compensation
+    t = total + y
+    return t, t - total - y
+
+
+def _wilder_rsi_loop(rows: np.ndarray, alpha: float) -> np.ndarray:
+    n_series, n = rows.shape
+    out = np.empty((n_series, n))
+    for r in range(n_series):
+        close = rows[r]
+        avg_gain = 0.0  # The first bar has no change: gain and loss are both 0
+        avg_loss = 0.0
+        old_wt = 1.0
+        for i in range(n):
+            gain = 0.0
+            loss = 0.0
+            if i > 0:
+                delta = close[i] - close[i - 1]  # NaN compares False: no gain, no loss
+                if delta > 0:
+                    gain = delta
+                elif delta < 0:
+                    loss = -delta
+                old_wt *= 1.0 - alpha
+                if avg_gain != gain:
+                    avg_gain = (old_wt * avg_gain + alpha * gain) / (old_wt + alpha)
+                if avg_loss != loss:
+                    avg_loss = (old_wt * avg_loss + alpha * loss) / (old_wt + alpha)
+                old_wt = 1.0
+            rs = avg_gain / (avg_loss if avg_loss != 0 else 1e-10)
+            out[r, i] = 100 - (100 / (1 + rs))
+    return out
+
+
+def _wilder_atr_loop(
+    highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, alpha: float, min_periods: int
+) -> np.ndarray:
+    n_series, n = closes.shape
+    out = np.empty((n_series, n))
+    for r in range(n_series):
+        high = highs[r]
+        low = lows[r]
+        close = closes[r]
+        weighted = np.nan
+        old_wt = 1.0
+        nobs = 0
+        for i in range(n):
+            # True range = max(H-L, |H-C_prev|, |L-C_prev|), skipping missing terms; the first bar is H-L
+            tr = high[i] - low[i]
+            if i > 0:
+                for term in (abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])):
+                    if term > tr or (tr != tr and term == term):
+                        tr = term
+            is_observation = tr == tr
+            nobs += is_observation
+            if i == 0:
+                weighted = tr
+            elif weighted == weighted:
+                old_wt *= 1.0 - alpha  # Missing bars still decay the old weight, as in pandas
+                if is_observation:
+                    if weighted != tr:  # pandas skips the update on constant series to avoid rounding drift
+                        weighted = (old_wt * weighted + alpha * tr) / (old_wt + alpha)
+                    old_wt = 1.0
+            elif is_observation:
+                weighted = tr
+            out[r, i] = weighted if nobs >= min_periods else np.nan
+    return out
+
+
+def _pandas_alpha(period: int) -> float:
+    # pandas turns alpha into a centre of mass and back; doing the same keeps results bit-identical
+    alpha = 1.0 / period
+    com = (1 - alpha) / alpha
+    return 1.0 / (1.0 + com)
+
+
+def wilder_rsi(close: Any, period: int = 14) -> np.ndarray:
+    """RSI with Wilder smoothing, equal to the former pandas ``calculate_rsi`` body.
+
+    Args:
+        close: 1-D close prices, or a 2-D dates x symbols panel (RSI per column)
+        period: Smoothing period (alpha = 1/period)
+    """
+    rsi = _kernel(_wilder_rsi_loop)(_as_series_rows(close), _pandas_alpha(period))
+    return _from_series_rows(rsi, close)
+
+
+def wilder_atr(high: Any, low: Any, close: Any, period: int = 14) -> np.ndarray:
+    """ATR: true range smoothed with alpha = 1/period, NaN before ``period`` observations.
+
+    Args:
+        high, low, close: 1-D price arrays, or 2-D dates x symbols panels, of equal shape
+        period: Smoothing period, also the minimum number of observations
+    """
+    if not (np.shape(high) == np.shape(low) == np.shape(close)):
+        raise ValueError("high, low and close must have the same length")
+    atr = _kernel(_wilder_atr_loop)(
+        _as_series_rows(high), _as_series_rows(low), _as_series_rows(close), _pandas_alpha(period), int(period)
+    )
+    return _from_series_rows(atr, close)
+
+
+def _as_series_rows(values: Any) -> np.ndarray:
+    """1-D series or 2-D dates x symbols panel -> C-contiguous (series, bars) rows."""
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim == 1:
+        return np.ascontiguousarray(array[None, :])
+    if array.ndim == 2:
+        return np.ascontiguousarray(array.T)
+    raise ValueError(f"Expected a 1-D series or 2-D (dates x symbols) panel, got {array.ndim}-D")
+
+
+def _from_series_rows(rows: np.ndarray, like: Any) -> np.ndarray:
+    return np.asarray(rows[0] if np.ndim(like) == 1 else rows.T, dtype=np.float64)
+
+
+def _window_args(window: int, min_periods: Any) -> Any:
+    if window <= 0:
+        raise ValueError(f"window ({window}) must be > 0")
+    min_periods = window if min_periods is None else int(min_periods)
+    if not 0 <= min_periods <= window:
+        raise ValueError(f"min_periods ({min_periods}) must be between 0 and window ({window})")
+    return int(window), min_periods
+
+
+def _rolling_sum_loop(rows: np.ndarray, window: int, min_periods: int, mean: bool) -> np.ndarray:
+    n_series, n = rows.shape
+    out = np.empty((n_series, n))
+    for r in range(n_series):
+        values = rows[r]
+        nobs = 0
+        neg_ct = 0
+        sum_x = 0.0
+        comp_add = 0.0
+        comp_remove = 0.0
+        same_run = 0
+        prev_value = values[0] if n > 0 else np.nan
+        for i in range(n):
+            if window == 1:  # pandas restarts every window that shares no bar with the previous one
+                nobs = 0
+                neg_ct = 0
+                sum_x = 0.0
+                comp_add = 0.0
+                comp_remove = 0.0
+                same_run = 0
+                prev_value = values[i]
+            elif i >= window:
+                old = values[i - window]
+                if old == old:
+                    nobs -= 1
+                    y = -old - comp_remove
+                    t = sum_x + y
+                    comp_remove = t - sum_x - y
+                    sum_x = t
+                    if math.copysign(1.0, old) < 0:
+                        neg_ct -= 1
+            val = values[i]
+            if val == val:
+                nobs += 1
+                y = val - comp_add
+                t = sum_x + y
+                comp_add = t - sum_x - y
+                sum_x = t
+                if math.copysign(1.0, val) < 0:
+                    neg_ct += 1
+                if val == prev_value:
+                    same_run += 1
+                else:
+                    same_run = 1
+                prev_value = val
+
+            if mean:
+                if nobs >= min_periods and nobs > 0:
+                    result = sum_x / nobs
+                    if same_run >= nobs:  # A constant window returns the constant exactly
+                        result = prev_value
+                    elif neg_ct == 0 and result < 0:
+                        result = 0.0
+                    elif neg_ct == nobs and result > 0:
+                        result = 0.0
+                else:
+                    result = np.nan
+            elif nobs == 0 and min_periods == 0:
+                result = 0.0
+            elif nobs >= min_periods:
+                result = prev_value * nobs if same_run >= nobs else sum_x
+            else:
+                result = np.nan
+            out[r, i] = result
+    return out
+
+
+def _rolling_var_loop(rows: np.ndarray, window: int, min_periods: int, ddof: int) -> np.ndarray:
+    n_series, n = rows.shape
+    out = np.empty((n_series, n))
+    for r in range(n_series):
+        values = rows[r]
+        nobs = 0.0
+        mean_x = 0.0
+        ssqdm_x = 0.0
+        comp_add = 0.0
+        comp_remove = 0.0
+        same_run = 0
+        prev_value = values[0] if n > 0 else np.nan
+        for i in range(n):
+            if window == 1:
+                nobs = 0.0
+                mean_x = 0.0
+                ssqdm_x = 0.0
+                comp_add = 0.0
+                comp_remove = 0.0
+                same_run = 0
+                prev_value = values[i]
+            elif i >= window:
+                old = values[i - window]
+                if old == old:  # Welford removal with Kahan-compensated mean
+                    nobs -= 1
+                    if nobs:
+                        prev_mean = mean_x - comp_remove
+                        y = old - comp_remove
+                        t = y - mean_x
+                        comp_remove = t + mean_x - y
+                        mean_x = mean_x - t / nobs
+                        ssqdm_x = ssqdm_x - (old - prev_mean) * (old - mean_x)
+                    else:
+                        mean_x = 0.0
+                        ssqdm_x = 0.0
+            val = values[i]
+            if val == val:
+                if val == prev_value:
+                    same_run += 1
+                else:
+                    same_run = 1
+                prev_value = val
+                nobs += 1
+                prev_mean = mean_x - comp_add
+                y = val - comp_add
+                t = y - mean_x
+                comp_add = t + mean_x - y
+                mean_x = mean_x + t / nobs
+                ssqdm_x = ssqdm_x + (val - prev_mean) * (val - mean_x)
+
+            if nobs >= min_periods and nobs > ddof:
+                if nobs == 1 or same_run >= nobs:
+                    out[r, i] = 0.0
+                else:
+                    out[r, i] = ssqdm_x / (nobs - ddof)
+            else:
+                out[r, i] = np.nan
+    return out
+
+
+def _rolling_extreme_loop(rows: np.ndarray, window: int, min_periods: int, is_max: bool) -> np.ndarray:
+    n_series, n = rows.shape
+    out = np.empty((n_series, n))
+    deque = np.empty(n, dtype=np.int64)  # Window positions whose values decrease (max) from head to tail
+    for r in range(n_series):
+        values = rows[r]
+        head = 0
+        tail = 0
+        nobs = 0
+        for i in range(n):
+            if i >= window and values[i - window] == values[i - window]:
+                nobs -= 1
+            if head < tail and deque[head] <= i - window:
+                head += 1
+            val = values[i]
+            if val == val:
+                nobs += 1
+                if is_max:
+                    while head < tail and values[deque[tail - 1]] <= val:
+                        tail -= 1
+                else:
+                    while head < tail and values[deque[tail - 1]] >= val:
+                        tail -= 1
+                deque[tail] = i
+                tail += 1
+            if head < tail and nobs >= min_periods and nobs > 0:
+                out[r, i] = values[deque[head]]
+            else:
+                out[r, i] = np.nan
+    return out
+
+
+def _running_max_loop(rows: np.ndarray, reset: np.ndarray) -> np.ndarray:
+    n_series, n = rows.shape
+    out = np.empty((n_series, n))
+    for r in range(n_series):
+        peak = np.nan
+        for i in range(n):
+            if reset[r, i]:
+                peak = np.nan
+            val = rows[r, i]
+            if val == val and not val <= peak:  # Also true while peak is still NaN
+                peak = val
+            out[r, i] = peak
+    return out
+
+
+def rolling_sum(values: Any, window: int, min_periods: Any = None) -> np.ndarray:
+    """``rolling(window, min_periods).sum()`` of a series or of every panel column."""
+    window, min_periods = _window_args(window, min_periods)
+    return _from_series_rows(_kernel(_rolling_sum_loop)(_as_series_rows(values), window, min_periods, False), values)
+
+
+def rolling_mean(values: Any, window: int, min_periods: Any = None) -> np.ndarray:
+    """``rolling(window, min_periods).mean()`` of a series or of every panel column."""
+    window, min_periods = _window_args(window, min_periods)
+    return _from_series_rows(_kernel(_rolling_sum_loop)(_as_series_rows(values), window, min_periods, True), values)
+
+
+def rolling_std(values: Any, window: int, min_periods: Any = None, ddof: int = 1) -> np.ndarray:
+    """``rolling(window, min_periods).std(ddof)`` of a series or of every panel column."""
+    window, min_periods = _window_args(window, min_periods)
+    variance = _kernel(_rolling_var_loop)(_as_series_rows(values), window, min_periods, int(ddof))
+    return _from_series_rows(np.sqrt(np.maximum(variance, 0.0)), values)
+
+
+def rolling_max(values: Any, window: int, min_periods: Any = None) -> np.ndarray:
+    """``rolling(window, min_periods).max()`` in O(n) with a monotonic deque."""
+    window, min_periods = _window_args(window, min_periods)
+    return _from_series_rows(_kernel(_rolling_extreme_loop)(_as_series_rows(values), window, min_periods, True), values)
+
+
+def rolling_min(values: Any, window: int, min_periods: Any = None) -> np.ndarray:
+    """``rolling(window, min_periods).min()`` in O(n) with a monotonic deque."""
+    window, min_periods = _window_args(window, min_periods)
+    return _from_series_rows(_kernel(_rolling_extreme_loop)(_as_series_rows(values), window, min_periods, False), values)
+
+
+def running_max(values: Any, reset: Any = None) -> np.ndarray:
+    """Highest value since the last reset bar (``expanding().max()`` when ``reset`` is None).
+
+    Args:
+        values: Series or panel, e.g. closes for a trailing stop's high-water mark
+        reset: Optional boolean mask of the same shape; the running max restarts
+            on each True bar (e.g. at every entry), starting from that bar's value
+    """
+    rows = _as_series_rows(values)
+    if reset is None:
+        reset_rows = np.zeros(rows.shape, dtype=np.bool_)
+    else:
+        reset_rows = np.ascontiguousarray(_as_series_rows(reset) != 0)
+        if reset_rows.shape != rows.shape:
+            raise ValueError("reset must have the same shape as values")
+    return _from_series_rows(_kernel(_running_max_loop)(rows, reset_rows), values)
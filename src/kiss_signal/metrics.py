@@ -0,0 +1,120 @@
+"""Metrics - Strategy performance metrics from raw vectorbt arrays.
+
+The backtester scores every simulated portfolio by trade count, win rate, mean
+trade return, Sharpe ratio and edge score. Asking the portfolio for each of
+these builds vectorbt's mapped arrays, masks and (for ``records_readable``) a
+whole DataFrame per call. Here they are computed together from the trade
+records structured array (``portfolio.trades.values``) and the portfolio's
+returns array.
+
+Arrays may be 1-D (one column) or 2-D (dates x columns, as produced by a
+multi-column portfolio); every metric comes back as an array with one value
+per column. Results match vectorbt's ``trades.count()``, ``trades.win_rate()``,
+``trades.returns.mean()`` and ``sharpe_ratio()`` (risk-free rate 0, ``ddof=1``),
+except that undefined values are reported as 0.0: a column without trades has
+a 0.0 win rate and mean return, and a NaN or infinite Sharpe ratio is 0.0.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+import numpy as np
+
+from .config import EdgeScoreWeights
+
+if TYPE_CHECKING:
+    import vectorbt as vbt
+
+__all__ = ["trade_metrics", "portfolio_metrics", "column_metrics"]
+
+logger = logging.getLogger(__name__)
+
+
+def _sharpe(returns: np.ndarray, ann_factor: float) -> np.ndarray:
+    """Annualized Sharpe ratio of each column, NaN-aware like vectorbt's sharpe_ratio_nb."""
+    if returns.shape[0] < 2 or not np.isfinite(ann_factor):
+        return np.full(returns.shape[1], np.nan)
+    valid = ~np.isnan(returns)
+    count = valid.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(valid, returns, 0.0).sum(axis=0) / count
+        deviations = np.where(valid, returns - mean, 0.0)
+        std = np.sqrt((deviations * deviations).sum(axis=0) / (count - 1))
+        sharpe = mean / std * np.sqrt(ann_factor)
+    return np.where(std == 0.0, np.inf, sharpe)
+
+
+def trade_metrics(
+    records: np.ndarray,
+    returns: Any,
+    ann_factor: float,
+    edge_score_weights: EdgeScoreWeights,
+    symbol: Optional[str] = None,
+) -> Dict[str, np.ndarray]:
+    """Computes per-column performance metrics in one vectorized pass.
+
+    Args:
+        records: Trade records structured array with at least the ``col``,
+            ``pnl`` and ``return`` fields (vectorbt's ``trades.values``)
+        returns: Portfolio returns, 1-D or 2-D (dates x columns)
+        ann_factor: Periods per year used to annualize the Sharpe ratio;
+            NaN when the portfolio has no usable frequency
+        edge_score_weights: Weights of win rate and Sharpe in the edge score
+        symbol: Optional symbol named in the zero-volatility warning
+
+    Returns:
+        Dict of ``total_trades``, ``win_pct``, ``avg_return`` (mean trade
+        return in percent), ``sharpe`` and ``edge_score`` arrays, one value per column
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.ndim == 1:
+        returns = returns[:, None]
+    n_columns = returns.shape[1]
+
+    columns = records["col"]
+    total_trades = np.bincount(columns, minlength=n_columns)
+    wins = np.bincount(columns, weights=records["pnl"] > 0.0, minlength=n_columns)
+    trade_returns = records["return"]
+    known = ~np.isnan(trade_returns)
+    return_sums = np.bincount(columns[known], weights=trade_returns[known], minlength=n_columns)
+    return_counts = np.bincount(columns[known], minlength=n_columns)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        win_pct = np.where(total_trades > 0, wins / total_trades, 0.0)
+        avg_return = np.where(return_counts > 0, return_sums / return_counts * 100, 0.0)
+
+    sharpe = _sharpe(returns, ann_factor)
+    if np.isinf(sharpe).any():
+        logger.warning(
+            f"Sharpe ratio for {symbol or 'portfolio'} is 'inf' due to zero volatility of returns. "
+            f"This is common with few trades. Setting to 0.0 for calculations."
+        )
+    sharpe = np.where(np.isfinite(sharpe), sharpe, 0.0)
+
+    return {
+        "total_trades": total_trades,
+        "win_pct": win_pct,
+        "avg_return": avg_return,
+        "sharpe": sharpe,
+        "edge_score": win_pct * edge_score_weights.win_pct + sharpe * edge_score_weights.sharpe,
+    }
+
+
+def portfolio_metrics(
+    portfolio: "vbt.Portfolio", edge_score_weights: EdgeScoreWeights, symbol: Optional[str] = None
+) -> Dict[str, np.ndarray]:
+    """trade_metrics of a vectorbt portfolio, read from its raw arrays."""
+    try:
+        ann_factor = portfolio.returns_acc.ann_factor
+    except Exception:
+        ann_factor = np.nan  # No usable frequency: Sharpe falls back to 0.0, as vectorbt would fail
+    return trade_metrics(
+        portfolio.trades.values, portfolio.returns().values, ann_factor, edge_score_weights, symbol
+    )
+
+
+def column_metrics(metrics: Dict[str, np.ndarray], column: int = 0) -> Dict[str, Any]:
+    """One column of trade_metrics as plain Python numbers, for result dicts."""
+    return {
+        key: int(values[column]) if key == "total_trades" else float(values[column])
+        for key, values in metrics.items()
+    }
@@ -1,21 +1,179 @@
 """Performance monitoring and profiling utilities for KISS Signal CLI."""
 
-__all__ = ["performance_monitor"]
+__all__ = ["performance_monitor", "HierarchicalProfiler", "peak_memory_mb"]
 
+import sys
+import threading
 import time
+import json
 import logging
 import functools
-from typing import Dict, Any, Callable
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import ContextManager, Dict, Any, Callable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 
 logger = logging.getLogger(__name__)
 
 @dataclass
 class PerformanceMetrics:
-    """Container for performance metrics."""
+    """Container for performance metrics, accumulated over every call of a name."""
     duration: float
     function_name: str
+    calls: int = 1
+    last_duration: float = 0.0
+
+# Shared no-op context returned by spans while profiling is disabled
+_NULL_SPAN: ContextManager[None] = nullcontext()
+
+
+def peak_memory_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB, or None if unavailable."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class HierarchicalProfiler:
+    """Nested span timer for hot paths (run -> symbol -> window -> rule -> simulate).
+
+    Spans are timed with perf_counter_ns and aggregated per name (count, total,
+    p50/p95/max) and per call path (self time, for collapsed-stack flame graphs).
+    Optional tracemalloc tracking records the peak memory allocated inside each
+    span. While disabled, span() returns a shared no-op context manager.
+
+    The open-span stack is per thread, so spans from worker threads nest under
+    their own thread's spans; the aggregates are shared under a lock.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.trace_memory = False
+        self._owns_tracemalloc = False
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all recorded spans."""
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._durations: Dict[str, List[int]] = defaultdict(list)
+        self._self_ns_by_path: Dict[Tuple[str, ...], int] = defaultdict(int)
+        self._peak_bytes: Dict[str, int] = {}
+
+    def enable(self, trace_memory: bool = False) -> None:
+        """Start recording spans, optionally with tracemalloc peak memory."""
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    def disable(self) -> None:
+        """Stop recording spans; recorded statistics are kept."""
+        self.enabled = False
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        self.trace_memory = False
+
+    def span(self, name: str) -> ContextManager[None]:
+        """Time a block as a child of the currently open span."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name)
+
+    def _thread_stacks(self) -> Tuple[List[str], List[int], List[int]]:
+        """This thread's (open span names, child time per span, child peak per span)."""
+        local = self._local
+        if not hasattr(local, 'stack'):
+            local.stack, local.child_ns, local.child_peak = [], [], []
+        return local.stack, local.child_ns, local.child_peak
+
+    @contextmanager
+    def _span(self, name: str) -> Iterator[None]:
+        stack, child_ns, child_peak = self._thread_stacks()
+        stack.append(name)
+        path = tuple(stack)
+        child_ns.append(0)
+        trace_memory = self.trace_memory and tracemalloc.is_tracing()
+        if trace_memory:
+            start_bytes, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            child_peak.append(0)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            children = child_ns.pop()
+            if child_ns:
+                child_ns[-1] += elapsed
+            peak = None
+            if trace_memory:
+                # reset_peak() in nested spans hides their peaks from us, so
+                # children report their absolute peak back up the stack
+                _, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, child_peak.pop())
+                if child_peak:
+                    child_peak[-1] = max(child_peak[-1], peak)
+            with self._lock:
+                self._self_ns_by_path[path] += elapsed - children
+                self._durations[name].append(elapsed)
+                if peak is not None:
+                    self._peak_bytes[name] = max(self._peak_bytes.get(name, 0), peak - start_bytes)
+            stack.pop()
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-span-name statistics in milliseconds (and KiB when memory was traced)."""
+        import numpy as np  # Deferred: only profiling reports need it, not CLI startup
+
+        stats: Dict[str, Dict[str, float]] = {}
+        for name, durations in self._durations.items():
+            values = np.asarray(durations, dtype=np.float64) / 1e6
+            entry = {
+                'count': int(values.size),
+                'total_ms': float(values.sum()),
+                'mean_ms': float(values.mean()),
+                'p50_ms': float(np.percentile(values, 50)),
+                'p95_ms': float(np.percentile(values, 95)),
+                'max_ms': float(values.max()),
+            }
+            if name in self._peak_bytes:
+                entry['peak_memory_kb'] = self._peak_bytes[name] / 1024
+            stats[name] = entry
+        return stats
+
+    def export_json(self, path: Path) -> Path:
+        """Write per-name statistics and per-path self times as JSON."""
+        payload = {
+            'spans': self.get_stats(),
+            'paths': {';'.join(p): ns / 1e6 for p, ns in sorted(self._self_ns_by_path.items())},
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(payload, indent=2), encoding='utf-8')
+        return path
+
+    def export_collapsed(self, path: Path) -> Path:
+        """Write self time per call path in collapsed-stack format (microseconds).
+
+        Each line is ``run;symbol;window <us>``, the input format of flamegraph.pl
+        and speedscope.
+        """
+        lines = [
+            f"{';'.join(p)} {ns // 1000}"
+            for p, ns in sorted(self._self_ns_by_path.items())
+            if ns >= 1000
+        ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('\n'.join(lines) + ('\n' if lines else ''), encoding='utf-8')
+        return path
+
 
 class PerformanceMonitor:
     """Monitors and profiles performance of code blocks and functions."""
@@ -24,21 +182,51 @@ class PerformanceMonitor:
         self.thresholds = {
             'duration_warning': 30.0,  # seconds
         }
+        self.profiler = HierarchicalProfiler()
+        self.reset_run_stats()
+    
+    def reset_run_stats(self) -> None:
+        """Clear per-run stage timings and counters."""
+        self.stage_durations: Dict[str, float] = defaultdict(float)
+        self.counters: Dict[str, int] = defaultdict(int)
     
     @contextmanager
-    def monitor_execution(self, name: str) -> Any:
-        """Context manager for monitoring code execution."""
-        start_time = time.time()
+    def stage(self, name: str) -> Iterator[None]:
+        """Accumulate wall time (seconds) spent in a pipeline stage across calls."""
+        start = time.perf_counter()
         try:
             yield
         finally:
-            duration = time.time() - start_time
-            metrics = PerformanceMetrics(
-                duration=duration,
-                function_name=name,
-            )
-            self.metrics[name] = metrics
-            self._check_thresholds(metrics)
+            self.stage_durations[name] += time.perf_counter() - start
+    
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Add to a per-run counter (cache hits, rows written, ...)."""
+        self.counters[name] += amount
+    
+    def span(self, name: str) -> ContextManager[None]:
+        """Nested hot-path span; a no-op unless the profiler is enabled."""
+        return self.profiler.span(name)
+    
+    @contextmanager
+    def monitor_execution(self, name: str) -> Any:
+        """Context manager for monitoring code execution.
+
+        Repeated calls of the same name add up in ``duration`` and ``calls``;
+        ``last_duration`` keeps the most recent call alone.
+        """
+        start_time = time.perf_counter()
+        try:
+            with self.profiler.span(name):
+                yield
+        finally:
+            duration = time.perf_counter() - start_time
+            metrics = self.metrics.get(name)
+            if metrics is None:
+                metrics = self.metrics[name] = PerformanceMetrics(duration=0.0, function_name=name, calls=0)
+            metrics.duration += duration
+            metrics.calls += 1
+            metrics.last_duration = duration
+            self._check_thresholds(name, duration)
             logger.info(f"{name} completed in {duration:.2f}s")
     
     def profile_performance(self, func: Callable[..., Any]) -> Callable[..., Any]:
@@ -49,10 +237,10 @@ class PerformanceMonitor:
                 return func(*args, **kwargs)
         return wrapper
 
-    def _check_thresholds(self, metrics: PerformanceMetrics) -> None:
-        if metrics.duration > self.thresholds['duration_warning']:
-            logger.warning(f"{metrics.function_name} exceeded duration threshold: "
-                          f"{metrics.duration:.2f}s > {self.thresholds['duration_warning']}s")
+    def _check_thresholds(self, name: str, duration: float) -> None:
+        if duration > self.thresholds['duration_warning']:
+            logger.warning(f"{name} exceeded duration threshold: "
+                          f"{duration:.2f}s > {self.thresholds['duration_warning']}s")
     
     def get_summary(self) -> Dict[str, Any]:
         """Get performance summary."""
@@ -2,7 +2,7 @@
 """SQLite persistence layer for storing backtesting results and trading signals."""
 
 from pathlib import Path  # Standard library
-from typing import List, Dict, Any, Optional, TYPE_CHECKING, Union
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple, TYPE_CHECKING, Union
 import sqlite3
 import json
 import logging
@@ -11,6 +11,7 @@ import shutil
 from datetime import datetime, date
 
 from .config import get_active_strategy_combinations
+from .performance import performance_monitor
 
 if TYPE_CHECKING:
     from .config import RulesConfig, Config, RuleDef
@@ -29,6 +30,19 @@ __all__ = [
     "clear_strategies_for_config",
     "clean_duplicate_strategies",
     "clear_current_strategies",
+    "get_indicator_states",
+    "save_indicator_states",
+    "save_run_metrics",
+    "get_run_metrics",
+    "mark_symbol_complete",
+    "get_resumable_run",
+    "get_run_strategies",
+    "iter_run_strategies",
+    "clear_run_progress",
+    "get_walk_forward_windows",
+    "save_walk_forward_windows",
+    "get_signal_cache",
+    "save_signal_cache",
 ]
 
 logger = logging.getLogger(__name__)
@@ -73,6 +87,83 @@ CREATE TABLE IF NOT EXISTS positions (
 );
 """
 
+CREATE_INDICATOR_STATE_TABLE = """
+CREATE TABLE IF NOT EXISTS indicator_state (
+    symbol TEXT NOT NULL,
+    indicator_key TEXT NOT NULL,
+    state TEXT NOT NULL,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (symbol, indicator_key)
+);
+"""
+
+CREATE_RUN_METRICS_TABLE = """
+CREATE TABLE IF NOT EXISTS run_metrics (
+    run_timestamp TEXT PRIMARY KEY,
+    command TEXT NOT NULL,
+    config_hash TEXT,
+    total_duration REAL,
+    refresh_duration REAL,
+    load_duration REAL,
+    backtest_duration REAL,
+    persist_duration REAL,
+    report_duration REAL,
+    symbols_total INTEGER,
+    symbols_processed INTEGER,
+    cache_hits INTEGER,
+    cache_misses INTEGER,
+    db_rows_written INTEGER,
+    peak_memory_mb REAL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+CREATE_RUN_PROGRESS_TABLE = """
+CREATE TABLE IF NOT EXISTS run_progress (
+    run_timestamp TEXT NOT NULL,
+    config_hash TEXT NOT NULL,
+    freeze_date TEXT,
+    symbol TEXT NOT NULL,
+    strategies_found INTEGER NOT NULL,
+    completed_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (run_timestamp, symbol)
+);
+"""
+
+CREATE_WALK_FORWARD_WINDOWS_TABLE = """
+CREATE TABLE IF NOT EXISTS walk_forward_windows (
+    symbol TEXT NOT NULL,
+    config_hash TEXT NOT NULL,
+    window_key TEXT NOT NULL,
+    training_start TEXT NOT NULL,
+    oos_test_start TEXT NOT NULL,
+    oos_test_end TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (symbol, config_hash, window_key)
+);
+"""
+
+CREATE_SIGNAL_CACHE_TABLE = """
+CREATE TABLE IF NOT EXISTS signal_cache (
+    symbol TEXT NOT NULL,
+    signal_key TEXT NOT NULL,
+    data_hash TEXT NOT NULL,
+    first_date TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    bits BLOB NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (symbol, signal_key, data_hash)
+);
+"""
+
+# Columns written by save_run_metrics, in table order (created_at is defaulted)
+RUN_METRICS_COLUMNS = (
+    "run_timestamp", "command", "config_hash", "total_duration",
+    "refresh_duration", "load_duration", "backtest_duration", "persist_duration", "report_duration",
+    "symbols_total", "symbols_processed", "cache_hits", "cache_misses", "db_rows_written", "peak_memory_mb",
+)
+
 CREATE_INDEX_STRATEGIES = """
 CREATE INDEX IF NOT EXISTS idx_strategies_symbol_timestamp 
 ON strategies(symbol, run_timestamp);
@@ -137,6 +228,26 @@ def create_database(db_path: Path) -> None:
             conn.execute(CREATE_POSITIONS_TABLE)
             logger.debug("Created positions table")
             
+            # Create incremental indicator state table for open-position monitoring
+            conn.execute(CREATE_INDICATOR_STATE_TABLE)
+            logger.debug("Created indicator_state table")
+            
+            # Create per-window walk-forward results
+            conn.execute(CREATE_WALK_FORWARD_WINDOWS_TABLE)
+            logger.debug("Created walk_forward_windows table")
+            
+            # Create bit-packed rule signal cache
+            conn.execute(CREATE_SIGNAL_CACHE_TABLE)
+            logger.debug("Created signal_cache table")
+            
+            # Create per-symbol checkpoints for resumable runs
+            conn.execute(CREATE_RUN_PROGRESS_TABLE)
+            logger.debug("Created run_progress table")
+            
+            # Create per-run performance ledger
+            conn.execute(CREATE_RUN_METRICS_TABLE)
+            logger.debug("Created run_metrics table")
+            
             # Create index for strategies table
             conn.execute(CREATE_INDEX_STRATEGIES)
             logger.debug("Created index on strategies table")
@@ -182,6 +293,7 @@ def add_new_positions_from_signals(db_path: Path, signals: List[Dict[str, Any]])
             open_symbols = {
                 row[0] for row in cursor.execute("SELECT symbol FROM positions WHERE status = 'OPEN'").fetchall()
             }
+            inserted = 0
             
             for signal in signals:
                 symbol = signal['ticker']
@@ -208,9 +320,11 @@ def add_new_positions_from_signals(db_path: Path, signals: List[Dict[str, Any]])
                     signal['entry_price'],
                     rule_stack_json
                 ))
+                inserted += 1
                 logger.info(f"Added new OPEN position for {symbol} at {signal['entry_price']}.")
             
             cursor.execute("COMMIT")
+            performance_monitor.increment("db_rows_written", inserted)
         except sqlite3.Error as e:
             logger.error(f"Failed to add new positions: {e}")
             cursor.execute("ROLLBACK")
@@ -265,11 +379,213 @@ def close_positions_batch(db_path: Path, closed_positions: List[Dict[str, Any]])
                     pos['id']
                 ))
             cursor.execute("COMMIT")
+            performance_monitor.increment("db_rows_written", len(closed_positions))
             logger.info(f"Closed {len(closed_positions)} positions.")
         except sqlite3.Error as e:
             logger.error(f"Failed to close positions: {e}")
             cursor.execute("ROLLBACK")
 
+# impure
+def get_indicator_states(db_path: Path, symbols: List[str]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Loads persisted incremental indicator states as {symbol: {indicator_key: state}}."""
+    if not symbols or not db_path.exists():
+        return {}
+
+    placeholders = ",".join("?" for _ in symbols)
+    query = f"SELECT symbol, indicator_key, state FROM indicator_state WHERE symbol IN ({placeholders});"
+    states: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    try:
+        with sqlite3.connect(str(db_path)) as conn:
+            conn.execute(CREATE_INDICATOR_STATE_TABLE)
+            for symbol, indicator_key, state_json in conn.execute(query, list(symbols)):
+                try:
+                    states.setdefault(symbol, {})[indicator_key] = json.loads(state_json)
+                except json.JSONDecodeError:
+                    logger.warning(f"Discarding unreadable indicator state {indicator_key} for {symbol}")
+    except sqlite3.Error as e:
+        logger.error(f"Failed to load indicator states: {e}")
+        return {}
+    return states
+
+# impure
+def save_indicator_states(db_path: Path, states: Dict[str, Dict[str, Dict[str, Any]]]) -> None:
+    """Upserts incremental indicator states keyed by (symbol, indicator_key)."""
+    rows = [
+        (symbol, indicator_key, json.dumps(state))
+        for symbol, symbol_states in states.items()
+        for indicator_key, state in symbol_states.items()
+    ]
+    if not rows or not db_path.exists():
+        return
+
+    upsert_sql = """
+    INSERT INTO indicator_state (symbol, indicator_key, state, updated_at)
+    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(symbol, indicator_key) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at;
+    """
+    try:
+        with sqlite3.connect(str(db_path)) as conn:
+            conn.execute(CREATE_INDICATOR_STATE_TABLE)
+            conn.executemany(upsert_sql, rows)
+            conn.commit()
+        logger.debug(f"Saved {len(rows)} indicator states")
+    except sqlite3.Error as e:
+        logger.error(f"Failed to save indicator states: {e}")
+
+# impure
+def save_run_metrics(db_path: Path, metrics: Dict[str, Any]) -> bool:
+    """Records one run's stage timings and counters in the run_metrics ledger.
+
+    Args:
+        db_path: Path to the SQLite database file
+        metrics: Values keyed by RUN_METRICS_COLUMNS; missing keys are stored as NULL
+
+    Returns:
+        True if the row was written, False otherwise.
+    """
+    if not db_path.exists():
+        return False
+
+    insert_sql = f"""
+    INSERT OR REPLACE INTO run_metrics ({', '.join(RUN_METRICS_COLUMNS)})
+    VALUES ({', '.join('?' for _ in RUN_METRICS_COLUMNS)});
+    """
+    try:
+        with sqlite3.connect(str(db_path)) as conn:
+            conn.execute(CREATE_RUN_METRICS_TABLE)
+            conn.execute(insert_sql, [metrics.get(column) for column in RUN_METRICS_COLUMNS])
+            conn.commit()
+        logger.debug(f"Saved run metrics for {metrics.get('run_timestamp')}")
+        return True
+    except sqlite3.Error as e:
+        logger.error(f"Failed to save run metrics: {e}")
+        return False
+
+# impure
+def get_run_metrics(db_path: Path, limit: int = 10) -> List[Dict[str, Any]]:
+    """Fetches the most recent run_metrics rows, newest first."""
+    if not db_path.exists():
+        return []
+
+    query = "SELECT * FROM run_metrics ORDER BY run_timestamp DESC LIMIT ?;"
+    try:
+        with sqlite3.connect(str(db_path)) as conn:
+            conn.execute(CREATE_RUN_METRICS_TABLE)
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(query, (limit,)).fetchall()]
+    except sqlite3.Error as e:
+        logger.error(f"Failed to fetch run metrics: {e}")
+        return []
+
+# impure
+def get_walk_forward_windows(db_path: Path, symbol: str, config_hash: str) -> List[Dict[str, str]]:
+    """Loads stored walk-forward windows of (symbol, config_hash), oldest first.
+
+    Each row has window_key, training_start, oos_test_start, oos_test_end and
+    the window's OOS result as JSON.
+    """
+    if not db_path.exists():
+        return []
+
+    query = """
+    SELECT window_key, training_start, oos_test_start, oos_test_end, result
+    FROM walk_forward_windows
+    WHERE symbol = ? AND config_hash = ?
+    ORDER BY training_start;
+    """
+    try:
+        with sqlite3.connect(str(db_path)) as conn:
+            conn.execute(CREATE_WALK_FORWARD_WINDOWS_TABLE)
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(query, (symbol, config_hash)).fetchall()]
+    except sqlite3.Error as e:
+        logger.error(f"Failed to load walk-forward windows for {symbol}: {e}")
+        return []
+
+# impure
+def save_walk_forward_windows(
+    db_path: Path, symbol: str, config_hash: str, windows: List[Dict[str, str]]
+) -> None:
+    """Replaces the stored walk-forward windows of (symbol, config_hash) with ``windows``.
+
+    Windows not in ``windows`` were not needed by the latest run (they left the
+    history or their data was revised), so they are dropped to keep the table bounded.
+    """
+    if not db_path.exists():
+        return
+
+    try:
+        with sqlite3.connect(str(db_path)) as conn:
+            conn.execute(CREATE_WALK_FORWARD_WINDOWS_TABLE)
+            conn.execute(
+                "DELETE FROM walk_forward_windows WHERE symbol = ? AND config_hash = ?;", (symbol, config_hash)
+            )
+            conn.executemany(
+                """
+                INSERT INTO walk_forward_windows (
+                    symbol, config_hash, window_key, training_start, oos_test_start, oos_test_end, result
+                ) VALUES (?, ?, ?, ?, ?, ?, ?);
+                """,
+                [
+                    (symbol, config_hash, w["window_key"], w["training_start"],
+                     w["oos_test_start"], w["oos_test_end"], w["result"])
+                    for w in windows
+                ],
+            )
+            conn.commit()
+        logger.debug(f"Stored {len(windows)} walk-forward windows for {symbol}")
+    except sqlite3.Error as e:
+        logger.error(f"Failed to save walk-forward windows for {symbol}: {e}")
+
+# impure
+def get_signal_cache(db_path: Path, symbol: str) -> List[Dict[str, Any]]:
+    """Loads the stored rule signals of a symbol.
+
+    Each row has signal_key, data_hash, first_date, length and the bit-packed
+    signals as bytes.
+    """
+    if not db_path.exists():
+        return []
+
+    query = """
+    SELECT signal_key, data_hash, first_date, length, bits
+    FROM signal_cache
+    WHERE symbol = ?;
+    """
+    try:
+        with sqlite3.connect(str(db_path)) as conn:
+            conn.execute(CREATE_SIGNAL_CACHE_TABLE)
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(query, (symbol,)).fetchall()]
+    except sqlite3.Error as e:
+        logger.error(f"Failed to load cached signals for {symbol}: {e}")
+        return []
+
+# impure
+def save_signal_cache(db_path: Path, symbol: str, rows: List[Dict[str, Any]]) -> None:
+    """Replaces the stored rule signals of a symbol with ``rows``."""
+    if not db_path.exists():
+        return
+
+    try:
+        with sqlite3.connect(str(db_path)) as conn:
+            conn.execute(CREATE_SIGNAL_CACHE_TABLE)
+            conn.execute("DELETE FROM signal_cache WHERE symbol = ?;", (symbol,))
+            conn.executemany(
+                """
+                INSERT INTO signal_cache (symbol, signal_key, data_hash, first_date, length, bits)
+                VALUES (?, ?, ?, ?, ?, ?);
+                """,
+                [
+                    (symbol, r["signal_key"], r["data_hash"], r["first_date"], int(r["length"]), bytes(r["bits"]))
+                    for r in rows
+                ],
+            )
+            conn.commit()
+        logger.debug(f"Stored {len(rows)} cached signal series for {symbol}")
+    except sqlite3.Error as e:
+        logger.error(f"Failed to save cached signals for {symbol}: {e}")
+
 # impure
 def save_strategies_batch(
     db_connection: Connection, 
@@ -291,7 +607,7 @@ def save_strategies_batch(
         True if successful, False if failed.
     """
     if not strategies:
-        logger.info("No strategies to save - skipping batch save")
+        logger.debug("No strategies to save - skipping batch save")
         return True
     
     logger.info(f"Saving {len(strategies)} strategies to the database.")
@@ -343,6 +659,7 @@ def save_strategies_batch(
             ))
         
         db_connection.commit()
+        performance_monitor.increment("db_rows_written", len(strategies))
         logger.info(f"Successfully saved {len(strategies)} strategies")
         return True
         
@@ -355,6 +672,104 @@ def save_strategies_batch(
         logger.error(f"Batch save failed: {e}")
         return False
 
+# impure
+def mark_symbol_complete(
+    db_connection: Connection,
+    run_timestamp: str,
+    config_hash: str,
+    symbol: str,
+    strategies_found: int,
+    freeze_date: Optional[str] = None,
+) -> None:
+    """Checkpoints a symbol whose strategies are saved so a resumed run skips it."""
+    progress_sql = """
+    INSERT OR REPLACE INTO run_progress (run_timestamp, config_hash, freeze_date, symbol, strategies_found)
+    VALUES (?, ?, ?, ?, ?);
+    """
+    try:
+        db_connection.execute(CREATE_RUN_PROGRESS_TABLE)
+        db_connection.execute(progress_sql, (run_timestamp, config_hash, freeze_date, symbol, strategies_found))
+        db_connection.commit()
+    except sqlite3.Error as e:
+        logger.error(f"Failed to checkpoint {symbol}: {e}")
+
+# impure
+def get_resumable_run(
+    db_connection: Connection, config_hash: str, freeze_date: Optional[str] = None
+) -> Optional[Tuple[str, Set[str]]]:
+    """Finds the latest unfinished run for this configuration.
+
+    Returns:
+        (run_timestamp, completed symbols), or None if there is nothing to resume.
+    """
+    try:
+        db_connection.execute(CREATE_RUN_PROGRESS_TABLE)
+        row = db_connection.execute(
+            "SELECT MAX(run_timestamp) FROM run_progress WHERE config_hash = ? AND freeze_date IS ?;",
+            (config_hash, freeze_date),
+        ).fetchone()
+        if not row or row[0] is None:
+            return None
+        run_timestamp = row[0]
+        symbols = {
+            symbol for (symbol,) in db_connection.execute(
+                "SELECT symbol FROM run_progress WHERE run_timestamp = ?;", (run_timestamp,)
+            )
+        }
+        return run_timestamp, symbols
+    except sqlite3.Error as e:
+        logger.error(f"Failed to read run progress: {e}")
+        return None
+
+# impure
+def get_run_strategies(db_connection: Connection, run_timestamp: str, symbols: Set[str]) -> List[Dict[str, Any]]:
+    """Loads strategies checkpointed for a run, restricted to ``symbols``."""
+    if not symbols:
+        return []
+    return list(iter_run_strategies(db_connection, run_timestamp, symbols))
+
+
+def iter_run_strategies(
+    db_connection: Connection, run_timestamp: str, symbols: Optional[Set[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Yields a run's checkpointed strategies ordered by symbol, straight from the cursor.
+
+    Args:
+        db_connection: An active SQLite database connection
+        run_timestamp: Timestamp the run saved its strategies under
+        symbols: Optional subset of symbols; None yields every symbol of the run
+    """
+    params: List[Any] = [run_timestamp]
+    symbol_filter = ""
+    if symbols is not None:
+        symbol_filter = f" AND symbol IN ({','.join('?' for _ in symbols)})"
+        params.extend(sorted(symbols))
+    query = f"""
+    SELECT symbol, rule_stack, edge_score, win_pct, sharpe, total_trades, avg_return
+    FROM strategies WHERE run_timestamp = ?{symbol_filter} ORDER BY symbol;
+    """
+    try:
+        cursor = db_connection.execute(query, params)
+    except sqlite3.Error as e:
+        logger.error(f"Failed to load strategies for run {run_timestamp}: {e}")
+        return
+    for symbol, rule_stack, edge_score, win_pct, sharpe, total_trades, avg_return in cursor:
+        yield {
+            "symbol": symbol, "rule_stack": json.loads(rule_stack), "edge_score": edge_score,
+            "win_pct": win_pct, "sharpe": sharpe, "total_trades": total_trades,
+            "avg_return": avg_return, "is_oos": True,  # Only walk-forward results are persisted
+        }
+
+# impure
+def clear_run_progress(db_connection: Connection, config_hash: str) -> None:
+    """Drops checkpoints for this configuration once its run has completed (or is restarted)."""
+    try:
+        db_connection.execute(CREATE_RUN_PROGRESS_TABLE)
+        db_connection.execute("DELETE FROM run_progress WHERE config_hash = ?;", (config_hash,))
+        db_connection.commit()
+    except sqlite3.Error as e:
+        logger.error(f"Failed to clear run progress: {e}")
+
 # impure
 def migrate_strategies_table_v2(db_path: Path) -> None:
     """Migrates the strategies table to version 2 by adding new columns.
@@ -0,0 +1,194 @@
+"""Pipeline - Streaming load → backtest → persist stages for the run command.
+
+The sequential run loads, backtests and saves one symbol at a time, so disk and
+network I/O never overlap with vectorbt's CPU work. ``run_pipeline`` runs the
+three stages concurrently instead:
+
+    loader thread ──queue──▶ process pool ──queue──▶ writer thread
+
+Both queues are bounded, so a slow stage applies backpressure upstream and at
+most a handful of price frames are in memory at once. The writer commits
+results in batches and the caller sees each result once, via ``on_result``;
+nothing is accumulated, so memory stays bounded however many items stream
+through. On Ctrl-C, pending backtests are cancelled, results that
+already finished are still written, and the interrupt is re-raised.
+"""
+
+import logging
+import multiprocessing as mp
+import queue
+import signal
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+__all__ = ["run_pipeline"]
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()  # End-of-stream marker passed through the queues
+_POLL_SECONDS = 0.2  # How often blocked stages re-check for cancellation
+
+
+def _put(target: "queue.Queue[Any]", item: Any, stop: threading.Event) -> bool:
+    """Blocking put that gives up once ``stop`` is set. Returns True if queued."""
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _load_stage(
+    items: Iterable[str],
+    load: Callable[[str], Any],
+    loaded: "queue.Queue[Any]",
+    stop: threading.Event,
+) -> None:
+    try:
+        for item in items:
+            if stop.is_set():
+                break
+            try:
+                payload = load(item)
+            except Exception as e:
+                logger.error(f"Failed to load {item}: {e}")
+                payload = None
+            if not _put(loaded, (item, payload), stop):
+                break
+    except Exception as e:
+        logger.error(f"Loader stage failed: {e}")
+    finally:
+        # After cancellation nobody reads the queue any more, so the marker may be dropped
+        _put(loaded, _DONE, stop)
+
+
+def _write_stage(
+    write: Callable[[List[Tuple[str, Any]]], None],
+    results: "queue.Queue[Any]",
+    batch_size: int,
+) -> None:
+    batch: List[Tuple[str, Any]] = []
+    while True:
+        entry = results.get()
+        if entry is not _DONE:
+            batch.append(entry)
+        if batch and (entry is _DONE or len(batch) >= batch_size):
+            try:
+                write(batch)
+            except Exception as e:
+                logger.error(f"Failed to write results for {[item for item, _ in batch]}: {e}")
+            batch = []
+        if entry is _DONE:
+            return
+
+
+def _init_worker(initializer: Optional[Callable[..., None]], initargs: Tuple[Any, ...]) -> None:
+    # Ctrl-C is handled once, by the parent; workers just stop receiving new work
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+# impure
+def run_pipeline(
+    items: Iterable[str],
+    load: Callable[[str], Any],
+    process: Callable[[str, Any], Any],
+    write: Callable[[List[Tuple[str, Any]]], None],
+    workers: int = 2,
+    max_pending: Optional[int] = None,
+    batch_size: int = 10,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Tuple[Any, ...] = (),
+    on_result: Optional[Callable[[str, Any], None]] = None,
+) -> int:
+    """Streams items through load (thread) → process (process pool) → write (thread).
+
+    Args:
+        items: Item keys (symbols); may be a lazy iterator consumed by the loader thread
+        load: ``load(item) -> payload``; I/O bound, runs in the loader thread
+        process: Picklable top-level ``process(item, payload) -> result``; runs in a worker process
+        write: ``write([(item, result), ...])``; runs in the writer thread, one call per batch
+        workers: Worker processes for ``process``
+        max_pending: Bound of each queue and of in-flight backtests (default ``2 * workers``)
+        batch_size: Results per ``write`` call
+        initializer: Optional worker initializer, e.g. to ship shared read-only data once per worker
+        initargs: Arguments for ``initializer``
+        on_result: ``on_result(item, result)``; called in the caller's thread as each
+            item finishes, for progress display and folding summaries
+
+    Returns:
+        Number of items whose processing succeeded. Items whose load or process
+        step raised are logged and left out; results are only handed to
+        ``write`` and ``on_result``, never retained.
+
+    Raises:
+        KeyboardInterrupt: Re-raised after cancelling pending work and writing
+            the results that had already finished.
+    """
+    max_pending = max_pending or 2 * workers
+    loaded: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+    finished: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+    succeeded = 0
+
+    loader = threading.Thread(target=_load_stage, args=(items, load, loaded, stop), name="pipeline-loader", daemon=True)
+    writer = threading.Thread(target=_write_stage, args=(write, finished, batch_size), name="pipeline-writer", daemon=True)
+    loader.start()
+    writer.start()
+
+    # Spawned workers avoid forking a process that already runs the stage threads
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=mp.get_context("spawn"),
+        initializer=_init_worker, initargs=(initializer, initargs),
+    )
+    in_flight: Dict[Future, str] = {}
+
+    def collect(done: Set[Future]) -> None:
+        nonlocal succeeded
+        for future in done:
+            item = in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Processing {item} failed: {e}")
+                continue
+            succeeded += 1
+            finished.put((item, result))  # Blocks while the writer is behind: backpressure
+            if on_result is not None:
+                on_result(item, result)
+
+    try:
+        source_done = False
+        while not source_done or in_flight:
+            if not source_done and len(in_flight) < max_pending:
+                try:
+                    entry = loaded.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    entry = None
+                if entry is _DONE:
+                    source_done = True
+                elif entry is not None:
+                    item, payload = entry
+                    in_flight[pool.submit(process, item, payload)] = item
+            if in_flight:
+                timeout = 0 if not source_done and len(in_flight) < max_pending else _POLL_SECONDS
+                done, _ = wait(list(in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+                collect(done)
+    except KeyboardInterrupt:
+        logger.warning("Pipeline interrupted; cancelling pending work")
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)  # Backtests already running are allowed to finish
+        collect({future for future in in_flight if future.done() and not future.cancelled()})
+        raise
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+        loader.join()
+        finished.put(_DONE)
+        writer.join()
+
+    return succeeded
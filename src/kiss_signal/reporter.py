@@ -7,16 +7,21 @@ containing business logic for processing positions and preparing data for report
 
 from pathlib import Path
 from datetime import date
-from typing import List, Dict, Any, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, List, Dict, Any, Iterable, Iterator, Optional, Sequence, TextIO, Tuple
+import csv
+import gzip
 import logging
 import sqlite3
 import json
-import pandas as pd
 from collections import defaultdict
 from io import StringIO
 
 from .config import Config
-from . import data, persistence
+from . import persistence
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +44,7 @@ def _get_validated_strategies_from_db(db_path: Path, run_timestamp: str, config:
     import sqlite3
     import json
     from datetime import date
+    from . import data
     
     strategies = []
     
@@ -60,21 +66,23 @@ def _get_validated_strategies_from_db(db_path: Path, run_timestamp: str, config:
                 ORDER BY s1.symbol
             """, (run_timestamp,))
             
-            for row in cursor.fetchall():
+            rows = cursor.fetchall()
+            
+            # One latest-bar index lookup for all candidate symbols
+            latest_bars = data.get_latest_bars(
+                list(dict.fromkeys(row['symbol'] for row in rows)),
+                Path(config.cache_dir),
+                freeze_date=config.freeze_date,
+            )
+            
+            for row in rows:
                 try:
-                    # Get current price for this symbol
-                    price_data = data.get_price_data(
-                        symbol=row['symbol'],
-                        cache_dir=Path(config.cache_dir),
-                        years=1,  # Just need recent data for current price
-                        freeze_date=config.freeze_date,
-                    )
-                    
-                    if price_data is None or len(price_data) == 0:
+                    latest_bar = latest_bars.get(row['symbol'])
+                    if latest_bar is None:
                         logger.warning(f"No price data available for {row['symbol']}, skipping")
                         continue
                     
-                    latest_close = float(price_data['close'].iloc[-1])
+                    latest_close = float(latest_bar['close'])
                     
                     # Parse rule stack from JSON
                     rule_stack_json = row['rule_stack']
@@ -114,7 +122,7 @@ def _get_validated_strategies_from_db(db_path: Path, run_timestamp: str, config:
 
 def check_exit_conditions(
     position: Dict[str, Any],
-    price_data: pd.DataFrame,
+    price_data: "pd.DataFrame",
     current_low: float,
     current_high: float,
     exit_conditions: List[Any],
@@ -196,20 +204,17 @@ def check_exit_conditions(
 
 
 def get_position_pricing(symbol: str, app_config: Config) -> Optional[Dict[str, float]]:
-    """Get current pricing data for a position."""
+    """Get current pricing data for a position from the latest-bar index."""
+    from . import data
     try:
-        price_data = data.get_price_data(
-            symbol=symbol,
-            cache_dir=Path(app_config.cache_dir),
-            years=1,  # Only need recent data for pricing
-            freeze_date=app_config.freeze_date,
-        )
+        latest = data.get_latest_bars(
+            [symbol], Path(app_config.cache_dir), freeze_date=app_config.freeze_date
+        ).get(symbol)
         
-        if price_data is None or len(price_data) == 0:
+        if latest is None:
             logger.warning(f"No price data available for {symbol}")
             return None
             
-        latest = price_data.iloc[-1]
         return {
             'current_price': float(latest['close']),
             'current_high': float(latest['high']),
@@ -220,8 +225,69 @@ def get_position_pricing(symbol: str, app_config: Config) -> Optional[Dict[str,
         return None
 
 
-def calculate_position_returns(position: Dict[str, Any], current_price: float, nifty_data: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+def calculate_benchmark_returns(
+    benchmark_data: Optional["pd.DataFrame"],
+    entry_dates: Sequence[Any],
+    eval_dates: Optional[Sequence[Any]] = None,
+) -> "np.ndarray":
+    """Calculate benchmark (e.g. NIFTY) % returns for many positions at once.
+
+    The entry bar is the first benchmark bar on or after each entry date, and the
+    evaluation bar is the last bar on or before each evaluation date (the latest bar
+    when eval_dates is None). All lookups are a single searchsorted over the index.
+
+    Args:
+        benchmark_data: Benchmark OHLCV data with a DatetimeIndex (or 'date' column)
+        entry_dates: Entry date per position
+        eval_dates: Optional evaluation date per position
+
+    Returns:
+        Float array of % returns aligned with entry_dates; NaN where unavailable
+    """
+    import numpy as np
+    import pandas as pd
+    n = len(entry_dates)
+    returns = np.full(n, np.nan)
+    if benchmark_data is None or n == 0 or benchmark_data.empty or 'close' not in benchmark_data.columns:
+        return returns
+
+    if not isinstance(benchmark_data.index, pd.DatetimeIndex) and 'date' in benchmark_data.columns:
+        bench_index = pd.DatetimeIndex(pd.to_datetime(benchmark_data['date'], format='mixed'))
+    else:
+        bench_index = pd.DatetimeIndex(benchmark_data.index)
+    closes = benchmark_data['close'].to_numpy(dtype=float)
+    last = len(closes) - 1
+
+    entries = pd.to_datetime(pd.Series(list(entry_dates), dtype=object), errors='coerce', format='mixed')
+    if eval_dates is None:
+        query = entries.to_numpy(dtype='datetime64[ns]')
+        positions = bench_index.values.searchsorted(query, side='left')
+        entry_idx, eval_idx = positions, np.full(n, last)
+    else:
+        evals = pd.to_datetime(pd.Series(list(eval_dates), dtype=object), errors='coerce', format='mixed')
+        query = np.concatenate([entries.to_numpy(dtype='datetime64[ns]'), evals.to_numpy(dtype='datetime64[ns]')])
+        # Entry uses the first bar >= date; evaluation uses the last bar <= date
+        positions = bench_index.values.searchsorted(query, side='left')
+        entry_idx = positions[:n]
+        eval_pos = positions[n:]
+        exact = (eval_pos <= last) & (bench_index.values[np.minimum(eval_pos, last)] == query[n:])
+        eval_idx = np.where(exact, eval_pos, eval_pos - 1)
+
+    valid = entries.notna().to_numpy() & (entry_idx <= last) & (eval_idx >= 0)
+    if not valid.any():
+        return returns
+
+    entry_close = closes[np.minimum(entry_idx, last)]
+    eval_close = closes[np.clip(eval_idx, 0, last)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct = (eval_close - entry_close) / entry_close * 100
+    returns[valid] = pct[valid]
+    return returns
+
+
+def calculate_position_returns(position: Dict[str, Any], current_price: float, nifty_data: Optional["pd.DataFrame"] = None) -> Dict[str, Any]:
     """Calculate returns for a position."""
+    import numpy as np
     entry_price = float(position['entry_price'])
     
     # Safety check for division by zero
@@ -235,12 +301,9 @@ def calculate_position_returns(position: Dict[str, Any], current_price: float, n
     nifty_return_pct = None
     if nifty_data is not None:
         try:
-            entry_date = pd.to_datetime(position['entry_date'])
-            nifty_entry_idx = nifty_data.index.searchsorted(entry_date)
-            if nifty_entry_idx < len(nifty_data):
-                nifty_entry_price = nifty_data.iloc[nifty_entry_idx]['close']
-                nifty_current_price = nifty_data.iloc[-1]['close']
-                nifty_return_pct = (nifty_current_price - nifty_entry_price) / nifty_entry_price * 100
+            benchmark = calculate_benchmark_returns(nifty_data, [position['entry_date']])[0]
+            if not np.isnan(benchmark):
+                nifty_return_pct = float(benchmark)
         except Exception as e:
             logger.debug(f"Could not calculate NIFTY return: {e}")
     
@@ -251,23 +314,345 @@ def calculate_position_returns(position: Dict[str, Any], current_price: float, n
     }
 
 
+def _condition_type_and_params(condition: Any) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Extract (type, params) from a RuleDef-like object or dict exit condition."""
+    if isinstance(condition, dict):
+        return condition.get('type'), condition.get('params', {})
+    return getattr(condition, 'type', None), getattr(condition, 'params', {})
+
+
+def evaluate_exit_conditions_batch(
+    positions: List[Dict[str, Any]],
+    price_frames: Dict[str, "pd.DataFrame"],
+    exit_conditions: List[Any],
+    days_held: Sequence[int],
+    hold_period: int,
+    indicator_states: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+    history_loader: Optional[Callable[[str], "pd.DataFrame"]] = None,
+) -> List[Optional[str]]:
+    """Batched counterpart of check_exit_conditions for many open positions.
+
+    Indicators are computed once per (symbol, rule params) from the symbol's history
+    and every position is then checked with vectorized array comparisons. Conditions
+    are applied in order and the first one to trigger wins, exactly as in
+    check_exit_conditions, so the returned reasons match position-by-position calls.
+
+    Args:
+        positions: Open positions with valid entry prices; each symbol must be in price_frames
+        price_frames: Price history per symbol (last row is the current bar); the full
+            history, or with indicator_states only the bars since the states' last bar
+        exit_conditions: Exit rule definitions (RuleDef objects or dicts)
+        days_held: Days held per position, aligned with positions
+        hold_period: Maximum holding period in days
+        indicator_states: Optional persisted incremental states ({symbol: {key: state}});
+            when given, ATR/SMA values are advanced from them in O(1) per new bar and
+            the dict is updated in place for the caller to save
+        history_loader: Loads a symbol's full history when price_frames holds only a
+            tail and a state has to be rebuilt; None means price_frames are full histories
+
+    Returns:
+        Exit reason per position, or None if the position should be held
+    """
+    import numpy as np
+    from . import indicator_state, rules
+
+    n = len(positions)
+    if n == 0:
+        return []
+
+    symbols = [pos['symbol'] for pos in positions]
+    entry = np.array([float(pos['entry_price']) for pos in positions], dtype=float)
+    latest_bars = {symbol: frame.iloc[-1] for symbol, frame in price_frames.items()}
+    close = np.array([float(latest_bars[s]['close']) for s in symbols], dtype=float)
+    high = np.array([float(latest_bars[s]['high']) for s in symbols], dtype=float)
+    low = np.array([float(latest_bars[s]['low']) for s in symbols], dtype=float)
+
+    reasons: List[Optional[str]] = [None] * n
+    pending = np.ones(n, dtype=bool)
+    indicator_cache: Dict[Tuple[Any, ...], float] = {}
+    states = indicator_states if indicator_states is not None else {}
+    frames = dict(price_frames)
+    full_histories = set() if history_loader is not None else set(frames)
+
+    def full_history(symbol: str) -> "pd.DataFrame":
+        if symbol not in full_histories:
+            assert history_loader is not None  # Without a loader every frame is already full
+            frames[symbol] = history_loader(symbol)
+            full_histories.add(symbol)
+        return frames[symbol]
+
+    def synced_state(symbol: str, state_key: str) -> Dict[str, Any]:
+        symbol_states = states.setdefault(symbol, {})
+        state = indicator_state.advance_state(state_key, symbol_states.get(state_key), frames[symbol])
+        if state is None:
+            state = indicator_state.build_state(state_key, full_history(symbol))
+        symbol_states[state_key] = state
+        return state
+
+    # A symbol whose indicator fails gets NaN, so only its positions skip that condition
+    def latest_atr(symbol: str, period: int) -> float:
+        key = (symbol, 'atr', period)
+        if key not in indicator_cache:
+            try:
+                state = synced_state(symbol, indicator_state.atr_key(period)) if indicator_states is not None else None
+                if state is not None and state['atr'] is not None:
+                    indicator_cache[key] = indicator_state.atr_value(state)
+                else:
+                    # Short histories use calculate_atr's adaptive period
+                    atr = rules.calculate_atr(full_history(symbol), period)
+                    indicator_cache[key] = float(atr.iloc[-1]) if len(atr) else float('nan')
+            except Exception as e:
+                logger.warning(f"ATR exit check failed for {symbol}: {e}")
+                indicator_cache[key] = float('nan')
+        return indicator_cache[key]
+
+    def latest_sma_signal(symbol: str, condition_type: str, fast_period: int, slow_period: int) -> float:
+        key = (symbol, condition_type, fast_period, slow_period)
+        if key not in indicator_cache:
+            try:
+                if indicator_states is not None:
+                    state = synced_state(symbol, indicator_state.sma_key(fast_period, slow_period))
+                    crossed_under, crossed_over = indicator_state.sma_cross_flags(state)
+                    indicator_cache[key] = float(crossed_under if condition_type == 'sma_cross_under' else crossed_over)
+                else:
+                    rule_func = rules.sma_cross_under if condition_type == 'sma_cross_under' else rules.sma_crossover
+                    signals = rule_func(full_history(symbol), fast_period, slow_period)
+                    indicator_cache[key] = float(bool(signals.iloc[-1])) if not signals.empty else 0.0
+            except Exception as e:
+                logger.warning(f"Indicator exit check failed for {symbol}: {e}")
+                indicator_cache[key] = float('nan')
+        return indicator_cache[key]
+
+    for condition in exit_conditions:
+        condition_type, condition_params = _condition_type_and_params(condition)
+        if not pending.any():
+            break
+
+        if condition_type == 'stop_loss_pct':
+            stop_pct = condition_params.get('percentage', 0.05)
+            stop_price = entry * (1 - stop_pct)
+            hit = pending & (low <= stop_price)
+            for i in np.flatnonzero(hit):
+                reasons[i] = f"Stop-loss triggered at {low[i]:.2f} (target: {stop_price[i]:.2f}) - stop_loss_pct"
+
+        elif condition_type == 'take_profit_pct':
+            profit_pct = condition_params.get('percentage', 0.10)
+            profit_price = entry * (1 + profit_pct)
+            hit = pending & (high >= profit_price)
+            for i in np.flatnonzero(hit):
+                reasons[i] = f"Take-profit triggered at {high[i]:.2f} (target: {profit_price[i]:.2f}) - take_profit_pct"
+
+        elif condition_type in ['stop_loss_atr', 'take_profit_atr']:
+            is_stop = condition_type == 'stop_loss_atr'
+            period = condition_params.get('period', 14)
+            multiplier = condition_params.get('multiplier', 2.0 if is_stop else 4.0)
+            if period <= 1 or multiplier <= 0:
+                logger.warning(f"ATR {'stop loss' if is_stop else 'take profit'} check failed: "
+                               f"invalid period ({period}) or multiplier ({multiplier})")
+                continue
+            atr = np.array([latest_atr(s, period) for s in symbols], dtype=float)
+            valid_atr = ~np.isnan(atr)
+            if is_stop:
+                hit = pending & valid_atr & (close <= entry - multiplier * np.nan_to_num(atr))
+                label = "ATR stop-loss"
+            else:
+                hit = pending & valid_atr & (close >= entry + multiplier * np.nan_to_num(atr))
+                label = "ATR take-profit"
+            for i in np.flatnonzero(hit):
+                reasons[i] = f"{label} triggered (period: {period}, multiplier: {multiplier})"
+
+        elif condition_type in ['sma_cross_under', 'sma_crossover']:
+            fast_period = condition_params.get('fast_period', 10)
+            slow_period = condition_params.get('slow_period', 20)
+            fired = np.array(
+                [latest_sma_signal(s, condition_type, fast_period, slow_period) for s in symbols], dtype=float
+            ) > 0  # NaN (failed symbol) compares False
+            hit = pending & fired
+            for i in np.flatnonzero(hit):
+                reasons[i] = f"Indicator exit triggered: {condition_type}"
+
+        else:
+            continue
+
+        pending &= ~hit
+
+    # Check time-based exit
+    hit = pending & (np.asarray(days_held) >= hold_period)
+    for i in np.flatnonzero(hit):
+        reasons[i] = f"End of {hold_period}-day holding period"
+
+    return reasons
+
+
+def _full_history_loader(app_config: Config) -> Callable[[str], "pd.DataFrame"]:
+    from . import data
+
+    def load(symbol: str) -> "pd.DataFrame":
+        return data.get_price_data(
+            symbol=symbol,
+            cache_dir=Path(app_config.cache_dir),
+            years=app_config.historical_data_years,
+            freeze_date=app_config.freeze_date,
+        )
+    return load
+
+
+def _load_position_histories(
+    symbols: Iterable[str], app_config: Config, start_dates: Optional[Dict[str, date]] = None
+) -> Dict[str, "pd.DataFrame"]:
+    """Load price history once per symbol; symbols without usable data are omitted.
+
+    A symbol in start_dates gets only its bars from that date on (the tail its
+    indicator or stream states still have to see) instead of the full history.
+    """
+    from . import data
+    start_dates = start_dates or {}
+    load_full_history = _full_history_loader(app_config)
+    histories: Dict[str, pd.DataFrame] = {}
+    for symbol in dict.fromkeys(symbols):
+        start_date = start_dates.get(symbol)
+        try:
+            if start_date is None:
+                price_data = load_full_history(symbol)
+            else:
+                price_data = data.get_price_data(
+                    symbol=symbol,
+                    cache_dir=Path(app_config.cache_dir),
+                    years=app_config.historical_data_years,
+                    start_date=start_date,
+                    end_date=app_config.freeze_date or date.today(),  # Position tracking: no short-history warning
+                    freeze_date=app_config.freeze_date,
+                )
+        except Exception as e:
+            logger.error(f"Failed to get pricing for {symbol}: {e}")
+            continue
+
+        if price_data is None or len(price_data) == 0:
+            logger.warning(f"No price data available for {symbol}")
+            continue
+        histories[symbol] = price_data
+    return histories
+
+
+def _state_start_dates(indicator_states: Dict[str, Dict[str, Dict[str, Any]]]) -> Dict[str, date]:
+    """Earliest last bar over each symbol's exit-indicator states, where tail reads can start.
+
+    Entry-signal stream states share the table but are advanced elsewhere, so
+    only ATR/SMA states count.
+    """
+    import pandas as pd
+    start_dates: Dict[str, date] = {}
+    for symbol, symbol_states in indicator_states.items():
+        try:
+            last_dates = [
+                pd.Timestamp(state["last_date"]).date()
+                for key, state in symbol_states.items()
+                if key.split(":", 1)[0] in ("atr", "sma")
+            ]
+        except (KeyError, TypeError, ValueError):
+            continue  # No usable state: the symbol loads its full history
+        if last_dates:
+            start_dates[symbol] = min(last_dates)
+    return start_dates
+
+
+# impure
+def latest_entry_signals(
+    db_path: Path,
+    symbols: List[str],
+    app_config: Config,
+    rules_config: Any,
+    market_data: Optional["pd.DataFrame"] = None,
+    market_symbol: str = "^NSEI",
+) -> Tuple[Dict[str, bool], Dict[str, "pd.DataFrame"]]:
+    """Whether each symbol's entry rules fire on its latest bar, from persisted streams.
+
+    A symbol whose rules all have current stream states reads only the bars
+    from its streams' last bar on; the full history is read for the rest, and
+    for streams that must be rebuilt. The advanced states are saved back.
+
+    Returns:
+        (signal per evaluated symbol, price frame read per symbol)
+    """
+    from . import streaming
+    states = persistence.get_indicator_states(db_path, [*symbols, market_symbol])
+    start_dates: Dict[str, date] = {}
+    for symbol in symbols:
+        start_date = streaming.history_start(rules_config, states.get(symbol))
+        if start_date is not None:
+            start_dates[symbol] = start_date
+    frames = _load_position_histories(symbols, app_config, start_dates)
+    # A tail can be empty (e.g. --freeze-data before the streams' last bar); fall back to the full history
+    missing = [symbol for symbol in start_dates if symbol not in frames]
+    frames.update(_load_position_histories(missing, app_config))
+
+    load_full_history = _full_history_loader(app_config)
+    tails = {symbol for symbol in start_dates if symbol not in missing}
+
+    def full_history(symbol: str) -> "pd.DataFrame":
+        return load_full_history(symbol) if symbol in tails else frames[symbol]
+
+    fired = streaming.latest_signals(frames, rules_config, states, market_data, market_symbol, full_history)
+    persistence.save_indicator_states(db_path, states)
+    logger.info(f"Streamed entry signals for {len(fired)} symbols ({len(tails)} from new bars only)")
+    return fired, frames
+
+
+def _context_index_symbol(rules_config: Any) -> Optional[str]:
+    """Index symbol the context filters read, or None when none needs market data."""
+    for filter_def in getattr(rules_config, 'context_filters', None) or []:
+        if getattr(filter_def, 'type', None) in ("market_above_sma", "expression"):
+            return str(filter_def.params.get("index_symbol", "^NSEI"))
+    return None
+
+
+def _todays_entry_signals(
+    db_path: Path, config: Config, rules_config: Any, market_data: Optional["pd.DataFrame"]
+) -> List[Dict[str, Any]]:
+    """Universe symbols whose entry rules fire on the latest bar, for the daily report."""
+    from . import data
+    index_symbol = _context_index_symbol(rules_config)
+    context_data = market_data
+    if index_symbol is not None and (index_symbol != "^NSEI" or context_data is None or context_data.empty):
+        context_data = _full_history_loader(config)(index_symbol)
+    symbols = data.load_universe(config.universe_path)
+    fired, frames = latest_entry_signals(
+        db_path, symbols, config, rules_config, context_data, index_symbol or "^NSEI"
+    )
+    return [
+        {
+            'symbol': symbol,
+            'date': str(frames[symbol].index[-1])[:10],
+            'close': float(frames[symbol]['close'].iloc[-1]),
+        }
+        for symbol, signal in fired.items() if signal
+    ]
+
+
 def process_open_positions(
     db_path: Path, 
     app_config: Config, 
     exit_conditions: List[Any],
-    nifty_data: Optional[pd.DataFrame] = None
+    nifty_data: Optional["pd.DataFrame"] = None
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """Process open positions and determine which to hold vs close.
     
+    Each held symbol's history is loaded once, and all positions are evaluated
+    together by evaluate_exit_conditions_batch. ATR/SMA exit indicators are advanced
+    from persisted incremental state and saved back for the next run; symbols with
+    state read only the bars since its last update, and the full history only when
+    a state has to be rebuilt.
+    
     Returns:
         Tuple of (positions_to_close, positions_to_hold)
     """
+    import numpy as np
+    import pandas as pd
     open_positions = persistence.get_open_positions(db_path)
-    positions_to_hold = []
-    positions_to_close = []
     
     current_date = app_config.freeze_date or date.today()
     
+    valid_positions: List[Tuple[Dict[str, Any], int]] = []
     for pos in open_positions:
         symbol = pos['symbol']
         
@@ -293,48 +678,54 @@ def process_open_positions(
             logger.error(f"CORRUPTION DETECTED: Position {pos.get('id')} for {symbol} has negative days held: {days_held} (entry: {entry_date}, current: {current_date}). Skipping.")
             continue
         
-        # Get current pricing
-        pricing = get_position_pricing(symbol, app_config)
-        if pricing is None:
+        valid_positions.append((pos, days_held))
+    
+    # One load per symbol, shared by every position in that symbol. Symbols with
+    # persisted indicator states read only the bars since their last update.
+    held_symbols = list(dict.fromkeys(pos['symbol'] for pos, _ in valid_positions))
+    indicator_states = persistence.get_indicator_states(db_path, held_symbols)
+    histories = _load_position_histories(held_symbols, app_config, _state_start_dates(indicator_states))
+    
+    priced = [(pos, days_held) for pos, days_held in valid_positions if pos['symbol'] in histories]
+    exit_reasons = evaluate_exit_conditions_batch(
+        [pos for pos, _ in priced],
+        histories,
+        exit_conditions,
+        [days_held for _, days_held in priced],
+        app_config.hold_period,
+        indicator_states=indicator_states,
+        history_loader=_full_history_loader(app_config),
+    )
+    persistence.save_indicator_states(db_path, indicator_states)
+    reason_by_position = {id(pos): reason for (pos, _), reason in zip(priced, exit_reasons)}
+    
+    # Benchmark returns for all priced positions in one vectorized lookup
+    benchmark_returns = calculate_benchmark_returns(nifty_data, [pos['entry_date'] for pos, _ in priced])
+    benchmark_by_position = {
+        id(pos): (None if np.isnan(benchmark) else float(benchmark))
+        for (pos, _), benchmark in zip(priced, benchmark_returns)
+    }
+    
+    positions_to_hold = []
+    positions_to_close = []
+    for pos, days_held in valid_positions:
+        symbol = pos['symbol']
+        if symbol not in histories:
             logger.warning(f"Could not get pricing for {symbol}, keeping position open")
             positions_to_hold.append(pos)
             continue
         
-        # Reuse embedded price_data if test/mocked helper already supplied it (structural: prevent second fetch in freeze mode)
-        price_data = pricing.get('price_data') if isinstance(pricing, dict) else None
-        if price_data is not None and not isinstance(price_data, pd.DataFrame):  # Defensive: wrong type
-            logger.debug(f"Ignoring non-DataFrame price_data for {symbol} provided by pricing helper")
-            price_data = None
-        
-        # Fetch price data for exit condition checking only if not provided
-        if price_data is None:
-            price_data = data.get_price_data(
-                symbol=symbol,
-                cache_dir=Path(app_config.cache_dir),
-                years=app_config.historical_data_years,
-                freeze_date=app_config.freeze_date,
-            )
-        
-        if price_data is None:
-            logger.warning(f"No price data for exit checking on {symbol}")
-            positions_to_hold.append(pos)
-            continue
-        
-        # Check exit conditions
-        exit_reason = check_exit_conditions(
-            pos, price_data, pricing['current_low'], pricing['current_high'],
-            exit_conditions, days_held, app_config.hold_period
-        )
+        current_price = float(histories[symbol]['close'].iloc[-1])
+        exit_reason = reason_by_position[id(pos)]
+        returns = calculate_position_returns(pos, current_price)
+        returns['nifty_return_pct'] = benchmark_by_position[id(pos)]
         
         if exit_reason:
-            # Calculate final returns
-            returns = calculate_position_returns(pos, pricing['current_price'], nifty_data)
-            
             pos_to_close = {
                 'id': pos['id'],
                 'symbol': symbol,
                 'exit_date': current_date.isoformat(),
-                'exit_price': pricing['current_price'],
+                'exit_price': current_price,
                 'final_return_pct': returns['return_pct'],
                 'final_nifty_return_pct': returns['nifty_return_pct'],
                 'days_held': days_held,
@@ -343,12 +734,9 @@ def process_open_positions(
             positions_to_close.append(pos_to_close)
             logger.info(f"Position {symbol} marked for closure: {exit_reason}")
         else:
-            # Calculate current returns for reporting
-            returns = calculate_position_returns(pos, pricing['current_price'], nifty_data)
-            
             pos_to_hold = {
                 **pos,
-                'current_price': pricing['current_price'],
+                'current_price': current_price,
                 'return_pct': returns['return_pct'],
                 'nifty_return_pct': returns['nifty_return_pct'],
                 'days_held': days_held,
@@ -446,6 +834,7 @@ def update_positions_and_generate_report_data(
     run_timestamp: str,
     config: Config,
     rules_config: Any,
+    market_data: Optional["pd.DataFrame"] = None,
 ) -> Dict[str, List[Dict[str, Any]]]:
     """Handles all position management and prepares data for the report.
     
@@ -458,10 +847,14 @@ def update_positions_and_generate_report_data(
         run_timestamp: Current run timestamp  
         config: Application configuration
         rules_config: Rules configuration
+        market_data: NIFTY (^NSEI) frame already loaded for context filters;
+            reused as the benchmark instead of reloading the index
     
     Returns:
-        Dictionary with new_buys, open, and closed positions
+        Dictionary with new_buys, open and closed positions, and entry_signals
+        (universe symbols whose entry rules fire on the latest bar)
     """
+    from . import data
     
     # Only generate signals from validated strategies stored in database
     logger.info("Generating signals from validated strategies in database")
@@ -487,17 +880,18 @@ def update_positions_and_generate_report_data(
             # It's already a dict
             exit_conditions.append(condition)
     
-    # Load NIFTY data for benchmark comparison
-    nifty_data = None
-    try:
-        nifty_data = data.get_price_data(
-            symbol="^NSEI",
-            cache_dir=Path(config.cache_dir),
-            years=1,
-            freeze_date=config.freeze_date,
-        )
-    except Exception as e:
-        logger.warning(f"Could not load NIFTY data for benchmark: {e}")
+    # Load NIFTY data for benchmark comparison unless the run already has it
+    nifty_data = market_data
+    if nifty_data is None or nifty_data.empty:
+        try:
+            nifty_data = data.get_price_data(
+                symbol="^NSEI",
+                cache_dir=Path(config.cache_dir),
+                years=1,
+                freeze_date=config.freeze_date,
+            )
+        except Exception as e:
+            logger.warning(f"Could not load NIFTY data for benchmark: {e}")
     
     # Process existing positions
     positions_to_close, positions_to_hold = process_open_positions(
@@ -517,10 +911,18 @@ def update_positions_and_generate_report_data(
         persistence.add_new_positions_from_signals(db_path, new_signals)
         logger.info(f"Added {len(new_signals)} new positions")
     
+    # Advance the universe's entry-signal streams by the new bars
+    try:
+        entry_signals = _todays_entry_signals(db_path, config, rules_config, market_data)
+    except Exception as e:
+        logger.warning(f"Could not evaluate today's entry signals: {e}")
+        entry_signals = []
+    
     return {
         "new_buys": new_signals,
         "open": positions_to_hold,
         "closed": positions_to_close,
+        "entry_signals": entry_signals,
     }
 
 
@@ -545,6 +947,20 @@ def _format_new_buys_table(new_buy_signals: List[Dict[str, Any]]) -> str:
     return header + separator + "\n".join(rows)
 
 
+def _format_entry_signals_table(entry_signals: List[Dict[str, Any]]) -> str:
+    """Format today's streamed entry signals as a table."""
+    if not entry_signals:
+        return "*No entry signals on the latest bar.*"
+    
+    header = "| Ticker | Date | Close |\n"
+    separator = "|:-------|:-----|:------|\n"
+    rows = [
+        f"| {signal.get('symbol', 'N/A')} | {signal.get('date', 'N/A')} | {signal.get('close', 0):.2f} |"
+        for signal in entry_signals
+    ]
+    return header + separator + "\n".join(rows)
+
+
 def _format_open_positions_table(open_positions: List[Dict[str, Any]], hold_period: int = 20) -> str:
     """Format open positions as a table."""
     if not open_positions:
@@ -596,6 +1012,7 @@ def generate_daily_report(
     open_positions: List[Dict[str, Any]],
     closed_positions: List[Dict[str, Any]],
     config: Config,
+    entry_signals: Optional[List[Dict[str, Any]]] = None,
 ) -> Optional[Path]:
     """
     Pure formatting and file writing logic. Accepts pre-calculated lists and writes the report.
@@ -605,6 +1022,8 @@ def generate_daily_report(
         open_positions: List of open position dictionaries
         closed_positions: List of closed position dictionaries
         config: Configuration object with output settings
+        entry_signals: Symbols whose entry rules fire on the latest bar
+            (symbol, date, close); the section is left out when None
         
     Returns:
         Path to generated report file, or None if failed
@@ -624,6 +1043,9 @@ def generate_daily_report(
         new_buys_table = _format_new_buys_table(new_buy_signals)
         open_pos_table = _format_open_positions_table(open_positions)
         sell_pos_table = _format_sell_positions_table(closed_positions)
+        entry_signals_section = ""
+        if entry_signals is not None:
+            entry_signals_section = f"\n## Entry Signals on the Latest Bar\n\n{_format_entry_signals_table(entry_signals)}\n"
         
         # Build complete report content
         report_content = f"""# Daily Trading Report - {report_date_str}
@@ -641,7 +1063,7 @@ def generate_daily_report(
 ## Positions to Sell
 
 {sell_pos_table}
-
+{entry_signals_section}
 ---
 *Report generated by KISS Signal CLI on {report_date_str}*
 """
@@ -663,60 +1085,129 @@ def generate_daily_report(
 
 # Analysis and CSV formatting functions (still used by CLI)
 
-def analyze_strategy_performance(db_path: Path, min_trades: int = 10) -> List[Dict[str, Any]]:
-    """Analyze strategy performance with comprehensive per-stock breakdown."""
-    try:
-        with sqlite3.connect(str(db_path)) as conn:
-            conn.row_factory = sqlite3.Row
+PER_STOCK_ANALYSIS_COLUMNS = [
+    "symbol", "strategy_rule_stack", "edge_score", "win_pct", "sharpe",
+    "total_return", "total_trades", "config_hash", "run_date", "config_details",
+]
 
-            base_query = """
-                SELECT s.symbol, s.rule_stack, s.edge_score, s.win_pct, s.sharpe,
-                       s.avg_return as total_return, s.total_trades, s.config_hash, s.run_timestamp,
-                       s.config_snapshot
-                FROM strategies s
-                INNER JOIN (
-                    SELECT MAX(id) as max_id
-                    FROM strategies
-                    GROUP BY symbol, rule_stack
-                ) latest ON s.id = latest.max_id
-            """
-            where_clause = "WHERE s.total_trades >= ?" if min_trades > 0 else ""
-            params = [min_trades] if min_trades > 0 else []
-            order_clause = "ORDER BY s.symbol, s.edge_score DESC"
- 
-            final_query = f"{base_query} {where_clause} {order_clause}"
+AGGREGATED_ANALYSIS_COLUMNS = [
+    "strategy_rule_stack", "frequency", "avg_edge_score", "avg_win_pct", "avg_sharpe",
+    "avg_return", "avg_trades", "top_symbols", "config_hash", "run_date", "config_details",
+]
 
-            cursor = conn.execute(final_query, params)
-            
-            results = []
-            for row in cursor.fetchall():
+# Rows pulled from SQLite / written to disk per round trip in streaming exports
+EXPORT_CHUNK_SIZE = 5000
+
+
+def _strategy_name_from_rule_stack(rule_stack_json: str) -> str:
+    """Build the human-readable strategy name from a stored rule_stack JSON string."""
+    rules = json.loads(rule_stack_json)
+    if isinstance(rules, list) and rules:
+        return " + ".join(str(r.get('name') or r.get('type') or 'N/A') for r in rules if isinstance(r, dict))
+    return "Unknown Strategy"
+
+
+def _iter_latest_strategies(
+    db_path: Path, min_trades: int, chunk_size: int, convert: Callable[[sqlite3.Row], Any]
+) -> Iterator[Any]:
+    """Stream the latest version of each symbol + rule stack, converted row by row.
+
+    Rows are fetched from the cursor in chunks of ``chunk_size``; malformed rows are skipped.
+    """
+    base_query = """
+        SELECT s.symbol, s.rule_stack, s.edge_score, s.win_pct, s.sharpe,
+               s.avg_return as total_return, s.total_trades, s.config_hash, s.run_timestamp,
+               s.config_snapshot
+        FROM strategies s
+        INNER JOIN (
+            SELECT MAX(id) as max_id
+            FROM strategies
+            GROUP BY symbol, rule_stack
+        ) latest ON s.id = latest.max_id
+    """
+    where_clause = "WHERE s.total_trades >= ?" if min_trades > 0 else ""
+    params = [min_trades] if min_trades > 0 else []
+    order_clause = "ORDER BY s.symbol, s.edge_score DESC"
+
+    final_query = f"{base_query} {where_clause} {order_clause}"
+
+    try:
+        conn = sqlite3.connect(str(db_path))
+    except sqlite3.Error as e:
+        logger.error(f"Failed to read strategies from database: {e}")
+        return
+
+    try:
+        conn.row_factory = sqlite3.Row
+        cursor = conn.execute(final_query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for row in rows:
                 try:
-                    rules = json.loads(row['rule_stack'])
-                    if isinstance(rules, list) and rules:
-                        strategy_name = " + ".join(str(r.get('name') or r.get('type') or 'N/A') for r in rules if isinstance(r, dict))
-                    else:
-                        strategy_name = "Unknown Strategy"
-                    
-                    config_details = json.loads(row['config_snapshot'] or '{}')
-                    
-                    results.append(dict(row) | {
-                        'strategy_rule_stack': strategy_name, 
-                        'config_details': str(config_details), 
-                        'run_date': row['run_timestamp'][:10] if row['run_timestamp'] else 'unknown'
-                    })
+                    item = convert(row)
                 except (json.JSONDecodeError, TypeError, KeyError) as e:
                     logger.warning(f"Skipping malformed strategy record: {e}")
                     continue
-            
-            return results
-            
-    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+                yield item
+    except sqlite3.Error as e:
         logger.error(f"Failed to read strategies from database: {e}")
-        return []
+    finally:
+        conn.close()
+
+
+def _run_date(row: sqlite3.Row) -> str:
+    return row['run_timestamp'][:10] if row['run_timestamp'] else 'unknown'
+
+
+def iter_strategy_performance(
+    db_path: Path, min_trades: int = 10, chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """Stream per-stock strategy records (latest version of each symbol + rule stack).
+
+    Rows are fetched from the cursor in chunks of ``chunk_size`` and yielded one at a
+    time, so memory stays constant regardless of how many strategies are stored.
+    """
+    def to_record(row: sqlite3.Row) -> Dict[str, Any]:
+        return dict(row) | {
+            'strategy_rule_stack': _strategy_name_from_rule_stack(row['rule_stack']),
+            'config_details': str(json.loads(row['config_snapshot'] or '{}')),
+            'run_date': _run_date(row),
+        }
+
+    return _iter_latest_strategies(db_path, min_trades, chunk_size, to_record)
+
+
+def iter_strategy_export_rows(
+    db_path: Path, min_trades: int = 10, chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[Tuple[Any, ...]]:
+    """Like iter_strategy_performance, but yields tuples in PER_STOCK_ANALYSIS_COLUMNS order.
+
+    This is the per-stock export path of write_strategy_analysis: it skips building
+    a dict per row.
+    """
+    def to_row(row: sqlite3.Row) -> Tuple[Any, ...]:
+        return (
+            row['symbol'], _strategy_name_from_rule_stack(row['rule_stack']),
+            row['edge_score'], row['win_pct'], row['sharpe'], row['total_return'], row['total_trades'],
+            row['config_hash'], _run_date(row), str(json.loads(row['config_snapshot'] or '{}')),
+        )
+
+    return _iter_latest_strategies(db_path, min_trades, chunk_size, to_row)
+
+
+def analyze_strategy_performance(db_path: Path, min_trades: int = 10) -> List[Dict[str, Any]]:
+    """Analyze strategy performance with comprehensive per-stock breakdown."""
+    return list(iter_strategy_performance(db_path, min_trades=min_trades))
 
 
 def analyze_strategy_performance_aggregated(db_path: Path, min_trades: int = 10) -> List[Dict[str, Any]]:
-    """Analyze strategy performance aggregated by rule stack combinations."""
+    """Analyze strategy performance aggregated by rule stack combinations.
+
+    Metrics are accumulated as running sums while iterating the cursor, so memory
+    grows with the number of strategy groups rather than the number of stored rows.
+    """
     try:
         with sqlite3.connect(str(db_path)) as conn:
             conn.row_factory = sqlite3.Row
@@ -733,14 +1224,10 @@ def analyze_strategy_performance_aggregated(db_path: Path, min_trades: int = 10)
                 ORDER BY symbol, edge_score DESC
             """, params)
             
-            strategy_groups = {}
-            for row in cursor.fetchall():
+            strategy_groups: Dict[str, Dict[str, Any]] = {}
+            for row in cursor:
                 try:
-                    rules = json.loads(row['rule_stack'])
-                    if isinstance(rules, list) and rules:
-                        strategy_name = " + ".join(str(r.get('name') or r.get('type') or 'N/A') for r in rules if isinstance(r, dict))
-                    else:
-                        strategy_name = "Unknown Strategy"
+                    strategy_name = _strategy_name_from_rule_stack(row['rule_stack'])
                     
                     group_key = f"{strategy_name}|{row['config_hash'] or 'legacy'}"
                     
@@ -750,17 +1237,24 @@ def analyze_strategy_performance_aggregated(db_path: Path, min_trades: int = 10)
                             'config_hash': row['config_hash'] or 'legacy',
                             'run_date': row['run_timestamp'][:10] if row['run_timestamp'] else 'unknown',
                             'config_snapshot': row['config_snapshot'],
-                            'records': []
+                            'count': 0,
+                            'edge_score': 0.0,
+                            'win_pct': 0.0,
+                            'sharpe': 0.0,
+                            'avg_return': 0.0,
+                            'total_trades': 0.0,
+                            'symbol_counts': {},
                         }
                     
-                    strategy_groups[group_key]['records'].append({
-                        'symbol': row['symbol'],
-                        'edge_score': row['edge_score'],
-                        'win_pct': row['win_pct'],
-                        'sharpe': row['sharpe'],
-                        'avg_return': row['avg_return'],
-                        'total_trades': row['total_trades']
-                    })
+                    group = strategy_groups[group_key]
+                    group['count'] += 1
+                    group['edge_score'] += row['edge_score'] or 0
+                    group['win_pct'] += row['win_pct'] or 0
+                    group['sharpe'] += row['sharpe'] or 0
+                    group['avg_return'] += row['avg_return'] or 0
+                    group['total_trades'] += row['total_trades'] or 0
+                    symbol_counts = group['symbol_counts']
+                    symbol_counts[row['symbol']] = symbol_counts.get(row['symbol'], 0) + 1
                     
                 except (json.JSONDecodeError, TypeError, KeyError) as e:
                     logger.warning(f"Skipping malformed strategy record: {e}")
@@ -768,31 +1262,26 @@ def analyze_strategy_performance_aggregated(db_path: Path, min_trades: int = 10)
             
             results = []
             for group_key, group_data in strategy_groups.items():
-                records = group_data['records']
-                if not records:
+                frequency = group_data['count']
+                if not frequency:
                     continue
                 
                 # Calculate averages
-                avg_edge_score = sum(r['edge_score'] or 0 for r in records) / len(records)
-                avg_win_pct = sum(r['win_pct'] or 0 for r in records) / len(records)
-                avg_sharpe = sum(r['sharpe'] or 0 for r in records) / len(records)
-                avg_return = sum(r['avg_return'] or 0 for r in records) / len(records) / 100000
-                avg_trades = sum(r['total_trades'] or 0 for r in records) / len(records)
+                avg_edge_score = group_data['edge_score'] / frequency
+                avg_win_pct = group_data['win_pct'] / frequency
+                avg_sharpe = group_data['sharpe'] / frequency
+                avg_return = group_data['avg_return'] / frequency / 100000
+                avg_trades = group_data['total_trades'] / frequency
                 
                 # Find top symbols
-                symbol_counts: Dict[str, int] = {}
-                for r in records:
-                    symbol = r['symbol']
-                    symbol_counts[symbol] = symbol_counts.get(symbol, 0) + 1
-                
-                top_symbols = sorted(symbol_counts.items(), key=lambda x: x[1], reverse=True)[:3]
+                top_symbols = sorted(group_data['symbol_counts'].items(), key=lambda x: x[1], reverse=True)[:3]
                 top_symbols_str = ", ".join([f"{symbol} ({count})" for symbol, count in top_symbols])
                 
                 config_details = json.loads(group_data['config_snapshot'] or '{}')
                 
                 results.append({
                     'strategy_rule_stack': group_data['strategy_name'],
-                    'frequency': len(records),
+                    'frequency': frequency,
                     'avg_edge_score': avg_edge_score,
                     'avg_win_pct': avg_win_pct,
                     'avg_sharpe': avg_sharpe,
@@ -807,58 +1296,169 @@ def analyze_strategy_performance_aggregated(db_path: Path, min_trades: int = 10)
             results.sort(key=lambda x: x['avg_edge_score'], reverse=True)
             return results
             
-    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+    except sqlite3.Error as e:
         logger.error(f"Failed to read strategies from database: {e}")
         return []
 
 
 def format_strategy_analysis_as_csv(analysis: List[Dict[str, Any]], aggregate: bool = False) -> str:
     """Format strategy performance analysis into CSV string."""
-    if not analysis:
-        if aggregate:
-            return "strategy_rule_stack,frequency,avg_edge_score,avg_win_pct,avg_sharpe,avg_return,avg_trades,top_symbols,config_hash,run_date,config_details\n"
-        else:
-            return "symbol,strategy_rule_stack,edge_score,win_pct,sharpe,total_return,total_trades,config_hash,run_date,config_details\n"
-
     output = StringIO()
-    
-    if aggregate:
-        output.write("strategy_rule_stack,frequency,avg_edge_score,avg_win_pct,avg_sharpe,avg_return,avg_trades,top_symbols,config_hash,run_date,config_details\n")
-        
-        for record in analysis:
-            avg_edge_score = f"{record['avg_edge_score']:.4f}" if record['avg_edge_score'] is not None else "0.0000"
-            avg_win_pct = f"{record['avg_win_pct']:.4f}" if record['avg_win_pct'] is not None else "0.0000"
-            avg_sharpe = f"{record['avg_sharpe']:.4f}" if record['avg_sharpe'] is not None else "0.0000"
-            avg_return = f"{record['avg_return']:.4f}" if record['avg_return'] is not None else "0.0000"
-            avg_trades = f"{record['avg_trades']:.1f}" if record['avg_trades'] is not None else "0.0"
-            
-            strategy_rule_stack = str(record['strategy_rule_stack']).replace('"', '""')
-            top_symbols = str(record['top_symbols']).replace('"', '""')
-            config_hash = str(record['config_hash']).replace('"', '""')
-            run_date = str(record['run_date']).replace('"', '""')
-            config_details = str(record['config_details']).replace('"', '""')
-            
-            output.write(f'"{strategy_rule_stack}",{record["frequency"]},{avg_edge_score},{avg_win_pct},{avg_sharpe},{avg_return},{avg_trades},"{top_symbols}","{config_hash}","{run_date}","{config_details}"\n')
-    else:
-        output.write("symbol,strategy_rule_stack,edge_score,win_pct,sharpe,total_return,total_trades,config_hash,run_date,config_details\n")
-        
-        for record in analysis:
-            edge_score = f"{record['edge_score']:.4f}" if record['edge_score'] is not None else "0.0000"
-            win_pct = f"{record['win_pct']:.4f}" if record['win_pct'] is not None else "0.0000"
-            sharpe = f"{record['sharpe']:.4f}" if record['sharpe'] is not None else "0.0000"
-            total_return = f"{record['total_return']:.4f}" if record['total_return'] is not None else "0.0000"
-            
-            symbol = str(record['symbol']).replace('"', '""')
-            strategy_rule_stack = str(record['strategy_rule_stack']).replace('"', '""')
-            config_hash = str(record['config_hash']).replace('"', '""')
-            run_date = str(record['run_date']).replace('"', '""')
-            config_details = str(record['config_details']).replace('"', '""')
-            
-            output.write(f'"{symbol}","{strategy_rule_stack}",{edge_score},{win_pct},{sharpe},{total_return},{record["total_trades"]},"{config_hash}","{run_date}","{config_details}"\n')
-    
+    _write_analysis_csv(output, analysis, aggregate, max(len(analysis), 1))
     return output.getvalue()
 
 
+# Field formats of analysis CSV rows: quoted text, raw integers, fixed-point metrics
+_TEXT_ANALYSIS_COLUMNS = {
+    "symbol", "strategy_rule_stack", "top_symbols", "config_hash", "run_date", "config_details",
+}
+_INT_ANALYSIS_COLUMNS = {"frequency", "total_trades"}
+
+
+class _FixedPoint(float):
+    """Metric the csv writer prints with a fixed number of decimals, unquoted.
+
+    csv writes floats by repr, and QUOTE_NONNUMERIC leaves numbers unquoted.
+    """
+    decimals = 4
+
+    def __repr__(self) -> str:
+        return f"{float(self):.{self.decimals}f}"
+
+    __str__ = __repr__
+
+
+class _OneDecimal(_FixedPoint):
+    decimals = 1
+
+
+def _analysis_export_row(record: Dict[str, Any], aggregate: bool) -> Tuple[Any, ...]:
+    """One analysis record as a tuple in export column order."""
+    columns = AGGREGATED_ANALYSIS_COLUMNS if aggregate else PER_STOCK_ANALYSIS_COLUMNS
+    return tuple(record.get(column) for column in columns)
+
+
+def _analysis_csv_fields(row: Sequence[Any], columns: Sequence[str]) -> List[Any]:
+    """Fields of one analysis row for the csv writer; missing metrics are written as 0."""
+    fields: List[Any] = []
+    for column, value in zip(columns, row):
+        if column in _TEXT_ANALYSIS_COLUMNS:
+            fields.append(str(value))
+        elif column in _INT_ANALYSIS_COLUMNS:
+            fields.append(value)
+        else:
+            fixed = _OneDecimal if column == "avg_trades" else _FixedPoint
+            fields.append(fixed(value if value is not None else 0.0))
+    return fields
+
+
+def _write_analysis_csv(output: TextIO, records: Iterable[Any], aggregate: bool, chunk_size: int) -> int:
+    """Write the analysis CSV (header and rows) to output; returns the number of rows."""
+    columns = AGGREGATED_ANALYSIS_COLUMNS if aggregate else PER_STOCK_ANALYSIS_COLUMNS
+    output.write(",".join(columns) + "\n")
+    writer = csv.writer(output, quoting=csv.QUOTE_NONNUMERIC, lineterminator="\n")
+    row_count = 0
+    for chunk in _chunked(records, aggregate, chunk_size):
+        writer.writerows(_analysis_csv_fields(row, columns) for row in chunk)
+        row_count += len(chunk)
+    return row_count
+
+
+def _chunked(
+    records: Iterable[Any], aggregate: bool, chunk_size: int
+) -> Iterator[List[Tuple[Any, ...]]]:
+    """Group export rows into lists of at most chunk_size tuples.
+
+    Records may be analysis dicts or tuples already in export column order.
+    """
+    chunk: List[Tuple[Any, ...]] = []
+    for record in records:
+        chunk.append(record if isinstance(record, tuple) else _analysis_export_row(record, aggregate))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _write_analysis_parquet(
+    records: Iterable[Any],
+    output_file: Path,
+    aggregate: bool,
+    compress: bool,
+    chunk_size: int,
+) -> int:
+    """Write analysis rows to a Parquet file one row group per chunk."""
+    try:
+        # Import pyarrow here to keep it an optional dependency
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ValueError("Parquet export requires pyarrow (pip install 'kiss-signal-cli[parquet]')") from e
+
+    columns = AGGREGATED_ANALYSIS_COLUMNS if aggregate else PER_STOCK_ANALYSIS_COLUMNS
+    schema = pa.schema([
+        (col, pa.int64() if col in _INT_ANALYSIS_COLUMNS else pa.string() if col in _TEXT_ANALYSIS_COLUMNS
+         else pa.float64())
+        for col in columns
+    ])
+
+    def column_values(chunk: List[Tuple[Any, ...]], i: int) -> List[Any]:
+        name = columns[i]
+        if name in _TEXT_ANALYSIS_COLUMNS:
+            return [str(row[i]) for row in chunk]
+        if name in _INT_ANALYSIS_COLUMNS:
+            return [int(row[i] or 0) for row in chunk]
+        return [float(row[i]) if row[i] is not None else 0.0 for row in chunk]
+
+    row_count = 0
+    with pq.ParquetWriter(str(output_file), schema, compression="gzip" if compress else "snappy") as writer:
+        for chunk in _chunked(records, aggregate, chunk_size):
+            arrays = [pa.array(column_values(chunk, i), type=schema.field(i).type) for i in range(len(columns))]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            row_count += len(chunk)
+    return row_count
+
+
+def write_strategy_analysis(
+    records: Iterable[Any],
+    output_file: Path,
+    aggregate: bool = False,
+    output_format: str = "csv",
+    compress: bool = False,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> int:
+    """Stream strategy analysis records straight to a CSV (optionally gzipped) or Parquet file.
+
+    Records are consumed lazily and written in chunks, so pairing this with
+    ``iter_strategy_export_rows`` exports any number of strategies in constant memory.
+    CSV rows use the format of ``format_strategy_analysis_as_csv``.
+
+    Args:
+        records: Iterable of per-stock or aggregated analysis records, as dicts
+            or as tuples in export column order
+        output_file: Destination path
+        aggregate: Whether records use the aggregated leaderboard layout
+        output_format: "csv" or "parquet"
+        compress: Gzip the CSV output, or use gzip compression inside the Parquet file
+        chunk_size: Number of rows buffered per write
+
+    Returns:
+        Number of data rows written
+
+    Raises:
+        ValueError: If the output format is unknown or its dependency is missing
+    """
+    if output_format == "parquet":
+        return _write_analysis_parquet(records, output_file, aggregate, compress, chunk_size)
+    if output_format != "csv":
+        raise ValueError(f"Unsupported output format: {output_format}. Use 'csv' or 'parquet'.")
+
+    with (gzip.open(output_file, "wt", encoding="utf-8", newline="") if compress
+          else open(output_file, "w", encoding="utf-8", newline="")) as f:
+        return _write_analysis_csv(f, records, aggregate, chunk_size)
+
+
 def _fetch_best_strategies(db_path: Path, run_timestamp: str, edge_threshold: float) -> List[Dict[str, Any]]:
     """Fetch best strategies from database with edge score threshold."""
     try:
@@ -1005,13 +1605,18 @@ def format_walk_forward_results(results: List[Dict[str, Any]]) -> str:
         return "No out-of-sample results found."
     
     output = StringIO()
-    output.write("WALK-FORWARD ANALYSIS SUMMARY\n")
-    output.write("=" * 50 + "\n\n")
+    output.write(WALK_FORWARD_SUMMARY_HEADER)
     
     for symbol, symbol_data in symbol_results.items():
         if symbol_data:
-            report = WalkForwardReport(symbol_data)
-            output.write(report.generate_report(symbol))
-            output.write("\n" + "-" * 50 + "\n\n")
+            output.write(format_symbol_walk_forward_results(symbol, symbol_data))
     
-    return output.getvalue()
\ No newline at end of file
+    return output.getvalue()
+
+
+WALK_FORWARD_SUMMARY_HEADER = "WALK-FORWARD ANALYSIS SUMMARY\n" + "=" * 50 + "\n\n"
+
+
+def format_symbol_walk_forward_results(symbol: str, results: List[Dict[str, Any]]) -> str:
+    """One symbol's section of format_walk_forward_results, for callers that stream symbols."""
+    return WalkForwardReport(results).generate_report(symbol) + "\n" + "-" * 50 + "\n\n"
\ No newline at end of file
@@ -1,12 +1,18 @@
 """Rules - Core Technical Indicator Implementation.
 
 This module implements the technical analysis indicators used for signal generation.
-All functions are pure and operate on pandas DataFrames with OHLCV data.
+All functions are pure and operate on pandas DataFrames with OHLCV data; the
+``*_2d`` companions evaluate whole-universe NumPy panels (dates x symbols).
 """
 
 import logging
+from typing import Any, List, Tuple
+
+import numpy as np
 import pandas as pd
 
+from . import kernels
+
 __all__ = [
     "sma_crossover",
     "rsi_oversold", 
@@ -36,11 +42,29 @@ __all__ = [
     "simple_trailing_stop",
     # New functions (Story 031) - Chandelier Exit
     "chandelier_exit",
+    # Donchian channel breakouts (rolling max/min kernels)
+    "donchian_breakout",
+    "donchian_breakdown",
+    # Universe-wide (2-D) kernels over dates x symbols panels
+    "calculate_rsi_2d",
+    "calculate_atr_2d",
+    "sma_crossover_2d",
+    "ema_crossover_2d",
+    "rsi_oversold_2d",
+    "macd_crossover_2d",
+    "bollinger_squeeze_2d",
+    "volume_spike_2d",
+    "price_above_sma_2d",
 ]
 
 logger = logging.getLogger(__name__)
 
 
+def _rolling(series: pd.Series, kernel: Any, window: int, **kwargs: Any) -> pd.Series:
+    """Applies a kernels.rolling_* primitive to a series, keeping its index."""
+    return pd.Series(kernel(series.to_numpy(), window, **kwargs), index=series.index, name=series.name)
+
+
 def _validate_ohlcv_columns(price_data: pd.DataFrame, required: list[str]) -> None:
     """Validate required columns exist in DataFrame."""
     missing = [col for col in required if col not in price_data.columns]
@@ -53,7 +77,7 @@ def sma_crossover(price_data: pd.DataFrame, fast_period: int = 10, slow_period:
     
     Mathematical Implementation:
     - Simple Moving Average (SMA) = sum of n recent close prices / n
-    - Uses pandas rolling window with min_periods=period for boundary handling
+    - Uses rolling means with min_periods=period for boundary handling
     - Crossover detection: fast_SMA > slow_SMA AND fast_SMA_prev <= slow_SMA_prev
     - Returns NaN-filled as False for insufficient data periods
     
@@ -79,8 +103,8 @@ def sma_crossover(price_data: pd.DataFrame, fast_period: int = 10, slow_period:
         return pd.Series(False, index=price_data.index)
     
     close_prices = price_data['close']
-    fast_sma = close_prices.rolling(window=fast_period, min_periods=fast_period).mean()
-    slow_sma = close_prices.rolling(window=slow_period, min_periods=slow_period).mean()
+    fast_sma = _rolling(close_prices, kernels.rolling_mean, fast_period)
+    slow_sma = _rolling(close_prices, kernels.rolling_mean, slow_period)
     
     # Crossover: fast crosses above slow
     signals = (fast_sma > slow_sma) & (fast_sma.shift(1) <= slow_sma.shift(1))
@@ -102,20 +126,9 @@ def calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
     if len(prices) < period + 1:
         return pd.Series(float('nan'), index=prices.index)
     
-    delta = prices.diff()
-    gains = delta.where(delta > 0, 0)
-    losses = -delta.where(delta < 0, 0)
-    
-    # Use exponential smoothing (Wilder's method)
-    alpha = 1.0 / period
-    avg_gains = gains.ewm(alpha=alpha, adjust=False).mean()
-    avg_losses = losses.ewm(alpha=alpha, adjust=False).mean()
-    
-    # Avoid division by zero
-    rs = avg_gains / avg_losses.where(avg_losses != 0, 1e-10)
-    rsi = 100 - (100 / (1 + rs))
-    
-    return rsi
+    # Wilder smoothing of gains and losses in one compiled pass (see kernels.wilder_rsi)
+    rsi = kernels.wilder_rsi(prices.to_numpy(dtype=float, na_value=np.nan), period)
+    return pd.Series(rsi, index=prices.index, name=prices.name)
 
 
 def rsi_oversold(price_data: pd.DataFrame, period: int = 14, oversold_threshold: float = 30.0) -> pd.Series:
@@ -218,7 +231,7 @@ def volume_spike(price_data: pd.DataFrame,
         return pd.Series(False, index=price_data.index)
     
     # Volume condition
-    avg_volume = price_data['volume'].rolling(period, min_periods=period).mean()
+    avg_volume = _rolling(price_data['volume'], kernels.rolling_mean, period)
     volume_condition = price_data['volume'] > (spike_multiplier * avg_volume)
     
     # Price change condition  
@@ -418,8 +431,8 @@ def bollinger_squeeze(price_data: pd.DataFrame,
         return pd.Series(False, index=price_data.index)
     
     # Bollinger Bands
-    sma = price_data['close'].rolling(period).mean()
-    std = price_data['close'].rolling(period).std()
+    sma = _rolling(price_data['close'], kernels.rolling_mean, period)
+    std = _rolling(price_data['close'], kernels.rolling_std, period)
     upper_band = sma + (std_dev * std)
     lower_band = sma - (std_dev * std)
     
@@ -444,7 +457,7 @@ def price_above_sma(price_data: pd.DataFrame, period: int = 50) -> pd.Series:
     _validate_ohlcv_columns(price_data, ['close'])
     if len(price_data) < period:
         return pd.Series(False, index=price_data.index)
-    sma = price_data['close'].rolling(window=period).mean()
+    sma = _rolling(price_data['close'], kernels.rolling_mean, period)
     signals = price_data['close'] > sma
     return signals.fillna(False)
 
@@ -473,8 +486,8 @@ def sma_cross_under(price_data: pd.DataFrame, fast_period: int, slow_period: int
         return pd.Series(False, index=price_data.index)
     
     # Calculate SMAs
-    fast_sma = price_data['close'].rolling(window=fast_period).mean()
-    slow_sma = price_data['close'].rolling(window=slow_period).mean()
+    fast_sma = _rolling(price_data['close'], kernels.rolling_mean, fast_period)
+    slow_sma = _rolling(price_data['close'], kernels.rolling_mean, slow_period)
     
     # Check for crossover: fast was above slow, now it's below
     previous_above = (fast_sma.shift(1) > slow_sma.shift(1))
@@ -589,26 +602,18 @@ def calculate_atr(price_data: pd.DataFrame, period: int = 14) -> pd.Series:
             # This ensures alignment with the original data for any subsequent calculations
             return pd.Series(float('nan'), index=price_data.index)
     
-    # Calculate True Range for each period
-    # TR = max(H-L, abs(H-C_prev), abs(L-C_prev))
-    high = price_data['high']
-    low = price_data['low']
-    close = price_data['close']
-    prev_close = close.shift(1)
-    
-    tr1 = high - low  # High - Low
-    tr2 = (high - prev_close).abs()  # abs(High - Previous Close)
-    tr3 = (low - prev_close).abs()   # abs(Low - Previous Close)
-    
-    true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    
-    # First period has no previous close, so TR = H - L only
-    true_range.iloc[0] = high.iloc[0] - low.iloc[0]
-    
-    # Apply Wilder's smoothing (same as RSI calculation)
-    # ATR = EWM with alpha = 1/period, but only start calculation after period-1 values
-    alpha = 1.0 / period
-    atr = true_range.ewm(alpha=alpha, adjust=False, min_periods=period).mean()
+    # True Range = max(H-L, |H-C_prev|, |L-C_prev|), with TR = H-L on the first bar,
+    # smoothed with Wilder's alpha = 1/period once period values exist; one
+    # compiled pass with no intermediate frames (see kernels.wilder_atr)
+    atr = pd.Series(
+        kernels.wilder_atr(
+            price_data['high'].to_numpy(dtype=float, na_value=np.nan),
+            price_data['low'].to_numpy(dtype=float, na_value=np.nan),
+            price_data['close'].to_numpy(dtype=float, na_value=np.nan),
+            period,
+        ),
+        index=price_data.index,
+    )
     
     logger.debug(f"Calculated ATR: {atr.count()} valid values")
     return atr
@@ -777,7 +782,7 @@ def market_above_sma(market_data: pd.DataFrame, period: int = 50) -> pd.Series:
         return pd.Series(False, index=market_data.index)
     
     # Calculate SMA
-    sma = market_data['close'].rolling(window=period).mean()
+    sma = _rolling(market_data['close'], kernels.rolling_mean, period)
     
     # Market is bullish when price > SMA
     bullish_signals = market_data['close'] > sma
@@ -810,7 +815,7 @@ def price_above_long_sma(price_data: pd.DataFrame, period: int = 200) -> pd.Seri
         return pd.Series(False, index=price_data.index)
     
     # Calculate long-term SMA
-    sma = price_data['close'].rolling(window=period, min_periods=period).mean()
+    sma = _rolling(price_data['close'], kernels.rolling_mean, period)
     
     # Trend signal when price > long SMA
     trend_signals = price_data['close'] > sma
@@ -890,7 +895,7 @@ def simple_trailing_stop(
         raise ValueError(f"Trail percent must be positive, got {trail_percent}")
     
     # Calculate the high-water mark (peak price seen so far)
-    high_water_mark = data['close'].expanding().max()
+    high_water_mark = pd.Series(kernels.running_max(data['close'].to_numpy()), index=data.index)
     
     # Calculate trailing stop price (trail_percent below peak)
     trailing_stop_price = high_water_mark * (1 - trail_percent)
@@ -947,8 +952,8 @@ def chandelier_exit(
     # Calculate ATR using existing function
     atr = calculate_atr(data, period=atr_period)
     
-    # Calculate highest high over the ATR period
-    highest_high = data['high'].rolling(window=atr_period, min_periods=1).max()
+    # Calculate highest high over the ATR period (O(n) monotonic deque)
+    highest_high = _rolling(data['high'], kernels.rolling_max, atr_period, min_periods=1)
     
     # Calculate Chandelier Exit stop level
     stop_level = highest_high - (atr_multiplier * atr)
@@ -957,3 +962,247 @@ def chandelier_exit(
     exit_signals = data['close'] <= stop_level
     
     return exit_signals.fillna(False)
+
+
+# =============================================================================
+# Donchian channel breakouts
+# =============================================================================
+
+def donchian_breakout(price_data: pd.DataFrame, period: int = 20) -> pd.Series:
+    """
+    Entry when the close breaks above the highest high of the prior ``period`` bars.
+    
+    The channel excludes the current bar, so a close can exceed it. Uses the
+    O(n) rolling max kernel, which keeps long channels cheap.
+    
+    Args:
+        price_data: DataFrame with OHLCV data
+        period: Channel lookback in bars (default: 20)
+        
+    Returns:
+        Boolean Series where True indicates a breakout
+    """
+    _validate_ohlcv_columns(price_data, ['high', 'close'])
+    
+    if period <= 0:
+        raise ValueError(f"Donchian period must be positive, got {period}")
+    
+    if len(price_data) <= period:
+        logger.warning(f"Insufficient data for Donchian breakout: {len(price_data)} rows, need {period + 1}")
+        return pd.Series(False, index=price_data.index)
+    
+    upper_channel = _rolling(price_data['high'], kernels.rolling_max, period).shift(1)
+    signals = price_data['close'] > upper_channel
+    
+    logger.debug(f"Donchian breakout signals: {signals.sum()} triggers")
+    return signals.fillna(False)
+
+
+def donchian_breakdown(price_data: pd.DataFrame, period: int = 10) -> pd.Series:
+    """
+    Exit when the close breaks below the lowest low of the prior ``period`` bars.
+    
+    The classic turtle exit: a shorter channel than the entry breakout.
+    
+    Args:
+        price_data: DataFrame with OHLCV data
+        period: Channel lookback in bars (default: 10)
+        
+    Returns:
+        Boolean Series where True indicates an exit signal
+    """
+    _validate_ohlcv_columns(price_data, ['low', 'close'])
+    
+    if period <= 0:
+        raise ValueError(f"Donchian period must be positive, got {period}")
+    
+    if len(price_data) <= period:
+        return pd.Series(False, index=price_data.index)
+    
+    lower_channel = _rolling(price_data['low'], kernels.rolling_min, period).shift(1)
+    exit_signals = price_data['close'] < lower_channel
+    
+    return exit_signals.fillna(False)
+
+
+# =============================================================================
+# Universe-wide (2-D) kernels
+# =============================================================================
+#
+# Companions of the per-symbol rules that take dates x symbols panels (see
+# data.price_panel) and evaluate the whole universe in one vectorized pass.
+# Symbols are NaN-padded outside their own history (later listing, delisting,
+# missing days). Each column's valid bars are first compacted to the top, so
+# every column gets what the per-symbol function returns for that symbol's own
+# frame; padded cells come back NaN (indicators) or False (signals).
+
+def _as_panel(values: Any) -> np.ndarray:
+    panel = np.asarray(values, dtype=np.float64)
+    if panel.ndim != 2:
+        raise ValueError(f"Expected a 2-D (dates x symbols) array, got {panel.ndim}-D")
+    return panel
+
+
+def _compact(*panels: np.ndarray) -> Tuple[List[np.ndarray], np.ndarray, np.ndarray]:
+    """Moves each column's valid bars (no NaN in any input) to the top, in date order.
+
+    Returns:
+        (compacted panels with NaN only below each column's history,
+        row order used for the move, valid bar count per column)
+    """
+    valid = np.ones(panels[0].shape, dtype=bool)
+    for panel in panels:
+        valid &= ~np.isnan(panel)
+    order = np.argsort(~valid, axis=0, kind="stable")
+    compacted = [np.take_along_axis(np.where(valid, panel, np.nan), order, axis=0) for panel in panels]
+    return compacted, order, valid.sum(axis=0)
+
+
+def _expand(result: np.ndarray, order: np.ndarray, counts: np.ndarray, fill: Any) -> np.ndarray:
+    """Inverse of _compact: puts results back on their dates and fills padded cells."""
+    rows = np.arange(result.shape[0])[:, None]
+    result = np.where(rows < counts, result, fill)
+    expanded = np.empty_like(result)
+    np.put_along_axis(expanded, order, result, axis=0)
+    return expanded
+
+
+def _shift_2d(values: np.ndarray, fill: Any = np.nan) -> np.ndarray:
+    shifted = np.empty_like(values)
+    shifted[:1] = fill
+    shifted[1:] = values[:-1]
+    return shifted
+
+
+def _ewm_2d(values: np.ndarray, alpha: Any, adjust: bool = False) -> np.ndarray:
+    """ewm(alpha=alpha, adjust=adjust).mean() down each column; alpha may vary per column."""
+    out = np.empty_like(values)
+    if values.shape[0] == 0:
+        return out
+    decay = 1.0 - np.asarray(alpha, dtype=np.float64)
+    if adjust:
+        numerator = np.zeros(values.shape[1])
+        denominator = np.zeros(values.shape[1])
+        for row in range(values.shape[0]):
+            numerator = values[row] + decay * numerator
+            denominator = 1.0 + decay * denominator
+            out[row] = numerator / denominator
+    else:
+        out[0] = values[0]
+        for row in range(1, values.shape[0]):
+            out[row] = decay * out[row - 1] + (1.0 - decay) * values[row]
+    return out
+
+
+def _crosses_above(fast: np.ndarray, slow: np.ndarray) -> np.ndarray:
+    return (fast > slow) & (_shift_2d(fast) <= _shift_2d(slow))
+
+
+def _rsi_compacted(close: np.ndarray, counts: np.ndarray, period: int) -> np.ndarray:
+    # One compiled Wilder pass over every column (see kernels.wilder_rsi)
+    rsi = kernels.wilder_rsi(close, period)
+    rsi[:, counts < period + 1] = np.nan
+    return rsi
+
+
+def calculate_rsi_2d(close: Any, period: int = 14) -> np.ndarray:
+    """Universe-wide :func:`calculate_rsi`: RSI of every column of a close panel."""
+    (compact_close,), order, counts = _compact(_as_panel(close))
+    return _expand(_rsi_compacted(compact_close, counts, period), order, counts, np.nan)
+
+
+def calculate_atr_2d(high: Any, low: Any, close: Any, period: int = 14) -> np.ndarray:
+    """Universe-wide :func:`calculate_atr`, including its short-history period adaptation."""
+    if period <= 1:
+        raise ValueError(f"period ({period}) must be > 1")
+    (h, l, c), order, counts = _compact(_as_panel(high), _as_panel(low), _as_panel(close))
+
+    periods = np.where(counts < period, counts, period)  # Short histories use their full length
+    atr = np.full(c.shape, np.nan)
+    # One compiled Wilder pass per distinct period: a single call unless some histories are short
+    for column_period in np.unique(periods[counts >= 3]):
+        columns = periods == column_period
+        atr[:, columns] = kernels.wilder_atr(h[:, columns], l[:, columns], c[:, columns], int(column_period))
+    return _expand(atr, order, counts, np.nan)
+
+
+def sma_crossover_2d(close: Any, fast_period: int = 10, slow_period: int = 20) -> np.ndarray:
+    """Universe-wide :func:`sma_crossover`."""
+    if fast_period >= slow_period:
+        raise ValueError(f"fast_period ({fast_period}) must be < slow_period ({slow_period})")
+    (c,), order, counts = _compact(_as_panel(close))
+    signals = _crosses_above(kernels.rolling_mean(c, fast_period), kernels.rolling_mean(c, slow_period))
+    return _expand(signals & (counts >= slow_period), order, counts, False)
+
+
+def ema_crossover_2d(close: Any, fast_period: int = 10, slow_period: int = 20) -> np.ndarray:
+    """Universe-wide :func:`ema_crossover`."""
+    if fast_period >= slow_period:
+        raise ValueError(f"fast_period ({fast_period}) must be < slow_period ({slow_period})")
+    (c,), order, counts = _compact(_as_panel(close))
+    fast = _ewm_2d(c, 2.0 / (fast_period + 1))
+    slow = _ewm_2d(c, 2.0 / (slow_period + 1))
+    return _expand(_crosses_above(fast, slow) & (counts >= slow_period), order, counts, False)
+
+
+def rsi_oversold_2d(close: Any, period: int = 14, oversold_threshold: float = 30.0) -> np.ndarray:
+    """Universe-wide :func:`rsi_oversold`."""
+    (c,), order, counts = _compact(_as_panel(close))
+    rsi = _rsi_compacted(c, counts, period)
+    recovering = (rsi >= oversold_threshold) & (_shift_2d(rsi) < oversold_threshold)
+    signals = (rsi > 40.0) | recovering
+    return _expand(signals & (counts >= period + 1), order, counts, False)
+
+
+def macd_crossover_2d(close: Any, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> np.ndarray:
+    """Universe-wide :func:`macd_crossover`."""
+    if fast_period >= slow_period:
+        raise ValueError(f"fast_period ({fast_period}) must be < slow_period ({slow_period})")
+    if signal_period <= 0:
+        raise ValueError(f"signal_period ({signal_period}) must be > 0")
+    (c,), order, counts = _compact(_as_panel(close))
+    macd_line = _ewm_2d(c, 2.0 / (fast_period + 1), adjust=True) - _ewm_2d(c, 2.0 / (slow_period + 1), adjust=True)
+    signal_line = _ewm_2d(macd_line, 2.0 / (signal_period + 1), adjust=True)
+    signals = _crosses_above(macd_line, signal_line)
+    return _expand(signals & (counts >= slow_period + signal_period), order, counts, False)
+
+
+def bollinger_squeeze_2d(close: Any, period: int = 20, std_dev: float = 2.0, squeeze_threshold: float = 0.1) -> np.ndarray:
+    """Universe-wide :func:`bollinger_squeeze`."""
+    if period <= 0:
+        raise ValueError(f"period ({period}) must be > 0")
+    if std_dev <= 0:
+        raise ValueError(f"std_dev ({std_dev}) must be > 0")
+    if squeeze_threshold <= 0:
+        raise ValueError(f"squeeze_threshold ({squeeze_threshold}) must be > 0")
+    (c,), order, counts = _compact(_as_panel(close))
+    sma = kernels.rolling_mean(c, period)
+    std = kernels.rolling_std(c, period)
+    upper_band = sma + std_dev * std
+    band_width = (upper_band - (sma - std_dev * std)) / sma
+    was_in_squeeze = _shift_2d(band_width < squeeze_threshold, False)
+    breakout = (c > upper_band) & was_in_squeeze
+    return _expand(breakout & (counts >= period + 5), order, counts, False)
+
+
+def volume_spike_2d(
+    close: Any, volume: Any, period: int = 20, spike_multiplier: float = 2.0, price_change_threshold: float = 0.01
+) -> np.ndarray:
+    """Universe-wide :func:`volume_spike`."""
+    if period <= 0:
+        raise ValueError(f"period ({period}) must be > 0")
+    if spike_multiplier <= 1.0:
+        raise ValueError(f"spike_multiplier ({spike_multiplier}) must be > 1.0")
+    if price_change_threshold <= 0:
+        raise ValueError(f"price_change_threshold ({price_change_threshold}) must be > 0")
+    (c, v), order, counts = _compact(_as_panel(close), _as_panel(volume))
+    volume_condition = v > spike_multiplier * kernels.rolling_mean(v, period)
+    price_condition = np.abs(c / _shift_2d(c) - 1) > price_change_threshold
+    return _expand(volume_condition & price_condition & (counts >= period), order, counts, False)
+
+
+def price_above_sma_2d(close: Any, period: int = 50) -> np.ndarray:
+    """Universe-wide :func:`price_above_sma`."""
+    (c,), order, counts = _compact(_as_panel(close))
+    signals = c > kernels.rolling_mean(c, period)
+    return _expand(signals & (counts >= period), order, counts, False)
@@ -0,0 +1,284 @@
+"""Server - Long-lived local service that keeps data and compiled kernels warm.
+
+A one-shot CLI run pays Python startup, the vectorbt import, numba JIT warm-up
+and CSV parsing every time. ``kiss_signal serve`` pays them once: it imports and
+warms the backtesting stack, keeps parsed price caches in memory (see
+``data.enable_frame_cache``) and then executes CLI commands sent by thin
+clients (``kiss_signal --server URL <command> ...``) in-process.
+
+Protocol (localhost HTTP, JSON bodies):
+
+    POST /invoke  {"argv": [...], "cwd": "..."}  ->  {"exit_code": int, "output": str}
+    GET  /health                                 ->  {"status": "ok", "uptime_s", "requests", "cached_frames"}
+
+Commands run one at a time in the server process, since they share the CLI
+console and working directory. The server only binds to loopback addresses.
+Each start writes a fresh secret to ``<cache_dir>/server.token`` (mode 0600);
+``/invoke`` requires it in the ``X-KISS-Signal-Token`` header, an
+``application/json`` body and no ``Origin`` header, so web pages cannot drive
+it, and it only runs the commands clients forward (``FORWARDED_COMMANDS``).
+"""
+
+import contextlib
+import hmac
+import io
+import ipaddress
+import json
+import logging
+import os
+import secrets
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import data
+from .config import Config, RulesConfig, WalkForwardConfig
+
+__all__ = [
+    "DEFAULT_PORT",
+    "FORWARDED_COMMANDS",
+    "SERVER_ENV_VAR",
+    "TOKEN_HEADER",
+    "create_server",
+    "invoke_remote",
+    "read_token",
+    "serve_forever",
+]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+SERVER_ENV_VAR = "KISS_SIGNAL_SERVER"
+TOKEN_HEADER = "X-KISS-Signal-Token"
+TOKEN_FILENAME = "server.token"
+FORWARDED_COMMANDS: FrozenSet[str] = frozenset({"run", "analyze-strategies", "backtest", "signals"})
+
+Executor = Callable[[List[str], str], Tuple[int, str]]
+
+
+# impure
+def _invoke_cli(argv: List[str], cwd: str) -> Tuple[int, str]:
+    """Runs one CLI command in this process and returns (exit code, console output)."""
+    from . import cli
+
+    previous_cwd = os.getcwd()
+    output = io.StringIO()  # Console, typer help and usage errors all write to the standard streams
+    try:
+        os.chdir(cwd)
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            try:
+                result = cli.app(args=argv, prog_name="kiss_signal", standalone_mode=False)
+                exit_code = result if isinstance(result, int) else 0
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else 1
+            except Exception as e:  # Usage errors and anything a command let escape
+                cli.console.print(f"[red]{e}[/red]")
+                exit_code = getattr(e, "exit_code", 1)
+    finally:
+        os.chdir(previous_cwd)
+        cli.console.export_text(clear=True)  # The console records everything; don't let it grow
+    return exit_code, output.getvalue()
+
+
+def _require_loopback(host: str) -> None:
+    """Raises ValueError unless ``host`` is ``localhost`` or a loopback IP address."""
+    try:
+        loopback = host == "localhost" or ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        loopback = False
+    if not loopback:
+        raise ValueError(f"Refusing to bind to non-loopback host {host!r}; the server runs local commands")
+
+
+def _command_name(argv: List[str]) -> Optional[str]:
+    """The subcommand an argv would run, skipping the global options before it."""
+    import typer.main
+
+    from . import cli
+
+    takes_value = {
+        opt
+        for param in typer.main.get_command(cli.app).params
+        if param.param_type_name == "option" and not getattr(param, "is_flag", False)
+        for opt in param.opts
+    }
+    skip_next = False
+    for arg in argv:
+        if skip_next:
+            skip_next = False
+        elif arg.startswith("-"):
+            skip_next = arg in takes_value
+        else:
+            return arg
+    return None
+
+
+# impure
+def _write_token(path: Path, token: str) -> None:
+    """Writes the server secret to a file readable only by the current user."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)  # O_EXCL below: never write through a file or link someone else created
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+
+
+def read_token(cache_dir: Path) -> str:
+    """The secret of the server started with this cache directory.
+
+    Raises:
+        OSError: If no server has written a token there
+    """
+    return (Path(cache_dir) / TOKEN_FILENAME).read_text(encoding="utf-8").strip()
+
+
+# impure
+def _warm_up(app_config: Config, rules_config: RulesConfig) -> None:
+    """Compiles the rule and vectorbt simulation kernels on a synthetic series.
+
+    Runs a short walk-forward through the public backtester entry point, with
+    the configured exits so the compiled signatures match real runs.
+    """
+    from .backtester import Backtester
+
+    start = time.perf_counter()
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range("2020-01-01", periods=300, name="date")
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.015, len(index))))
+    frame = pd.DataFrame({
+        "open": close, "high": close * 1.01, "low": close * 0.99, "close": close,
+        "volume": np.full(len(index), 1_000_000),
+    }, index=index)
+
+    # Context filters need market data and preconditions may reject the series; neither compiles kernels
+    warm_rules = RulesConfig(entry_signals=rules_config.entry_signals[:1], exit_conditions=rules_config.exit_conditions)
+    warm_windows = WalkForwardConfig(
+        enabled=True, training_period="180d", testing_period="90d", step_size="90d", min_trades_per_period=1
+    )
+    bt = Backtester(hold_period=app_config.hold_period, min_trades_threshold=0)
+    bt.walk_forward_backtest(frame, warm_windows, warm_rules, "WARMUP", app_config.edge_score_weights, app_config)
+    logger.info(f"Backtesting kernels warmed up in {time.perf_counter() - start:.1f}s")
+
+
+def create_server(
+    token: str, host: str = "127.0.0.1", port: int = DEFAULT_PORT, executor: Optional[Executor] = None
+) -> HTTPServer:
+    """Builds (but does not start) the HTTP server. ``port=0`` picks a free port.
+
+    Raises:
+        ValueError: If ``host`` is not a loopback address
+    """
+    _require_loopback(host)
+    execute = executor or _invoke_cli
+    started = time.monotonic()
+    stats = {"requests": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status: int, body: Dict[str, Any]) -> None:
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self) -> None:
+            if self.path != "/health":
+                self._reply(404, {"error": f"Unknown path: {self.path}"})
+                return
+            self._reply(200, {
+                "status": "ok",
+                "uptime_s": round(time.monotonic() - started, 1),
+                "requests": stats["requests"],
+                "cached_frames": data.frame_cache_size(),
+            })
+
+        def do_POST(self) -> None:
+            if self.path != "/invoke":
+                self._reply(404, {"error": f"Unknown path: {self.path}"})
+                return
+            # Browsers send Origin on cross-site POSTs and can't set a JSON type or custom header without preflight
+            if self.headers.get("Origin") is not None:
+                self._reply(403, {"error": "Cross-origin requests are not allowed"})
+                return
+            if not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ""), token):
+                self._reply(403, {"error": "Missing or invalid server token"})
+                return
+            if self.headers.get_content_type() != "application/json":
+                self._reply(415, {"error": "Content-Type must be application/json"})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                argv = [str(arg) for arg in request["argv"]]
+                cwd = str(request.get("cwd") or os.getcwd())
+            except (ValueError, KeyError, TypeError) as e:
+                self._reply(400, {"error": f"Malformed request: {e}"})
+                return
+            command = _command_name(argv)
+            if command not in FORWARDED_COMMANDS:
+                self._reply(403, {"error": f"Command not allowed on the server: {command}"})
+                return
+            stats["requests"] += 1
+            logger.info(f"Serving: {' '.join(argv)}")
+            exit_code, output = execute(argv, cwd)
+            self._reply(200, {"exit_code": exit_code, "output": output})
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug(f"{self.address_string()} {format % args}")
+
+    return HTTPServer((host, port), Handler)
+
+
+# impure
+def serve_forever(
+    host: str, port: int, app_config: Config, rules_config: RulesConfig, warm_up: bool = True
+) -> None:
+    """Warms the backtesting stack, then serves commands until interrupted.
+
+    Raises:
+        ValueError: If ``host`` is not a loopback address
+    """
+    _require_loopback(host)
+    os.environ.pop(SERVER_ENV_VAR, None)  # Commands run here must never forward to a server again
+    data.enable_frame_cache()
+    if warm_up:
+        _warm_up(app_config, rules_config)
+
+    token = secrets.token_urlsafe(32)
+    server = create_server(token, host, port)
+    token_path = Path(app_config.cache_dir) / TOKEN_FILENAME
+    _write_token(token_path, token)  # Only once bound, so a failed start leaves a running server's token alone
+    logger.info(f"KISS Signal server listening on http://{host}:{server.server_port} (token in {token_path})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Server stopped")
+    finally:
+        server.server_close()
+        token_path.unlink(missing_ok=True)
+
+
+# impure
+def invoke_remote(
+    url: str, argv: List[str], cwd: str, token: str, timeout: Optional[float] = None
+) -> Tuple[int, str]:
+    """Client side: runs a CLI command on a server. Returns (exit code, output).
+
+    Raises:
+        OSError: If the server is unreachable or replies with an error
+    """
+    body = json.dumps({"argv": argv, "cwd": cwd}).encode("utf-8")
+    request = urllib.request.Request(
+        f"{url.rstrip('/')}/invoke",
+        data=body,
+        headers={"Content-Type": "application/json", TOKEN_HEADER: token},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        reply = json.loads(response.read())
+    return int(reply["exit_code"]), str(reply["output"])
@@ -0,0 +1,811 @@
+"""Streaming - Bar-by-bar signal engine for daily evaluation.
+
+The batch rules recompute every indicator over the whole history to learn
+whether the last bar fires. Each stream here is the incremental counterpart of
+one rule: ``update(bar) -> signal`` advances a few accumulators (running EMA,
+ring-buffered SMA/std window, monotonic max/min deque, Wilder RSI/ATR, previous
+values for crossovers) in O(1) per bar.
+
+The accumulators repeat the batch kernels' floating-point steps (pandas' ewm
+recursion, the Kahan/Welford rolling sums), so a stream's signal on a bar equals
+the batch function's on that bar. A stream returns False until the history is as
+long as its batch function requires. The one exception is ``chandelier_exit``,
+whose ATR stays undefined for its first ``atr_period`` bars instead of adapting
+the period as ``calculate_atr`` does for short histories.
+
+Stream states are plain JSON-serialisable dicts, persisted per symbol in the
+indicator_state table next to ``indicator_state``'s position-monitoring states,
+and synced the same way: new bars are applied incrementally, and a state whose
+last bar is gone or revised is rebuilt by replaying the history. Callers read
+only the bars from ``history_start`` on and pass a loader for the full history,
+which is needed only for rebuilds and rules without a stream, so today's signals
+for the universe cost O(symbols), not O(symbols x history).
+"""
+
+import json
+import logging
+import math
+from collections import deque
+from datetime import date
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import pandas as pd
+
+from . import indicator_state, kernels, rules
+
+__all__ = [
+    "STREAMS",
+    "stream_key",
+    "create_stream",
+    "build_stream_state",
+    "advance_stream",
+    "sync_stream",
+    "history_start",
+    "latest_signals",
+]
+
+logger = logging.getLogger(__name__)
+
+_NAN = float("nan")
+
+# Exit-only rules that generate_signals_for_stack drops from entry stacks
+_NOT_ENTRY_SIGNALS = {"stop_loss_atr", "take_profit_atr"}
+
+
+def _divide(a: float, b: float) -> float:
+    """a / b with IEEE semantics (x/0 is +-inf, 0/0 is NaN), as in pandas."""
+    try:
+        return a / b
+    except ZeroDivisionError:
+        if a != a or a == 0:
+            return _NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+
+
+class _Stateful:
+    """Base for accumulators and streams whose attributes are their whole state."""
+
+    def state(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for name, value in vars(self).items():
+            if isinstance(value, _Stateful):
+                value = value.state()
+            elif isinstance(value, deque):
+                value = list(value)
+            out[name] = value
+        return out
+
+    def load(self, state: Mapping[str, Any]) -> None:
+        for name, value in state.items():
+            current = getattr(self, name, None)
+            if isinstance(current, _Stateful):
+                current.load(value)
+            elif isinstance(current, deque):
+                setattr(self, name, deque(tuple(v) if isinstance(v, list) else v for v in value))
+            else:
+                setattr(self, name, value)
+
+
+# ===== Accumulators =====
+
+class _Ewm(_Stateful):
+    """``ewm(alpha=alpha, adjust=adjust, min_periods=...).mean()``, one bar at a time."""
+
+    def __init__(self, alpha: float, adjust: bool, min_periods: int = 0) -> None:
+        self.alpha = alpha
+        self.adjust = adjust
+        self.min_periods = max(min_periods, 1)
+        self.weighted = _NAN
+        self.old_wt = 1.0
+        self.nobs = 0
+        self.started = False
+
+    def update(self, value: float) -> float:
+        is_observation = value == value
+        self.nobs += is_observation
+        if not self.started:
+            self.started = True
+            self.weighted = value
+        elif self.weighted == self.weighted:
+            self.old_wt *= 1.0 - self.alpha  # Missing bars still decay the old weight, as in pandas
+            if is_observation:
+                new_wt = 1.0 if self.adjust else self.alpha
+                if self.weighted != value:
+                    self.weighted = (self.old_wt * self.weighted + new_wt * value) / (self.old_wt + new_wt)
+                self.old_wt = self.old_wt + new_wt if self.adjust else 1.0
+        elif is_observation:
+            self.weighted = value
+        return self.weighted if self.nobs >= self.min_periods else _NAN
+
+
+def _span_alpha(span: int) -> float:
+    return 1.0 / (1.0 + (span - 1) / 2.0)  # pandas' span -> centre of mass -> alpha
+
+
+class _RollingMean(_Stateful):
+    """``kernels.rolling_mean`` one bar at a time (same Kahan sums, so bit-identical)."""
+
+    def __init__(self, window: int, min_periods: Optional[int] = None) -> None:
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.values: deque = deque()
+        self.nobs = 0
+        self.neg_ct = 0
+        self.sum_x = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.same_run = 0
+        self.prev_value = _NAN
+        self.started = False
+
+    def update(self, value: float) -> float:
+        if not self.started:
+            self.started = True
+            self.prev_value = value
+        if self.window == 1:
+            self.nobs = self.neg_ct = self.same_run = 0
+            self.sum_x = self.comp_add = self.comp_remove = 0.0
+            self.prev_value = value
+        elif len(self.values) == self.window:
+            old = self.values.popleft()
+            if old == old:
+                self.nobs -= 1
+                self.sum_x, self.comp_remove = kernels.kahan_add(self.sum_x, self.comp_remove, -old)
+                if math.copysign(1.0, old) < 0:
+                    self.neg_ct -= 1
+        if self.window > 1:
+            self.values.append(value)
+        if value == value:
+            self.nobs += 1
+            self.sum_x, self.comp_add = kernels.kahan_add(self.sum_x, self.comp_add, value)
+            if math.copysign(1.0, value) < 0:
+                self.neg_ct += 1
+            self.same_run = self.same_run + 1 if value == self.prev_value else 1
+            self.prev_value = value
+
+        if not (self.nobs >= self.min_periods and self.nobs > 0):
+            return _NAN
+        result = self.sum_x / self.nobs
+        if self.same_run >= self.nobs:
+            return self.prev_value
+        if (self.neg_ct == 0 and result < 0) or (self.neg_ct == self.nobs and result > 0):
+            return 0.0
+        return result
+
+
+class _RollingStd(_Stateful):
+    """``kernels.rolling_std`` one bar at a time (same Welford updates)."""
+
+    def __init__(self, window: int, ddof: int = 1) -> None:
+        self.window = window
+        self.ddof = ddof
+        self.values: deque = deque()
+        self.nobs = 0
+        self.mean_x = 0.0
+        self.ssqdm_x = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.same_run = 0
+        self.prev_value = _NAN
+        self.started = False
+
+    def update(self, value: float) -> float:
+        if not self.started:
+            self.started = True
+            self.prev_value = value
+        if self.window == 1:
+            self.nobs = self.same_run = 0
+            self.mean_x = self.ssqdm_x = self.comp_add = self.comp_remove = 0.0
+            self.prev_value = value
+        elif len(self.values) == self.window:
+            old = self.values.popleft()
+            if old == old:
+                self.nobs -= 1
+                if self.nobs:
+                    prev_mean = self.mean_x - self.comp_remove
+                    y = old - self.comp_remove
+                    t = y - self.mean_x
+                    self.comp_remove = t + self.mean_x - y
+                    self.mean_x = self.mean_x - t / self.nobs
+                    self.ssqdm_x = self.ssqdm_x - (old - prev_mean) * (old - self.mean_x)
+                else:
+                    self.mean_x = self.ssqdm_x = 0.0
+        if self.window > 1:
+            self.values.append(value)
+        if value == value:
+            self.same_run = self.same_run + 1 if value == self.prev_value else 1
+            self.prev_value = value
+            self.nobs += 1
+            prev_mean = self.mean_x - self.comp_add
+            y = value - self.comp_add
+            t = y - self.mean_x
+            self.comp_add = t + self.mean_x - y
+            self.mean_x = self.mean_x + t / self.nobs
+            self.ssqdm_x = self.ssqdm_x + (value - prev_mean) * (value - self.mean_x)
+
+        if not (self.nobs >= self.window and self.nobs > self.ddof):
+            return _NAN
+        if self.nobs == 1 or self.same_run >= self.nobs:
+            return 0.0
+        return math.sqrt(max(self.ssqdm_x / (self.nobs - self.ddof), 0.0))
+
+
+class _RollingExtreme(_Stateful):
+    """``kernels.rolling_max``/``rolling_min`` one bar at a time (monotonic deque)."""
+
+    def __init__(self, window: int, is_max: bool, min_periods: Optional[int] = None) -> None:
+        self.window = window
+        self.is_max = is_max
+        self.min_periods = window if min_periods is None else min_periods
+        self.values: deque = deque()  # Last `window` values, to know when a valid bar leaves
+        self.candidates: deque = deque()  # (bar, value), values decreasing (max) from the left
+        self.nobs = 0
+        self.bars = 0
+
+    def update(self, value: float) -> float:
+        if len(self.values) == self.window:
+            old = self.values.popleft()
+            if old == old:
+                self.nobs -= 1
+        self.values.append(value)
+        if self.candidates and self.candidates[0][0] <= self.bars - self.window:
+            self.candidates.popleft()
+        if value == value:
+            self.nobs += 1
+            while self.candidates and (
+                self.candidates[-1][1] <= value if self.is_max else self.candidates[-1][1] >= value
+            ):
+                self.candidates.pop()
+            self.candidates.append((self.bars, value))
+        self.bars += 1
+        if self.candidates and self.nobs >= self.min_periods and self.nobs > 0:
+            return float(self.candidates[0][1])
+        return _NAN
+
+
+class _Rsi(_Stateful):
+    """``calculate_rsi`` one bar at a time (Wilder-smoothed gains and losses)."""
+
+    def __init__(self, period: int) -> None:
+        alpha = kernels._pandas_alpha(period)
+        self.avg_gain = _Ewm(alpha, adjust=False)
+        self.avg_loss = _Ewm(alpha, adjust=False)
+        self.prev_close = _NAN
+        self.started = False
+
+    def update(self, close: float) -> float:
+        gain = loss = 0.0  # The first bar has no change; NaN changes count as neither
+        if self.started:
+            delta = close - self.prev_close
+            if delta > 0:
+                gain = delta
+            elif delta < 0:
+                loss = -delta
+        self.started = True
+        self.prev_close = close
+        avg_gain, avg_loss = self.avg_gain.update(gain), self.avg_loss.update(loss)
+        rs = _divide(avg_gain, avg_loss if avg_loss != 0 else 1e-10)
+        return 100 - (100 / (1 + rs))
+
+
+class _Atr(_Stateful):
+    """``calculate_atr`` one bar at a time, for histories of at least ``period`` bars."""
+
+    def __init__(self, period: int) -> None:
+        if period <= 1:
+            raise ValueError(f"period ({period}) must be > 1")
+        self.ewm = _Ewm(kernels._pandas_alpha(period), adjust=False, min_periods=period)
+        self.prev_close = _NAN
+        self.started = False
+
+    def update(self, high: float, low: float, close: float) -> float:
+        true_range = high - low
+        if self.started:
+            for term in (abs(high - self.prev_close), abs(low - self.prev_close)):
+                if term > true_range or (true_range != true_range and term == term):
+                    true_range = term
+        self.started = True
+        self.prev_close = close
+        return self.ewm.update(true_range)
+
+
+# ===== Rule streams =====
+
+class _RuleStream(_Stateful):
+    """A rule's incremental counterpart. ``update`` returns the signal of the new bar."""
+
+    min_bars = 0  # Shortest history on which the batch rule can fire
+
+    def __init__(self) -> None:
+        self.bars = 0
+
+    def update(self, bar: Mapping[str, float]) -> bool:
+        self.bars += 1
+        signal = self._step(bar)
+        return bool(signal) and self.bars >= self.min_bars
+
+    def _step(self, bar: Mapping[str, float]) -> bool:
+        raise NotImplementedError
+
+
+class _SmaCross(_RuleStream):
+    def __init__(self, fast_period: int = 10, slow_period: int = 20, under: bool = False) -> None:
+        super().__init__()
+        if fast_period >= slow_period:
+            raise ValueError(f"fast_period ({fast_period}) must be < slow_period ({slow_period})")
+        self.fast = _RollingMean(fast_period)
+        self.slow = _RollingMean(slow_period)
+        self.under = under
+        self.min_bars = slow_period + 1 if under else slow_period
+        self.prev_fast = _NAN
+        self.prev_slow = _NAN
+
+    def _step(self, bar: Mapping[str, float]) -> bool:
+        fast, slow = self.fast.update(bar["close"]), self.slow.update(bar["close"])
+        if self.under:
+            signal = self.prev_fast > self.prev_slow and fast < slow
+        else:
+            signal = fast > slow and self.prev_fast <= self.prev_slow
+        self.prev_fast, self.prev_slow = fast, slow
+        return signal
+
+
+class _EmaCrossover(_RuleStream):
+    def __init__(self, fast_period: int = 10, slow_period: int = 20) -> None:
+        super().__init__()
+        if fast_period >= slow_period:
+            raise ValueError(f"fast_period ({fast_period}) must be < slow_period ({slow_period})")
+        self.fast = _Ewm(_span_alpha(fast_period), adjust=False)
+        self.slow = _Ewm(_span_alpha(slow_period), adjust=False)
+        self.min_bars = slow_period
+        self.prev_fast = _NAN
+        self.prev_slow = _NAN
+
+    def _step(self, bar: Mapping[str, float]) -> bool:
+        fast, slow = self.fast.update(bar["close"]), self.slow.update(bar["close"])
+        signal = fast > slow and self.prev_fast <= self.prev_slow
+        self.prev_fast, self.prev_slow = fast, slow
+        return signal
+
+
+class _MacdCrossover(_RuleStream):
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> None:
+        super().__init__()
+        if fast_period >= slow_period:
+            raise ValueError(f"fast_period ({fast_period}) must be < slow_period ({slow_period})")
+        if signal_period <= 0:
+            raise ValueError(f"signal_period ({signal_period}) must be > 0")
+        self.fast = _Ewm(_span_alpha(fast_period), adjust=True)
+        self.slow = _Ewm(_span_alpha(slow_period), adjust=True)
+        self.signal_line = _Ewm(_span_alpha(signal_period), adjust=True)
+        self.min_bars = slow_period + signal_period
+        self.prev_macd = _NAN
+        self.prev_signal = _NAN
+
+    def _step(self, bar: Mapping[str, float]) -> bool:
+        macd = self.fast.update(bar["close"]) - self.slow.update(bar["close"])
+        signal_value = self.signal_line.update(macd)
+        signal = macd > signal_value and self.prev_macd <= self.prev_signal
+        self.prev_macd, self.prev_signal = macd, signal_value
+        return signal
+
+
+class _RsiOversold(_RuleStream):
+    def __init__(self, period: int = 14, oversold_threshold: float = 30.0) -> None:
+        super().__init__()
+        self.rsi = _Rsi(period)
+        self.threshold = oversold_threshold
+        self.min_bars = period + 1
+        self.prev_rsi = _NAN
+
+    def _step(self, bar: Mapping[str, float]) -> bool:
+        rsi = self.rsi.update(bar["close"])
+        signal = rsi > 40.0 or (rsi >= self.threshold and self.prev_rsi < self.threshold)
+        self.prev_rsi = rsi
+        return signal
+
+
+class _VolumeSpike(_RuleStream):
+    def __init__(self, period: int = 20, spike_multiplier: float = 2.0, price_change_threshold: float = 0.01) -> None:
+        super().__init__()
+        if period <= 0:
+            raise ValueError(f"period ({period}) must be > 0")
+        if spike_multiplier <= 1.0:
+            raise ValueError(f"spike_multiplier ({spike_multiplier}) must be > 1.0")
+        if price_change_threshold <= 0:
+            raise ValueError(f"price_change_threshold ({price_change_threshold}) must be > 0")
+        self.avg_volume = _RollingMean(period)
+        self.spike_multiplier = spike_multiplier
+        self.price_change_threshold = price_change_threshold
+        self.min_bars = period
+        self.prev_close = _NAN
+
+    def _step(self, bar: Mapping[str, float]) -> bool:
+        avg_volume = self.avg_volume.update(bar["volume"])
+        price_change = abs(_divide(bar["close"], self.prev_close) - 1)
+        self.prev_close = bar["close"]
+        return bar["volume"] > self.spike_multiplier * avg_volume and price_change > self.price_change_threshold
+
+
+class _HammerPattern(_RuleStream):
+    def __init__(self, body_ratio: float = 0.3, shadow_ratio: float = 2.0) -> None:
+        super().__init__()
+        self.body_ratio = float(body_ratio)
+        self.shadow_ratio = float(shadow_ratio)
+        if not (0 < self.body_ratio < 1):
+            raise ValueError(f"body_ratio ({body_ratio}) must be between 0 and 1")
+        if self.shadow_ratio <= 0:
+            raise ValueError(f"shadow_ratio ({shadow_ratio}) must be > 0")
+
+    def _step(self, bar: Mapping[str, float]) -> bool:
+        body = abs(bar["close"] - bar["open"])
+        lower_shadow = min(bar["open"], bar["close"]) - bar["low"]
+        upper_shadow = bar["high"] - max(bar["open"], bar["close"])
+        return (
+            body > 0
+            and body <= self.body_ratio * (bar["high"] - bar["low"])
+            and lower_shadow >= self.shadow_ratio * body
+            and upper_shadow <= lower_shadow / 2.0
+        )
+
+
+class _EngulfingPattern(_RuleStream):
+    min_bars = 2
+
+    def __init__(self, min_body_ratio: float = 1.2) -> None:
+        super().__init__()
+        if min_body_ratio <= 1.0:
+            raise ValueError(f"min_body_ratio ({min_body_ratio}) must be > 1.0")
+        self.min_body_ratio = min_body_ratio
+        self.prev_open = _NAN
+        self.prev_close = _NAN
+
+    def _step(self, bar: Mapping[str, float]) -> bool:
+        prev_open, prev_close = self.prev_open, self.prev_close
+        self.prev_open, self.prev_close = bar["open"], bar["close"]
+        return (
+            prev_close < prev_open
+            and bar["close"] > bar["open"]
+            and abs(bar["close"] - bar["open"]) >= self.min_body_ratio * abs(prev_close - prev_open)
+            and bar["close"] > prev_open
+            and bar["open"] <= prev_close
+        )
+
+
+class _BollingerSqueeze(_RuleStream):
+    def __init__(self, period: int = 20, std_dev: float = 2.0, squeeze_threshold: float = 0.1) -> None:
+        super().__init__()
+        if period <= 0:
+            raise ValueError(f"period ({period}) must be > 0")
+        if std_dev <= 0:
+            raise ValueError(f"std_dev ({std_dev}) must be > 0")
+        if squeeze_threshold <= 0:
+            raise ValueError(f"squeeze_threshold ({squeeze_threshold}) must be > 0")
+        self.sma = _RollingMean(period)
+        self.std = _RollingStd(period)
+        self.std_dev = std_dev
+        self.squeeze_threshold = squeeze_threshold
+        self.min_bars = period + 5
+        self.was_in_squeeze = False
+
+    def _step(self, bar: Mapping[str, float]) -> bool:
+        sma, std = self.sma.update(bar["close"]), self.std.update(bar["close"])
+        upper_band = sma + (self.std_dev * std)
+        lower_band = sma - (self.std_dev * std)
+        in_squeeze = _divide(upper_band - lower_band, sma) < self.squeeze_threshold
+        signal = bar["close"] > upper_band and self.was_in_squeeze
+        self.was_in_squeeze = in_squeeze
+        return signal
+
+
+class _PriceAboveSma(_RuleStream):
+    def __init__(self, period: int = 50) -> None:
+        super().__init__()
+        if period <= 0:
+            raise ValueError(f"SMA period must be positive, got {period}")
+        self.sma = _RollingMean(period)
+        self.min_bars = period
+
+    def _step(self, bar: Mapping[str, float]) -> bool:
+        return bar["close"] > self.sma.update(bar["close"])
+
+
+class _IsVolatile(_RuleStream):
+    def __init__(self, period: int = 14, atr_threshold_pct: float = 0.02) -> None:
+        super().__init__()
+        if period <= 0 or atr_threshold_pct <= 0:
+            raise ValueError(f"Period and threshold must be positive, got period={period}, threshold={atr_threshold_pct}")
+        self.atr = _Atr(period)
+        self.atr_threshold_pct = atr_threshold_pct
+        self.min_bars = period + 1
+
+    def _step(self, bar: Mapping[str, float]) -> bool:
+        return _divide(self.atr.update(bar["high"], bar["low"], bar["close"]), bar["close"]) > self.atr_threshold_pct
+
+
+class _SimpleTrailingStop(_RuleStream):
+    def __init__(self, trail_percent: float = 0.05) -> None:
+        super().__init__()
+        if trail_percent <= 0:
+            raise ValueError(f"Trail percent must be positive, got {trail_percent}")
+        self.trail_percent = trail_percent
+        self.high_water_mark = _NAN
+
+    def _step(self, bar: Mapping[str, float]) -> bool:
+        close = bar["close"]
+        if close == close and not close <= self.high_water_mark:
+            self.high_water_mark = close
+        return close <= self.high_water_mark * (1 - self.trail_percent)
+
+
+class _ChandelierExit(_RuleStream):
+    def __init__(self, atr_period: int = 22, atr_multiplier: float = 3.0) -> None:
+        super().__init__()
+        if atr_period <= 1:
+            raise ValueError(f"ATR period must be > 1, got {atr_period}")
+        if atr_multiplier <= 0:
+            raise ValueError(f"ATR multiplier must be positive, got {atr_multiplier}")
+        self.atr = _Atr(atr_period)
+        self.highest_high = _RollingExtreme(atr_period, is_max=True, min_periods=1)
+        self.atr_multiplier = atr_multiplier
+
+    def _step(self, bar: Mapping[str, float]) -> bool:
+        atr = self.atr.update(bar["high"], bar["low"], bar["close"])
+        return bar["close"] <= self.highest_high.update(bar["high"]) - (self.atr_multiplier * atr)
+
+
+class _DonchianChannel(_RuleStream):
+    def __init__(self, period: int, breakout: bool) -> None:
+        super().__init__()
+        if period <= 0:
+            raise ValueError(f"Donchian period must be positive, got {period}")
+        self.channel = _RollingExtreme(period, is_max=breakout)
+        self.breakout = breakout
+        self.min_bars = period + 1
+        self.prev_channel = _NAN
+
+    def _step(self, bar: Mapping[str, float]) -> bool:
+        prev_channel = self.prev_channel
+        self.prev_channel = self.channel.update(bar["high"] if self.breakout else bar["low"])
+        return bar["close"] > prev_channel if self.breakout else bar["close"] < prev_channel
+
+
+# Rule type -> stream factory (keyword parameters as in rules.yaml)
+STREAMS: Dict[str, Callable[..., _RuleStream]] = {
+    "sma_crossover": _SmaCross,
+    "sma_cross_under": lambda fast_period, slow_period: _SmaCross(fast_period, slow_period, under=True),
+    "ema_crossover": _EmaCrossover,
+    "macd_crossover": _MacdCrossover,
+    "rsi_oversold": _RsiOversold,
+    "volume_spike": _VolumeSpike,
+    "hammer_pattern": _HammerPattern,
+    "engulfing_pattern": _EngulfingPattern,
+    "bollinger_squeeze": _BollingerSqueeze,
+    "price_above_sma": _PriceAboveSma,
+    "price_above_long_sma": lambda period=200: _PriceAboveSma(period),
+    "market_above_sma": _PriceAboveSma,
+    "is_volatile": _IsVolatile,
+    "simple_trailing_stop": _SimpleTrailingStop,
+    "chandelier_exit": _ChandelierExit,
+    "donchian_breakout": lambda period=20: _DonchianChannel(period, breakout=True),
+    "donchian_breakdown": lambda period=10: _DonchianChannel(period, breakout=False),
+}
+
+
+def _rule_type_and_params(rule_def: Any) -> Tuple[str, Dict[str, Any]]:
+    if isinstance(rule_def, dict):
+        rule_type, params = rule_def.get("type", ""), rule_def.get("params", {})
+    else:
+        rule_type, params = rule_def.type, rule_def.params
+    return str(rule_type), {key: value for key, value in (params or {}).items() if key != "index_symbol"}
+
+
+def stream_key(rule_def: Any) -> str:
+    """indicator_state key of a rule's stream; changes whenever the rule's parameters do."""
+    rule_type, params = _rule_type_and_params(rule_def)
+    return f"stream:{rule_type}:{json.dumps(params, sort_keys=True)}"
+
+
+def create_stream(rule_def: Any) -> _RuleStream:
+    """A fresh stream for a rule definition (RuleDef or dict).
+
+    Raises:
+        ValueError: If the rule type has no streaming counterpart or the
+            parameters are invalid
+    """
+    rule_type, params = _rule_type_and_params(rule_def)
+    if rule_type not in STREAMS:
+        raise ValueError(f"Rule '{rule_type}' has no streaming counterpart")
+    try:
+        return STREAMS[rule_type](**params)
+    except TypeError as e:
+        raise ValueError(f"Invalid parameters for streaming rule '{rule_type}': {e}") from e
+
+
+def _bars(price_data: pd.DataFrame) -> List[Tuple[Any, Dict[str, float]]]:
+    columns = [column for column in ("open", "high", "low", "close", "volume") if column in price_data.columns]
+    values = price_data[columns].to_numpy(dtype=float, na_value=_NAN)
+    return [(label, dict(zip(columns, row))) for label, row in zip(price_data.index, values.tolist())]
+
+
+def _replay(stream: _RuleStream, state: Dict[str, Any], bars: List[Tuple[Any, Dict[str, float]]]) -> Dict[str, Any]:
+    for label, bar in bars:
+        state["signal"] = stream.update(bar)
+        state["last_date"] = str(label)
+        state["last_close"] = bar["close"]
+    state["stream"] = stream.state()
+    return state
+
+
+def build_stream_state(rule_def: Any, price_data: pd.DataFrame) -> Dict[str, Any]:
+    """Replays the full history through a fresh stream (the slow path)."""
+    state = {"key": stream_key(rule_def), "signal": False, "last_date": None, "last_close": None}
+    return _replay(create_stream(rule_def), state, _bars(price_data))
+
+
+def advance_stream(
+    rule_def: Any, state: Optional[Dict[str, Any]], price_data: pd.DataFrame
+) -> Optional[Dict[str, Any]]:
+    """Feeds a stream the bars of price_data after its state's last bar.
+
+    price_data only needs to start at (or before) the state's last bar, so
+    callers can pass a short tail of the history.
+
+    Returns:
+        The updated state, or None when it must be rebuilt from the full
+        history: it is missing, belongs to other rule parameters, or its last
+        bar is not in price_data with the same close
+    """
+    key = stream_key(rule_def)
+    if state is None or state.get("key") != key or state.get("last_date") is None:
+        return None
+    pos = indicator_state.locate_last_bar(state, price_data)
+    last_close = state.get("last_close")
+    if pos is None or last_close is None or not math.isclose(float(price_data["close"].iloc[pos]), last_close):
+        logger.debug(f"Stream state {key} is stale")
+        return None
+    stream = create_stream(rule_def)
+    stream.load(state["stream"])
+    return _replay(stream, state, _bars(price_data.iloc[pos + 1:]))
+
+
+def sync_stream(
+    rule_def: Any, state: Optional[Dict[str, Any]], price_data: pd.DataFrame
+) -> Tuple[Dict[str, Any], bool]:
+    """Brings a rule's stream state up to the last bar of price_data.
+
+    Bars after the state's last bar are fed to the stream one by one. The state
+    is rebuilt from price_data when ``advance_stream`` cannot advance it.
+
+    Returns:
+        Tuple of (state with ``signal`` for the last bar, rebuilt)
+    """
+    advanced = advance_stream(rule_def, state, price_data)
+    if advanced is not None:
+        return advanced, False
+    return build_stream_state(rule_def, price_data), True
+
+
+def _signal_rules(rules_config: Any) -> List[Any]:
+    """Per-symbol rules behind an entry: preconditions, then entry signals."""
+    entry_rules = [r for r in rules_config.entry_signals if _rule_type_and_params(r)[0] not in _NOT_ENTRY_SIGNALS]
+    return [*rules_config.preconditions, *entry_rules]
+
+
+def history_start(rules_config: Any, symbol_states: Optional[Mapping[str, Dict[str, Any]]]) -> Optional[date]:
+    """First date a symbol's price read must include for ``latest_signals``.
+
+    That is the earliest last bar over the streams of its preconditions and
+    entry signals. None means the full history is needed: a rule has no
+    stream or no usable state yet.
+    """
+    last_dates = []
+    for rule_def in _signal_rules(rules_config):
+        if _rule_type_and_params(rule_def)[0] not in STREAMS:
+            return None
+        state = (symbol_states or {}).get(stream_key(rule_def))
+        if state is None or state.get("last_date") is None:
+            return None
+        try:
+            last_dates.append(pd.Timestamp(state["last_date"]).date())
+        except (TypeError, ValueError):
+            return None
+    return min(last_dates) if last_dates else None
+
+
+def _latest_signal(
+    rule_def: Any,
+    price_data: pd.DataFrame,
+    symbol_states: Optional[Dict[str, Dict[str, Any]]],
+    full_history: Callable[[], pd.DataFrame],
+) -> bool:
+    """Today's signal of one rule: streamed when possible, else the batch rule's last bar."""
+    rule_type, params = _rule_type_and_params(rule_def)
+    if rule_type in STREAMS and symbol_states is not None:
+        key = stream_key(rule_def)
+        state = advance_stream(rule_def, symbol_states.get(key), price_data)
+        if state is None:
+            state = build_stream_state(rule_def, full_history())
+        symbol_states[key] = state
+        return bool(state["signal"])
+    history = full_history()
+    if rule_type == "expression":
+        from . import expressions
+
+        signals = expressions.evaluate(params.get("expr", ""), history)
+    else:
+        signals = getattr(rules, rule_type)(history, **params)
+    return bool(signals.iloc[-1]) if len(signals) else False
+
+
+def _history_of(
+    symbol: str, price_data: pd.DataFrame, history_loader: Optional[Callable[[str], pd.DataFrame]]
+) -> Callable[[], pd.DataFrame]:
+    """Loads a symbol's full history at most once, and only if a rule needs it."""
+    if history_loader is None:
+        return lambda: price_data
+    loaded: List[pd.DataFrame] = []
+
+    def load() -> pd.DataFrame:
+        if not loaded:
+            loaded.append(history_loader(symbol))
+        return loaded[0]
+    return load
+
+
+def latest_signals(
+    price_frames: Mapping[str, pd.DataFrame],
+    rules_config: Any,
+    states: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+    market_data: Optional[pd.DataFrame] = None,
+    market_symbol: str = "^NSEI",
+    history_loader: Optional[Callable[[str], pd.DataFrame]] = None,
+) -> Dict[str, bool]:
+    """Whether each symbol's entry rules fire on its last bar.
+
+    A symbol fires when every precondition, every context filter (evaluated
+    on ``market_data``) and every entry signal holds on the last bar, as in
+    the backtester. Rules with a streaming counterpart advance persisted
+    states; others (expressions, ATR stops) fall back to the batch function.
+
+    Args:
+        price_frames: Price history per symbol (lowercase OHLCV columns); with
+            a ``history_loader``, only the bars from ``history_start`` on
+        rules_config: RulesConfig with preconditions, context filters and entries
+        states: Persisted states ({symbol: {key: state}}), updated in place for
+            the caller to save; None evaluates every rule in batch
+        market_data: Index history for context filters; without it, a rules
+            config with context filters fires for no symbol
+        market_symbol: Symbol the market states are stored under
+        history_loader: Returns a symbol's full history, for stream rebuilds
+            and batch rules when price_frames hold tails
+    """
+    market_ok = True
+    if rules_config.context_filters:
+        if market_data is None:
+            logger.warning("Market data not provided for context filters; no entry can fire")
+            market_ok = False
+        else:
+            market_states = None if states is None else states.setdefault(market_symbol, {})
+            try:
+                market_ok = all(
+                    _latest_signal(f, market_data, market_states, _history_of(market_symbol, market_data, None))
+                    for f in rules_config.context_filters
+                )
+            except Exception as e:  # Fail safe, as the backtester does
+                logger.error(f"Failed to evaluate context filters: {e}")
+                market_ok = False
+
+    signals: Dict[str, bool] = {}
+    for symbol, price_data in price_frames.items():
+        if price_data is None or len(price_data) == 0:
+            continue
+        symbol_states = None if states is None else states.setdefault(symbol, {})
+        full_history = _history_of(symbol, price_data, history_loader)
+        try:
+            # Evaluate every rule, not just until one fails, so all states stay current
+            fired = [_latest_signal(rule, price_data, symbol_states, full_history) for rule in _signal_rules(rules_config)]
+            signals[symbol] = market_ok and all(fired)
+        except Exception as e:
+            logger.error(f"Failed to evaluate today's signal for {symbol}: {e}")
+    return signals
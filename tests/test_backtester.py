@@ -19,6 +19,7 @@ import logging
 import tempfile
 import importlib
 
+from kiss_signal import rules
 from kiss_signal.backtester import Backtester
 from kiss_signal.config import RuleDef, RulesConfig, EdgeScoreWeights, Config, WalkForwardConfig
 
@@ -1316,8 +1317,10 @@ class TestBacktesterIntegration:
         # Create a mock portfolio with low trade count
         mock_portfolio = Mock()
         mock_trades = Mock()
-        mock_trades.count.return_value = 5  # Below default min_trades_threshold of 10
+        mock_trades.values = np.zeros(5, dtype=[("col", "i8"), ("pnl", "f8"), ("return", "f8")])  # Below threshold of 10
         mock_portfolio.trades = mock_trades
+        mock_portfolio.returns.return_value = pd.Series(np.zeros(20))
+        mock_portfolio.returns_acc.ann_factor = 365.0
         
         combo = [sample_rules_config.entry_signals[0]]  # Use first entry signal
         edge_weights = EdgeScoreWeights(win_pct=0.6, sharpe=0.4)
@@ -2009,31 +2012,15 @@ class TestBacktesterEdgeCases:
         
         # Mock a portfolio with exactly 3 trades and real performance metrics
         mock_portfolio = Mock()
-        # Mock trades records as a list that supports len() - this is used in _backtest_single_strategy_oos
-        mock_trades_records = ['trade1', 'trade2', 'trade3']
-        mock_portfolio.trades.records_readable = mock_trades_records
-        mock_portfolio.trades.count.return_value = 3  # For _calculate_performance_metrics 
-        mock_portfolio.trades.win_rate.return_value = 0.6667  # 2 wins out of 3
-        mock_portfolio.sharpe_ratio.return_value = 1.2
-        mock_portfolio.trades.pnl.mean.return_value = 25.5
-        # Add returns mock for the new percentage calculation
-        mock_portfolio.trades.returns.mean.return_value = 0.255  # 25.5% as decimal
-        
-        # Mock np.isnan checks to return False for valid values
-        def mock_isnan(value):
-            if hasattr(value, 'return_value'):
-                return False  # Mock methods return valid numbers
-            return np.isnan(value)
-        
-        # Mock np.isinf to return False for valid numbers 
-        def mock_isinf(value):
-            if hasattr(value, 'return_value'):
-                return False  # Mock methods return valid finite numbers
-            return np.isinf(value)
-        
-        with patch('numpy.isnan', side_effect=mock_isnan), \
-             patch('numpy.isinf', side_effect=mock_isinf), \
-             patch('kiss_signal.backtester.vbt.Portfolio.from_signals', return_value=mock_portfolio), \
+        mock_portfolio.trades.values = np.array(
+            [(0, 40.0, 0.30), (0, 50.0, 0.50), (0, -13.5, -0.035)],  # 2 wins out of 3
+            dtype=[("col", "i8"), ("pnl", "f8"), ("return", "f8")],
+        )
+        # Daily returns with mean/std = sqrt(2); an annualization factor of 0.72 makes the Sharpe 1.2
+        mock_portfolio.returns.return_value = pd.Series([0.01, 0.03])
+        mock_portfolio.returns_acc.ann_factor = 0.72
+
+        with patch('kiss_signal.backtester.vbt.Portfolio.from_signals', return_value=mock_portfolio), \
              patch.object(edge_case_backtester, 'generate_signals_for_stack') as mock_signals, \
              patch.object(edge_case_backtester, '_generate_exit_signals') as mock_exit_signals, \
              patch.object(edge_case_backtester, '_calculate_risk_based_size') as mock_risk_size:
@@ -2067,9 +2054,9 @@ class TestBacktesterEdgeCases:
             assert result["total_trades"] == 3
             
             # CRITICAL: These should be the REAL calculated values, not artificially zeroed
-            assert result["win_pct"] == 0.6667  # Real calculated win rate
-            assert result["sharpe"] == 1.2      # Real calculated Sharpe
-            assert result["avg_return"] == 25.5 # Real calculated return (now as percentage)
+            assert result["win_pct"] == pytest.approx(2 / 3)  # Real calculated win rate
+            assert result["sharpe"] == pytest.approx(1.2)      # Real calculated Sharpe
+            assert result["avg_return"] == pytest.approx(25.5) # Real calculated return (now as percentage)
             
             # The bug signature was: total_trades > 0 but metrics = 0.0
             # This combination should now be impossible with our fix
@@ -2255,7 +2242,8 @@ class TestBacktesterEdgeCases:
             
             # Mock portfolio with zero trades
             mock_portfolio_instance = Mock()
-            mock_portfolio_instance.trades.count.return_value = 0
+            mock_portfolio_instance.trades.values = np.zeros(0, dtype=[("col", "i8"), ("pnl", "f8"), ("return", "f8")])
+            mock_portfolio_instance.returns.return_value = pd.Series(np.zeros(len(edge_case_data)))
             mock_portfolio.return_value = mock_portfolio_instance
             
             result = edge_case_backtester._backtest_combination(
@@ -2336,3 +2324,521 @@ if __name__ == "__main__":
 
 # Ensure logging is imported at the top
 import logging
+
+
+class TestWindowResultCache:
+    """Walk-forward windows with unchanged input bars are served from the cache."""
+
+    @pytest.fixture
+    def wf_data(self):
+        rng = np.random.default_rng(7)
+        index = pd.bdate_range("2022-01-03", periods=500)
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, len(index))))
+        return pd.DataFrame({
+            "open": close * 0.995, "high": close * 1.01, "low": close * 0.99,
+            "close": close, "volume": rng.integers(1_000_000, 2_000_000, len(index)),
+        }, index=index)
+
+    @pytest.fixture
+    def wf_setup(self):
+        rules_config = RulesConfig(entry_signals=[
+            RuleDef(name="sma_fast", type="sma_crossover", params={"fast_period": 5, "slow_period": 10}),
+        ])
+        wf_config = WalkForwardConfig(
+            enabled=True, training_period="180d", testing_period="60d", step_size="60d", min_trades_per_period=1
+        )
+        return Backtester(hold_period=10, min_trades_threshold=1), rules_config, wf_config
+
+    def test_unchanged_data_is_fully_cached(self, wf_data, wf_setup):
+        bt, rules_config, wf_config = wf_setup
+        from kiss_signal.backtester import WindowResultCache
+
+        first_cache = WindowResultCache()
+        first = bt.walk_forward_backtest(wf_data, wf_config, rules_config, "TEST", window_cache=first_cache)
+        assert first_cache.hits == 0 and first_cache.misses > 0
+
+        second_cache = WindowResultCache(list(first_cache.used.values()))
+        with patch.object(bt, "_run_window", side_effect=AssertionError("window should be cached")):
+            second = bt.walk_forward_backtest(wf_data, wf_config, rules_config, "TEST", window_cache=second_cache)
+
+        assert second_cache.misses == 0
+        assert second_cache.hits == first_cache.misses
+        assert not second_cache.changed
+        for key in ("total_trades", "win_pct", "sharpe", "avg_return", "edge_score", "consolidated_periods"):
+            assert second[0][key] == pytest.approx(first[0][key])
+        assert second[0]["rule_stack"][0].name == "sma_fast"
+
+    def test_cache_version_bump_misses_stored_windows(self, wf_data, wf_setup):
+        bt, rules_config, wf_config = wf_setup
+        from kiss_signal import backtester
+        from kiss_signal.backtester import WindowResultCache
+
+        first_cache = WindowResultCache()
+        bt.walk_forward_backtest(wf_data, wf_config, rules_config, "TEST", window_cache=first_cache)
+
+        second_cache = WindowResultCache(list(first_cache.used.values()))
+        with patch.object(backtester, "CACHE_VERSION", backtester.CACHE_VERSION + 1):
+            bt.walk_forward_backtest(wf_data, wf_config, rules_config, "TEST", window_cache=second_cache)
+
+        assert second_cache.hits == 0
+        assert second_cache.misses == first_cache.misses
+
+    def test_key_covers_market_warmup_bars(self, wf_data, wf_setup):
+        bt, _, _ = wf_setup
+        start, train_end, test_end = bt._get_rolling_periods(wf_data, 180, 60, 60)[-1]
+        pos = wf_data.index.get_loc(start)
+        sma_filter = RulesConfig(
+            entry_signals=[RuleDef(name="sma", type="sma_crossover", params={"fast_period": 5, "slow_period": 10})],
+            context_filters=[RuleDef(name="regime", type="market_above_sma", params={"period": 50})],
+        )
+        warmup = bt._context_warmup(sma_filter)
+        assert warmup == 50
+
+        def key(market, warmup):
+            return bt._window_cache_key(wf_data, market, start, train_end, test_end, warmup)
+
+        in_warmup = wf_data.copy()
+        in_warmup.iloc[pos - 10, in_warmup.columns.get_loc("close")] *= 1.1
+        before_warmup = wf_data.copy()
+        before_warmup.iloc[pos - 60, before_warmup.columns.get_loc("close")] *= 1.1
+
+        assert key(in_warmup, warmup) != key(wf_data, warmup)
+        assert key(before_warmup, warmup) == key(wf_data, warmup)
+        # An expression filter has no known lookback: every earlier market bar counts
+        expression_filter = RulesConfig(
+            entry_signals=sma_filter.entry_signals,
+            context_filters=[RuleDef(name="regime", type="expression", params={"expr": "close > sma(close, 50)"})],
+        )
+        assert bt._context_warmup(expression_filter) is None
+        assert key(before_warmup, None) != key(wf_data, None)
+
+    def test_precondition_memo_is_cleared_per_walk_forward(self, wf_data, wf_setup):
+        bt, rules_config, wf_config = wf_setup
+        bt._precondition_results[("OLD", "key", "digest")] = True
+
+        bt.walk_forward_backtest(wf_data, wf_config, rules_config, "TEST")
+
+        assert ("OLD", "key", "digest") not in bt._precondition_results
+
+    def test_results_list_every_window_in_order(self, wf_data, wf_setup):
+        bt, rules_config, wf_config = wf_setup
+        from kiss_signal.backtester import WindowResultCache
+
+        cache = WindowResultCache()
+        consolidated = bt.walk_forward_backtest(wf_data, wf_config, rules_config, "TEST", window_cache=cache)
+
+        windows = [result for result in cache.results() if result]
+        assert len(cache.results()) == cache.misses
+        starts = [result["oos_test_start"] for result in windows]
+        assert starts == sorted(starts)
+        assert sum(result["total_trades"] for result in windows) == consolidated[0]["total_trades"]
+
+    def test_revised_bar_recomputes_only_affected_windows(self, wf_data, wf_setup):
+        bt, rules_config, wf_config = wf_setup
+        from kiss_signal.backtester import WindowResultCache
+
+        first_cache = WindowResultCache()
+        bt.walk_forward_backtest(wf_data, wf_config, rules_config, "TEST", window_cache=first_cache)
+
+        # Revise the final bar of the last window, as a late data correction would
+        last_window_end = bt._get_rolling_periods(wf_data, 180, 60, 60)[-1][2]
+        revised = wf_data.copy()
+        revised.loc[last_window_end, "close"] *= 1.05
+        second_cache = WindowResultCache(list(first_cache.used.values()))
+        bt.walk_forward_backtest(revised, wf_config, rules_config, "TEST", window_cache=second_cache)
+
+        assert second_cache.hits > 0
+        assert 0 < second_cache.misses < first_cache.misses
+        assert second_cache.changed
+
+    def test_sliding_history_only_computes_new_windows(self, wf_data, wf_setup):
+        bt, rules_config, wf_config = wf_setup
+        from kiss_signal.backtester import WindowResultCache
+
+        first_cache = WindowResultCache()
+        bt.walk_forward_backtest(wf_data.iloc[:420], wf_config, rules_config, "TEST", window_cache=first_cache)
+        stored = list(first_cache.used.values())
+
+        # Later run: history trimmed by 30 bars at the start, 50 new bars at the end
+        slid = wf_data.iloc[30:470]
+        second_cache = WindowResultCache(stored)
+        bt.walk_forward_backtest(slid, wf_config, rules_config, "TEST", window_cache=second_cache)
+
+        old_starts = {row["training_start"] for row in stored}
+        new_starts = [start.isoformat() for start, _, _ in bt._get_rolling_periods(slid, 180, 60, 60)]
+        assert second_cache.hits == len(old_starts & set(new_starts)) > 0
+        assert second_cache.misses == len(set(new_starts) - old_starts) == 1
+
+    def test_window_grid_depends_only_on_dates(self, wf_data, wf_setup):
+        bt, _, _ = wf_setup
+        full = bt._get_rolling_periods(wf_data, 180, 60, 60)
+        trimmed = bt._get_rolling_periods(wf_data.iloc[17:], 180, 60, 60)
+
+        assert 0 <= wf_data.index.get_loc(full[0][0]) < 41
+        assert trimmed == [period for period in full if period[0] >= wf_data.index[17]]
+        assert all(np.busday_count("2000-01-03", start.date()) % 41 == 0 for start, _, _ in full)
+
+    def test_shifted_history_with_holidays_reuses_stored_windows(self, wf_setup):
+        bt, rules_config, _ = wf_setup
+        from kiss_signal.backtester import WindowResultCache
+
+        days = pd.bdate_range("2020-01-01", "2024-12-31")
+        index = days[np.arange(len(days)) % 37 != 36]  # Every 37th business day is a market holiday
+        rng = np.random.default_rng(11)
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, len(index))))
+        data = pd.DataFrame({
+            "open": close * 0.995, "high": close * 1.01, "low": close * 0.99,
+            "close": close, "volume": rng.integers(1_000_000, 2_000_000, len(index)),
+        }, index=index)
+        wf_config = WalkForwardConfig(
+            enabled=True, training_period="365d", testing_period="92d", step_size="92d", min_trades_per_period=1
+        )
+
+        first_cache = WindowResultCache()
+        bt.walk_forward_backtest(data, wf_config, rules_config, "TEST", window_cache=first_cache)
+        stored = list(first_cache.used.values())
+        full = bt._get_rolling_periods(data, 365, 92, 92)
+
+        for shift in (150, 300):
+            shifted = data.iloc[shift:]
+            periods = bt._get_rolling_periods(shifted, 365, 92, 92)
+            assert periods == [period for period in full if period[0] >= shifted.index[0]]
+
+            cache = WindowResultCache(stored)
+            with patch.object(bt, "_run_window", side_effect=AssertionError("window should be cached")):
+                bt.walk_forward_backtest(shifted, wf_config, rules_config, "TEST", window_cache=cache)
+            assert cache.misses == 0
+            assert cache.hits == len(periods) > 0
+
+
+class TestSignalCache:
+    """Rule signals with unchanged rule and input bars are read from the cache."""
+
+    @pytest.fixture
+    def price_data(self):
+        rng = np.random.default_rng(46)
+        index = pd.bdate_range("2022-01-03", periods=500)
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, len(index))))
+        return pd.DataFrame({
+            "open": close * 0.995, "high": close * 1.01, "low": close * 0.99,
+            "close": close, "volume": rng.integers(1_000_000, 2_000_000, len(index)).astype(float),
+        }, index=index)
+
+    @staticmethod
+    def _signals(bt, cache, rule, frame):
+        bt._signal_cache = cache
+        try:
+            return bt._generate_signals(rule, frame)
+        finally:
+            bt._signal_cache = None
+
+    def test_walk_forward_reads_signals_on_second_run(self, price_data):
+        from kiss_signal.backtester import SignalCache
+
+        bt = Backtester(hold_period=10, min_trades_threshold=1)
+        rules_config = RulesConfig(
+            entry_signals=[
+                RuleDef(name="sma_fast", type="sma_crossover", params={"fast_period": 5, "slow_period": 10}),
+                RuleDef(name="rsi", type="rsi_oversold", params={"period": 14, "oversold_threshold": 40.0}),
+            ],
+            exit_conditions=[RuleDef(name="donchian", type="donchian_breakdown", params={"period": 10})],
+        )
+        wf_config = WalkForwardConfig(
+            enabled=True, training_period="180d", testing_period="60d", step_size="60d", min_trades_per_period=1
+        )
+
+        uncached = bt.walk_forward_backtest(price_data, wf_config, rules_config, "TEST")
+        first_cache = SignalCache()
+        first = bt.walk_forward_backtest(price_data, wf_config, rules_config, "TEST", signal_cache=first_cache)
+        assert first_cache.misses > 0
+        assert first_cache.hits > 0  # Exit signals are shared by every entry rule of a window
+        assert bt._signal_cache is None
+
+        second_cache = SignalCache(first_cache.rows())
+        with patch.object(bt, "_compute_signals", side_effect=AssertionError("signals should be cached")):
+            second = bt.walk_forward_backtest(price_data, wf_config, rules_config, "TEST", signal_cache=second_cache)
+
+        assert second_cache.misses == 0 and not second_cache.changed
+        for key in ("total_trades", "win_pct", "sharpe", "avg_return", "edge_score"):
+            assert first[0][key] == pytest.approx(uncached[0][key])
+            assert second[0][key] == pytest.approx(uncached[0][key])
+
+    @pytest.mark.parametrize("rule", [
+        RuleDef(name="sma", type="sma_crossover", params={"fast_period": 5, "slow_period": 20}),
+        RuleDef(name="bb", type="bollinger_squeeze", params={"period": 10, "squeeze_threshold": 0.15}),
+        RuleDef(name="donchian", type="donchian_breakout", params={"period": 15}),
+    ], ids=lambda rule: rule.type)
+    def test_appended_bars_only_compute_the_tail(self, price_data, rule):
+        from kiss_signal.backtester import SignalCache
+
+        bt = Backtester()
+        cache = SignalCache()
+        self._signals(bt, cache, rule, price_data.iloc[:400])
+        stored = cache.rows()
+
+        cache = SignalCache(stored)
+        with patch.object(bt, "_compute_signals", wraps=bt._compute_signals) as compute:
+            extended = self._signals(bt, cache, rule, price_data)
+        assert cache.extended == 1 and cache.misses == 0
+        assert len(compute.call_args.args[3]) < 150  # Tail plus lookback, not the full history
+
+        expected = bt._generate_signals(rule, price_data)
+        assert extended.tolist() == expected.tolist()
+        assert [row["length"] for row in cache.rows()] == [500]  # The extended prefix is dropped
+
+    def test_recursive_rules_and_changed_params_recompute(self, price_data):
+        from kiss_signal.backtester import SignalCache
+
+        bt = Backtester()
+        ema = RuleDef(name="ema", type="ema_crossover", params={"fast_period": 5, "slow_period": 20})
+        cache = SignalCache()
+        self._signals(bt, cache, ema, price_data.iloc[:400])
+
+        cache = SignalCache(cache.rows())
+        assert self._signals(bt, cache, ema, price_data).tolist() == bt._generate_signals(ema, price_data).tolist()
+        slower = RuleDef(name="ema", type="ema_crossover", params={"slow_period": 30, "fast_period": 5})
+        self._signals(bt, cache, slower, price_data)
+        assert cache.extended == 0 and cache.misses == 2
+
+    def test_signal_key_is_canonical(self):
+        from kiss_signal.backtester import CACHE_VERSION, SignalCache
+
+        assert SignalCache.signal_key("market_above_sma", {"period": 50, "index_symbol": "^NSEI"}) == (
+            f'v{CACHE_VERSION}:market_above_sma:{{"period": 50}}'
+        )
+        assert SignalCache.signal_key("sma_crossover", {"slow_period": 20, "fast_period": 5}) == (
+            SignalCache.signal_key("sma_crossover", {"fast_period": 5, "slow_period": 20})
+        )
+
+    def test_cache_version_bump_misses_stored_signals(self, price_data):
+        from kiss_signal import backtester
+        from kiss_signal.backtester import SignalCache
+
+        bt = Backtester(hold_period=10, min_trades_threshold=1)
+        rule = RuleDef(name="sma", type="sma_crossover", params={"fast_period": 5, "slow_period": 20})
+        first = SignalCache()
+        self._signals(bt, first, rule, price_data)
+
+        second = SignalCache(first.rows())
+        with patch.object(backtester, "CACHE_VERSION", backtester.CACHE_VERSION + 1):
+            self._signals(bt, second, rule, price_data)
+
+        assert second.hits == 0 and second.misses == 1
+
+
+class TestContextMemoization:
+    """Context filters are evaluated once per market frame; preconditions once per symbol history."""
+
+    @pytest.fixture
+    def market(self):
+        rng = np.random.default_rng(47)
+        index = pd.bdate_range("2022-01-03", periods=400)
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, len(index))))
+        return pd.DataFrame({
+            "open": close, "high": close * 1.01, "low": close * 0.99, "close": close,
+            "volume": np.full(len(index), 1_000_000.0),
+        }, index=index)
+
+    FILTER = RuleDef(name="bull", type="market_above_sma", params={"period": 20, "index_symbol": "^NSEI"})
+
+    def test_filter_evaluated_once_and_sliced_without_copies(self, market):
+        bt = Backtester()
+        expected = rules.market_above_sma(market, period=20)
+        with patch("kiss_signal.rules.market_above_sma", wraps=rules.market_above_sma) as rule:
+            first = bt._apply_context_filters(market.iloc[50:150], [self.FILTER], "A", market)
+            second = bt._apply_context_filters(market.iloc[200:300], [self.FILTER], "B", market)
+        assert rule.call_count == 1
+        assert first.equals(expected.iloc[50:150])
+        assert second.equals(expected.iloc[200:300])
+        memo = next(iter(bt._context_values.values())).to_numpy()
+        assert np.shares_memory(first.to_numpy(), memo) and np.shares_memory(second.to_numpy(), memo)
+
+    def test_missing_dates_take_the_latest_market_bar(self, market):
+        bt = Backtester()
+        stock_index = market.index[100:140].append(pd.DatetimeIndex(["2030-01-01"]))
+        stock_index = pd.DatetimeIndex(sorted(set(stock_index.drop(market.index[110])) | {pd.Timestamp("2021-12-31")}))
+        stock = pd.DataFrame({"close": 1.0}, index=stock_index)
+
+        result = bt._apply_context_filters(stock, [self.FILTER], "A", market)
+
+        expected = rules.market_above_sma(market, period=20).reindex(stock_index).ffill().fillna(False)
+        assert result.tolist() == expected.astype(bool).tolist()
+        assert not result.iloc[0]  # Before the first market bar
+
+    def test_new_market_frame_is_evaluated_again(self, market):
+        bt = Backtester()
+        with patch("kiss_signal.rules.market_above_sma", wraps=rules.market_above_sma) as rule:
+            bt._apply_context_filters(market.iloc[50:150], [self.FILTER], "A", market)
+            bt._apply_context_filters(market.iloc[50:150], [self.FILTER], "A", market.copy())
+        assert rule.call_count == 2
+
+    def test_walk_forward_evaluates_context_once(self, market):
+        bt = Backtester(hold_period=10, min_trades_threshold=1)
+        rules_config = RulesConfig(
+            entry_signals=[RuleDef(name="sma", type="sma_crossover", params={"fast_period": 5, "slow_period": 10})],
+            context_filters=[self.FILTER],
+        )
+        wf_config = WalkForwardConfig(
+            enabled=True, training_period="120d", testing_period="40d", step_size="40d", min_trades_per_period=1
+        )
+        with patch("kiss_signal.rules.market_above_sma", wraps=rules.market_above_sma) as rule:
+            try:
+                bt.walk_forward_backtest(market, wf_config, rules_config, "A", market_data=market)
+            except ValueError:
+                pass  # Whether any window trades is irrelevant here
+        assert rule.call_count == 1
+
+    def test_preconditions_memoized_per_symbol_history(self, market):
+        bt = Backtester()
+        preconditions = [RuleDef(name="vol", type="is_volatile", params={"period": 14, "atr_threshold_pct": 0.001})]
+        with patch("kiss_signal.rules.is_volatile", wraps=rules.is_volatile) as rule:
+            assert bt._check_preconditions(market, preconditions, "A")
+            assert bt._check_preconditions(market.copy(), preconditions, "A")
+            assert rule.call_count == 1
+            bt._check_preconditions(market.iloc[:-1], preconditions, "A")
+            bt._check_preconditions(market, preconditions, "B")
+            assert rule.call_count == 3
+
+
+class TestWindowPreScreen:
+    """Windows that cannot reach min_trades_per_period are skipped before simulation."""
+
+    @pytest.fixture
+    def price_data(self):
+        rng = np.random.default_rng(48)
+        index = pd.bdate_range("2021-01-01", periods=600)
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, len(index))))
+        return pd.DataFrame({
+            "open": close * 0.995, "high": close * 1.01, "low": close * 0.99,
+            "close": close, "volume": rng.integers(100_000, 1_000_000, len(index)).astype(float),
+        }, index=index)
+
+    @staticmethod
+    def _run(bt, price_data, rules_config, min_trades):
+        from kiss_signal.backtester import WindowResultCache
+
+        wf_config = WalkForwardConfig(
+            enabled=True, training_period="240d", testing_period="60d", step_size="60d",
+            min_trades_per_period=min_trades,
+        )
+        cache = WindowResultCache()
+        try:
+            result = bt.walk_forward_backtest(price_data, wf_config, rules_config, "TEST", window_cache=cache)
+        except ValueError as e:
+            result = str(e)
+        return result, [(r["oos_test_start"], r["total_trades"]) for r in cache.results() if r]
+
+    @pytest.mark.parametrize("min_trades", [1, 3, 6])
+    def test_screen_never_changes_results(self, price_data, min_trades):
+        from kiss_signal.performance import performance_monitor
+
+        rules_config = RulesConfig(entry_signals=[
+            RuleDef(name="sma", type="sma_crossover", params={"fast_period": 5, "slow_period": 20}),
+            RuleDef(name="breakout", type="donchian_breakout", params={"period": 20}),
+        ])
+        performance_monitor.reset_run_stats()
+        screened, screened_windows = self._run(Backtester(hold_period=10), price_data, rules_config, min_trades)
+        skipped = performance_monitor.counters["windows_screened_out"]
+
+        with patch.object(Backtester, "_window_can_trade", return_value=True):
+            full, full_windows = self._run(Backtester(hold_period=10), price_data, rules_config, min_trades)
+
+        kept = [w for w in full_windows if w[1] >= min_trades]
+        assert [w for w in screened_windows if w[1] >= min_trades] == kept
+        if isinstance(full, str):
+            assert screened == full
+        else:
+            assert screened[0]["total_trades"] == full[0]["total_trades"]
+            assert screened[0]["edge_score"] == pytest.approx(full[0]["edge_score"])
+        if min_trades == 6:
+            assert skipped > 0
+
+    def test_windows_without_entries_are_not_simulated(self, price_data):
+        from kiss_signal.performance import performance_monitor
+
+        never = RulesConfig(entry_signals=[RuleDef(name="never", type="expression", params={"expr": "close < 0"})])
+        performance_monitor.reset_run_stats()
+        with patch.object(Backtester, "_run_window", side_effect=AssertionError("window should be screened out")):
+            result, _ = self._run(Backtester(), price_data, never, 1)
+
+        assert "No valid out-of-sample results" in result
+        assert performance_monitor.counters["windows_screened_out"] == performance_monitor.counters["windows_total"]
+        assert performance_monitor.counters["symbols_screened_out"] == 1
+
+    def test_window_entry_signals_are_generated_once(self, price_data):
+        rules_config = RulesConfig(entry_signals=[
+            RuleDef(name="sma", type="sma_crossover", params={"fast_period": 5, "slow_period": 20}),
+            RuleDef(name="breakout", type="donchian_breakout", params={"period": 20}),
+        ])
+        bt = Backtester(hold_period=10)
+        calls = []
+        generate = bt._generate_signals
+
+        def spy(rule_def, frame):
+            calls.append((rule_def.name, frame.index[0], len(frame)))
+            return generate(rule_def, frame)
+
+        with patch.object(bt, "_generate_signals", side_effect=spy):
+            self._run(bt, price_data, rules_config, 1)
+
+        assert calls
+        assert len(calls) == len(set(calls))
+
+    def test_combination_below_threshold_skips_simulation(self, price_data):
+        bt = Backtester(min_trades_threshold=1_000)
+        combo = [RuleDef(name="sma", type="sma_crossover", params={"fast_period": 5, "slow_period": 20})]
+        with patch("kiss_signal.backtester._vbt", side_effect=AssertionError("should not simulate")):
+            result = bt._backtest_combination(
+                combo, price_data, RulesConfig(entry_signals=combo), EdgeScoreWeights(win_pct=0.6, sharpe=0.4), "TEST"
+            )
+        assert result is None
+
+
+class TestCompactStorage:
+    """Walk-forward results on compact (float32) frames match float64 frames."""
+
+    @pytest.fixture
+    def price_data(self):
+        rng = np.random.default_rng(49)
+        index = pd.bdate_range("2021-01-04", periods=900)
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, len(index))))
+        open_ = close * (1 + rng.normal(0, 0.01, len(index)))
+        return pd.DataFrame({
+            "open": open_, "high": np.maximum(open_, close) * 1.01, "low": np.minimum(open_, close) * 0.99,
+            "close": close, "volume": pd.array(rng.integers(1_000_000, 2_000_000, len(index)), dtype="Int64"),
+        }, index=index)
+
+    def test_edge_scores_match_float64_within_tolerance(self, price_data):
+        from kiss_signal.data import compact_frame
+
+        rules_config = RulesConfig(
+            entry_signals=[
+                RuleDef(name="sma", type="sma_crossover", params={"fast_period": 5, "slow_period": 20}),
+                RuleDef(name="rsi", type="rsi_oversold", params={"period": 14, "oversold_threshold": 40.0}),
+                RuleDef(name="volume", type="volume_spike", params={
+                    "period": 10, "spike_multiplier": 1.3, "price_change_threshold": 0.005,
+                }),
+                RuleDef(name="donchian", type="donchian_breakout", params={"period": 15}),
+            ],
+            exit_conditions=[
+                RuleDef(name="stop", type="stop_loss_pct", params={"percentage": 0.05}),
+                RuleDef(name="target", type="take_profit_pct", params={"percentage": 0.08}),
+            ],
+        )
+        wf_config = WalkForwardConfig(
+            enabled=True, training_period="365d", testing_period="120d", step_size="120d", min_trades_per_period=1
+        )
+        compact = compact_frame(price_data)
+        assert compact["close"].dtype == np.float32 and compact["volume"].dtype == np.int32
+
+        bt = Backtester(hold_period=10, min_trades_threshold=1)
+        full = bt.walk_forward_backtest(price_data, wf_config, rules_config, "TEST")
+        reduced = bt.walk_forward_backtest(compact, wf_config, rules_config, "TEST")
+
+        assert len(full) == len(reduced) > 0
+        for expected, actual in zip(full, reduced):
+            assert actual["rule_stack"][0].name == expected["rule_stack"][0].name
+            assert actual["total_trades"] == expected["total_trades"]
+            assert actual["win_pct"] == pytest.approx(expected["win_pct"])
+            assert actual["sharpe"] == pytest.approx(expected["sharpe"], abs=1e-4)
+            assert actual["edge_score"] == pytest.approx(expected["edge_score"], abs=1e-4)
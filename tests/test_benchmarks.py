@@ -0,0 +1,113 @@
+"""Tests for the benchmark harness (result collection and regression comparison)."""
+
+from queue import Empty
+from typing import Any, Dict, List
+
+import pytest
+
+from benchmarks import harness
+from benchmarks.scenarios import BenchmarkParams
+
+
+class FakeQueue:
+    """Queue stand-in that returns queued results, else raises Empty like a timed-out get."""
+
+    def __init__(self, results: List[Dict[str, Any]]) -> None:
+        self.results = list(results)
+        self.timeouts: List[float] = []
+
+    def get(self, timeout: float) -> Dict[str, Any]:
+        self.timeouts.append(timeout)
+        if not self.results:
+            raise Empty
+        return self.results.pop(0)
+
+
+class FakeProcess:
+    def __init__(self, alive: bool = True, exitcode: Any = None) -> None:
+        self.alive = alive
+        self.exitcode = exitcode
+        self.terminated = False
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def terminate(self) -> None:
+        self.terminated = True
+
+
+def _results(params: Dict[str, Any], **scenarios: Dict[str, Any]) -> Dict[str, Any]:
+    return {"meta": {"params": params}, "scenarios": scenarios}
+
+
+class TestCollect:
+    def test_returns_child_result(self):
+        result = harness._collect(FakeProcess(), FakeQueue([{"wall_s": 1.0}]), timeout=None, poll=0.01)
+
+        assert result == {"wall_s": 1.0}
+
+    def test_dead_child_reports_exit_code(self):
+        queue = FakeQueue([])
+        result = harness._collect(FakeProcess(alive=False, exitcode=-9), queue, timeout=None, poll=0.01)
+
+        assert result == {"error": "Scenario process exited with code -9 without a result"}
+        assert queue.timeouts == [0.01, 0.01]  # Never blocks without a timeout
+
+    def test_timeout_terminates_child(self):
+        process = FakeProcess()
+        result = harness._collect(process, FakeQueue([]), timeout=0.0, poll=0.01)
+
+        assert process.terminated
+        assert result["error"].startswith("Timed out")
+
+
+class TestCompareResults:
+    def test_flags_regressions_beyond_threshold(self):
+        baseline = _results({"symbols": 1}, fast={"wall_s": 1.0, "peak_rss_mb": 100.0},
+                            slow={"wall_s": 1.0, "peak_rss_mb": 100.0})
+        current = _results({"symbols": 1}, fast={"wall_s": 1.1, "peak_rss_mb": 100.0},
+                           slow={"wall_s": 1.5, "peak_rss_mb": None})
+
+        rows = {row["scenario"]: row for row in harness.compare_results(baseline, current, threshold=0.2)}
+
+        assert not rows["fast"]["regressed"]
+        assert rows["fast"]["wall_s_change"] == pytest.approx(0.1)
+        assert rows["slow"]["regressed"]
+        assert "peak_rss_mb_change" not in rows["slow"]
+
+    def test_skips_failed_and_missing_scenarios(self):
+        baseline = _results({}, a={"wall_s": 1.0}, b={"error": "boom"}, c={"wall_s": 1.0})
+        current = _results({}, a={"error": "boom"}, b={"wall_s": 1.0})
+
+        assert harness.compare_results(baseline, current) == []
+
+    def test_rejects_different_params(self):
+        with pytest.raises(ValueError, match="different benchmark parameters"):
+            harness.compare_results(_results({"symbols": 1}), _results({"symbols": 2}))
+
+
+def test_save_and_load_round_trip(tmp_path):
+    results = _results({"symbols": 1}, a={"wall_s": 0.5})
+    path = tmp_path / "nested" / "results.json"
+
+    harness.save_results(results, path)
+
+    assert harness.load_results(path) == results
+
+
+def test_unknown_scenario_raises():
+    with pytest.raises(ValueError, match="Unknown scenarios"):
+        harness.run_benchmarks(BenchmarkParams(), ["no_such_scenario"])
+
+
+@pytest.mark.slow
+def test_run_benchmarks_in_spawned_process():
+    params = BenchmarkParams(symbols=2, years=1, positions=5, strategy_rows=50)
+
+    results = harness.run_benchmarks(params, ["reporter_aggregation"], timeout=120)
+
+    scenario = results["scenarios"]["reporter_aggregation"]
+    assert "error" not in scenario
+    assert scenario["ops"] == 50
+    assert scenario["peak_rss_mb"] > 0
+    assert results["meta"]["params"]["symbols"] == 2
@@ -32,7 +32,7 @@ from rich.console import Console
 from typer.testing import CliRunner
 
 from kiss_signal.cli import (
-    app, _create_progress_context, _show_banner,
+    app, _create_progress_context, _report_screened_work, _show_banner,
     get_position_pricing
 )
 from kiss_signal.reporter import (
@@ -91,6 +91,22 @@ def test_show_banner() -> None:
         assert "KISS Signal CLI" in output
 
 
+def test_report_screened_work() -> None:
+    """The pre-screen summary reports skipped windows and is silent without windows."""
+    console = Console(record=True, width=200)
+    with patch('kiss_signal.cli.console', console), \
+         patch('kiss_signal.cli.performance_monitor.counters', {}):
+        _report_screened_work()
+        assert console.export_text() == ""
+    counters = {"windows_total": 40, "windows_screened_out": 10, "symbols_screened_out": 2}
+    with patch('kiss_signal.cli.console', console), \
+         patch('kiss_signal.cli.performance_monitor.counters', counters):
+        _report_screened_work()
+        output = console.export_text()
+    assert "Pre-screen skipped 10 of 40 walk-forward windows (25%)" in output
+    assert "2 symbols had no window able to trade" in output
+
+
 def test_create_progress_context() -> None:
     """Test _create_progress_context function."""
     progress_context = _create_progress_context()
@@ -255,10 +271,17 @@ def test_run_command_invalid_freeze_date(test_environment) -> None:
         os.chdir(original_cwd)
 
 
-def test_run_command_no_config() -> None:
+def test_run_command_no_config(tmp_path) -> None:
     """Test run command without config file."""
-    result = runner.invoke(app, ["run"])
-    assert result.exit_code != 0 or "config" in result.stdout.lower()
+    import os
+    original_cwd = os.getcwd()
+    try:
+        os.chdir(tmp_path)  # No config.yaml here, and nothing is written into the checkout
+        result = runner.invoke(app, ["run"])
+    finally:
+        os.chdir(original_cwd)
+    assert result.exit_code != 0
+    assert "Error loading configuration" in result.stdout
 
 
 def test_run_command_missing_rules(test_environment) -> None:
@@ -474,6 +497,25 @@ def test_analyze_strategies_command_no_database(test_environment):
         os.chdir(original_cwd)
 
 
+def test_analyze_strategies_per_stock_empty_database_writes_nothing(test_environment):
+    """An empty database reports that there is nothing to export instead of writing a header-only file."""
+    import os
+    persistence.create_database(test_environment / "test.db")
+    original_cwd = os.getcwd()
+    try:
+        os.chdir(test_environment)
+        result = runner.invoke(app, [
+            "--config", str(test_environment / "config.yaml"),
+            "analyze-strategies", "--per-stock", "--output", "per_stock.csv",
+        ])
+
+        assert result.exit_code == 0
+        assert "No strategy data found" in result.stdout
+        assert not (test_environment / "per_stock.csv").exists()
+    finally:
+        os.chdir(original_cwd)
+
+
 # =============================================================================
 # Clear and Recalculate Tests  
 # =============================================================================
@@ -1088,7 +1130,7 @@ def test_analyze_symbol_exception_paths():
         
         result = _analyze_symbol('TEST', app_config, rules_config, None, bt)
         
-        assert result == []
+        assert result is None
         mock_logger.error.assert_called_with("CRITICAL: Market data for ^NSEI does not cover the full history for TEST. Run data refresh.")
     
     # Test FileNotFoundError path
@@ -1097,7 +1139,7 @@ def test_analyze_symbol_exception_paths():
         
         result = _analyze_symbol('TEST', app_config, rules_config, None, bt)
         
-        assert result == []
+        assert result is None
         mock_logger.error.assert_called()
     
     # Test ValueError path
@@ -1115,7 +1157,7 @@ def test_analyze_symbol_exception_paths():
         
         result = _analyze_symbol('TEST', app_config, rules_config, None, bt)
         
-        assert result == []
+        assert result is None
         mock_logger.error.assert_called()
 
 
@@ -1440,3 +1482,351 @@ def test_display_results_with_rule_objects():
         mock_console.print.assert_called()
 
 
+
+
+def test_run_metrics_command_shows_trend(test_environment):
+    """run-metrics lists recorded runs and flags a run far above the median."""
+    from kiss_signal import persistence
+
+    db_path = test_environment / "test.db"
+    persistence.create_database(db_path)
+    for day, total in [(1, 10.0), (2, 11.0), (3, 33.0)]:
+        persistence.save_run_metrics(db_path, {
+            "run_timestamp": f"2025-01-0{day}T09:00:00", "command": "run", "config_hash": "abcdef123456",
+            "total_duration": total, "symbols_total": 2, "symbols_processed": 2,
+            "cache_hits": 3, "cache_misses": 1, "db_rows_written": 5, "peak_memory_mb": 250.0,
+        })
+
+    from kiss_signal import cli as cli_module
+
+    original_cwd = os.getcwd()
+    try:
+        os.chdir(test_environment)
+        with patch.object(cli_module.console, "_width", 200):  # Wide enough for every column
+            result = runner.invoke(app, ["--config", "config.yaml", "--rules", "config/rules.yaml", "run-metrics", "--last", "2"])
+    finally:
+        os.chdir(original_cwd)
+
+    assert result.exit_code == 0, result.stdout
+    assert "2025-01-03 09:00" in result.stdout
+    assert "2025-01-01 09:00" not in result.stdout
+    assert "75%" in result.stdout
+
+
+def test_run_metrics_command_empty(test_environment):
+    """run-metrics without a ledger prints a notice instead of failing."""
+    original_cwd = os.getcwd()
+    try:
+        os.chdir(test_environment)
+        result = runner.invoke(app, ["--config", "config.yaml", "--rules", "config/rules.yaml", "run-metrics"])
+    finally:
+        os.chdir(original_cwd)
+
+    assert result.exit_code == 0
+    assert "No run metrics recorded yet" in result.stdout
+
+
+def test_record_run_metrics_persists_stage_timings(test_environment):
+    """_record_run_metrics writes the monitor's stages and counters to the ledger."""
+    from kiss_signal import persistence
+    from kiss_signal.cli import _record_run_metrics
+    from kiss_signal.config import load_config
+    from kiss_signal.performance import performance_monitor
+
+    app_config = load_config(test_environment / "config.yaml")
+    app_config.database_path = str(test_environment / "test.db")
+    persistence.create_database(Path(app_config.database_path))
+
+    performance_monitor.reset_run_stats()
+    with performance_monitor.stage("backtest"):
+        pass
+    performance_monitor.increment("cache_hits", 4)
+    performance_monitor.increment("db_rows_written", 7)
+    _record_run_metrics(app_config, "run", "2025-02-01T10:00:00", "hash123", 5)
+
+    row = persistence.get_run_metrics(Path(app_config.database_path))[0]
+    assert row["command"] == "run"
+    assert row["config_hash"] == "hash123"
+    assert row["symbols_total"] == 5
+    assert row["cache_hits"] == 4
+    assert row["db_rows_written"] == 7
+    assert row["backtest_duration"] >= 0.0
+    assert row["refresh_duration"] == 0.0
+
+
+def test_run_resume_skips_checkpointed_symbols(test_environment):
+    """A run that dies mid-universe resumes with only the unfinished symbols."""
+    from kiss_signal import persistence
+
+    def strategy(symbol: str) -> Dict[str, Any]:
+        return {
+            'symbol': symbol, 'rule_stack': [{'name': 'sma', 'type': 'sma_crossover'}], 'edge_score': 0.6,
+            'win_pct': 0.6, 'sharpe': 1.1, 'total_trades': 12, 'avg_return': 1.5, 'is_oos': True,
+        }
+
+    def crash_on_infy(symbol, *args, **kwargs):
+        if symbol == 'INFY':
+            raise RuntimeError("simulated crash")
+        return [strategy(symbol)]
+
+    args = ["--config", "config.yaml", "--rules", "config/rules.yaml", "run", "--freeze-data", "2025-01-31"]
+    original_cwd = os.getcwd()
+    try:
+        os.chdir(test_environment)
+        with patch('kiss_signal.data.load_universe', return_value=['RELIANCE', 'INFY']), \
+             patch('kiss_signal.cli.update_positions_and_generate_report_data',
+                   return_value={"new_buys": [], "open": [], "closed": []}), \
+             patch('kiss_signal.cli.generate_daily_report', return_value=None):
+            with patch('kiss_signal.cli._analyze_symbol', side_effect=crash_on_infy):
+                first = runner.invoke(app, args)
+            with patch('kiss_signal.cli._analyze_symbol', side_effect=lambda symbol, *a, **k: [strategy(symbol)]) as mock_analyze:
+                resumed = runner.invoke(app, args + ["--resume"])
+    finally:
+        os.chdir(original_cwd)
+
+    assert first.exit_code == 1
+    assert resumed.exit_code == 0, resumed.stdout
+    assert [call.args[0] for call in mock_analyze.call_args_list] == ['INFY']
+    assert "1 symbols already complete" in resumed.stdout
+
+    with sqlite3.connect(test_environment / "test.db") as conn:
+        rows = conn.execute("SELECT symbol, run_timestamp FROM strategies ORDER BY symbol").fetchall()
+        assert conn.execute("SELECT COUNT(*) FROM run_progress").fetchone()[0] == 0
+    assert [symbol for symbol, _ in rows] == ['INFY', 'RELIANCE']
+    assert rows[0][1] == rows[1][1]  # Both symbols belong to the resumed run
+
+
+def test_run_resume_retries_symbols_whose_analysis_failed(test_environment):
+    """A failed symbol is not checkpointed, so --resume after a crash analyzes it again."""
+    def strategy(symbol: str) -> Dict[str, Any]:
+        return {
+            'symbol': symbol, 'rule_stack': [{'name': 'sma', 'type': 'sma_crossover'}], 'edge_score': 0.6,
+            'win_pct': 0.6, 'sharpe': 1.1, 'total_trades': 12, 'avg_return': 1.5, 'is_oos': True,
+        }
+
+    def fail_then_crash(symbol, *args, **kwargs):
+        if symbol == 'RELIANCE':
+            raise RuntimeError("simulated crash")
+        return None if symbol == 'INFY' else [strategy(symbol)]
+
+    args = ["--config", "config.yaml", "--rules", "config/rules.yaml", "run", "--freeze-data", "2025-01-31"]
+    original_cwd = os.getcwd()
+    try:
+        os.chdir(test_environment)
+        with patch('kiss_signal.data.load_universe', return_value=['TCS', 'INFY', 'RELIANCE']), \
+             patch('kiss_signal.cli.update_positions_and_generate_report_data',
+                   return_value={"new_buys": [], "open": [], "closed": []}), \
+             patch('kiss_signal.cli.generate_daily_report', return_value=None):
+            with patch('kiss_signal.cli._analyze_symbol', side_effect=fail_then_crash):
+                first = runner.invoke(app, args)
+            with patch('kiss_signal.cli._analyze_symbol', side_effect=lambda symbol, *a, **k: [strategy(symbol)]) as mock_analyze:
+                resumed = runner.invoke(app, args + ["--resume"])
+    finally:
+        os.chdir(original_cwd)
+
+    assert first.exit_code == 1
+    assert resumed.exit_code == 0, resumed.stdout
+    assert [call.args[0] for call in mock_analyze.call_args_list] == ['INFY', 'RELIANCE']
+    # Results are displayed from the database, including the symbol finished before the crash
+    assert "WALK-FORWARD ANALYSIS SUMMARY" in resumed.stdout
+    assert all(symbol in resumed.stdout for symbol in ('TCS', 'INFY', 'RELIANCE'))
+
+
+def test_run_with_workers_streams_symbols_through_pipeline(test_environment):
+    """--workers > 1 hands loading, backtesting and saving to the concurrent pipeline."""
+    def inline_pipeline(items, load, process, write, workers, initializer=None, initargs=(), on_result=None, **kwargs):
+        # Same stage contract as run_pipeline, executed in-process so patches apply
+        initializer(*initargs)
+        succeeded = 0
+        for item in items:
+            result = process(item, load(item))
+            write([(item, result)])
+            on_result(item, result)
+            succeeded += 1
+        return succeeded
+
+    def analyze(symbol, *args, **kwargs):
+        assert kwargs["price_data"] is not None  # Loaded by the load stage, not re-read
+        return [{
+            'symbol': symbol, 'rule_stack': [{'name': 'sma', 'type': 'sma_crossover'}], 'edge_score': 0.6,
+            'win_pct': 0.6, 'sharpe': 1.1, 'total_trades': 12, 'avg_return': 1.5, 'is_oos': True,
+        }]
+
+    args = ["--config", "config.yaml", "--rules", "config/rules.yaml", "run", "--freeze-data", "2025-01-31", "--workers", "2"]
+    original_cwd = os.getcwd()
+    try:
+        os.chdir(test_environment)
+        with patch('kiss_signal.data.load_universe', return_value=['RELIANCE', 'INFY']), \
+             patch('kiss_signal.cli.update_positions_and_generate_report_data',
+                   return_value={"new_buys": [], "open": [], "closed": []}), \
+             patch('kiss_signal.cli.generate_daily_report', return_value=None), \
+             patch('kiss_signal.cli._load_symbol_history', return_value=pd.DataFrame({'close': [1.0]})), \
+             patch('kiss_signal.cli._analyze_symbol_data', side_effect=analyze), \
+             patch('kiss_signal.cli.run_pipeline', side_effect=inline_pipeline) as mock_pipeline:
+            result = runner.invoke(app, args)
+    finally:
+        os.chdir(original_cwd)
+
+    assert result.exit_code == 0, result.stdout
+    assert mock_pipeline.call_args.kwargs["workers"] == 2
+    with sqlite3.connect(test_environment / "test.db") as conn:
+        symbols = [row[0] for row in conn.execute("SELECT symbol FROM strategies ORDER BY symbol")]
+        assert conn.execute("SELECT COUNT(*) FROM run_progress").fetchone()[0] == 0
+    assert symbols == ['INFY', 'RELIANCE']
+
+
+def test_help_does_not_import_backtesting_dependencies():
+    """`--help` must not pay for backtesting dependencies (checked in a fresh interpreter)."""
+    import json
+    import subprocess
+    import sys
+
+    script = (
+        "import json, sys\n"
+        "from kiss_signal.cli import app\n"
+        "sys.argv = ['kiss_signal', '--help']\n"
+        "try:\n"
+        "    app()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(json.dumps(sorted({name.split('.')[0] for name in sys.modules})), file=sys.stderr)\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+    assert "Usage" in proc.stdout, proc.stderr
+
+    modules = set(json.loads(proc.stderr.strip().splitlines()[-1]))
+    assert not modules & {"vectorbt", "numba", "scipy", "yfinance", "pandas", "numpy"}
+
+
+def test_cli_import_time_budget():
+    """Importing the CLI costs at most a small multiple of importing typer itself.
+
+    Both are timed in one ``-X importtime`` run, so a slow machine slows the
+    baseline too; with pandas and vectorbt loaded eagerly the ratio is above 15.
+    """
+    import subprocess
+    import sys
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import typer, rich.console; import kiss_signal.cli"],
+        capture_output=True, text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+
+    cumulative_us = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                cumulative_us[name.strip()] = int(cumulative)
+
+    assert cumulative_us["kiss_signal.cli"] < 10 * cumulative_us["typer"], cumulative_us
+
+
+def test_server_option_forwards_command(test_environment):
+    """--server runs the command remotely and mirrors its output and exit code."""
+    args = ["--config", "config.yaml", "--rules", "config/rules.yaml", "--server", "http://127.0.0.1:1",
+            "analyze-strategies", "--per-stock"]
+    original_cwd = os.getcwd()
+    try:
+        os.chdir(test_environment)
+        with patch('kiss_signal.server.read_token', return_value="secret") as mock_token, \
+             patch('kiss_signal.server.invoke_remote', return_value=(3, "remote output\n")) as mock_remote, \
+             patch('kiss_signal.cli._execute_analysis_pipeline') as mock_local:
+            result = runner.invoke(app, args)
+    finally:
+        os.chdir(original_cwd)
+
+    assert result.exit_code == 3
+    assert "remote output" in result.stdout
+    mock_local.assert_not_called()
+    url, argv, cwd, token = mock_remote.call_args.args
+    assert url == "http://127.0.0.1:1"
+    assert argv[:4] == ["--config", "config.yaml", "--rules", "config/rules.yaml"]
+    assert "analyze-strategies" in argv and "--per-stock" in argv
+    assert "--server" not in argv
+    assert cwd == str(test_environment)
+    assert token == "secret"
+    from kiss_signal.config import load_config
+    assert mock_token.call_args.args[0] == Path(load_config(test_environment / "config.yaml").cache_dir)
+
+
+def test_server_option_without_token_fails(test_environment):
+    """--server refuses to send a command when no server token exists for the config's cache_dir."""
+    args = ["--config", "config.yaml", "--rules", "config/rules.yaml", "--server", "http://127.0.0.1:1",
+            "analyze-strategies"]
+    original_cwd = os.getcwd()
+    try:
+        os.chdir(test_environment)
+        with patch('kiss_signal.server.read_token', side_effect=FileNotFoundError("server.token")), \
+             patch('kiss_signal.server.invoke_remote') as mock_remote:
+            result = runner.invoke(app, args)
+    finally:
+        os.chdir(original_cwd)
+
+    assert result.exit_code == 1
+    assert "token" in result.stdout
+    mock_remote.assert_not_called()
+
+
+def test_serve_refuses_non_loopback_host(test_environment):
+    """serve exits with an error instead of binding to a routable interface."""
+    args = ["--config", "config.yaml", "--rules", "config/rules.yaml", "serve", "--host", "0.0.0.0", "--no-warm-up"]
+    original_cwd = os.getcwd()
+    try:
+        os.chdir(test_environment)
+        with patch('kiss_signal.server.create_server') as mock_create:
+            result = runner.invoke(app, args)
+    finally:
+        os.chdir(original_cwd)
+
+    assert result.exit_code == 1
+    assert "non-loopback" in result.stdout
+    mock_create.assert_not_called()
+
+
+def test_backtest_single_symbol_prints_windows_without_db_writes(test_environment):
+    """`backtest SYMBOL` reports the strategy and each OOS window, and never opens the universe or database."""
+    rule = RuleDef(name="sma", type="sma_crossover", params={"fast_period": 5, "slow_period": 10})
+
+    def fake_find(self, price_data, rules_config, window_cache=None, **kwargs):
+        for i, month in enumerate(("2024-01-01", "2024-04-01")):
+            start, end = pd.Timestamp(month), pd.Timestamp(month) + pd.Timedelta(days=60)
+            result = {'rule_stack': [rule], 'edge_score': 0.6, 'win_pct': 0.5, 'sharpe': 1.0, 'total_trades': 12 + i,
+                      'avg_return': 1.0, 'oos_test_start': start, 'oos_test_end': end, 'is_oos': True}
+            window_cache.put(f"w{i}", result, start - pd.Timedelta(days=365), start, end)
+        return [{'rule_stack': [rule], 'edge_score': 0.6, 'win_pct': 0.5, 'sharpe': 1.0, 'total_trades': 25,
+                 'avg_return': 1.0, 'consistency_score': 1.0, 'is_oos': True}]
+
+    original_cwd = os.getcwd()
+    try:
+        os.chdir(test_environment)
+        alt_rules = test_environment / "tweak.yaml"
+        alt_rules.write_text(VALID_RULES_YAML)
+        with patch('kiss_signal.cli._load_symbol_history', return_value=pd.DataFrame({'close': [1.0]})) as mock_load, \
+             patch('kiss_signal.data.load_universe', side_effect=AssertionError("universe must not be loaded")), \
+             patch('kiss_signal.backtester.Backtester.find_optimal_strategies', fake_find):
+            result = runner.invoke(app, ["--config", "config.yaml", "--rules", "config/rules.yaml",
+                                         "backtest", "RELIANCE", "--rules", "tweak.yaml", "--profile"])
+    finally:
+        os.chdir(original_cwd)
+
+    assert result.exit_code == 0, result.stdout
+    assert mock_load.call_args.args[1] == "RELIANCE"
+    assert "Optimal Strategy for RELIANCE" in result.stdout
+    assert "Period  1 (2024-01-01" in result.stdout and "Period  2 (2024-04-01" in result.stdout
+    assert "Hot-Path Profile" in result.stdout
+    assert not (test_environment / "test.db").exists()
+
+
+def test_backtest_missing_rules_file_exits(test_environment):
+    original_cwd = os.getcwd()
+    try:
+        os.chdir(test_environment)
+        result = runner.invoke(app, ["--config", "config.yaml", "--rules", "config/rules.yaml",
+                                     "backtest", "RELIANCE", "--rules", "missing.yaml"])
+    finally:
+        os.chdir(original_cwd)
+
+    assert result.exit_code == 1
+    assert "Error loading rules" in result.stdout
@@ -15,6 +15,7 @@ from unittest.mock import patch
 import tempfile
 from pathlib import Path
 import logging
+import os
 import numpy as np
 
 from kiss_signal import data
@@ -225,6 +226,135 @@ class TestCacheOperations:
             assert len(loaded_data) == 2
 
 
+class TestFrameCache:
+    """Test suite for the in-memory frame cache used by the server."""
+
+    @pytest.fixture(autouse=True)
+    def frame_cache(self):
+        data.enable_frame_cache()
+        yield
+        data.enable_frame_cache(False)
+
+    def test_unchanged_file_is_parsed_once(self, temp_cache_dir, sample_price_data):
+        data._save_cache("RELIANCE", sample_price_data, temp_cache_dir)
+        first = data._load_cache("RELIANCE", temp_cache_dir)
+        first["close"] = 0.0  # Callers get copies; mutating one must not corrupt the cache
+
+        with patch.object(data.pd, "read_csv", side_effect=AssertionError("file re-read")):
+            second = data._load_cache("RELIANCE", temp_cache_dir)
+        assert data.frame_cache_size() == 1
+        assert (second["close"] > 0).all()
+
+    def test_rewritten_file_is_reloaded(self, temp_cache_dir, sample_price_data):
+        data._save_cache("RELIANCE", sample_price_data.iloc[:-5], temp_cache_dir)
+        assert len(data._load_cache("RELIANCE", temp_cache_dir)) == len(sample_price_data) - 5
+
+        data._save_cache("RELIANCE", sample_price_data, temp_cache_dir)  # Refresh appends bars
+        assert len(data._load_cache("RELIANCE", temp_cache_dir)) == len(sample_price_data)
+
+
+class TestCompactMode:
+    """Test suite for the opt-in float32/int32 storage mode."""
+
+    @pytest.fixture(autouse=True)
+    def compact_mode(self):
+        data.enable_compact_mode()
+        yield
+        data.enable_compact_mode(False)
+
+    def test_compact_frame_dtypes(self, sample_price_data):
+        frame = sample_price_data.astype({"volume": "Int64"})  # As served by the yfinance adapter
+        compact = data.compact_frame(frame)
+
+        assert compact[["open", "high", "low", "close"]].dtypes.eq(np.float32).all()
+        assert compact["volume"].dtype == np.int32
+        assert compact.memory_usage(index=False).sum() * 2 <= frame.memory_usage(index=False).sum()
+        np.testing.assert_allclose(compact["close"], sample_price_data["close"], rtol=1e-7)
+
+    @pytest.mark.parametrize("volume", [[10000, None], [3_000_000_000, 1]], ids=["missing", "above-int32"])
+    def test_volume_falls_back_to_float32(self, volume):
+        frame = pd.DataFrame({"close": [1.0, 2.0], "volume": pd.array(volume, dtype="Int64")})
+        compact = data.compact_frame(frame)
+
+        assert compact["volume"].dtype == np.float32
+        assert compact["volume"].isna().sum() == pd.isna(frame["volume"]).sum()
+
+    def test_get_price_data_serves_compact_frames(self, temp_cache_dir, sample_price_data):
+        data._save_cache("RELIANCE", sample_price_data, temp_cache_dir)
+        loaded = get_price_data("RELIANCE", temp_cache_dir, freeze_date=date(2024, 1, 10))
+
+        assert loaded["close"].dtype == np.float32
+        assert loaded["volume"].dtype == np.int32
+
+        data.enable_compact_mode(False)
+        assert get_price_data("RELIANCE", temp_cache_dir, freeze_date=date(2024, 1, 10))["close"].dtype != np.float32
+
+    def test_price_panel_dtype(self, sample_price_data):
+        panel = data.price_panel({"A": sample_price_data, "B": sample_price_data.iloc[2:]}, dtype="float32")
+        assert panel.dtypes.eq(np.float32).all()
+        assert panel["B"].isna().sum() == 2
+
+
+class TestLatestBarIndex:
+    """Test suite for the latest-bar index maintained at cache-write time."""
+
+    def test_save_cache_records_latest_bar(self, temp_cache_dir, sample_price_data):
+        """Saving a cache makes the last bar available without parsing the CSV."""
+        data._save_cache("RELIANCE", sample_price_data, temp_cache_dir)
+        data._save_cache("^NSEI", sample_price_data * 2, temp_cache_dir)
+
+        with patch.object(data, 'get_price_data') as mock_get_price_data:
+            latest = data.get_latest_bars(["RELIANCE", "^NSEI"], temp_cache_dir)
+
+        mock_get_price_data.assert_not_called()
+        assert latest["RELIANCE"] == {"date": "2024-01-10", "close": 112.0, "high": 114.0, "low": 104.0}
+        assert latest["^NSEI"]["close"] == 224.0
+
+    def test_changed_cache_falls_back_and_reindexes(self, temp_cache_dir, sample_price_data):
+        """A cache file rewritten outside _save_cache is re-read once and re-indexed."""
+        data._save_cache("RELIANCE", sample_price_data, temp_cache_dir)
+        cache_file = temp_cache_dir / "RELIANCE.NS.csv"
+        sample_price_data.iloc[:5].reset_index(names="date").to_csv(cache_file, index=False)
+        stat = cache_file.stat()
+        os.utime(cache_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        with patch.object(data, '_needs_refresh', return_value=False):
+            latest = data.get_latest_bars(["RELIANCE"], temp_cache_dir)
+            assert latest["RELIANCE"]["close"] == 107.0
+
+            with patch.object(data, 'get_price_data') as mock_get_price_data:
+                assert data.get_latest_bars(["RELIANCE"], temp_cache_dir)["RELIANCE"]["close"] == 107.0
+            mock_get_price_data.assert_not_called()
+
+    def test_freeze_date_before_indexed_bar_uses_history(self, temp_cache_dir, sample_price_data):
+        """Indexed bars after the freeze date are not used."""
+        data._save_cache("RELIANCE", sample_price_data, temp_cache_dir)
+
+        latest = data.get_latest_bars(["RELIANCE"], temp_cache_dir, freeze_date=date(2024, 1, 5))
+
+        assert latest["RELIANCE"]["close"] == 107.0
+        assert data.get_latest_bars(["RELIANCE"], temp_cache_dir)["RELIANCE"]["close"] == 112.0
+
+    def test_refresh_writes_index_once(self, temp_cache_dir, sample_price_data):
+        """A refresh batches its index updates into one write, leaving no temp files."""
+        def fake_fetch(symbol, years, freeze_date, cache_path):
+            return data._save_cache(symbol, sample_price_data, cache_path)
+
+        with patch.object(data, '_fetch_and_store_data', side_effect=fake_fetch), \
+             patch.object(data, 'time') as mock_time, \
+             patch.object(data, '_write_latest_bars', wraps=data._write_latest_bars) as mock_write:
+            results = dict(data.iter_refresh_market_data(["AAA", "BBB", "CCC"], str(temp_cache_dir)))
+
+        assert results == {"AAA": True, "BBB": True, "CCC": True}
+        assert mock_write.call_count == 1
+        assert sorted(data._read_latest_bars(temp_cache_dir)) == ["AAA", "BBB", "CCC"]
+        assert not list(temp_cache_dir.glob("*.tmp"))
+
+    def test_missing_symbols_are_omitted(self, temp_cache_dir):
+        """Symbols without cache in freeze mode are skipped rather than raising."""
+        assert data.get_latest_bars(["MISSING"], temp_cache_dir, freeze_date=date(2024, 1, 5)) == {}
+
+
 # ================================================================================================  
 # PRICE DATA RETRIEVAL TESTS
 # ================================================================================================
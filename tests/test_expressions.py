@@ -0,0 +1,171 @@
+"""Tests for the rule-expression language and its deduplicated evaluation plan."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kiss_signal import expressions, rules
+from kiss_signal.backtester import Backtester
+from kiss_signal.config import RuleDef
+
+
+@pytest.fixture
+def price_data() -> pd.DataFrame:
+    rng = np.random.default_rng(21)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, 500)))
+    return pd.DataFrame({
+        "open": close * (1 + rng.normal(0, 0.005, 500)),
+        "high": close * 1.01,
+        "low": close * 0.99,
+        "close": close,
+        "volume": rng.integers(100_000, 1_000_000, 500).astype(float),
+    }, index=pd.bdate_range("2022-01-03", periods=500))
+
+
+class TestParse:
+    def test_equivalent_spellings_are_the_same_node(self) -> None:
+        assert expressions.parse("rsi(14) > 40") == expressions.parse("rsi(close, period=14) > 40.0")
+        assert expressions.parse("sma(10) crosses_above sma(20)") == expressions.parse(
+            "sma(close,10)  crosses_above  sma(close, period=20)"
+        )
+
+    def test_precedence(self) -> None:
+        node = expressions.parse("close > 1 or close < 2 and not volume > 3")
+        assert node.op == "or"
+        assert node.inputs[1].op == "and"
+        assert expressions.parse("close > 1 + 2 * 3").inputs[1].op == "+"
+        assert expressions.parse("close > -5").inputs[1] == expressions.Node("const", params=(("value", -5),))
+
+    @pytest.mark.parametrize("source,error", [
+        ("rsi(14)", "needs a condition"),
+        ("sma(10) and close > 1", "needs a condition"),
+        ("close > 1 extra", "Unexpected 'extra'"),
+        ("close >", "Unexpected end"),
+        ("foo(3) > 1", "Unknown function 'foo'"),
+        ("price > 1", "Unknown name 'price'"),
+        ("sma(close) > 1", "missing parameter 'period'"),
+        ("sma(close, close) > 1", "must be a number"),
+        ("volume_spike(window=3)", "no parameter 'window'"),
+        ("stop_loss_pct(0.05)", "Unknown function"),
+        ("close > 1 $", "Unexpected character"),
+        ("", "non-empty"),
+    ])
+    def test_invalid_expressions(self, source: str, error: str) -> None:
+        with pytest.raises(ValueError, match=error):
+            expressions.parse(source)
+
+
+class TestEvaluate:
+    def test_matches_rule_functions(self, price_data: pd.DataFrame) -> None:
+        pd.testing.assert_series_equal(
+            expressions.evaluate("sma(close, 10) crosses_above sma(close, 20)", price_data),
+            rules.sma_crossover(price_data, 10, 20), check_names=False,
+        )
+        pd.testing.assert_series_equal(
+            expressions.evaluate("ema(10) crosses_below ema(20)", price_data),
+            rules.ema_crossover(price_data.assign(close=-price_data["close"]), 10, 20), check_names=False,
+        )
+        expected = price_data["close"] > price_data["high"].rolling(20).max().shift(1)
+        pd.testing.assert_series_equal(
+            expressions.evaluate("close > shift(highest(20))", price_data), expected, check_names=False
+        )
+
+    def test_rules_combine_with_indicators(self, price_data: pd.DataFrame) -> None:
+        signals = expressions.evaluate("volume_spike(20, 1.5) and not rsi(14) > 70", price_data)
+        rsi = rules.calculate_rsi(price_data["close"], 14)
+        expected = rules.volume_spike(price_data, 20, 1.5) & ~(rsi > 70)
+        pd.testing.assert_series_equal(signals, expected, check_names=False)
+        assert signals.dtype == bool
+
+    def test_plan_computes_shared_subexpressions_once(self, price_data: pd.DataFrame) -> None:
+        plan = expressions.Plan({
+            "entry": "sma(10) crosses_above sma(20) and rsi(14) > 40",
+            "exit": "sma(close, 10) crosses_below sma(close, 20) or rsi(14) > 70",
+        })
+        # close, sma10, sma20, rsi14 and 40 appear in both rules but are single nodes
+        assert sum(node.op == "indicator" for node in plan.steps) == 3
+
+        with patch.object(expressions.kernels, "rolling_mean", wraps=expressions.kernels.rolling_mean) as mean:
+            cache: dict = {}
+            signals = plan.evaluate(price_data, cache)
+            assert mean.call_count == 2
+            expressions.evaluate("sma(10) > sma(20)", price_data, cache)  # Another rule on the same frame
+            assert mean.call_count == 2
+        assert set(signals) == {"entry", "exit"}
+
+    def test_missing_column(self, price_data: pd.DataFrame) -> None:
+        with pytest.raises(ValueError, match="Missing required columns"):
+            expressions.evaluate("volume > 0", price_data.drop(columns="volume"))
+
+
+class TestRuleIntegration:
+    def test_rule_def_validates_expression(self) -> None:
+        RuleDef(name="ok", type="expression", params={"expr": "rsi(14) > 40"})
+        with pytest.raises(ValueError, match="Unknown function"):
+            RuleDef(name="bad", type="expression", params={"expr": "rsy(14) > 40"})
+        with pytest.raises(ValueError, match="non-empty"):
+            RuleDef(name="missing", type="expression", params={})
+
+    def test_backtester_shares_nodes_between_entry_and_exit(self, price_data: pd.DataFrame) -> None:
+        bt = Backtester(hold_period=10, min_trades_threshold=0)
+        entry = RuleDef(name="entry", type="expression", params={"expr": "sma(10) crosses_above sma(20)"})
+        exit_rule = RuleDef(name="exit", type="expression", params={"expr": "sma(10) crosses_below sma(20)"})
+        frame = price_data.rename(columns=str.capitalize)  # Column names are normalized as for other rules
+
+        entry_signals = bt.generate_signals_for_stack([entry], frame)
+        with patch.object(expressions.kernels, "rolling_mean") as mean:
+            exit_signals, _, _ = bt._generate_exit_signals(entry_signals, frame, [exit_rule])
+        mean.assert_not_called()
+
+        pd.testing.assert_series_equal(entry_signals, rules.sma_crossover(price_data, 10, 20), check_names=False)
+        assert exit_signals.any()
+
+    def test_node_cache_survives_evaluating_another_frame(self, price_data: pd.DataFrame) -> None:
+        bt = Backtester(hold_period=10, min_trades_threshold=0)
+        entry = RuleDef(name="entry", type="expression", params={"expr": "sma(10) crosses_above sma(20)"})
+        exit_rule = RuleDef(name="exit", type="expression", params={"expr": "sma(10) crosses_below sma(20)"})
+        context = RuleDef(name="bull", type="expression", params={"expr": "close > sma(50)", "index_symbol": "^NSEI"})
+
+        entry_signals = bt.generate_signals_for_stack([entry], price_data)
+        bt._apply_context_filters(price_data, [context], "TEST", price_data * 1.0)  # Market frame in between
+        with patch.object(expressions.kernels, "rolling_mean") as mean:
+            bt._generate_exit_signals(entry_signals, price_data, [exit_rule])
+        mean.assert_not_called()
+
+    def test_walk_forward_compiles_one_plan_per_rules_config(self, price_data: pd.DataFrame) -> None:
+        from kiss_signal.config import RulesConfig, WalkForwardConfig
+
+        rules_config = RulesConfig(
+            entry_signals=[
+                RuleDef(name="cross", type="expression", params={"expr": "sma(10) crosses_above sma(20)"}),
+                RuleDef(name="momentum", type="expression", params={"expr": "sma(10) > sma(20) and rsi(14) > 50"}),
+            ],
+            exit_conditions=[RuleDef(name="exit", type="expression", params={"expr": "rsi(14) > 70"})],
+        )
+        plan = Backtester._compile_expressions(rules_config)
+        assert plan is not None and len(plan.roots) == 3
+        assert sum(node.op == "indicator" for node in plan.steps) == 3  # sma10, sma20, rsi14 shared by all rules
+
+        wf_config = WalkForwardConfig(training_period="240d", testing_period="60d", step_size="60d", min_trades_per_period=1)
+        with patch.object(expressions, "Plan", wraps=expressions.Plan) as compiled:
+            try:
+                Backtester(hold_period=10, min_trades_threshold=0).walk_forward_backtest(
+                    price_data, wf_config, rules_config, "TEST"
+                )
+            except ValueError:
+                pass  # No tradeable window is fine; only compilation is under test
+        assert compiled.call_count == 1
+
+    def test_expression_context_filter_reads_market_data(self, price_data: pd.DataFrame) -> None:
+        bt = Backtester(hold_period=10, min_trades_threshold=0)
+        market = price_data.iloc[::-1].iloc[::-1] * 1.0  # Same values, different frame
+        context = RuleDef(name="bull", type="expression", params={"expr": "close > sma(50)", "index_symbol": "^NSEI"})
+
+        signals = bt._apply_context_filters(price_data, [context], "TEST", market)
+
+        pd.testing.assert_series_equal(
+            signals, rules.market_above_sma(market, 50), check_names=False, check_dtype=False
+        )
+        assert not bt._apply_context_filters(price_data, [context], "TEST", None).any()
@@ -0,0 +1,151 @@
+"""Tests for incremental indicator state used in daily position monitoring."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kiss_signal import indicator_state, persistence, rules
+
+
+@pytest.fixture
+def price_history() -> pd.DataFrame:
+    """Seeded random-walk OHLC history with a few SMA crossings."""
+    rng = np.random.default_rng(42)
+    close = 100 + np.cumsum(rng.normal(0, 2, 120))
+    return pd.DataFrame({
+        'open': close,
+        'high': close + rng.uniform(0.5, 2.0, 120),
+        'low': close - rng.uniform(0.5, 2.0, 120),
+        'close': close,
+        'volume': 1000,
+    }, index=pd.date_range('2024-01-01', periods=120))
+
+
+class TestIncrementalIndicators:
+    """Incremental updates must reproduce the full-history rule functions."""
+
+    def test_atr_matches_full_recompute(self, price_history):
+        key = indicator_state.atr_key(14)
+        state = indicator_state.build_state(key, price_history.iloc[:60])
+
+        for end in range(61, len(price_history) + 1):
+            state, rebuilt = indicator_state.sync_state(key, state, price_history.iloc[:end])
+            assert not rebuilt
+            expected = rules.calculate_atr(price_history.iloc[:end], 14).iloc[-1]
+            assert indicator_state.atr_value(state) == pytest.approx(expected, rel=1e-9)
+
+    def test_sma_cross_flags_match_rules(self, price_history):
+        key = indicator_state.sma_key(5, 10)
+        state = indicator_state.build_state(key, price_history.iloc[:30])
+        under_hits = over_hits = 0
+
+        for end in range(31, len(price_history) + 1):
+            window = price_history.iloc[:end]
+            state, _ = indicator_state.sync_state(key, state, window)
+            crossed_under, crossed_over = indicator_state.sma_cross_flags(state)
+            assert crossed_under == bool(rules.sma_cross_under(window, 5, 10).iloc[-1])
+            assert crossed_over == bool(rules.sma_crossover(window, 5, 10).iloc[-1])
+            under_hits += crossed_under
+            over_hits += crossed_over
+
+        assert under_hits > 0 and over_hits > 0
+
+    def test_multiple_new_bars_applied_in_one_sync(self, price_history):
+        key = indicator_state.atr_key(14)
+        state = indicator_state.build_state(key, price_history.iloc[:50])
+
+        state, rebuilt = indicator_state.sync_state(key, state, price_history)
+
+        assert not rebuilt
+        assert state['bars'] == len(price_history)
+        assert indicator_state.atr_value(state) == pytest.approx(
+            rules.calculate_atr(price_history, 14).iloc[-1], rel=1e-9
+        )
+
+    def test_rebuilds_when_cache_rewritten(self, price_history):
+        key = indicator_state.atr_key(14)
+        state = indicator_state.build_state(key, price_history.iloc[:50])
+        rewritten = price_history.copy()
+        rewritten.iloc[49, rewritten.columns.get_loc('close')] += 5.0
+
+        _, rebuilt = indicator_state.sync_state(key, state, rewritten)
+
+        assert rebuilt
+
+    def test_rebuilds_when_state_missing_or_short(self, price_history):
+        key = indicator_state.atr_key(14)
+        _, rebuilt = indicator_state.sync_state(key, None, price_history)
+        assert rebuilt
+
+        short_state = indicator_state.build_state(key, price_history.iloc[:5])
+        assert np.isnan(indicator_state.atr_value(short_state))
+        state, rebuilt = indicator_state.sync_state(key, short_state, price_history)
+        assert rebuilt
+        assert not np.isnan(indicator_state.atr_value(state))
+
+    def test_advance_from_tail_matches_full_sync(self, price_history):
+        for key in (indicator_state.atr_key(14), indicator_state.sma_key(5, 10)):
+            state = indicator_state.build_state(key, price_history.iloc[:80])
+            expected, _ = indicator_state.sync_state(key, indicator_state.build_state(key, price_history.iloc[:80]), price_history)
+
+            advanced = indicator_state.advance_state(key, state, price_history.iloc[79:])
+
+            assert advanced == expected
+
+    def test_advance_returns_none_when_rebuild_needed(self, price_history):
+        key = indicator_state.atr_key(14)
+        state = indicator_state.build_state(key, price_history.iloc[:80])
+
+        assert indicator_state.advance_state(key, None, price_history) is None
+        assert indicator_state.advance_state(indicator_state.atr_key(10), state, price_history) is None
+        assert indicator_state.advance_state(key, state, price_history.iloc[90:]) is None
+
+    def test_sma_sums_do_not_drift(self):
+        rng = np.random.default_rng(7)
+        close = 1e6 + np.cumsum(rng.normal(0, 0.01, 5000))
+        history = pd.DataFrame({'high': close, 'low': close, 'close': close},
+                               index=pd.date_range('2000-01-01', periods=5000))
+        key = indicator_state.sma_key(5, 10)
+        state = indicator_state.build_state(key, history.iloc[:20])
+
+        state, rebuilt = indicator_state.sync_state(key, state, history)
+
+        assert not rebuilt
+        fresh = indicator_state.build_state(key, history)
+        assert state['slow'] == pytest.approx(fresh['slow'], abs=1e-9)
+        assert state['fast'] == pytest.approx(fresh['fast'], abs=1e-9)
+
+    def test_sma_state_without_compensation_still_advances(self, price_history):
+        key = indicator_state.sma_key(5, 10)
+        state = indicator_state.build_state(key, price_history.iloc[:60])
+        del state['fast_comp'], state['slow_comp']
+
+        state, rebuilt = indicator_state.sync_state(key, state, price_history)
+
+        assert not rebuilt
+        assert state['slow'] == pytest.approx(price_history['close'].iloc[-10:].mean(), rel=1e-12)
+
+    def test_invalid_sma_periods_raise(self, price_history):
+        with pytest.raises(ValueError, match="fast_period"):
+            indicator_state.build_state(indicator_state.sma_key(20, 10), price_history)
+
+
+class TestIndicatorStatePersistence:
+    """Round-trip of indicator states through the positions database."""
+
+    def test_save_and_load_round_trip(self, tmp_path, price_history):
+        db_path = tmp_path / "state.db"
+        persistence.create_database(db_path)
+        key = indicator_state.sma_key(5, 10)
+        states = {'TEST': {key: indicator_state.build_state(key, price_history)}}
+
+        persistence.save_indicator_states(db_path, states)
+        loaded = persistence.get_indicator_states(db_path, ['TEST', 'OTHER'])
+
+        assert loaded == states
+
+    def test_missing_database_returns_empty(self, tmp_path):
+        db_path = tmp_path / "missing.db"
+        assert persistence.get_indicator_states(db_path, ['TEST']) == {}
+        persistence.save_indicator_states(db_path, {'TEST': {'atr:14': {'key': 'atr:14'}}})
+        assert not db_path.exists()
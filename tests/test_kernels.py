@@ -0,0 +1,148 @@
+"""Tests for the compiled indicator kernels."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kiss_signal import kernels
+from kiss_signal.rules import calculate_atr, calculate_rsi
+from tests.reference_data.manual_calculations import ATR_TEST_CASES
+
+
+def _pandas_rsi(prices: pd.Series, period: int) -> pd.Series:
+    """The ewm-based calculate_rsi body the kernel replaced."""
+    delta = prices.diff()
+    gains = delta.where(delta > 0, 0)
+    losses = -delta.where(delta < 0, 0)
+    avg_gains = gains.ewm(alpha=1.0 / period, adjust=False).mean()
+    avg_losses = losses.ewm(alpha=1.0 / period, adjust=False).mean()
+    rs = avg_gains / avg_losses.where(avg_losses != 0, 1e-10)
+    return 100 - (100 / (1 + rs))
+
+
+def _pandas_atr(price_data: pd.DataFrame, period: int) -> pd.Series:
+    """The concat/ewm-based calculate_atr body the kernel replaced."""
+    high, low, close = price_data['high'], price_data['low'], price_data['close']
+    prev_close = close.shift(1)
+    true_range = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+    true_range.iloc[0] = high.iloc[0] - low.iloc[0]
+    return true_range.ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean()
+
+
+@pytest.fixture
+def gappy_prices() -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 600))))
+    frame = pd.DataFrame({"high": close * 1.01, "low": close * 0.99, "close": close},
+                         index=pd.bdate_range("2022-01-03", periods=600))
+    frame.iloc[[10, 200, 201], 2] = np.nan  # Missing closes
+    frame.iloc[[50, 51], 0] = np.nan  # Missing highs
+    return frame
+
+
+class TestWilderKernels:
+    @pytest.mark.parametrize("period", [2, 3, 14, 21])
+    def test_rsi_is_bit_identical_to_pandas(self, gappy_prices, period):
+        expected = _pandas_rsi(gappy_prices["close"], period).to_numpy()
+        np.testing.assert_array_equal(kernels.wilder_rsi(gappy_prices["close"].to_numpy(), period), expected)
+        np.testing.assert_array_equal(calculate_rsi(gappy_prices["close"], period).to_numpy(), expected)
+
+    @pytest.mark.parametrize("period", [2, 3, 14, 21])
+    def test_atr_is_bit_identical_to_pandas(self, gappy_prices, period):
+        expected = _pandas_atr(gappy_prices, period).to_numpy()
+        np.testing.assert_array_equal(calculate_atr(gappy_prices, period).to_numpy(), expected)
+
+    def test_interpreted_fallback_matches_compiled(self, gappy_prices):
+        close, high, low = (gappy_prices[c].to_numpy() for c in ("close", "high", "low"))
+        alpha = kernels._pandas_alpha(14)
+        np.testing.assert_array_equal(kernels._wilder_rsi_loop(close[None, :], alpha)[0], kernels.wilder_rsi(close, 14))
+        np.testing.assert_array_equal(
+            kernels._wilder_atr_loop(high[None, :], low[None, :], close[None, :], alpha, 14)[0],
+            kernels.wilder_atr(high, low, close, 14),
+        )
+
+    def test_panel_columns_match_single_series(self, gappy_prices):
+        close, high, low = (gappy_prices[c].to_numpy() for c in ("close", "high", "low"))
+        panels = [np.column_stack([values, values[::-1], values * 2]) for values in (close, high, low)]
+
+        rsi = kernels.wilder_rsi(panels[0], 14)
+        atr = kernels.wilder_atr(panels[1], panels[2], panels[0], 14)
+
+        assert rsi.shape == atr.shape == panels[0].shape
+        for column in range(3):
+            np.testing.assert_array_equal(rsi[:, column], kernels.wilder_rsi(panels[0][:, column], 14))
+            np.testing.assert_array_equal(
+                atr[:, column], kernels.wilder_atr(panels[1][:, column], panels[2][:, column], panels[0][:, column], 14)
+            )
+
+    def test_atr_matches_hand_calculated_reference(self):
+        case = ATR_TEST_CASES["simple_case"]
+        ohlc = case["ohlc"]
+        atr = kernels.wilder_atr(ohlc["high"], ohlc["low"], ohlc["close"], period=3)
+
+        assert np.isnan(atr[:2]).all()
+        for position, key in ((2, "day_3"), (3, "day_4"), (4, "day_5")):
+            # Hand-calculated values are rounded to two decimals at each step
+            assert atr[position] == pytest.approx(case["expected_atr_period_3"][key], abs=0.01)
+
+        flat = ATR_TEST_CASES["zero_volatility"]["ohlc"]
+        assert kernels.wilder_atr(flat["high"], flat["low"], flat["close"], period=3)[-1] == 0.0
+
+    def test_empty_and_mismatched_inputs(self):
+        assert kernels.wilder_rsi(np.array([]), 14).shape == (0,)
+        assert kernels.wilder_atr([], [], [], 14).shape == (0,)
+        with pytest.raises(ValueError, match="same length"):
+            kernels.wilder_atr([1.0, 2.0], [1.0], [1.0, 2.0], 14)
+
+
+@pytest.fixture
+def rolling_input() -> np.ndarray:
+    rng = np.random.default_rng(9)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 800)))
+    values[[3, 4, 300, 301, 302]] = np.nan  # Gaps inside and near the start
+    values[500:540] = 123.45  # Flat run: constant windows
+    values[600:610] -= 200.0  # Sign changes
+    return values
+
+
+class TestRollingKernels:
+    @pytest.mark.parametrize("window,min_periods", [(1, None), (2, None), (5, None), (20, None), (20, 1), (50, 25)])
+    @pytest.mark.parametrize("name", ["sum", "mean", "std", "max", "min"])
+    def test_bit_identical_to_pandas_rolling(self, rolling_input, name, window, min_periods):
+        expected = getattr(pd.Series(rolling_input).rolling(window, min_periods=min_periods), name)().to_numpy()
+        result = getattr(kernels, f"rolling_{name}")(rolling_input, window, min_periods)
+        np.testing.assert_array_equal(result, expected)
+
+    def test_panel_columns_are_independent_series(self, rolling_input):
+        panel = np.column_stack([rolling_input, rolling_input[::-1], np.full(len(rolling_input), np.nan)])
+        result = kernels.rolling_max(panel, 22, min_periods=1)
+
+        assert result.shape == panel.shape
+        np.testing.assert_array_equal(result[:, 0], kernels.rolling_max(rolling_input, 22, min_periods=1))
+        np.testing.assert_array_equal(result[:, 1], kernels.rolling_max(rolling_input[::-1], 22, min_periods=1))
+        assert np.isnan(result[:, 2]).all()
+
+    def test_running_max_restarts_at_reset_bars(self, rolling_input):
+        np.testing.assert_array_equal(
+            kernels.running_max(rolling_input), pd.Series(rolling_input).expanding().max().to_numpy()
+        )
+
+        values = np.array([5.0, 7.0, 6.0, 3.0, np.nan, 4.0, 8.0])
+        reset = np.array([False, False, False, True, False, False, False])
+        np.testing.assert_array_equal(kernels.running_max(values, reset), [5.0, 7.0, 7.0, 3.0, 3.0, 4.0, 8.0])
+
+    def test_interpreted_fallback_matches_compiled(self, rolling_input):
+        rows = kernels._as_series_rows(rolling_input)
+        np.testing.assert_array_equal(kernels._rolling_extreme_loop(rows, 20, 20, True)[0],
+                                      kernels.rolling_max(rolling_input, 20))
+        np.testing.assert_array_equal(kernels._rolling_sum_loop(rows, 20, 20, True)[0],
+                                      kernels.rolling_mean(rolling_input, 20))
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="window"):
+            kernels.rolling_mean([1.0, 2.0], 0)
+        with pytest.raises(ValueError, match="min_periods"):
+            kernels.rolling_max([1.0, 2.0], 2, min_periods=3)
+        with pytest.raises(ValueError, match="same shape"):
+            kernels.running_max([1.0, 2.0], reset=[True])
+        assert kernels.rolling_std(np.array([]), 5).shape == (0,)
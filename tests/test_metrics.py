@@ -0,0 +1,93 @@
+"""Tests for one-pass performance metrics from vectorbt trade records."""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kiss_signal import metrics
+from kiss_signal.backtester import Backtester
+from kiss_signal.config import EdgeScoreWeights
+
+WEIGHTS = EdgeScoreWeights(win_pct=0.6, sharpe=0.4)
+RECORD_DTYPE = [("col", "i8"), ("pnl", "f8"), ("return", "f8")]
+
+
+@pytest.fixture
+def portfolio():
+    """Four-column portfolio; the last column never enters a trade."""
+    import vectorbt as vbt
+
+    Backtester()  # Applies the vectorbt frequency settings the backtester simulates with
+    rng = np.random.default_rng(50)
+    index = pd.bdate_range("2022-01-03", periods=400)
+    close = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0.0, 0.02, (400, 4)), axis=0)), index=index)
+    entries = pd.DataFrame(rng.random((400, 4)) < 0.05, index=index)
+    exits = pd.DataFrame(rng.random((400, 4)) < 0.05, index=index)
+    entries[3] = False
+    return vbt.Portfolio.from_signals(close, entries, exits, sl_stop=0.05, fees=0.001)
+
+
+class TestPortfolioMetrics:
+    def test_matches_vectorbt_per_column(self, portfolio):
+        result = metrics.portfolio_metrics(portfolio, WEIGHTS)
+
+        np.testing.assert_array_equal(result["total_trades"], portfolio.trades.count().to_numpy())
+        traded = result["total_trades"] > 0
+        assert traded.tolist() == [True, True, True, False]
+        np.testing.assert_allclose(result["win_pct"][traded], portfolio.trades.win_rate().to_numpy()[traded])
+        np.testing.assert_allclose(
+            result["avg_return"][traded], portfolio.trades.returns.mean().to_numpy()[traded] * 100
+        )
+        np.testing.assert_allclose(result["sharpe"][traded], portfolio.sharpe_ratio().to_numpy()[traded])
+        np.testing.assert_allclose(
+            result["edge_score"], result["win_pct"] * WEIGHTS.win_pct + result["sharpe"] * WEIGHTS.sharpe
+        )
+
+    def test_column_without_trades_reports_zeros(self, portfolio, caplog):
+        with caplog.at_level(logging.WARNING, logger="kiss_signal.metrics"):
+            result = metrics.column_metrics(metrics.portfolio_metrics(portfolio, WEIGHTS, "TEST"), column=3)
+
+        assert result == {"total_trades": 0, "win_pct": 0.0, "avg_return": 0.0, "sharpe": 0.0, "edge_score": 0.0}
+        assert "Sharpe ratio for TEST is 'inf'" in caplog.text  # Flat equity: vectorbt reports inf
+
+    def test_single_column_matches_its_2d_column(self, portfolio):
+        full = metrics.column_metrics(metrics.portfolio_metrics(portfolio, WEIGHTS), column=1)
+        records = portfolio.trades.values
+        records = records[records["col"] == 1].copy()
+        records["col"] = 0
+        returns = portfolio.returns().to_numpy()[:, 1]
+
+        assert metrics.column_metrics(
+            metrics.trade_metrics(records, returns, portfolio.returns_acc.ann_factor, WEIGHTS)
+        ) == pytest.approx(full)
+
+
+class TestTradeMetrics:
+    def test_returns_shape_sets_column_count(self):
+        records = np.array([(1, 5.0, 0.05), (1, -2.0, -0.02)], dtype=RECORD_DTYPE)
+        result = metrics.trade_metrics(records, np.full((10, 3), 0.001), 252.0, WEIGHTS)
+
+        assert result["total_trades"].tolist() == [0, 2, 0]
+        assert result["win_pct"].tolist() == [0.0, 0.5, 0.0]
+        assert result["avg_return"][1] == pytest.approx(1.5)
+
+    @pytest.mark.parametrize("returns,ann_factor", [
+        ([0.01], 252.0),  # Fewer than two bars: Sharpe is undefined
+        ([0.01, np.nan, 0.02], np.nan),  # No usable frequency
+        ([np.nan, np.nan, 0.02], 252.0),  # One valid bar: std with ddof=1 is NaN
+    ], ids=["one-bar", "no-frequency", "one-valid-bar"])
+    def test_undefined_sharpe_is_zero(self, returns, ann_factor):
+        records = np.array([(0, 1.0, 0.01)], dtype=RECORD_DTYPE)
+        result = metrics.trade_metrics(records, returns, ann_factor, WEIGHTS)
+
+        assert result["sharpe"].tolist() == [0.0]
+        assert result["edge_score"].tolist() == [WEIGHTS.win_pct]
+
+    def test_nan_trade_returns_are_ignored_in_mean(self):
+        records = np.array([(0, 1.0, 0.04), (0, -1.0, np.nan)], dtype=RECORD_DTYPE)
+        result = metrics.trade_metrics(records, [0.01, 0.02], 252.0, WEIGHTS)
+
+        assert result["total_trades"].tolist() == [2]
+        assert result["avg_return"][0] == pytest.approx(4.0)
@@ -1,10 +1,12 @@
 """Tests for the performance monitoring module."""
 
+import json
 import pytest
+import threading
 import time
 from unittest.mock import patch
 
-from kiss_signal.performance import PerformanceMonitor, performance_monitor
+from kiss_signal.performance import HierarchicalProfiler, PerformanceMonitor, performance_monitor
 
 
 def test_performance_monitor_context_manager():
@@ -111,3 +113,122 @@ def test_performance_benchmark_simulation():
 
     assert "full_60_ticker_run" in monitor.metrics
     assert monitor.metrics["full_60_ticker_run"].duration >= 60 * 0.001
+
+
+def test_profiler_disabled_is_noop():
+    """Disabled spans share one no-op context and record nothing."""
+    monitor = PerformanceMonitor()
+    assert monitor.span("a") is monitor.span("b")
+    with monitor.span("a"):
+        pass
+    assert monitor.profiler.get_stats() == {}
+
+
+def test_profiler_nested_spans_stats_and_paths(tmp_path):
+    """Nested spans aggregate per name and export collapsed stacks by path."""
+    monitor = PerformanceMonitor()
+    monitor.profiler.enable()
+    with monitor.span("run"):
+        for _ in range(3):
+            with monitor.span("symbol"):
+                with monitor.span("simulate"):
+                    time.sleep(0.002)
+    monitor.profiler.disable()
+
+    stats = monitor.profiler.get_stats()
+    assert stats["symbol"]["count"] == 3
+    assert stats["simulate"]["count"] == 3
+    assert stats["run"]["total_ms"] >= stats["symbol"]["total_ms"] >= stats["simulate"]["total_ms"] >= 6
+    assert stats["simulate"]["p50_ms"] <= stats["simulate"]["p95_ms"] <= stats["simulate"]["max_ms"]
+
+    collapsed = monitor.profiler.export_collapsed(tmp_path / "profile.collapsed").read_text().splitlines()
+    stacks = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in collapsed}
+    assert stacks["run;symbol;simulate"] >= 6000
+
+    payload = json.loads(monitor.profiler.export_json(tmp_path / "profile.json").read_text())
+    assert payload["spans"]["run"]["count"] == 1
+    assert "run;symbol;simulate" in payload["paths"]
+
+
+def test_profiler_traces_peak_memory():
+    """Memory tracing attributes a nested allocation to every enclosing span."""
+    monitor = PerformanceMonitor()
+    monitor.profiler.enable(trace_memory=True)
+    try:
+        with monitor.span("outer"):
+            with monitor.span("inner"):
+                buffer = bytearray(2 * 1024 * 1024)
+                del buffer
+    finally:
+        monitor.profiler.disable()
+
+    stats = monitor.profiler.get_stats()
+    assert stats["inner"]["peak_memory_kb"] >= 2048
+    assert stats["outer"]["peak_memory_kb"] >= 2048
+
+
+def test_monitor_execution_records_span_when_enabled():
+    """monitor_execution blocks become spans so repeated calls are all counted."""
+    monitor = PerformanceMonitor()
+    monitor.profiler.enable()
+    for _ in range(2):
+        with monitor.monitor_execution("block"):
+            pass
+    monitor.profiler.disable()
+
+    assert monitor.profiler.get_stats()["block"]["count"] == 2
+
+
+def test_monitor_execution_accumulates_repeated_calls():
+    """Repeated names add up instead of replacing the previous call."""
+    monitor = PerformanceMonitor()
+    for delay in (0.01, 0.02):
+        with monitor.monitor_execution("block"):
+            time.sleep(delay)
+
+    metrics = monitor.metrics["block"]
+    assert metrics.calls == 2
+    assert metrics.duration >= 0.03
+    assert 0.02 <= metrics.last_duration < metrics.duration
+
+
+def test_profiler_spans_nest_per_thread():
+    """Spans opened in worker threads do not nest under another thread's spans."""
+    profiler = HierarchicalProfiler()
+    profiler.enable()
+    started = threading.Event()
+    release = threading.Event()
+
+    def worker() -> None:
+        with profiler.span("worker"):
+            started.set()
+            release.wait(5)
+
+    with profiler.span("main"):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        started.wait(5)
+        with profiler.span("child"):
+            pass
+        release.set()
+        thread.join()
+    profiler.disable()
+
+    assert set(profiler._self_ns_by_path) == {("main",), ("main", "child"), ("worker",)}
+
+
+def test_stage_accumulates_and_reset_run_stats():
+    """Stage timings add up across calls; counters and stages clear together."""
+    monitor = PerformanceMonitor()
+    for _ in range(2):
+        with monitor.stage("load"):
+            time.sleep(0.005)
+    monitor.increment("cache_hits")
+    monitor.increment("cache_hits", 2)
+
+    assert monitor.stage_durations["load"] >= 0.01
+    assert monitor.counters["cache_hits"] == 3
+
+    monitor.reset_run_stats()
+    assert not monitor.stage_durations
+    assert not monitor.counters
@@ -1499,3 +1499,139 @@ class TestClearCurrentStrategies:
         # Verify results - no clearing should happen
         assert result['cleared_count'] == 0, "Should clear 0 strategies"
         assert result['preserved_count'] == 1, "Should preserve 1 strategy"
+
+
+class TestRunMetrics:
+    """Test the per-run performance ledger."""
+
+    def test_save_and_get_run_metrics_newest_first(self, temp_db_path: Path) -> None:
+        create_database(temp_db_path)
+        for i, total in enumerate([10.0, 12.0, 30.0]):
+            assert persistence.save_run_metrics(temp_db_path, {
+                "run_timestamp": f"2025-01-0{i + 1}T09:00:00",
+                "command": "run",
+                "config_hash": "abc123",
+                "total_duration": total,
+                "backtest_duration": total / 2,
+                "cache_hits": 9,
+                "cache_misses": 1,
+            })
+
+        rows = persistence.get_run_metrics(temp_db_path, limit=2)
+
+        assert [row["run_timestamp"] for row in rows] == ["2025-01-03T09:00:00", "2025-01-02T09:00:00"]
+        assert rows[0]["total_duration"] == 30.0
+        assert rows[0]["config_hash"] == "abc123"
+        assert rows[0]["refresh_duration"] is None
+
+    def test_run_metrics_missing_database(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "missing.db"
+        assert persistence.save_run_metrics(db_path, {"run_timestamp": "x", "command": "run"}) is False
+        assert persistence.get_run_metrics(db_path) == []
+        assert not db_path.exists()
+
+
+class TestRunProgress:
+    """Test per-symbol checkpoints for resumable runs."""
+
+    def test_checkpoint_resume_and_clear(self, temp_db_path: Path, sample_strategies: List[Dict[str, Any]]) -> None:
+        create_database(temp_db_path)
+        conn = persistence.get_connection(temp_db_path)
+        try:
+            assert save_strategies_batch(conn, sample_strategies[:1], "2025-01-01T09:00:00", {}, "cfg1")
+            persistence.mark_symbol_complete(conn, "2025-01-01T09:00:00", "cfg1", "RELIANCE", 1)
+            persistence.mark_symbol_complete(conn, "2025-01-01T09:00:00", "cfg1", "INFY", 0)
+
+            assert persistence.get_resumable_run(conn, "cfg1") == ("2025-01-01T09:00:00", {"RELIANCE", "INFY"})
+            assert persistence.get_resumable_run(conn, "cfg1", freeze_date="2025-01-01") is None
+            assert persistence.get_resumable_run(conn, "other") is None
+
+            loaded = persistence.get_run_strategies(conn, "2025-01-01T09:00:00", {"RELIANCE"})
+            assert len(loaded) == 1
+            assert loaded[0]["symbol"] == "RELIANCE"
+            assert loaded[0]["rule_stack"][0]["type"] == "sma_crossover"
+            assert loaded[0]["is_oos"] is True
+
+            persistence.clear_run_progress(conn, "cfg1")
+            assert persistence.get_resumable_run(conn, "cfg1") is None
+        finally:
+            conn.close()
+
+    def test_iter_run_strategies_streams_whole_run_by_symbol(
+        self, temp_db_path: Path, sample_strategies: List[Dict[str, Any]]
+    ) -> None:
+        create_database(temp_db_path)
+        conn = persistence.get_connection(temp_db_path)
+        try:
+            assert save_strategies_batch(conn, sample_strategies, "2025-01-01T09:00:00", {}, "cfg1")
+            assert save_strategies_batch(conn, sample_strategies[:1], "2025-01-02T09:00:00", {}, "cfg1")
+
+            rows = persistence.iter_run_strategies(conn, "2025-01-01T09:00:00")
+            assert not isinstance(rows, list)
+            symbols = [row["symbol"] for row in rows]
+            assert symbols == sorted(s["symbol"] for s in sample_strategies)
+            assert [row["symbol"] for row in persistence.iter_run_strategies(conn, "2025-01-02T09:00:00")] == [
+                sample_strategies[0]["symbol"]
+            ]
+        finally:
+            conn.close()
+
+
+class TestWalkForwardWindows:
+    """Test the per-window walk-forward results table."""
+
+    @staticmethod
+    def _window(key: str, start: str) -> Dict[str, str]:
+        return {
+            "window_key": key, "training_start": start, "oos_test_start": f"{start}T1",
+            "oos_test_end": f"{start}T2", "result": "null",
+        }
+
+    def test_save_replaces_symbol_windows(self, temp_db_path: Path) -> None:
+        create_database(temp_db_path)
+        persistence.save_walk_forward_windows(
+            temp_db_path, "RELIANCE", "cfg1", [self._window("w2", "2024-03-01"), self._window("w1", "2024-01-01")]
+        )
+        persistence.save_walk_forward_windows(temp_db_path, "INFY", "cfg1", [self._window("w1", "2024-01-01")])
+        persistence.save_walk_forward_windows(
+            temp_db_path, "RELIANCE", "cfg1", [self._window("w2", "2024-03-01"), self._window("w3", "2024-05-01")]
+        )
+
+        windows = persistence.get_walk_forward_windows(temp_db_path, "RELIANCE", "cfg1")
+        assert [w["window_key"] for w in windows] == ["w2", "w3"]  # Oldest first
+        assert windows[0] == self._window("w2", "2024-03-01")
+        assert len(persistence.get_walk_forward_windows(temp_db_path, "INFY", "cfg1")) == 1
+        assert persistence.get_walk_forward_windows(temp_db_path, "RELIANCE", "cfg2") == []
+
+    def test_missing_database(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "missing.db"
+        persistence.save_walk_forward_windows(db_path, "RELIANCE", "cfg1", [self._window("w1", "2024-01-01")])
+        assert persistence.get_walk_forward_windows(db_path, "RELIANCE", "cfg1") == []
+        assert not db_path.exists()
+
+
+class TestSignalCache:
+    """Test the bit-packed rule signal table."""
+
+    @staticmethod
+    def _row(key: str, data_hash: str) -> Dict[str, Any]:
+        return {
+            "signal_key": key, "data_hash": data_hash, "first_date": "2024-01-01T00:00:00",
+            "length": 10, "bits": bytes([0b10100000, 0b01000000]),
+        }
+
+    def test_save_replaces_symbol_rows(self, temp_db_path: Path) -> None:
+        create_database(temp_db_path)
+        persistence.save_signal_cache(temp_db_path, "RELIANCE", [self._row("sma:{}", "h1"), self._row("rsi:{}", "h1")])
+        persistence.save_signal_cache(temp_db_path, "INFY", [self._row("sma:{}", "h1")])
+        persistence.save_signal_cache(temp_db_path, "RELIANCE", [self._row("sma:{}", "h2")])
+
+        rows = persistence.get_signal_cache(temp_db_path, "RELIANCE")
+        assert rows == [self._row("sma:{}", "h2")]
+        assert len(persistence.get_signal_cache(temp_db_path, "INFY")) == 1
+
+    def test_missing_database(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "missing.db"
+        persistence.save_signal_cache(db_path, "RELIANCE", [self._row("sma:{}", "h1")])
+        assert persistence.get_signal_cache(db_path, "RELIANCE") == []
+        assert not db_path.exists()
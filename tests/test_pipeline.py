@@ -0,0 +1,104 @@
+"""Tests for the streaming load → process → write pipeline."""
+
+import threading
+from typing import Any, List, Tuple
+
+import pytest
+
+from kiss_signal.pipeline import run_pipeline
+
+
+# Process-stage functions must be importable top-level callables (spawned workers)
+def _square(item: str, payload: Any) -> int:
+    return int(payload) ** 2
+
+
+def _fail_on_three(item: str, payload: Any) -> int:
+    if payload == 3:
+        raise ValueError("bad symbol")
+    return int(payload)
+
+
+def _scaled(item: str, payload: Any) -> int:
+    return int(payload) * _FACTOR[0]
+
+
+_FACTOR = [1]
+
+
+def _set_factor(factor: int) -> None:
+    _FACTOR[0] = factor
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.batches: List[List[Tuple[str, Any]]] = []
+        self.threads = set()
+
+    def __call__(self, batch: List[Tuple[str, Any]]) -> None:
+        self.threads.add(threading.current_thread().name)
+        self.batches.append(list(batch))
+
+    @property
+    def written(self) -> dict:
+        return {item: result for batch in self.batches for item, result in batch}
+
+
+class TestRunPipeline:
+    def test_all_items_processed_and_written_in_batches(self) -> None:
+        items = [f"S{i}" for i in range(7)]
+        writer = _Recorder()
+
+        seen = {}
+        succeeded = run_pipeline(
+            iter(items), load=lambda item: item[1:], process=_square, write=writer,
+            workers=2, batch_size=3, on_result=seen.__setitem__,
+        )
+
+        expected = {f"S{i}": i * i for i in range(7)}
+        assert succeeded == 7
+        assert seen == expected
+        assert writer.written == expected
+        assert all(len(batch) <= 3 for batch in writer.batches)
+        assert writer.threads == {"pipeline-writer"}
+
+    def test_failures_are_logged_and_skipped(self, caplog: pytest.LogCaptureFixture) -> None:
+        def load(item: str) -> int:
+            if item == "S1":
+                raise FileNotFoundError("no cache")
+            return int(item[1:])
+
+        writer = _Recorder()
+        succeeded = run_pipeline(["S0", "S1", "S2", "S3"], load=load, process=_fail_on_three, write=writer, workers=2)
+
+        # A failed load still reaches the process stage, with a None payload
+        assert "Failed to load S1" in caplog.text
+        assert "Processing S1 failed" in caplog.text
+        assert "Processing S3 failed" in caplog.text
+        assert succeeded == 2
+        assert writer.written == {"S0": 0, "S2": 2}
+
+    def test_initializer_runs_in_workers(self) -> None:
+        writer = _Recorder()
+        run_pipeline(
+            ["S1", "S2"], load=lambda item: item[1:], process=_scaled, write=writer,
+            workers=1, initializer=_set_factor, initargs=(10,),
+        )
+        assert writer.written == {"S1": 10, "S2": 20}
+        assert _FACTOR == [1]  # Parent state untouched
+
+    def test_interrupt_writes_finished_results_and_reraises(self) -> None:
+        items = [f"S{i}" for i in range(20)]
+        writer = _Recorder()
+
+        def on_result(item: str, result: Any) -> None:
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            run_pipeline(
+                iter(items), load=lambda item: item[1:], process=_square, write=writer,
+                workers=1, max_pending=2, on_result=on_result,
+            )
+
+        assert writer.written  # The result that finished before Ctrl-C was still saved
+        assert len(writer.written) < len(items)
@@ -25,6 +25,7 @@ from pathlib import Path
 from typing import Any, Dict, List
 from unittest.mock import Mock, patch
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -734,6 +735,112 @@ class TestStrategyAnalysis:
         assert result == []
 
 
+class TestStreamingExport:
+    """Tests for the streaming strategy analysis export."""
+
+    @pytest.fixture
+    def export_db(self, tmp_path: Path) -> Path:
+        """Strategies database with a few per-stock records."""
+        db_path = tmp_path / "export.db"
+        persistence.create_database(db_path)
+        with sqlite3.connect(str(db_path)) as conn:
+            for i, symbol in enumerate(["AAA", "BBB", "CCC"]):
+                conn.execute("""
+                    INSERT INTO strategies (symbol, run_timestamp, rule_stack, edge_score, win_pct,
+                                            sharpe, total_trades, avg_return, config_snapshot, config_hash)
+                    VALUES (?, '2024-01-01T00:00:00', ?, ?, 0.6, 1.1, ?, 0.02, '{}', 'hash1')
+                """, (symbol, '[{"name": "sma_10_20", "type": "sma_crossover"}]', 0.5 + i / 10, 10 + i))
+        return db_path
+
+    def test_iter_strategy_performance_matches_list(self, export_db):
+        """Iterator yields the same records as the list-returning analysis."""
+        streamed = list(reporter.iter_strategy_performance(export_db, min_trades=0, chunk_size=2))
+        assert streamed == reporter.analyze_strategy_performance(export_db, min_trades=0)
+        assert [r['symbol'] for r in streamed] == ["AAA", "BBB", "CCC"]
+
+    def test_write_strategy_analysis_csv_chunks(self, export_db, tmp_path):
+        """CSV export writes header plus every row across chunk boundaries."""
+        import csv
+
+        output_file = tmp_path / "report.csv"
+        row_count = reporter.write_strategy_analysis(
+            reporter.iter_strategy_export_rows(export_db, min_trades=0),
+            output_file, aggregate=False, chunk_size=2,
+        )
+
+        with open(output_file, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        assert row_count == 3
+        assert rows[0] == reporter.PER_STOCK_ANALYSIS_COLUMNS
+        assert rows[1][:3] == ["AAA", "sma_10_20", "0.5000"]
+        assert rows[3][6] == "12"
+
+    @pytest.mark.parametrize("aggregate", [False, True], ids=["per-stock", "aggregated"])
+    def test_write_strategy_analysis_matches_csv_formatter(self, export_db, tmp_path, aggregate):
+        """Streamed CSV is byte-identical to format_strategy_analysis_as_csv, from dicts or tuples."""
+        if aggregate:
+            records = reporter.analyze_strategy_performance_aggregated(export_db, min_trades=0)
+            streamed = records
+        else:
+            records = reporter.analyze_strategy_performance(export_db, min_trades=0)
+            streamed = reporter.iter_strategy_export_rows(export_db, min_trades=0)
+        output_file = tmp_path / "report.csv"
+
+        reporter.write_strategy_analysis(streamed, output_file, aggregate=aggregate, chunk_size=2)
+
+        expected = reporter.format_strategy_analysis_as_csv(records, aggregate=aggregate)
+        assert output_file.read_text(encoding="utf-8") == expected
+
+    def test_csv_format_quotes_text_and_fixes_metric_decimals(self):
+        """Text fields are quoted (quotes doubled), metrics .4f (avg_trades .1f), integers raw."""
+        per_stock = reporter.format_strategy_analysis_as_csv([{
+            'symbol': 'A"B', 'strategy_rule_stack': 'sma,rsi', 'edge_score': 0.5, 'win_pct': None,
+            'sharpe': 1.23456, 'total_return': -2.0, 'total_trades': 12, 'config_hash': 'h',
+            'run_date': '2025-01-01', 'config_details': "{'a': 1}",
+        }])
+        aggregated = reporter.format_strategy_analysis_as_csv([{
+            'strategy_rule_stack': 's', 'frequency': 3, 'avg_edge_score': 1, 'avg_win_pct': 0.5,
+            'avg_sharpe': 0.0, 'avg_return': 0.1, 'avg_trades': 12.34, 'top_symbols': 'A (2), B (1)',
+            'config_hash': 'h', 'run_date': 'd', 'config_details': '{}',
+        }], aggregate=True)
+
+        assert per_stock.splitlines()[1] == '"A""B","sma,rsi",0.5000,0.0000,1.2346,-2.0000,12,"h","2025-01-01","{\'a\': 1}"'
+        assert aggregated.splitlines()[1] == '"s",3,1.0000,0.5000,0.0000,0.1000,12.3,"A (2), B (1)","h","d","{}"'
+
+    def test_write_strategy_analysis_gzip(self, export_db, tmp_path):
+        """Gzip export produces a readable compressed CSV."""
+        import gzip
+
+        output_file = tmp_path / "report.csv.gz"
+        reporter.write_strategy_analysis(
+            reporter.iter_strategy_export_rows(export_db, min_trades=0),
+            output_file, aggregate=False, compress=True,
+        )
+
+        with gzip.open(output_file, "rt", encoding="utf-8") as f:
+            content = f.read()
+        assert content.startswith('symbol,strategy_rule_stack,')
+        assert '"CCC"' in content
+
+    def test_write_strategy_analysis_aggregated_parquet(self, export_db, tmp_path):
+        """Aggregated records round-trip through Parquet."""
+        pytest.importorskip("pyarrow")
+
+        output_file = tmp_path / "report.parquet"
+        records = reporter.analyze_strategy_performance_aggregated(export_db, min_trades=0)
+        row_count = reporter.write_strategy_analysis(records, output_file, aggregate=True, output_format="parquet")
+
+        df = pd.read_parquet(output_file)
+        assert row_count == 1
+        assert list(df.columns) == reporter.AGGREGATED_ANALYSIS_COLUMNS
+        assert df.loc[0, 'frequency'] == 3
+
+    def test_write_strategy_analysis_unknown_format(self, tmp_path):
+        """Unknown formats are rejected."""
+        with pytest.raises(ValueError, match="Unsupported output format"):
+            reporter.write_strategy_analysis([], tmp_path / "report.xlsx", output_format="xlsx")
+
+
 # =============================================================================
 # Error Handling and Edge Cases Tests
 # =============================================================================
@@ -876,10 +983,12 @@ class TestReportGeneration:
             # Some exceptions may be expected due to incomplete test setup
             assert "report" in str(e).lower() or "file" in str(e).lower()
     
-    def test_generate_report_file_write_error(self, populated_db, sample_config):
+    def test_generate_report_file_write_error(self, populated_db, sample_config, tmp_path):
         """Test report generation with file write error - should return None, not raise."""
-        # Set truly invalid output directory that will cause permission error
-        sample_config.reports_output_dir = "\\\\invalid\\network\\path\\that\\cannot\\exist"
+        # Output directory below a regular file, so it cannot be created on any platform
+        blocker = tmp_path / "blocker"
+        blocker.write_text("")
+        sample_config.reports_output_dir = str(blocker / "reports")
         
         # Should return None instead of raising exception (resilient design)
         # The new signature is simpler and does not involve DB access.
@@ -1153,6 +1262,40 @@ class TestPositionPricingAndCalculations:
         
         assert result['return_pct'] == 10.0
         assert result['nifty_return_pct'] is None  # Should be None due to error
+    
+    def test_calculate_benchmark_returns_vectorized(self):
+        """Benchmark returns for many positions match per-position lookups."""
+        nifty_data = pd.DataFrame({
+            'close': [100.0, 102.0, 101.0, 105.0, 110.0]
+        }, index=pd.to_datetime(['2023-01-02', '2023-01-03', '2023-01-05', '2023-01-06', '2023-01-09']))
+        entry_dates = ['2023-01-02', '2023-01-04', '2023-01-09', '2023-02-01', 'invalid-date']
+        
+        result = reporter.calculate_benchmark_returns(nifty_data, entry_dates)
+        
+        assert result[0] == pytest.approx(10.0)
+        assert result[1] == pytest.approx((110.0 - 101.0) / 101.0 * 100)
+        assert result[2] == pytest.approx(0.0)
+        assert np.isnan(result[3]) and np.isnan(result[4])
+        for entry_date, expected in zip(entry_dates, result):
+            single = reporter.calculate_position_returns(
+                {'entry_price': 100.0, 'entry_date': entry_date}, 100.0, nifty_data
+            )['nifty_return_pct']
+            assert (single is None and np.isnan(expected)) or single == pytest.approx(expected)
+    
+    def test_calculate_benchmark_returns_with_eval_dates(self):
+        """Evaluation dates use the last benchmark bar on or before the date."""
+        nifty_data = pd.DataFrame({
+            'close': [100.0, 102.0, 101.0, 105.0]
+        }, index=pd.to_datetime(['2023-01-02', '2023-01-03', '2023-01-05', '2023-01-06']))
+        
+        result = reporter.calculate_benchmark_returns(
+            nifty_data, ['2023-01-02', '2023-01-02', '2023-01-05'], ['2023-01-04', '2023-01-05', '2023-01-01']
+        )
+        
+        assert result[0] == pytest.approx(2.0)
+        assert result[1] == pytest.approx(1.0)
+        assert np.isnan(result[2])
+        assert np.isnan(reporter.calculate_benchmark_returns(None, ['2023-01-02'])).all()
 
 
 # =============================================================================
@@ -1262,6 +1405,182 @@ class TestPositionProcessing:
         assert len(positions_to_hold) == 1  # Should keep position open when pricing unavailable
         assert len(positions_to_close) == 0
     
+    @patch('kiss_signal.data.get_price_data')
+    @patch('kiss_signal.persistence.get_open_positions')
+    def test_process_open_positions_loads_each_symbol_once(self, mock_get_positions, mock_get_price_data, tmp_path):
+        """Positions sharing a symbol reuse a single history load."""
+        mock_get_positions.return_value = [
+            {'id': 1, 'symbol': 'RELIANCE', 'entry_date': '2023-01-01', 'entry_price': 100.0},
+            {'id': 2, 'symbol': 'RELIANCE', 'entry_date': '2023-01-10', 'entry_price': 120.0},
+            {'id': 3, 'symbol': 'INFY', 'entry_date': '2023-01-05', 'entry_price': 50.0},
+        ]
+        mock_get_price_data.return_value = pd.DataFrame({
+            'close': [105.0], 'high': [106.0], 'low': [104.0]
+        }, index=[pd.Timestamp('2023-01-15')])
+        
+        config = Mock()
+        config.cache_dir = str(tmp_path)
+        config.freeze_date = date(2023, 1, 15)
+        config.hold_period = 20
+        config.historical_data_years = 1
+        exit_conditions = [RuleDef(name='stop', type='stop_loss_pct', params={'percentage': 0.05})]
+        
+        positions_to_close, positions_to_hold = reporter.process_open_positions(
+            tmp_path / "test.db", config, exit_conditions, None
+        )
+        
+        assert mock_get_price_data.call_count == 2
+        assert [p['id'] for p in positions_to_close] == [2]
+        assert positions_to_close[0]['exit_reason'].startswith("Stop-loss triggered at 104.00")
+        assert [p['id'] for p in positions_to_hold] == [1, 3]
+    
+    @patch('kiss_signal.persistence.get_open_positions')
+    def test_process_open_positions_reads_tail_after_indicator_state(self, mock_get_positions, tmp_path):
+        """Symbols with saved ATR state load only the bars since the state's last bar."""
+        from kiss_signal import data, indicator_state
+
+        history = pd.DataFrame({
+            'close': [100.0 + i for i in range(60)],
+            'high': [101.0 + i for i in range(60)],
+            'low': [99.0 + i for i in range(60)],
+        }, index=pd.date_range('2023-01-01', periods=60))
+        db_path = tmp_path / "test.db"
+        persistence.create_database(db_path)
+        key = indicator_state.atr_key(14)
+        persistence.save_indicator_states(db_path, {'RELIANCE': {key: indicator_state.build_state(key, history.iloc[:50])}})
+        mock_get_positions.return_value = [
+            {'id': 1, 'symbol': 'RELIANCE', 'entry_date': '2023-02-20', 'entry_price': 150.0},
+        ]
+        config = Mock()
+        config.cache_dir = str(tmp_path)
+        config.freeze_date = date(2023, 3, 1)
+        config.hold_period = 20
+        config.historical_data_years = 1
+        exit_conditions = [RuleDef(name='atr', type='stop_loss_atr', params={'period': 14, 'multiplier': 2.0})]
+
+        def fake_price_data(symbol, cache_dir, years, start_date=None, end_date=None, freeze_date=None):
+            return history if start_date is None else history[history.index.date >= start_date]
+
+        with patch.object(data, 'get_price_data', side_effect=fake_price_data) as mock_get_price_data:
+            reporter.process_open_positions(db_path, config, exit_conditions, None)
+
+        assert mock_get_price_data.call_count == 1
+        assert mock_get_price_data.call_args.kwargs['start_date'] == date(2023, 2, 19)
+        saved = persistence.get_indicator_states(db_path, ['RELIANCE'])['RELIANCE'][key]
+        assert saved == indicator_state.build_state(key, history) | {'bars': saved['bars']}
+        assert saved['bars'] == 60
+
+        # A state for other parameters has to be rebuilt, which needs the full history
+        exit_conditions = [RuleDef(name='atr', type='stop_loss_atr', params={'period': 10, 'multiplier': 2.0})]
+        with patch.object(data, 'get_price_data', side_effect=fake_price_data) as mock_get_price_data:
+            reporter.process_open_positions(db_path, config, exit_conditions, None)
+
+        assert [c.kwargs.get('start_date') for c in mock_get_price_data.call_args_list] == [date(2023, 3, 1), None]
+
+    def test_latest_entry_signals_reads_tail_after_stream_state(self, tmp_path):
+        """Symbols with current stream states load only the bars since the streams' last bar."""
+        from kiss_signal import data, streaming
+        from kiss_signal.config import RulesConfig
+
+        history = pd.DataFrame({
+            'close': [100.0 + i for i in range(60)],
+            'high': [101.0 + i for i in range(60)],
+            'low': [99.0 + i for i in range(60)],
+        }, index=pd.date_range('2023-01-01', periods=60))
+        rule = RuleDef(name='trend', type='price_above_sma', params={'period': 20})
+        rules_config = RulesConfig(entry_signals=[rule], exit_conditions=[])
+        db_path = tmp_path / "test.db"
+        persistence.create_database(db_path)
+        key = streaming.stream_key(rule)
+        persistence.save_indicator_states(db_path, {'RELIANCE': {key: streaming.build_stream_state(rule, history.iloc[:50])}})
+        config = Mock()
+        config.cache_dir = str(tmp_path)
+        config.freeze_date = date(2023, 3, 1)
+        config.historical_data_years = 1
+
+        def fake_price_data(symbol, cache_dir, years, start_date=None, end_date=None, freeze_date=None):
+            return history if start_date is None else history[history.index.date >= start_date]
+
+        with patch.object(data, 'get_price_data', side_effect=fake_price_data) as mock_get_price_data:
+            fired, frames = reporter.latest_entry_signals(db_path, ['RELIANCE', 'TCS'], config, rules_config)
+
+        assert fired == {'RELIANCE': True, 'TCS': True}
+        assert len(frames['RELIANCE']) == 11
+        assert len(frames['TCS']) == 60
+        assert sorted(
+            (c.kwargs['symbol'], c.kwargs.get('start_date')) for c in mock_get_price_data.call_args_list
+        ) == [('RELIANCE', date(2023, 2, 19)), ('TCS', None)]
+        saved = persistence.get_indicator_states(db_path, ['RELIANCE', 'TCS'])
+        assert saved['RELIANCE'][key] == streaming.build_stream_state(rule, history)
+        assert saved['TCS'][key] == streaming.build_stream_state(rule, history)
+    
+    def test_evaluate_exit_conditions_batch_matches_single(self):
+        """Batched evaluation returns the same reasons as check_exit_conditions."""
+        dates = pd.date_range('2023-01-01', periods=40)
+        rising = pd.DataFrame({
+            'close': [100.0 + i for i in range(40)],
+            'high': [101.0 + i for i in range(40)],
+            'low': [99.0 + i for i in range(40)],
+        }, index=dates)
+        falling = pd.DataFrame({
+            'close': [140.0 - i for i in range(40)],
+            'high': [141.0 - i for i in range(40)],
+            'low': [139.0 - i for i in range(40)],
+        }, index=dates)
+        frames = {'UP': rising, 'DOWN': falling}
+        positions = [
+            {'symbol': 'UP', 'entry_price': 100.0},
+            {'symbol': 'UP', 'entry_price': 135.0},
+            {'symbol': 'DOWN', 'entry_price': 140.0},
+            {'symbol': 'DOWN', 'entry_price': 103.0},
+        ]
+        days_held = [5, 25, 3, 10]
+        exit_conditions = [
+            RuleDef(name='atr_stop', type='stop_loss_atr', params={'period': 14, 'multiplier': 2.0}),
+            {'type': 'take_profit_pct', 'params': {'percentage': 0.30}},
+            RuleDef(name='sma_exit', type='sma_cross_under', params={'fast_period': 5, 'slow_period': 10}),
+        ]
+        
+        batch = reporter.evaluate_exit_conditions_batch(positions, frames, exit_conditions, days_held, 20)
+        
+        expected = [
+            reporter.check_exit_conditions(
+                pos, frames[pos['symbol']], frames[pos['symbol']]['low'].iloc[-1],
+                frames[pos['symbol']]['high'].iloc[-1], exit_conditions, days, 20
+            )
+            for pos, days in zip(positions, days_held)
+        ]
+        assert batch == expected
+        assert any(reason is None for reason in batch)
+        assert any(reason is not None for reason in batch)
+    
+    def test_evaluate_exit_conditions_batch_isolates_failing_symbol(self):
+        """A symbol whose indicator raises skips that condition only for its own positions."""
+        dates = pd.date_range('2023-01-01', periods=40)
+        falling = pd.DataFrame({
+            'close': [140.0 - i for i in range(40)],
+            'high': [141.0 - i for i in range(40)],
+            'low': [139.0 - i for i in range(40)],
+        }, index=dates)
+        frames = {'GOOD': falling, 'BAD': falling.copy()}
+        positions = [{'symbol': 'GOOD', 'entry_price': 140.0}, {'symbol': 'BAD', 'entry_price': 140.0}]
+        exit_conditions = [
+            RuleDef(name='atr_stop', type='stop_loss_atr', params={'period': 14, 'multiplier': 2.0}),
+            RuleDef(name='stop', type='stop_loss_pct', params={'percentage': 0.05}),
+        ]
+        original_atr = rules.calculate_atr
+
+        def failing_atr(price_data, period=14):
+            if price_data is frames['BAD']:
+                raise ValueError("no ATR for BAD")
+            return original_atr(price_data, period)
+
+        with patch('kiss_signal.rules.calculate_atr', side_effect=failing_atr):
+            reasons = reporter.evaluate_exit_conditions_batch(positions, frames, exit_conditions, [5, 5], 20)
+
+        assert reasons[0] == "ATR stop-loss triggered (period: 14, multiplier: 2.0)"
+        assert reasons[1].endswith("- stop_loss_pct")  # Falls through to the next condition
+
     @patch('kiss_signal.persistence.get_open_positions')
     def test_identify_new_signals_basic(self, mock_get_positions, tmp_path):
         """Test new signal identification."""
@@ -1306,6 +1625,26 @@ class TestPositionProcessing:
         new_signals = reporter.identify_new_signals([], tmp_path / "test.db")
         assert new_signals == []
     
+    @patch('kiss_signal.data.get_price_data')
+    @patch('kiss_signal.reporter._get_validated_strategies_from_db', return_value=[])
+    def test_update_positions_reuses_market_data(self, mock_db_strategies, mock_get_price_data, tmp_path):
+        """A NIFTY frame passed in from the run is used instead of reloading ^NSEI."""
+        config = Mock()
+        config.cache_dir = str(tmp_path)
+        config.freeze_date = date(2023, 1, 15)
+        config.hold_period = 20
+        rules_config = Mock()
+        rules_config.exit_conditions = []
+        market_data = pd.DataFrame({'close': [18000, 18100]}, index=pd.date_range('2023-01-01', periods=2))
+        
+        with patch.object(reporter, 'process_open_positions', return_value=([], [])) as mock_process:
+            reporter.update_positions_and_generate_report_data(
+                tmp_path / "test.db", "test_run", config, rules_config, market_data=market_data
+            )
+        
+        mock_get_price_data.assert_not_called()
+        assert mock_process.call_args[0][3] is market_data
+    
     @patch('kiss_signal.data.get_price_data')
     @patch('kiss_signal.persistence.close_positions_batch')
     @patch('kiss_signal.persistence.add_new_positions_from_signals')
@@ -1477,6 +1816,20 @@ class TestAdvancedFormatting:
         assert 'OPEN1' in content
         assert 'CLOSED1' in content
         assert 'Take-profit triggered' in content
+        assert 'Entry Signals on the Latest Bar' not in content
+
+    def test_generate_daily_report_lists_entry_signals(self, sample_config):
+        """Streamed entry signals get their own section."""
+        entry_signals = [{'symbol': 'FIRED1', 'date': '2023-01-15', 'close': 101.5}]
+
+        result = reporter.generate_daily_report([], [], [], sample_config, entry_signals=entry_signals)
+
+        content = result.read_text()
+        assert '## Entry Signals on the Latest Bar' in content
+        assert '| FIRED1 | 2023-01-15 | 101.50 |' in content
+        assert 'No entry signals on the latest bar' in reporter.generate_daily_report(
+            [], [], [], sample_config, entry_signals=[]
+        ).read_text()
 
 
 @pytest.mark.parametrize("csv_format,aggregate", [
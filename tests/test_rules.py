@@ -32,6 +32,8 @@ from kiss_signal.rules import (
     # New functions (Story 023) - Stock personality preconditions
     price_above_long_sma,
     is_volatile,
+    donchian_breakout,
+    donchian_breakdown,
 )
 
 # Import for backtester integration tests
@@ -1602,3 +1604,123 @@ class TestATRExitFunctionsFix:
         assert len(signals) == len(price_data)
         assert signals.dtype == bool
         # The result should be the AND of engulfing_pattern and rsi_oversold only
+
+
+class TestUniverseKernels:
+    """2-D kernels match the per-symbol rules column by column, NaN padding included."""
+
+    @pytest.fixture
+    def universe(self):
+        rng = np.random.default_rng(11)
+        index = pd.bdate_range("2021-01-01", periods=400)
+        frames = {}
+        # (first bar, last bar) per symbol: full history, late listing, delisted, too short, one bar
+        spans = {"FULL": (0, 400), "LATE": (150, 400), "GONE": (0, 260), "SHORT": (390, 400), "ONE": (399, 400)}
+        for symbol, (start, stop) in spans.items():
+            dates = index[start:stop]
+            close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+            frames[symbol] = pd.DataFrame({
+                "open": close * (1 + rng.normal(0, 0.005, len(dates))),
+                "high": close * (1 + np.abs(rng.normal(0, 0.01, len(dates)))),
+                "low": close * (1 - np.abs(rng.normal(0, 0.01, len(dates)))),
+                "close": close,
+                "volume": rng.integers(1_000, 10_000, len(dates)).astype(float),
+            }, index=dates)
+        # Trading halt: missing days inside the history must not break windows or crossovers
+        frames["FULL"] = frames["FULL"].drop(index[200:205])
+        return frames
+
+    def _per_symbol(self, frames, panel, func, **params):
+        return pd.DataFrame(
+            {symbol: func(frame, **params).reindex(panel.index) for symbol, frame in frames.items()}
+        )
+
+    @pytest.mark.parametrize("func_name,params", [
+        ("sma_crossover", {"fast_period": 5, "slow_period": 20}),
+        ("ema_crossover", {"fast_period": 5, "slow_period": 20}),
+        ("rsi_oversold", {"period": 14, "oversold_threshold": 30.0}),
+        ("macd_crossover", {}),
+        ("bollinger_squeeze", {"period": 20, "std_dev": 2.0, "squeeze_threshold": 0.2}),
+        ("price_above_sma", {"period": 50}),
+    ])
+    def test_close_signals_match_per_symbol_rules(self, universe, func_name, params):
+        from kiss_signal import data, rules
+
+        close = data.price_panel(universe, "close")
+        expected = self._per_symbol(universe, close, getattr(rules, func_name), **params)
+        actual = getattr(rules, f"{func_name}_2d")(close.to_numpy(), **params)
+
+        np.testing.assert_array_equal(actual, expected.fillna(False).to_numpy(dtype=bool))
+        assert actual.any()
+
+    def test_volume_spike_matches_per_symbol_rule(self, universe):
+        from kiss_signal import data, rules
+
+        close, volume = data.price_panel(universe, "close"), data.price_panel(universe, "volume")
+        params = {"period": 10, "spike_multiplier": 1.5, "price_change_threshold": 0.01}
+        expected = self._per_symbol(universe, close, rules.volume_spike, **params)
+        actual = rules.volume_spike_2d(close.to_numpy(), volume.to_numpy(), **params)
+        np.testing.assert_array_equal(actual, expected.fillna(False).to_numpy(dtype=bool))
+
+    def test_indicators_match_per_symbol_values(self, universe):
+        from kiss_signal import data, rules
+
+        close = data.price_panel(universe, "close")
+        high, low = data.price_panel(universe, "high"), data.price_panel(universe, "low")
+        expected_rsi = pd.DataFrame({s: calculate_rsi(f["close"], 14).reindex(close.index) for s, f in universe.items()})
+        expected_atr = pd.DataFrame({s: calculate_atr(f, 14).reindex(close.index) for s, f in universe.items()})
+
+        np.testing.assert_array_equal(rules.calculate_rsi_2d(close.to_numpy(), 14), expected_rsi.to_numpy())
+        np.testing.assert_array_equal(
+            rules.calculate_atr_2d(high.to_numpy(), low.to_numpy(), close.to_numpy(), 14), expected_atr.to_numpy()
+        )
+
+    def test_padded_cells_stay_empty(self, universe):
+        from kiss_signal import data, rules
+
+        close = data.price_panel(universe, "close")
+        rsi = rules.calculate_rsi_2d(close.to_numpy(), 14)
+        signals = rules.rsi_oversold_2d(close.to_numpy(), 14)
+        padded = close.isna().to_numpy()
+        assert np.isnan(rsi[padded]).all()
+        assert not signals[padded].any()
+
+    def test_rejects_non_panel_input(self):
+        from kiss_signal import rules
+
+        with pytest.raises(ValueError, match="2-D"):
+            rules.sma_crossover_2d(np.arange(50.0), 5, 20)
+        with pytest.raises(ValueError, match="fast_period"):
+            rules.sma_crossover_2d(np.ones((50, 2)), 20, 5)
+
+
+class TestDonchianChannels:
+    @pytest.fixture
+    def trending_data(self) -> pd.DataFrame:
+        rng = np.random.default_rng(3)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 300)))
+        return pd.DataFrame({
+            "high": close * 1.01, "low": close * 0.99, "close": close,
+        }, index=pd.bdate_range("2023-01-02", periods=300))
+
+    def test_breakout_matches_prior_channel(self, trending_data):
+        expected = trending_data["close"] > trending_data["high"].rolling(20).max().shift(1)
+        signals = donchian_breakout(trending_data, period=20)
+
+        pd.testing.assert_series_equal(signals, expected, check_names=False)
+        assert signals.sum() > 0
+
+    def test_breakdown_matches_prior_channel(self, trending_data):
+        expected = trending_data["close"] < trending_data["low"].rolling(10).min().shift(1)
+        signals = donchian_breakdown(trending_data, period=10)
+
+        pd.testing.assert_series_equal(signals, expected, check_names=False)
+        assert signals.sum() > 0
+
+    def test_insufficient_data_and_validation(self, trending_data):
+        assert not donchian_breakout(trending_data.iloc[:20], period=20).any()
+        assert not donchian_breakdown(trending_data.iloc[:5], period=10).any()
+        with pytest.raises(ValueError, match="must be positive"):
+            donchian_breakout(trending_data, period=0)
+        with pytest.raises(ValueError, match="Missing required columns"):
+            donchian_breakdown(trending_data[["close"]])
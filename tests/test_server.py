@@ -0,0 +1,138 @@
+"""Tests for the warm server and its thin-client protocol."""
+
+import json
+import os
+import stat
+import threading
+import urllib.error
+import urllib.request
+from typing import Dict, List, Tuple
+from unittest.mock import patch
+
+import pytest
+
+from kiss_signal import backtester, server
+from kiss_signal.config import RuleDef, RulesConfig
+
+TOKEN = "test-token"
+
+
+@pytest.fixture
+def running_server():
+    calls: List[Tuple[List[str], str]] = []
+
+    def executor(argv: List[str], cwd: str) -> Tuple[int, str]:
+        calls.append((argv, cwd))
+        return 3, f"ran {' '.join(argv)}\n"
+
+    httpd = server.create_server(TOKEN, "127.0.0.1", 0, executor=executor)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}", calls
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _post(url: str, body: bytes, headers: Dict[str, str]) -> int:
+    """POSTs to /invoke and returns the HTTP status."""
+    request = urllib.request.Request(f"{url}/invoke", data=body, headers=headers, method="POST")
+    try:
+        with urllib.request.urlopen(request) as response:
+            return int(response.status)
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+class TestServer:
+    def test_invoke_remote_round_trip(self, running_server, tmp_path) -> None:
+        url, calls = running_server
+        exit_code, output = server.invoke_remote(url, ["run", "--freeze-data", "2025-01-31"], str(tmp_path), TOKEN)
+
+        assert exit_code == 3
+        assert output == "ran run --freeze-data 2025-01-31\n"
+        assert calls == [(["run", "--freeze-data", "2025-01-31"], str(tmp_path))]
+
+    def test_health_reports_requests(self, running_server, tmp_path) -> None:
+        url, _ = running_server
+        server.invoke_remote(url, ["run"], str(tmp_path), TOKEN)
+        with urllib.request.urlopen(f"{url}/health") as response:
+            health = json.loads(response.read())
+        assert health["status"] == "ok"
+        assert health["requests"] == 1
+        assert "cached_frames" in health
+
+    def test_malformed_request_is_rejected(self, running_server) -> None:
+        url, calls = running_server
+        headers = {"Content-Type": "application/json", server.TOKEN_HEADER: TOKEN}
+        assert _post(url, b'{"cwd": "/"}', headers) == 400
+        assert calls == []
+
+    @pytest.mark.parametrize("headers, status", [
+        ({"Content-Type": "application/json"}, 403),
+        ({"Content-Type": "application/json", server.TOKEN_HEADER: "wrong"}, 403),
+        ({"Content-Type": "text/plain", server.TOKEN_HEADER: TOKEN}, 415),
+        ({"Content-Type": "application/json", server.TOKEN_HEADER: TOKEN, "Origin": "http://evil.example"}, 403),
+    ])
+    def test_unauthenticated_or_cross_origin_requests_are_rejected(
+        self, running_server, headers: Dict[str, str], status: int
+    ) -> None:
+        url, calls = running_server
+        assert _post(url, json.dumps({"argv": ["run"]}).encode("utf-8"), headers) == status
+        assert calls == []
+
+    @pytest.mark.parametrize("argv", [
+        ["clear-and-recalculate", "--force"],
+        ["--config", "run", "serve"],
+        ["--help"],
+    ])
+    def test_only_forwarded_commands_are_served(self, running_server, tmp_path, argv: List[str]) -> None:
+        url, calls = running_server
+        with pytest.raises(urllib.error.HTTPError) as exc_info:
+            server.invoke_remote(url, argv, str(tmp_path), TOKEN)
+        assert exc_info.value.code == 403
+        assert calls == []
+
+    def test_global_options_before_command_are_skipped(self, running_server, tmp_path) -> None:
+        url, calls = running_server
+        argv = ["--config", "config.yaml", "--verbose", "backtest", "RELIANCE"]
+        server.invoke_remote(url, argv, str(tmp_path), TOKEN)
+        assert calls == [(argv, str(tmp_path))]
+
+    @pytest.mark.parametrize("host", ["0.0.0.0", "192.168.1.10", "example.com"])
+    def test_non_loopback_host_is_refused(self, host: str) -> None:
+        with pytest.raises(ValueError, match="non-loopback"):
+            server.create_server(TOKEN, host, 0)
+
+    def test_token_file_is_private(self, tmp_path) -> None:
+        path = tmp_path / "cache" / server.TOKEN_FILENAME
+        server._write_token(path, TOKEN)
+        server._write_token(path, "rotated")
+
+        assert server.read_token(tmp_path / "cache") == "rotated"
+        if os.name == "posix":
+            assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    def test_unreachable_server_raises_oserror(self, tmp_path) -> None:
+        httpd = server.create_server(TOKEN, "127.0.0.1", 0)
+        port = httpd.server_port
+        httpd.server_close()  # Nothing listens on the port any more
+        with pytest.raises(OSError):
+            server.invoke_remote(f"http://127.0.0.1:{port}", ["run"], str(tmp_path), TOKEN, timeout=5)
+
+    def test_invoke_cli_captures_output_and_exit_code(self, tmp_path) -> None:
+        exit_code, output = server._invoke_cli(["--help"], str(tmp_path))
+        assert exit_code == 0
+        assert "serve" in output and "run" in output
+
+        exit_code, _ = server._invoke_cli(["no-such-command"], str(tmp_path))
+        assert exit_code != 0
+
+    def test_warm_up_simulates_through_the_public_backtester(self, test_config) -> None:
+        rules_config = RulesConfig(entry_signals=[
+            RuleDef(name="sma", type="sma_crossover", params={"fast_period": 5, "slow_period": 20}),
+        ])
+        simulate = backtester._vbt().Portfolio.from_signals
+        with patch.object(backtester._vbt().Portfolio, "from_signals", side_effect=simulate) as from_signals:
+            server._warm_up(test_config, rules_config)
+
+        assert from_signals.called
@@ -0,0 +1,237 @@
+"""Tests for the streaming (bar-by-bar) signal engine."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kiss_signal import rules, streaming
+from kiss_signal.config import RuleDef, RulesConfig
+
+
+@pytest.fixture
+def price_data() -> pd.DataFrame:
+    rng = np.random.default_rng(45)
+    n = 140
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+    open_ = close * (1 + rng.normal(0, 0.01, n))
+    return pd.DataFrame({
+        "open": open_,
+        "high": np.maximum(open_, close) * (1 + rng.uniform(0, 0.02, n)),
+        "low": np.minimum(open_, close) * (1 - rng.uniform(0, 0.03, n)),
+        "close": close,
+        "volume": rng.integers(100_000, 1_000_000, n).astype(float),
+    }, index=pd.bdate_range("2024-01-01", periods=n, name="date"))
+
+
+STREAM_RULES = [
+    ("sma_crossover", {"fast_period": 5, "slow_period": 15}),
+    ("sma_cross_under", {"fast_period": 5, "slow_period": 15}),
+    ("ema_crossover", {"fast_period": 5, "slow_period": 15}),
+    ("macd_crossover", {"fast_period": 6, "slow_period": 13, "signal_period": 5}),
+    ("rsi_oversold", {"period": 14, "oversold_threshold": 45.0}),
+    ("volume_spike", {"period": 10, "spike_multiplier": 1.5, "price_change_threshold": 0.005}),
+    ("hammer_pattern", {"body_ratio": 0.4, "shadow_ratio": 1.5}),
+    ("engulfing_pattern", {"min_body_ratio": 1.1}),
+    ("bollinger_squeeze", {"period": 10, "std_dev": 2.0, "squeeze_threshold": 0.15}),
+    ("price_above_sma", {"period": 20}),
+    ("price_above_long_sma", {"period": 50}),
+    ("market_above_sma", {"period": 30, "index_symbol": "^NSEI"}),
+    ("is_volatile", {"period": 14, "atr_threshold_pct": 0.02}),
+    ("simple_trailing_stop", {"trail_percent": 0.05}),
+    ("chandelier_exit", {"atr_period": 14, "atr_multiplier": 2.0}),
+    ("donchian_breakout", {"period": 10}),
+    ("donchian_breakdown", {"period": 10}),
+]
+
+
+def _batch(rule_type: str, params: dict, price_data: pd.DataFrame) -> pd.Series:
+    params = {key: value for key, value in params.items() if key != "index_symbol"}
+    return getattr(rules, rule_type)(price_data, **params)
+
+
+class TestStreamEquivalence:
+    def test_every_stream_rule_is_covered(self) -> None:
+        assert {rule_type for rule_type, _ in STREAM_RULES} == set(streaming.STREAMS)
+
+    @pytest.mark.parametrize("rule_type,params", STREAM_RULES, ids=[r for r, _ in STREAM_RULES])
+    def test_stream_matches_batch_rule_on_every_prefix(
+        self, price_data: pd.DataFrame, rule_type: str, params: dict
+    ) -> None:
+        rule = {"type": rule_type, "params": params}
+        stream = streaming.create_stream(rule)
+        for i, (_, bar) in enumerate(streaming._bars(price_data)):
+            signal = stream.update(bar)
+            if i >= 60:  # Past every rule's warm-up, the last bar of each prefix must agree
+                assert signal == bool(_batch(rule_type, params, price_data.iloc[: i + 1]).iloc[-1]), i
+
+    def test_state_survives_json_round_trip(self, price_data: pd.DataFrame) -> None:
+        rule = {"type": "macd_crossover", "params": {"fast_period": 6, "slow_period": 13, "signal_period": 5}}
+        state = json.loads(json.dumps(streaming.build_stream_state(rule, price_data.iloc[:100])))
+        state, rebuilt = streaming.sync_stream(rule, state, price_data)
+
+        assert not rebuilt
+        assert state == streaming.build_stream_state(rule, price_data)
+
+    def test_unknown_rule_and_bad_params_raise(self) -> None:
+        with pytest.raises(ValueError, match="no streaming counterpart"):
+            streaming.create_stream({"type": "stop_loss_pct", "params": {"percentage": 0.05}})
+        with pytest.raises(ValueError, match="Invalid parameters"):
+            streaming.create_stream({"type": "rsi_oversold", "params": {"window": 14}})
+
+
+class TestSyncStream:
+    RULE = RuleDef(name="trend", type="price_above_sma", params={"period": 20})
+
+    def test_stream_key_ignores_index_symbol_and_param_order(self) -> None:
+        a = {"type": "market_above_sma", "params": {"period": 50, "index_symbol": "^NSEI"}}
+        b = {"type": "market_above_sma", "params": {"period": 50}}
+        assert streaming.stream_key(a) == streaming.stream_key(b)
+        assert streaming.stream_key(self.RULE) == 'stream:price_above_sma:{"period": 20}'
+
+    def test_missing_state_is_built(self, price_data: pd.DataFrame) -> None:
+        state, rebuilt = streaming.sync_stream(self.RULE, None, price_data)
+        assert rebuilt
+        assert state["last_date"] == str(price_data.index[-1])
+        assert state["signal"] == bool(rules.price_above_sma(price_data, period=20).iloc[-1])
+
+    def test_changed_params_rebuild(self, price_data: pd.DataFrame) -> None:
+        state = streaming.build_stream_state(self.RULE, price_data.iloc[:100])
+        other = RuleDef(name="trend", type="price_above_sma", params={"period": 30})
+        state, rebuilt = streaming.sync_stream(other, state, price_data)
+        assert rebuilt
+        assert state["key"] == streaming.stream_key(other)
+
+    def test_revised_history_rebuilds(self, price_data: pd.DataFrame) -> None:
+        state = streaming.build_stream_state(self.RULE, price_data.iloc[:100])
+        revised = price_data.copy()
+        revised.iloc[99, revised.columns.get_loc("close")] *= 1.1  # e.g. a corporate-action adjustment
+
+        state, rebuilt = streaming.sync_stream(self.RULE, state, revised)
+        assert rebuilt
+        assert state == streaming.build_stream_state(self.RULE, revised)
+
+    def test_up_to_date_state_is_unchanged(self, price_data: pd.DataFrame) -> None:
+        state = streaming.build_stream_state(self.RULE, price_data)
+        synced, rebuilt = streaming.sync_stream(self.RULE, json.loads(json.dumps(state)), price_data)
+        assert not rebuilt
+        assert synced == state
+
+
+class TestLatestSignals:
+    @staticmethod
+    def _config(**overrides) -> RulesConfig:
+        config = {
+            "entry_signals": [
+                RuleDef(name="trend", type="price_above_sma", params={"period": 20}),
+                RuleDef(name="expr", type="expression", params={"expr": "close > 0"}),
+            ],
+            "exit_conditions": [RuleDef(name="stop", type="stop_loss_pct", params={"percentage": 0.05})],
+        }
+        config.update(overrides)
+        return RulesConfig(**config)
+
+    def test_matches_batch_rules_and_persists_states(self, price_data: pd.DataFrame) -> None:
+        falling = price_data.copy()
+        falling["close"] = np.linspace(200, 100, len(falling))
+        rising = price_data.copy()
+        rising["close"] = np.linspace(100, 200, len(rising))
+        states: dict = {}
+
+        fired = streaming.latest_signals({"UP": rising, "DOWN": falling}, self._config(), states)
+
+        assert fired == {"UP": True, "DOWN": False}
+        assert set(states) == {"UP", "DOWN"}
+        assert list(states["UP"]) == ['stream:price_above_sma:{"period": 20}']  # Expressions run in batch
+        assert streaming.latest_signals({"UP": rising, "DOWN": falling}, self._config()) == fired
+
+    def test_context_filters_use_market_data(self, price_data: pd.DataFrame) -> None:
+        rising = price_data.copy()
+        rising["close"] = np.linspace(100, 200, len(rising))
+        falling = rising.copy()
+        falling["close"] = falling["close"].to_numpy()[::-1]
+        config = self._config(context_filters=[
+            RuleDef(name="market", type="market_above_sma", params={"index_symbol": "^NSEI", "period": 20})
+        ])
+        states: dict = {}
+
+        assert streaming.latest_signals({"A": rising}, config, states, market_data=rising) == {"A": True}
+        assert "^NSEI" in states
+        assert streaming.latest_signals({"A": rising}, config, {}, market_data=falling) == {"A": False}
+        assert streaming.latest_signals({"A": rising}, config) == {"A": False}
+
+    def test_failed_precondition_still_advances_entry_states(self, price_data: pd.DataFrame) -> None:
+        rising = price_data.copy()
+        rising["close"] = np.linspace(100, 200, len(rising))
+        config = self._config(preconditions=[
+            RuleDef(name="volatile", type="is_volatile", params={"period": 14, "atr_threshold_pct": 0.9})
+        ])
+        states: dict = {}
+
+        assert streaming.latest_signals({"A": rising}, config, states) == {"A": False}
+        assert len(states["A"]) == 2
+
+    def test_failing_symbol_is_skipped(self, price_data: pd.DataFrame) -> None:
+        broken = price_data.drop(columns=["close"])
+        assert streaming.latest_signals({"A": price_data, "B": broken, "C": price_data.iloc[:0]}, self._config()) == {
+            "A": bool(rules.price_above_sma(price_data, period=20).iloc[-1])
+        }
+
+    def test_tails_with_history_loader_match_full_history(self, price_data: pd.DataFrame) -> None:
+        config = self._config(entry_signals=[RuleDef(name="trend", type="price_above_sma", params={"period": 20})])
+        states: dict = {}
+        streaming.latest_signals({"A": price_data.iloc[:100]}, config, states)
+        start = streaming.history_start(config, states["A"])
+        assert start == price_data.index[99].date()
+
+        loaded: list = []
+
+        def loader(symbol: str) -> pd.DataFrame:
+            loaded.append(symbol)
+            return price_data
+
+        tail = price_data.loc[pd.Timestamp(start):]
+        fired = streaming.latest_signals({"A": tail}, config, states, history_loader=loader)
+
+        assert fired == streaming.latest_signals({"A": price_data}, config)
+        assert loaded == []  # Advanced from the tail alone
+        assert states["A"][streaming.stream_key(config.entry_signals[0])]["last_date"] == str(price_data.index[-1])
+
+    def test_history_loader_serves_rebuilds_and_batch_rules(self, price_data: pd.DataFrame) -> None:
+        loaded: list = []
+
+        def loader(symbol: str) -> pd.DataFrame:
+            loaded.append(symbol)
+            return price_data
+
+        states: dict = {}
+        fired = streaming.latest_signals({"A": price_data.iloc[-5:]}, self._config(), states, history_loader=loader)
+
+        assert fired == streaming.latest_signals({"A": price_data}, self._config())
+        assert loaded == ["A"]  # Loaded once for the rebuild and the expression
+
+
+class TestHistoryStart:
+    def test_earliest_stream_date_or_none(self, price_data: pd.DataFrame) -> None:
+        sma = RuleDef(name="trend", type="price_above_sma", params={"period": 20})
+        rsi = RuleDef(name="rsi", type="rsi_oversold", params={"period": 14, "oversold_threshold": 45.0})
+        config = RulesConfig(entry_signals=[sma, rsi], exit_conditions=[])
+        states = {
+            streaming.stream_key(sma): streaming.build_stream_state(sma, price_data.iloc[:90]),
+            streaming.stream_key(rsi): streaming.build_stream_state(rsi, price_data.iloc[:80]),
+        }
+
+        assert streaming.history_start(config, states) == price_data.index[79].date()
+        assert streaming.history_start(config, {streaming.stream_key(sma): states[streaming.stream_key(sma)]}) is None
+        assert streaming.history_start(config, None) is None
+        expression = RuleDef(name="expr", type="expression", params={"expr": "close > 0"})
+        assert streaming.history_start(RulesConfig(entry_signals=[sma, expression], exit_conditions=[]), states) is None
+
+    def test_advance_stream_needs_the_last_bar(self, price_data: pd.DataFrame) -> None:
+        rule = RuleDef(name="trend", type="price_above_sma", params={"period": 20})
+        state = streaming.build_stream_state(rule, price_data.iloc[:100])
+
+        assert streaming.advance_stream(rule, dict(state), price_data.iloc[100:]) is None
+        assert streaming.advance_stream(rule, state, price_data.iloc[99:]) == streaming.build_stream_state(rule, price_data)
+        assert streaming.advance_stream(rule, None, price_data) is None